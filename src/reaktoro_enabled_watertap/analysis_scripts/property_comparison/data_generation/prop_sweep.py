@@ -12,13 +12,21 @@
 
 from parameter_sweep.loop_tool.loop_tool import loopTool, get_working_dir
 import reaktoro_enabled_watertap.flowsheets.property_comparator.watertap_prop_comparison as wpc
+import reaktoro_enabled_watertap.flowsheets.property_comparator.direct_prop_comparison as dpc
+from reaktoro_enabled_watertap.flowsheets.property_comparator.property_grid import (
+    evaluate_property_grid,
+)
 import time
+import os
+import yaml
+import numpy as np
 from reaktoro_enabled_watertap.utils.report_util import get_lib_path
+from reaktoro_enabled_watertap.utils.adaptive_sweep import save_sweep_results
 
 __author__ = "Alexander V. Dudchenko"
 
 
-def main(save_location=None, config_location=None):
+def main(save_location=None, config_location=None, direct=False):
     ts = time.time()
     work_path = get_lib_path()
     work_path = str(work_path) + "/analysis_scripts/property_comparison/data_generation"
@@ -27,17 +35,91 @@ def main(save_location=None, config_location=None):
     if config_location is None:
         config_location = work_path
 
-    loopTool(
-        config_location + "/prop_sweep.yaml",
-        build_function=wpc.build_model,
-        optimize_function=wpc.solve_model,
-        save_name="prop_sweep",
-        saving_dir=save_location,
-        number_of_subprocesses=1,
-        num_loop_workers=1,
-    )
+    if direct:
+        run_direct_sweep(
+            config_location + "/prop_sweep.yaml",
+            save_location + "/output/prop_sweep_analysisType_prop_sweep.h5",
+        )
+    else:
+        loopTool(
+            config_location + "/prop_sweep.yaml",
+            build_function=wpc.build_model,
+            optimize_function=wpc.solve_model,
+            save_name="prop_sweep",
+            saving_dir=save_location,
+            number_of_subprocesses=1,
+            num_loop_workers=1,
+        )
+    print("Total time: ", time.time() - ts)
+
+
+def run_direct_sweep(config_file, h5_file):
+    """runs sweeps defined in prop_sweep.yaml using direct property comparison
+    (no NLP solves) and saves them using loopTool h5 layout"""
+    with open(config_file, "r") as f:
+        config = yaml.safe_load(f)
+    if os.path.exists(h5_file):
+        os.remove(h5_file)
+    os.makedirs(os.path.dirname(h5_file), exist_ok=True)
+    for analysis, analysis_config in config.items():
+        build_loop = analysis_config["build_loop"]
+        for water, water_config in build_loop["water_sim_cases"].items():
+            for sweep_name, sweep in build_loop["sweep_param_loop"].items():
+                water_recovery = np.linspace(
+                    sweep["lower_limit"], sweep["upper_limit"], sweep["num_samples"]
+                )
+                results = dpc.compare_properties(
+                    water_config["water_case"], water_recovery
+                )
+                outputs = {
+                    key: data
+                    for key, data in results.items()
+                    if key != "fs.water_recovery"
+                }
+                save_sweep_results(
+                    {
+                        "sweep_params": {sweep["param"]: water_recovery},
+                        "outputs": outputs,
+                        "solve_successful": np.ones(len(water_recovery), dtype=bool),
+                    },
+                    h5_file,
+                    f"{analysis}/water_sim_cases/{water}/{sweep_name}",
+                )
 
+
+def run_grid_sweep(save_location=None, config_location=None, num_workers=1):
+    """evaluates property comparison over water x recovery x temperature x pressure
+    grid defined in prop_grid.yaml and saves it as a columnar table
+    (output/prop_grid.npz and output/prop_grid.csv)"""
+    ts = time.time()
+    work_path = get_lib_path()
+    work_path = str(work_path) + "/analysis_scripts/property_comparison/data_generation"
+    if save_location is None:
+        save_location = work_path
+    if config_location is None:
+        config_location = work_path
+    with open(config_location + "/prop_grid.yaml", "r") as f:
+        config = yaml.safe_load(f)["prop_grid"]
+    grid = {
+        dim: np.linspace(
+            config[dim]["lower_limit"],
+            config[dim]["upper_limit"],
+            config[dim]["num_samples"],
+        )
+        for dim in ["water_recovery", "temperature", "pressure"]
+    }
+    table = evaluate_property_grid(
+        config["water_cases"],
+        chunk_size=config.get("chunk_size", 100),
+        num_workers=num_workers,
+        **grid,
+    )
+    os.makedirs(save_location + "/output", exist_ok=True)
+    table.save(save_location + "/output/prop_grid.npz")
+    with open(save_location + "/output/prop_grid.csv", "w", newline="") as f:
+        table.to_csv(f)
     print("Total time: ", time.time() - ts)
+    return table
 
 
 if __name__ == "__main__":
@@ -10,7 +10,7 @@
 # "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
 #################################################################################
 
-from psPlotKit.data_manager.ps_data_manager import PsDataManager
+from reaktoro_enabled_watertap.utils.sweep_data_store import SweepDataStore
 from psPlotKit.data_plotter.fig_generator import FigureGenerator
 from reaktoro_enabled_watertap.utils.report_util import get_lib_path
 import pandas as pd
@@ -105,50 +105,51 @@ def main(show_figs=False):
     save_location = (
         work_path / "analysis_scripts/property_comparison/figure_generation/"
     )
-    data_manager = PsDataManager(
+    sweep_store = SweepDataStore(
         str(
             work_path
             / "analysis_scripts/property_comparison/data_generation/output/prop_sweep_analysisType_prop_sweep.h5"
         ),
     )
 
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.water_recovery",
         return_key="Water recovery",
         units="%",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.feed_tds",
         return_key="TDS",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.modified_properties[osmoticPressure,H2O]",
         return_key=("Reaktoro", "osmotic pressure"),
         assign_units="Pa",
         conversion_factor=1e-5,
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.seawater_feed.properties[0.0].pressure_osm_phase[Liq]",
         return_key=("Watertap Seawater property package", "osmotic pressure"),
         units="bar",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.nacl_feed.properties[0.0].pressure_osm_phase[Liq]",
         return_key=("Watertap NaCl property package", "osmotic pressure"),
         units="bar",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.multicomp_feed.properties[0.0].dens_mass_phase[Liq]",
         return_key=("Reaktoro", "density"),
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.seawater_feed.properties[0.0].dens_mass_phase[Liq]",
         return_key=("Watertap Seawater property package", "density"),
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.nacl_feed.properties[0.0].dens_mass_phase[Liq]",
         return_key=("Watertap NaCl property package", "density"),
     )
+    data_manager = sweep_store.get_data_manager()
     data_manager.load_data()
     data_manager.display()
     water_reference = {
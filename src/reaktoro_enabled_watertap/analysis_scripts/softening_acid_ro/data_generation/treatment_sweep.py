@@ -18,7 +18,12 @@ from reaktoro_enabled_watertap.utils.report_util import get_lib_path
 __author__ = "Alexander V. Dudchenko"
 
 
-def main(save_location=None, config_location=None):
+def main(
+    save_location=None, config_location=None, memory_lean=False, rss_threshold=None
+):
+    """Runs treatment sweep, if memory_lean is True, models are torn down between
+    builds, memory is tracked per build/initialize/solve phase (saved next to results)
+    and reaktoro workers are restarted when memory exceeds rss_threshold (MB)"""
     ts = time.time()
     work_path = get_lib_path()
     work_path = str(work_path) + "/analysis_scripts/softening_acid_ro/data_generation"
@@ -27,18 +32,32 @@ def main(save_location=None, config_location=None):
     if config_location is None:
         config_location = work_path
 
+    build_function = sar.build_model
+    initialize_function = sar.initialize
+    optimize_function = sar.solve_model
+    if memory_lean:
+        lean_sweep = sar.get_memory_lean_sweep(rss_threshold=rss_threshold)
+        build_function = lean_sweep.build
+        initialize_function = lean_sweep.initialize
+        optimize_function = lean_sweep.optimize
     loopTool(
         config_location + "/treatment_lime_soda_ash_hcl_h2so4_sweep.yaml",
-        build_function=sar.build_model,
-        initialize_function=sar.initialize,
-        optimize_function=sar.solve_model,
+        build_function=build_function,
+        initialize_function=initialize_function,
+        optimize_function=optimize_function,
         save_name="treatment_lime_soda_ash_hcl_h2so4_sweep",
         probe_function=sar.test_func,
         saving_dir=save_location,
         number_of_subprocesses=1,
         num_loop_workers=1,
     )
-
+    if memory_lean:
+        lean_sweep.teardown()
+        lean_sweep.tracker.report()
+        lean_sweep.tracker.save(
+            save_location
+            + "/output/treatment_lime_soda_ash_hcl_h2so4_sweep_memory.json"
+        )
     print("Total time: ", time.time() - ts)
 
 
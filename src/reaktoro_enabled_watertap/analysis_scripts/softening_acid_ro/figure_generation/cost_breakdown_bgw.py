@@ -10,7 +10,7 @@
 # "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
 #################################################################################
 
-from psPlotKit.data_manager.ps_data_manager import PsDataManager
+from reaktoro_enabled_watertap.utils.sweep_data_store import SweepDataStore
 from psPlotKit.data_plotter.ps_break_down_plotter import BreakDownPlotter
 from reaktoro_enabled_watertap.utils.report_util import get_lib_path
 from psPlotKit.data_manager.costing_packages.watertap_costing import (
@@ -30,7 +30,7 @@ def main(show_figs=True):
     save_location = (
         work_path / "analysis_scripts/softening_acid_ro/figure_generation/cost_figures/"
     )
-    costing_data = PsDataManager(
+    sweep_store = SweepDataStore(
         str(
             work_path
             / "analysis_scripts/softening_acid_ro/data_generation/output/treatment_lime_soda_ash_hcl_h2so4_sweep_analysisType_treatment_sweep.h5"
@@ -83,7 +83,7 @@ def main(show_figs=True):
         },
     )
 
-    costing_data.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.water_recovery",
         return_key="Water recovery",
         units="%",
@@ -115,6 +115,16 @@ def main(show_figs=True):
     pkg.register_product_flow(
         file_key="fs.product.product.properties[0.0].flow_vol_phase[Liq]"
     )
+    # costing keys are registered by PsCostingManager
+    for pattern in [
+        "fs.costing.*",
+        "*.costing.*",
+        "*control_volume.work*",
+        "*flow_mass_reagent*",
+        "fs.product.product.properties*",
+    ]:
+        sweep_store.register_key_pattern(pattern)
+    costing_data = sweep_store.get_data_manager()
     cm = PsCostingManager(
         costing_data, pkg, [RO, HPRO, erd, softening, acid_addition]
     )  # , acid_addition])
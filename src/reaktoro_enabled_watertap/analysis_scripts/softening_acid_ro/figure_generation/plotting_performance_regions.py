@@ -10,7 +10,7 @@
 # "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
 #################################################################################
 
-from psPlotKit.data_manager.ps_data_manager import PsDataManager
+from reaktoro_enabled_watertap.utils.sweep_data_store import SweepDataStore
 from psPlotKit.data_plotter.fig_generator import FigureGenerator
 from reaktoro_enabled_watertap.utils.report_util import get_lib_path
 
@@ -94,166 +94,167 @@ def main(show_figs=True):
         work_path
         / "analysis_scripts/softening_acid_ro/figure_generation/treatment_figures/"
     )
-    data_manager = PsDataManager(
+    sweep_store = SweepDataStore(
         str(
             work_path
             / "analysis_scripts/softening_acid_ro/data_generation/output/treatment_lime_soda_ash_hcl_h2so4_sweep_analysisType_treatment_sweep.h5"
         ),
     )
 
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.water_recovery",
         return_key="Water recovery",
         units="%",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.costing.LCOW",
         return_key="LCOW",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.hpro_unit.ro_unit.flux_mass_phase_comp_avg[0.0,Liq,H2O]",
         return_key=("HPRO1", "flux"),
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.hpro_unit.ro_unit.flux_mass_phase_comp[0.0,0.1,Liq,H2O]",
         return_key=("HPRO1", "flux inlet"),
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.hpro_unit.ro_unit.flux_mass_phase_comp[0.0,1.0,Liq,H2O]",
         return_key=("HPRO1", "flux outlet"),
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.hpro_unit.ro_unit.area",
         return_key=("HPRO1", "area"),
         units="m**2",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.ro_unit.ro_retentate.pH",
         return_key=("RO1", "pH"),
         units="dimensionless",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.hpro_unit.ro_retentate.pH",
         return_key=("HPRO1", "pH"),
         units="dimensionless",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.softening_unit.precipitation_reactor.pH[outlet]",
         return_key=("softening", "pH"),
         units="dimensionless",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.hpro_unit.ro_unit.feed_side.properties[0.0,0.0].pressure",
         return_key=("HPRO1", "pressure"),
         units="bar",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.hpro_unit.ro_unit.feed_side.velocity[0.0,0.0]",
         return_key=("HPRO1", "velocity"),
         units="m/s",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.ro_unit.ro_unit.flux_mass_phase_comp_avg[0.0,Liq,H2O]",
         return_key=("RO1", "flux"),
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.ro_unit.ro_unit.flux_mass_phase_comp[0.0,0.1,Liq,H2O]",
         return_key=("RO1", "flux inlet"),
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.ro_unit.ro_unit.flux_mass_phase_comp[0.0,1.0,Liq,H2O]",
         return_key=("RO1", "flux outlet"),
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.ro_unit.ro_unit.area",
         return_key=("RO1", "area"),
         units="m**2",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.ro_unit.ro_unit.feed_side.properties[0.0,0.0].pressure",
         return_key=("RO1", "pressure"),
         units="bar",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.ro_unit.ro_unit.feed_side.velocity[0.0,0.0]",
         return_key=("RO1", "velocity"),
         units="m/s",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.softening_unit.precipitation_reactor.reagent_dose[CaO]",
         return_key=("Softening_RKT_1", "Chemical dose", "Lime"),
         units="PPM",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.softening_unit.precipitation_reactor.reagent_dose[Na2CO3]",
         return_key=("Softening_RKT_1", "Chemical dose", "Soda ash"),
         units="PPM",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.softening_unit.precipitation_reactor.dissolution_reactor.properties_in[0.0].conc_mass_phase_comp[Liq,Ca_2+]",
         return_key=("Softening_RKT_1", "Effluent in", "Ca"),
         units="PPM",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.softening_unit.precipitation_reactor.dissolution_reactor.properties_in[0.0].conc_mass_phase_comp[Liq,HCO3_-]",
         return_key=("Softening_RKT_1", "Effluent in", "HCO3"),
         units="PPM",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.softening_unit.precipitation_reactor.dissolution_reactor.properties_in[0.0].conc_mass_phase_comp[Liq,Mg_2+]",
         return_key=("Softening_RKT_1", "Effluent in", "Mg"),
         units="PPM",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.softening_unit.precipitation_reactor.precipitation_reactor.properties_out[0.0].conc_mass_phase_comp[Liq,Ca_2+]",
         return_key=("Softening_RKT_1", "Effluent out", "Ca"),
         units="PPM",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.softening_unit.precipitation_reactor.precipitation_reactor.properties_out[0.0].conc_mass_phase_comp[Liq,HCO3_-]",
         return_key=("Softening_RKT_1", "Effluent out", "HCO3"),
         units="PPM",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.softening_unit.precipitation_reactor.precipitation_reactor.properties_out[0.0].conc_mass_phase_comp[Liq,Mg_2+]",
         return_key=("Softening_RKT_1", "Effluent out", "Mg"),
         units="PPM",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.softening_unit.precipitation_reactor.alkalinity",
         return_key=("Softening_RKT_1", "Alkalinity"),
         units="PPM",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.acidification_unit.chemical_reactor.reagent_dose[HCl]",
         return_key=("acid_addition", "Chemical dose", "HCl"),
         units="PPM",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.acidification_unit.chemical_reactor.reagent_dose[H2SO4]",
         return_key=("acid_addition", "Chemical dose", "H2SO4"),
         units="PPM",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.ro_unit.ro_unit.scaling_tendency[Calcite]",
         return_key=("Scaling tendency", "Calcite"),
         units="dimensionless",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.ro_unit.ro_unit.scaling_tendency[Gypsum]",
         return_key=("Scaling tendency", "Gypsum"),
         units="dimensionless",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.hpro_unit.ro_unit.scaling_tendency[Calcite]",
         return_key=("HP Scaling tendency", "Calcite"),
         units="dimensionless",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.hpro_unit.ro_unit.scaling_tendency[Gypsum]",
         return_key=("HP Scaling tendency", "Gypsum"),
         units="dimensionless",
     )
+    data_manager = sweep_store.get_data_manager()
     data_manager.load_data()
     data_manager.display()
     data_manager.select_data(("water_sim_cases", "SW_RO"))
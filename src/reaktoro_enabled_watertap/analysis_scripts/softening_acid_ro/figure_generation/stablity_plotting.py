@@ -10,7 +10,7 @@
 # "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
 #################################################################################
 
-from psPlotKit.data_manager.ps_data_manager import PsDataManager
+from reaktoro_enabled_watertap.utils.sweep_data_store import SweepDataStore
 from psPlotKit.data_plotter.fig_generator import FigureGenerator
 
 from reaktoro_enabled_watertap.utils.report_util import get_lib_path
@@ -48,27 +48,28 @@ def main(show_figs=True):
         work_path
         / "analysis_scripts/softening_acid_ro/figure_generation/stability_figures/"
     )
-    data_manager = PsDataManager(
+    sweep_store = SweepDataStore(
         str(
             work_path
             / "analysis_scripts/softening_acid_ro/data_generation/output/stability_sweep_analysisType_stability_sweep.h5"
         ),
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.ipopt_iterations[Objective function evaluations]",
         return_key="iterations",
         units="dimensionless",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.unscaled_ipopt_result[dual_infeasibility]",
         return_key="Dual infeasibility",
         units="dimensionless",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.unscaled_ipopt_result[overall_nlp_error]",
         return_key="Overall NLP error",
         units="dimensionless",
     )
+    data_manager = sweep_store.get_data_manager()
     data_manager.load_data()
     data_manager.display()
     # assert False
@@ -10,7 +10,7 @@
 # "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
 #################################################################################
 
-from psPlotKit.data_manager.ps_data_manager import PsDataManager
+from reaktoro_enabled_watertap.utils.sweep_data_store import SweepDataStore
 from psPlotKit.data_plotter.fig_generator import FigureGenerator
 from reaktoro_enabled_watertap.utils.report_util import get_lib_path
 import pandas as pd
@@ -106,7 +106,7 @@ def main(show_figs=True):
         work_path
         / "analysis_scripts/softening_acid_ro/figure_generation/validation_figures/"
     )
-    data_manager = PsDataManager(
+    sweep_store = SweepDataStore(
         str(
             work_path
             / "analysis_scripts/softening_acid_ro/data_generation/output/validation_soda_ash_hcl_h2so4_sweep_analysisType_validation_sweep.h5"
@@ -126,50 +126,51 @@ def main(show_figs=True):
             / "analysis_scripts/softening_acid_ro/figure_generation/validation_data/bw_onestage_medium_capacity_rightdensity.csv"
         )
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.water_recovery",
         return_key="Water recovery",
         units="%",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.costing.LCOW",
         return_key="LCOW",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.softening_unit.precipitation_reactor.reagent_dose[Na2CO3]",
         return_key=("softening chemical dose", "Soda ash"),
         units="PPM",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.acidification_unit.chemical_reactor.reagent_dose[HCl]",
         return_key=("acid addition dose", "HCl"),
         units="PPM",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.acidification_unit.chemical_reactor.reagent_dose[H2SO4]",
         return_key=("acid addition dose", "H2SO4"),
         units="PPM",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.ro_unit.ro_unit.scaling_tendency[Calcite]",
         return_key=("Scaling tendency", "Calcite"),
         units="dimensionless",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.ro_unit.ro_unit.scaling_tendency[Gypsum]",
         return_key=("Scaling tendency", "Gypsum"),
         units="dimensionless",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.hpro_unit.ro_unit.scaling_tendency[Calcite]",
         return_key=("HP Scaling tendency", "Calcite"),
         units="dimensionless",
     )
-    data_manager.register_data_key(
+    sweep_store.register_data_key(
         file_key="fs.hpro_unit.ro_unit.scaling_tendency[Gypsum]",
         return_key=("HP Scaling tendency", "Gypsum"),
         units="dimensionless",
     )
+    data_manager = sweep_store.get_data_manager()
     data_manager.load_data()
     data_manager.select_data(("water_sim_cases", "SW_RO"))
     data_manager.select_data(("water_sim_cases", "SW_HPRO"), add_to_existing=True)
@@ -0,0 +1,190 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+from pyomo.environ import ConcreteModel, value
+from idaes.core.util.constants import Constants
+import watertap.property_models.seawater_prop_pack as props_seawater
+import watertap.property_models.NaCl_T_dep_prop_pack as props_nacl
+import numpy as np
+
+__author__ = "Alexander V. Dudchenko"
+
+
+def _polyval(coefficients, x):
+    """evaluates sum of coefficients[k] * x**k"""
+    return sum(c * x**k for k, c in enumerate(coefficients))
+
+
+def _indexed_coefficients(param):
+    return [value(param[str(k)]) for k in range(len(param))]
+
+
+def _seawater_properties(params, mass_frac, temperature):
+    """seawater property package correlations (Sharqawy et al. 2010, Nayar et al.
+    2016) as array functions of TDS mass fraction and temperature (K)"""
+    t = temperature - 273.15
+    dens_mass_solvent = _polyval(
+        [value(getattr(params, f"dens_mass_param_A{k}")) for k in range(1, 6)], t
+    )
+    dens_mass = (
+        dens_mass_solvent
+        + value(params.dens_mass_param_B1) * mass_frac
+        + value(params.dens_mass_param_B2) * mass_frac * t
+        + value(params.dens_mass_param_B3) * mass_frac * t**2
+        + value(params.dens_mass_param_B4) * mass_frac * t**3
+        + value(params.dens_mass_param_B5) * mass_frac**2 * t**2
+    )
+    osm_param = [value(getattr(params, f"osm_coeff_param_{k}")) for k in range(1, 11)]
+    osm_coeff = (
+        osm_param[0]
+        + osm_param[1] * t
+        + osm_param[2] * t**2
+        + osm_param[3] * t**4
+        + osm_param[4] * mass_frac
+        + osm_param[5] * mass_frac * t
+        + osm_param[6] * mass_frac * t**3
+        + osm_param[7] * mass_frac**2
+        + osm_param[8] * mass_frac**2 * t
+        + osm_param[9] * mass_frac**2 * t**2
+    )
+    molality = mass_frac / (1 - mass_frac) / value(params.mw_comp["TDS"])
+    pressure_osm = (
+        osm_coeff
+        * molality
+        * dens_mass_solvent
+        * value(Constants.gas_constant)
+        * temperature
+    )
+    psatw_param = [
+        value(getattr(params, f"pressure_sat_param_psatw_A{k}")) for k in range(1, 7)
+    ]
+    psatw = np.exp(
+        psatw_param[0] / temperature
+        + psatw_param[1]
+        + psatw_param[2] * temperature
+        + psatw_param[3] * temperature**2
+        + psatw_param[4] * temperature**3
+        + psatw_param[5] * np.log(temperature)
+    )
+    # salinity in g/kg
+    salinity = mass_frac * 1000
+    pressure_sat = psatw * np.exp(
+        value(params.pressure_sat_param_B1) * salinity
+        + value(params.pressure_sat_param_B2) * salinity**2
+    )
+    return pressure_osm, pressure_sat, dens_mass
+
+
+def _nacl_properties(params, mass_frac, temperature):
+    """NaCl property package correlations (Sparrow 2003, Pitzer et al. 1984) as
+    array functions of NaCl mass fraction and temperature (K)"""
+    t = temperature - 273.15
+    dens_mass = _polyval(
+        [
+            _polyval(
+                _indexed_coefficients(getattr(params, f"dens_mass_param_{k}")),
+                mass_frac,
+            )
+            for k in "ABCDE"
+        ],
+        t,
+    )
+    pressure_sat = 1e6 * _polyval(
+        [
+            _polyval(
+                _indexed_coefficients(getattr(params, f"vap_pressure_{k}1_param")),
+                mass_frac,
+            )
+            for k in "ABCDE"
+        ],
+        t,
+    )
+    molality = mass_frac / (1 - mass_frac) / value(params.mw_comp["NaCl"])
+    osm_coeff = _polyval(
+        [
+            _polyval(
+                _indexed_coefficients(getattr(params, f"osm_coeff_param_{k}")), molality
+            )
+            for k in "ABCD"
+        ],
+        t,
+    )
+    dens_mass_solvent = _polyval(
+        [value(getattr(params, f"dens_mass_param_A{k}")) for k in range(1, 6)], t
+    )
+    # two ionic species
+    pressure_osm = (
+        2
+        * osm_coeff
+        * molality
+        * dens_mass_solvent
+        * value(Constants.gas_constant)
+        * temperature
+    )
+    return pressure_osm, pressure_sat, dens_mass
+
+
+# property package and array functions of its correlations
+CORRELATION_PACKAGES = {
+    "seawater": (props_seawater.SeawaterParameterBlock, _seawater_properties),
+    "nacl": (props_nacl.NaClParameterBlock, _nacl_properties),
+}
+
+
+def evaluate_correlation_properties(
+    package, tds, temperature, pressure=101325, tolerance=1e-12, max_iter=20
+):
+    """Evaluates osmotic pressure, vapor pressure, and density correlations of
+    WaterTAP seawater or NaCl property package over arrays of TDS concentration,
+    temperature and pressure, without solving an NLP.
+
+    Correlations are evaluated as numpy array functions using parameters of the
+    property package, solute mass fraction is found by fixed point iteration on
+    all points at once, so that TDS concentration matches requested concentration.
+
+    Args:
+        package: seawater or nacl
+        tds: TDS concentration (g/L)
+        temperature: temperature (K)
+        pressure: pressure (Pa), correlations do not depend on pressure, it only
+            sets broadcast shape of results
+        tolerance: tolerance on solute mass fraction
+        max_iter: maximum number of fixed point iterations
+
+    Returns:
+        dict with pressure_osm_phase (Pa), pressure_sat (Pa), dens_mass_phase (kg/m3)
+        arrays with broadcast shape of inputs
+    """
+    params_class, properties = CORRELATION_PACKAGES[package]
+    m = ConcreteModel()
+    m.params = params_class()
+    tds, temperature, _ = np.broadcast_arrays(
+        np.asarray(tds, dtype=float),
+        np.asarray(temperature, dtype=float),
+        np.asarray(pressure, dtype=float),
+    )
+    # initial guess uses density of 1000 kg/m3
+    mass_frac = tds / 1000
+    for _ in range(max_iter):
+        pressure_osm, pressure_sat, dens_mass = properties(
+            m.params, mass_frac, temperature
+        )
+        new_mass_frac = tds / dens_mass
+        converged = np.all(np.abs(new_mass_frac - mass_frac) < tolerance)
+        mass_frac = new_mass_frac
+        if converged:
+            break
+    pressure_osm, pressure_sat, dens_mass = properties(m.params, mass_frac, temperature)
+    return {
+        "pressure_osm_phase": pressure_osm,
+        "pressure_sat": pressure_sat,
+        "dens_mass_phase": dens_mass,
+    }
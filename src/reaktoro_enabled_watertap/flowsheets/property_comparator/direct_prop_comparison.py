@@ -0,0 +1,242 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+from pyomo.environ import value, units as pyunits
+import reaktoro as rkt
+import numpy as np
+import math
+
+from reaktoro_enabled_watertap.water_sources.source_water_importer import (
+    get_source_water_data,
+)
+from reaktoro_enabled_watertap.flowsheets.property_comparator.correlation_props import (
+    evaluate_correlation_properties,
+)
+
+__author__ = "Alexander V. Dudchenko"
+
+GAS_CONSTANT = 8.314462618  # J/mol/K
+STANDARD_PRESSURE = 1e5  # Pa
+
+# keys match variable names in watertap_prop_comparison model, so direct results
+# can be used in place of NLP sweep results
+RESULT_KEYS = {
+    "water_recovery": "fs.water_recovery",
+    "temperature": "fs.multicomp_feed.properties[0.0].temperature",
+    "pressure": "fs.multicomp_feed.properties[0.0].pressure",
+    "tds": "fs.feed_tds",
+    "reaktoro_osmotic_pressure": "fs.modified_properties[osmoticPressure,H2O]",
+    "reaktoro_vapor_pressure": "fs.modified_properties[vaporPressure,H2O(g)]",
+    "reaktoro_density": "fs.multicomp_feed.properties[0.0].dens_mass_phase[Liq]",
+    "seawater_osmotic_pressure": "fs.seawater_feed.properties[0.0].pressure_osm_phase[Liq]",
+    "seawater_vapor_pressure": "fs.seawater_feed.properties[0.0].pressure_sat",
+    "seawater_density": "fs.seawater_feed.properties[0.0].dens_mass_phase[Liq]",
+    "nacl_osmotic_pressure": "fs.nacl_feed.properties[0.0].pressure_osm_phase[Liq]",
+    "nacl_vapor_pressure": "fs.nacl_feed.properties[0.0].pressure_sat",
+    "nacl_density": "fs.nacl_feed.properties[0.0].dens_mass_phase[Liq]",
+}
+
+
+def convert_to_rkt_species(ion):
+    """converts MCAS ion name to reaktoro species name (e.g. Ca_2+ to Ca+2)"""
+    if "_" not in ion:
+        return ion
+    species, charge = ion.split("_")
+    if len(charge) > 1:
+        charge = charge[-1] + charge[:-1]
+    return species + charge
+
+
+class DirectPropertyComparator:
+    """Computes reaktoro properties of a concentrated source water directly,
+    without building and solving the watertap_prop_comparison NLP.
+
+    The feed is set up same way as in watertap_prop_comparison: ion mass flows are
+    computed from source water concentrations (using constant MCAS density) for
+    1 kg of water, water is removed based on water recovery, and Cl_- is adjusted
+    to keep solution charge neutral at feed pH.
+
+    Args:
+        water_case: source water yaml file
+        database: reaktoro phreeqc database
+        activity_model: reaktoro activity model for aqueous phase
+    """
+
+    def __init__(
+        self,
+        water_case,
+        database="pitzer.dat",
+        activity_model="ActivityModelPitzer",
+    ):
+        mcas_props, feed_specs = get_source_water_data(water_case)
+        self.water_case = water_case
+        self.feed_specs = feed_specs
+        self.mw = mcas_props["mw_data"]
+        self.ions = list(feed_specs["ion_concentrations"].keys())
+        conc = {
+            ion: value(pyunits.convert(c, to_units=pyunits.kg / pyunits.m**3))
+            for ion, c in feed_specs["ion_concentrations"].items()
+        }
+        # MCAS uses constant density of 1000 kg/m3 in comparison model
+        ion_mass_per_water = 1 / (1000 - sum(conc.values()))
+        self.ion_mass = {ion: c * ion_mass_per_water for ion, c in conc.items()}
+        self.rkt_species = {ion: convert_to_rkt_species(ion) for ion in self.ions}
+
+        db = rkt.PhreeqcDatabase(database)
+        elements = {"H", "O"}
+        for species in self.rkt_species.values():
+            elements.update(db.species().get(species).elements().symbols())
+        aqueous_phase = rkt.AqueousPhase(rkt.speciate(" ".join(sorted(elements))))
+        aqueous_phase.set(getattr(rkt, activity_model)())
+        gas_phase = rkt.GaseousPhase("H2O(g) Ntg(g)")
+        gas_phase.set(rkt.ActivityModelPengRobinsonPhreeqc())
+        self.system = rkt.ChemicalSystem(db, aqueous_phase, gas_phase)
+        specs = rkt.EquilibriumSpecs(self.system)
+        specs.temperature()
+        specs.pressure()
+        specs.pH()
+        specs.charge()
+        specs.openTo(self.rkt_species["Cl_-"])
+        self.specs = specs
+        self.solver = rkt.EquilibriumSolver(specs)
+        self.water_index = self.system.species().index("H2O")
+        self.vapor_index = self.system.species().index("H2O(g)")
+
+    def equilibrate(self, water_recovery, temperature, pressure=101325):
+        """equilibrates concentrated feed and returns dict with reaktoro properties,
+        TDS (g/L), and ion concentrations (kg/m3) of concentrated solution"""
+        water_mass = 1 - water_recovery
+        state = rkt.ChemicalState(self.system)
+        state.temperature(temperature, "K")
+        state.pressure(pressure, "Pa")
+        state.set("H2O", water_mass, "kg")
+        for ion, species in self.rkt_species.items():
+            state.set(species, self.ion_mass[ion] / self.mw[ion], "mol")
+        conditions = rkt.EquilibriumConditions(self.specs)
+        conditions.temperature(temperature, "K")
+        conditions.pressure(pressure, "Pa")
+        conditions.pH(self.feed_specs["pH"])
+        conditions.charge(0.0)
+        result = self.solver.solve(state, conditions)
+        if not result.succeeded():
+            raise RuntimeError(
+                f"Reaktoro failed to equilibrate {self.water_case} at water recovery "
+                f"{water_recovery}, temperature {temperature}, pressure {pressure}"
+            )
+        props = rkt.ChemicalProps(state)
+        ln_water_activity = float(props.speciesActivitiesLn()[self.water_index])
+        water_volume = float(props.speciesStandardVolumes()[self.water_index])
+        water_potential = float(props.speciesChemicalPotentials()[self.water_index])
+        vapor_gibbs = float(props.speciesStandardGibbsEnergies()[self.vapor_index])
+        density = float(props.phaseProps("AqueousPhase").density())
+
+        ion_mass = dict(self.ion_mass)
+        ion_mass["Cl_-"] = float(props.elementAmount("Cl")) * self.mw["Cl_-"]
+        volume = (water_mass + sum(ion_mass.values())) / density
+        results = {
+            "reaktoro_osmotic_pressure": -GAS_CONSTANT
+            * temperature
+            * ln_water_activity
+            / water_volume,
+            "reaktoro_vapor_pressure": STANDARD_PRESSURE
+            * math.exp((water_potential - vapor_gibbs) / (GAS_CONSTANT * temperature)),
+            "reaktoro_density": density,
+            "tds": sum(ion_mass.values()) / volume,
+        }
+        for ion, mass in ion_mass.items():
+            results[ion] = mass / volume
+        results["H2O"] = water_mass / volume
+        return results
+
+    def evaluate(
+        self, water_recovery, temperature=None, pressure=101325, raise_on_failure=True
+    ):
+        """Evaluates reaktoro, seawater, and NaCl properties over arrays of water
+        recovery, temperature (K), and pressure (Pa), which are broadcast together.
+
+        Args:
+            raise_on_failure: if False, points that fail to equilibrate are not
+                raised, their properties are nan and they are marked in failed array
+
+        Returns:
+            dict of arrays keyed by RESULT_KEYS names and ion names (kg/m3), and
+            failed array if raise_on_failure is False
+        """
+        if temperature is None:
+            temperature = self.feed_specs["temperature"]
+        water_recovery, temperature, pressure = np.broadcast_arrays(
+            np.asarray(water_recovery, dtype=float),
+            np.asarray(temperature, dtype=float),
+            np.asarray(pressure, dtype=float),
+        )
+        results = {
+            "water_recovery": water_recovery.copy(),
+            "temperature": temperature.copy(),
+            "pressure": pressure.copy(),
+        }
+        failed = np.zeros(water_recovery.shape, dtype=bool)
+        for idx in np.ndindex(water_recovery.shape):
+            try:
+                point = self.equilibrate(
+                    water_recovery[idx], temperature[idx], pressure[idx]
+                )
+            except RuntimeError:
+                if raise_on_failure:
+                    raise
+                failed[idx] = True
+                continue
+            for key, val in point.items():
+                if key not in results:
+                    results[key] = np.full(water_recovery.shape, np.nan)
+                results[key][idx] = val
+        if "tds" not in results:
+            # no point equilibrated
+            results["tds"] = np.full(water_recovery.shape, np.nan)
+        for package in ["seawater", "nacl"]:
+            # failed points are evaluated at zero TDS and replaced with nan
+            props = evaluate_correlation_properties(
+                package, np.where(failed, 0, results["tds"]), temperature, pressure
+            )
+            for key, prop in [
+                ("osmotic_pressure", "pressure_osm_phase"),
+                ("vapor_pressure", "pressure_sat"),
+                ("density", "dens_mass_phase"),
+            ]:
+                results[f"{package}_{key}"] = np.where(failed, np.nan, props[prop])
+        if not raise_on_failure:
+            results["failed"] = failed
+        return results
+
+
+def compare_properties(water_case, water_recovery, temperature=None, pressure=101325):
+    """Directly compares reaktoro, seawater, and NaCl properties for a water case
+    over arrays of water recovery, temperature (K), and pressure (Pa)
+
+    Returns:
+        dict of arrays keyed by watertap_prop_comparison variable names
+    """
+    results = DirectPropertyComparator(water_case).evaluate(
+        water_recovery, temperature, pressure
+    )
+    return get_model_keyed_results(results)
+
+
+def get_model_keyed_results(results):
+    """renames direct results to watertap_prop_comparison variable names"""
+    keyed_results = {}
+    for key, data in results.items():
+        if key in RESULT_KEYS:
+            keyed_results[RESULT_KEYS[key]] = data
+        else:
+            keyed_results[
+                f"fs.multicomp_feed.properties[0.0].conc_mass_phase_comp[Liq,{key}]"
+            ] = data
+    return keyed_results
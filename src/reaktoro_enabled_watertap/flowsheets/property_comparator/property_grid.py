@@ -0,0 +1,214 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import csv
+import idaes.logger as idaeslog
+
+from reaktoro_enabled_watertap.flowsheets.property_comparator.direct_prop_comparison import (
+    DirectPropertyComparator,
+)
+
+__author__ = "Alexander V. Dudchenko"
+
+_log = idaeslog.getLogger(__name__)
+
+INDEX_FIELDS = ("water_case", "water_recovery", "temperature", "pressure")
+# column marking grid points that reaktoro failed to equilibrate
+FAILED_FIELD = "failed"
+
+# comparators are built once per process and reused between chunks
+_comparators = {}
+
+
+def _get_comparator(water_case):
+    if water_case not in _comparators:
+        _comparators[water_case] = DirectPropertyComparator(water_case)
+    return _comparators[water_case]
+
+
+def _evaluate_chunk(water_case, water_recovery, temperature, pressure):
+    results = _get_comparator(water_case).evaluate(
+        water_recovery, temperature, pressure, raise_on_failure=False
+    )
+    for key in INDEX_FIELDS[1:]:
+        del results[key]
+    return results
+
+
+class PropertyComparisonTable:
+    """Columnar table of property comparison results, stored as numpy record array
+    with composite index of (water_case, water_recovery, temperature, pressure),
+    one float column per property, and failed column marking points that failed
+    to equilibrate (their properties are nan)
+
+    Args:
+        records: numpy record array with INDEX_FIELDS and property columns
+    """
+
+    def __init__(self, records):
+        self.records = records
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, key):
+        return self.records[key]
+
+    @property
+    def columns(self):
+        """returns property columns (excluding index and failed fields)"""
+        return [
+            f
+            for f in self.records.dtype.names
+            if f not in INDEX_FIELDS and f != FAILED_FIELD
+        ]
+
+    @property
+    def index(self):
+        """returns composite index as record array"""
+        return self.records[list(INDEX_FIELDS)]
+
+    def get_failed(self):
+        """returns table with points that failed to equilibrate"""
+        return PropertyComparisonTable(self.records[self.records[FAILED_FIELD]])
+
+    def get_index_values(self, field):
+        """returns unique values of an index field"""
+        return np.unique(self.records[field])
+
+    def select(self, **index_values):
+        """returns table with rows matching index values,
+        e.g. select(water_case="Seawater.yaml", temperature=298.15)"""
+        mask = np.ones(len(self.records), dtype=bool)
+        for field, val in index_values.items():
+            if field not in INDEX_FIELDS:
+                raise KeyError(f"{field} is not an index field {INDEX_FIELDS}")
+            if field == "water_case":
+                mask &= self.records[field] == val
+            else:
+                mask &= np.isclose(self.records[field], val)
+        return PropertyComparisonTable(self.records[mask])
+
+    def get_grid(self, column, water_case):
+        """returns column for water case as array with shape of
+        (water_recovery, temperature, pressure) grid"""
+        table = self.select(water_case=water_case)
+        records = np.sort(table.records, order=list(INDEX_FIELDS[1:]))
+        shape = tuple(len(np.unique(records[f])) for f in INDEX_FIELDS[1:])
+        return records[column].reshape(shape)
+
+    def save(self, file_name):
+        """saves table as npz file with one array per column"""
+        np.savez(file_name, **{f: self.records[f] for f in self.records.dtype.names})
+
+    @classmethod
+    def load(cls, file_name):
+        with np.load(file_name) as data:
+            names = list(data.keys())
+            dtype = [(name, data[name].dtype) for name in names]
+            records = np.empty(len(data[names[0]]), dtype=dtype)
+            for name in names:
+                records[name] = data[name]
+        return cls(records)
+
+    def to_csv(self, ostream):
+        writer = csv.writer(ostream)
+        writer.writerow(self.records.dtype.names)
+        for row in self.records:
+            writer.writerow(row.tolist())
+
+
+def evaluate_property_grid(
+    water_cases,
+    water_recovery,
+    temperature,
+    pressure=101325,
+    chunk_size=100,
+    num_workers=1,
+):
+    """Evaluates direct property comparison over N-dimensional grid of
+    water_cases x water_recovery x temperature x pressure. Grid points are split
+    into chunks per water case that are evaluated in parallel. Points that fail to
+    equilibrate do not stop evaluation, their properties are nan, and they are
+    reported and marked in failed column (see PropertyComparisonTable.get_failed).
+
+    Args:
+        water_cases: list of source water yaml files
+        water_recovery: water recovery values
+        temperature: temperature values (K)
+        pressure: pressure values (Pa)
+        chunk_size: number of grid points per chunk
+        num_workers: number of worker processes (1 evaluates chunks in this process)
+
+    Returns:
+        PropertyComparisonTable with one row per grid point
+    """
+    grid = np.meshgrid(
+        np.atleast_1d(np.asarray(water_recovery, dtype=float)),
+        np.atleast_1d(np.asarray(temperature, dtype=float)),
+        np.atleast_1d(np.asarray(pressure, dtype=float)),
+        indexing="ij",
+    )
+    water_recovery, temperature, pressure = (g.ravel() for g in grid)
+    chunks = []
+    for water_case in water_cases:
+        for start in range(0, water_recovery.size, chunk_size):
+            chunk = slice(start, start + chunk_size)
+            chunks.append(
+                (
+                    water_case,
+                    water_recovery[chunk],
+                    temperature[chunk],
+                    pressure[chunk],
+                )
+            )
+    _log.info(
+        f"Evaluating {len(water_cases) * water_recovery.size} grid points in {len(chunks)} chunks"
+    )
+    if num_workers == 1:
+        chunk_results = [_evaluate_chunk(*chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            chunk_results = list(executor.map(_evaluate_chunk, *zip(*chunks)))
+
+    # properties can differ between water cases (e.g. ions), missing ones are nan
+    columns = {}
+    for result in chunk_results:
+        columns.update(dict.fromkeys(result))
+    del columns[FAILED_FIELD]
+    water_case_length = max(len(water_case) for water_case in water_cases)
+    dtype = [("water_case", f"U{water_case_length}")]
+    dtype += [(field, np.float64) for field in INDEX_FIELDS[1:]]
+    dtype += [(column, np.float64) for column in columns]
+    dtype += [(FAILED_FIELD, bool)]
+    num_rows = sum(chunk[1].size for chunk in chunks)
+    records = np.empty(num_rows, dtype=dtype)
+    row = 0
+    for chunk, result in zip(chunks, chunk_results):
+        rows = slice(row, row + chunk[1].size)
+        for field, data in zip(INDEX_FIELDS, chunk):
+            records[field][rows] = data
+        for column in columns:
+            records[column][rows] = result.get(column, np.nan)
+        records[FAILED_FIELD][rows] = result[FAILED_FIELD]
+        row = rows.stop
+    table = PropertyComparisonTable(records)
+    failed = table.get_failed()
+    if len(failed) > 0:
+        _log.warning(
+            f"{len(failed)} of {len(table)} grid points failed to equilibrate, "
+            "their properties are nan"
+        )
+        for point in failed.index:
+            _log.warning(f"Failed point {dict(zip(INDEX_FIELDS, point.tolist()))}")
+    return table
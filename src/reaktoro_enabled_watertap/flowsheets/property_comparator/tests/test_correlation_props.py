@@ -0,0 +1,42 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from reaktoro_enabled_watertap.flowsheets.property_comparator.correlation_props import (
+    evaluate_correlation_properties,
+)
+import numpy as np
+import pytest
+
+
+@pytest.mark.core
+def test_evaluate_correlation_properties():
+    # values from solved watertap_prop_comparison model for USDA brackish water
+    tds = 6.835665983881908
+    seawater = evaluate_correlation_properties("seawater", tds, 293.15)
+    assert seawater["pressure_osm_phase"] == pytest.approx(478462.72467433196)
+    assert seawater["pressure_sat"] == pytest.approx(2331.2925100741427)
+    assert seawater["dens_mass_phase"] == pytest.approx(1003.2512267757132)
+    nacl = evaluate_correlation_properties("nacl", tds, 293.15)
+    assert nacl["pressure_osm_phase"] == pytest.approx(529506.6166892514)
+    assert nacl["pressure_sat"] == pytest.approx(2039.6936689781523)
+    assert nacl["dens_mass_phase"] == pytest.approx(1002.5416769691211)
+
+    # inputs are broadcast
+    grid = evaluate_correlation_properties(
+        "seawater", np.array([[tds], [2 * tds]]), np.array([293.15, 303.15, 313.15])
+    )
+    assert grid["pressure_osm_phase"].shape == (2, 3)
+    assert grid["pressure_osm_phase"][0, 0] == pytest.approx(478462.72467433196)
+    assert np.all(np.diff(grid["pressure_osm_phase"], axis=0) > 0)
+    assert np.all(np.diff(grid["pressure_sat"], axis=1) > 0)
@@ -0,0 +1,105 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from reaktoro_enabled_watertap.flowsheets.property_comparator.property_grid import (
+    evaluate_property_grid,
+    PropertyComparisonTable,
+)
+from reaktoro_enabled_watertap.flowsheets.property_comparator.direct_prop_comparison import (
+    DirectPropertyComparator,
+)
+import csv
+import io
+import numpy as np
+import pytest
+
+
+@pytest.mark.component
+@pytest.mark.flowsheets
+def test_evaluate_property_grid(tmp_path):
+    table = evaluate_property_grid(
+        ["USDA_brackish.yaml", "Seawater.yaml"],
+        water_recovery=[0.5, 0.6, 0.7],
+        temperature=[293.15, 313.15],
+        pressure=[1e5, 5e6],
+        chunk_size=5,
+    )
+    assert len(table) == 2 * 3 * 2 * 2
+    osmotic_pressure = table.get_grid("reaktoro_osmotic_pressure", "Seawater.yaml")
+    assert osmotic_pressure.shape == (3, 2, 2)
+    # osmotic pressure increases with recovery
+    assert np.all(np.diff(osmotic_pressure, axis=0) > 0)
+    brackish = table.select(water_case="USDA_brackish.yaml", temperature=293.15)
+    assert len(brackish) == 6
+    assert np.all(brackish["reaktoro_osmotic_pressure"] < 1e6)
+
+    table.save(tmp_path / "grid.npz")
+    loaded = PropertyComparisonTable.load(tmp_path / "grid.npz")
+    assert loaded.records.dtype == table.records.dtype
+    assert np.array_equal(loaded["seawater_density"], table["seawater_density"])
+    assert len(table.get_failed()) == 0
+
+    ostream = io.StringIO()
+    table.to_csv(ostream)
+    rows = list(csv.reader(io.StringIO(ostream.getvalue())))
+    assert rows[0] == list(table.records.dtype.names)
+    assert len(rows) == len(table) + 1
+    assert rows[1][0] == table["water_case"][0]
+    assert float(rows[1][rows[0].index("seawater_density")]) == pytest.approx(
+        table["seawater_density"][0]
+    )
+
+
+@pytest.mark.component
+@pytest.mark.flowsheets
+def test_evaluate_property_grid_workers():
+    grid = {
+        "water_cases": ["USDA_brackish.yaml", "Seawater.yaml"],
+        "water_recovery": [0.5, 0.7],
+        "temperature": [293.15, 313.15],
+        "chunk_size": 2,
+    }
+    serial = evaluate_property_grid(**grid)
+    parallel = evaluate_property_grid(**grid, num_workers=2)
+    assert parallel.records.dtype == serial.records.dtype
+    for column in serial.columns:
+        assert np.allclose(parallel[column], serial[column], equal_nan=True)
+
+
+@pytest.mark.component
+@pytest.mark.flowsheets
+def test_evaluate_property_grid_failed_points(monkeypatch):
+    equilibrate = DirectPropertyComparator.equilibrate
+
+    def failing_equilibrate(self, water_recovery, temperature, pressure=101325):
+        if water_recovery > 0.65:
+            raise RuntimeError("Reaktoro failed to equilibrate")
+        return equilibrate(self, water_recovery, temperature, pressure)
+
+    monkeypatch.setattr(DirectPropertyComparator, "equilibrate", failing_equilibrate)
+    table = evaluate_property_grid(
+        ["Seawater.yaml"],
+        water_recovery=[0.5, 0.6, 0.7],
+        temperature=[293.15, 313.15],
+    )
+    # failed points do not stop grid evaluation
+    assert len(table) == 6
+    failed = table.get_failed()
+    assert len(failed) == 2
+    assert np.all(failed["water_recovery"] == 0.7)
+    assert np.all(np.isnan(failed["reaktoro_osmotic_pressure"]))
+    assert np.all(np.isnan(failed["seawater_density"]))
+    solved = table.select(water_recovery=0.5)
+    assert not np.any(solved["failed"])
+    assert np.all(np.isfinite(solved["reaktoro_osmotic_pressure"]))
@@ -1,5 +1,6 @@
 from reaktoro_enabled_watertap.flowsheets.property_comparator import (
     watertap_prop_comparison as wpc,
+    direct_prop_comparison as dpc,
 )
 from pyomo.environ import (
     assert_optimal_termination,
@@ -115,3 +116,46 @@ def test_props(water):
     for key, val in expected_results[water].items():
         assert pytest.approx(test_results[key], rel=1e-3) == val
     print(test_results)
+
+
+@pytest.mark.parametrize(
+    "water",
+    [
+        "USDA_brackish.yaml",
+        "sample_500_hardness.yaml",
+        "sample_1500_hardness.yaml",
+        "Seawater.yaml",
+    ],
+)
+@pytest.mark.flowsheets
+@pytest.mark.component
+def test_direct_props(water):
+    m = wpc.build_model(water_case=water)
+    m.fs.water_recovery.fix(0.5)
+    result = wpc.solve_model(m)
+    assert_optimal_termination(result)
+    test_results = wpc.print_comparison(m)
+
+    direct_results = dpc.DirectPropertyComparator(water).evaluate(
+        [0.5], temperature=test_results["Temperature (K)"]
+    )
+    direct_keys = {
+        "Temperature (K)": "temperature",
+        "TDS": "tds",
+        "Reaktoro_osmoticPressure (Pa)": "reaktoro_osmotic_pressure",
+        "Seawater_osmoticPressure (Pa)": "seawater_osmotic_pressure",
+        "NaCl_osmoticPressure( Pa)": "nacl_osmotic_pressure",
+        "Reaktoro_vaporPressure (Pa)": "reaktoro_vapor_pressure",
+        "Seawater_vaporPressure (Pa)": "seawater_vapor_pressure",
+        "NaCl_vaporPressure (Pa)": "nacl_vapor_pressure",
+        "Reaktoro_density (kg/m3)": "reaktoro_density",
+        "Seawater_density (kg/m3)": "seawater_density",
+        "NaCl_density (kg/m3)": "nacl_density",
+    }
+    for key, val in test_results.items():
+        if key in direct_keys:
+            direct_val = direct_results[direct_keys[key]][0]
+        else:
+            # ion and water concentrations are returned in kg/m3
+            direct_val = direct_results[key.replace(" (mg/L)", "")][0] * 1000
+        assert pytest.approx(direct_val, rel=1e-3) == val
@@ -0,0 +1,639 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+import csv
+import multiprocessing as mp
+from multiprocessing import Pipe
+
+import numpy as np
+from pyomo.environ import (
+    Block,
+    Constraint,
+    Objective,
+    Param,
+    Set,
+    Var,
+    value,
+    units as pyunits,
+)
+from pyomo.repn import generate_standard_repn
+import idaes.logger as idaeslog
+
+from reaktoro_enabled_watertap.flowsheets.softening_acid_ro import (
+    softening_acid_ro as sar,
+)
+from reaktoro_enabled_watertap.utils.phase_profiler import get_profiler
+
+__author__ = "Alexander V. Dudchenko"
+
+_log = idaeslog.getLogger(__name__)
+
+# columns of period file that are not ion concentrations
+PERIOD_COLUMNS = ["weight", "electricity_cost", "feed_flow_rate", "pH"]
+
+# costing blocks whose capital cost is sized for the worst period
+CAPACITY_COSTING_BLOCKS = {
+    "softening_capacity": "softening_unit.precipitation_reactor.costing",
+    "acidification_capacity": "acidification_unit.chemical_reactor.costing",
+    "pump_capacity": "pump_unit.pump.costing",
+    "hp_pump_capacity": "hp_pump_unit.pump.costing",
+}
+
+
+def load_periods(csv_file):
+    """Loads operating periods from csv file, each row is a period with columns:
+        weight: hours per year period represents
+        electricity_cost: electricity cost in $/kWh (optional)
+        feed_flow_rate: feed flow rate in m3/day (optional)
+        pH: feed pH (optional)
+        any other column is ion concentration in mg/L (e.g. Ca_2+), ions that
+        are not provided use concentrations from water case
+
+    Returns:
+        list of period dicts that can be passed to MultiPeriodFlowsheet
+    """
+    periods = []
+    with open(csv_file, "r", newline="") as f:
+        for row in csv.DictReader(f):
+            row = {k.strip(): v.strip() for k, v in row.items() if v not in (None, "")}
+            period = {
+                "weight": float(row["weight"]),
+                "electricity_cost": None,
+                "feed_flow_rate": None,
+                "feed_overrides": {},
+            }
+            if "electricity_cost" in row:
+                period["electricity_cost"] = float(row["electricity_cost"])
+            if "feed_flow_rate" in row:
+                period["feed_flow_rate"] = (
+                    float(row["feed_flow_rate"]) * pyunits.m**3 / pyunits.day
+                )
+            if "pH" in row:
+                period["feed_overrides"]["pH"] = float(row["pH"])
+            ions = {
+                ion: float(conc) * pyunits.mg / pyunits.L
+                for ion, conc in row.items()
+                if ion not in PERIOD_COLUMNS
+            }
+            if len(ions) > 0:
+                period["feed_overrides"]["ion_concentrations"] = ions
+            periods.append(period)
+    if len(periods) == 0:
+        raise ValueError(f"No periods found in {csv_file}")
+    return periods
+
+
+def get_capacity_costing_blocks(m):
+    """returns costing blocks of units whose capital cost is sized by capacity
+    (reactors and pumps), keyed by design variable name"""
+    blocks = {}
+    for name, block_name in CAPACITY_COSTING_BLOCKS.items():
+        block = m.fs.find_component(block_name)
+        if block is not None:
+            blocks[name] = block
+    return blocks
+
+
+def get_design_variables(m):
+    """returns dict of design variables shared by all periods, which include
+    membrane areas and capital cost (capacity) of reactors and pumps"""
+    design_vars = {"ro_area": m.fs.ro_unit.ro_unit.area}
+    if m.fs.find_component("hpro_unit") is not None:
+        design_vars["hpro_area"] = m.fs.hpro_unit.ro_unit.area
+    for name, block in get_capacity_costing_blocks(m).items():
+        design_vars[name] = block.capital_cost
+    return design_vars
+
+
+def get_annual_cost(m):
+    """returns expression of annualized capital cost and annual operating cost of
+    period model (operating cost as if period conditions lasted all year)"""
+    costing = m.fs.costing
+    return (
+        costing.total_capital_cost * costing.capital_recovery_factor
+        + costing.total_operating_cost
+    )
+
+
+def get_annual_production(m):
+    """returns expression of annual product volume of period model (as if period
+    conditions lasted all year)"""
+    costing = m.fs.costing
+    return (
+        pyunits.convert(
+            m.fs.product.product.properties[0].flow_vol,
+            to_units=pyunits.m**3 / costing.base_period,
+        )
+        * costing.utilization_factor
+    )
+
+
+def get_objective_penalty(m):
+    """returns penalty terms added to LCOW in lcow_objective of period model
+    (reagent sparsity penalties, see build_model)"""
+    return sum(
+        blk.reagent_sparsity_penalty
+        for blk in [
+            m.fs.softening_unit.precipitation_reactor,
+            m.fs.acidification_unit.chemical_reactor,
+        ]
+        if blk.find_component("reagent_sparsity_penalty") is not None
+    )
+
+
+def get_annual_lcow(weights, annual_costs, annual_productions):
+    """returns annual LCOW of periods, which is weighted annual cost (annualized
+    capital cost and operating cost) over weighted annual production, rather than
+    weighted mean of period LCOWs, as periods can have different production
+
+    Args:
+        weights: fraction of year of each period
+        annual_costs: annual cost of each period (see get_annual_cost)
+        annual_productions: annual production of each period (see get_annual_production)
+    """
+    weights = np.asarray(weights, dtype=float)
+    return np.sum(weights * np.asarray(annual_costs, dtype=float)) / np.sum(
+        weights * np.asarray(annual_productions, dtype=float)
+    )
+
+
+def add_capacity_constraints(m):
+    """Replaces capital cost equality of reactors and pumps with inequality
+    (capital_cost >= cost at period operation), so shared capital cost acts as
+    installed capacity that must cover operation in every period"""
+    for block in get_capacity_costing_blocks(m).values():
+        if block.find_component("capacity_constraint") is not None:
+            continue
+        con = block.capital_cost_constraint
+        # capital cost can be on either side of equality, orient body so
+        # it increases with capital cost (body is already scaled if transform was applied)
+        repn = generate_standard_repn(con.body, compute_values=True, quadratic=False)
+        sign = 1
+        for var, coef in zip(repn.linear_vars, repn.linear_coefs):
+            if var is block.capital_cost:
+                sign = 1 if coef > 0 else -1
+        block.capacity_constraint = Constraint(expr=sign * (con.body - con.upper) >= 0)
+        con.deactivate()
+
+
+def consensus_update(period_values, duals, consensus, rho):
+    """Consensus ADMM update of shared design variables.
+
+    Args:
+        period_values: array (periods x design variables) of scaled design
+            variable values in each period
+        duals: array (periods x design variables) of scaled duals
+        consensus: array of scaled consensus values from previous iteration
+        rho: ADMM penalty
+
+    Returns:
+        updated consensus, updated duals, primal residual, and dual residual
+    """
+    period_values = np.asarray(period_values, dtype=float)
+    duals = np.asarray(duals, dtype=float)
+    consensus = np.asarray(consensus, dtype=float)
+    new_consensus = np.mean(period_values + duals / rho, axis=0)
+    new_duals = duals + rho * (period_values - new_consensus)
+    primal_residual = np.linalg.norm(period_values - new_consensus)
+    dual_residual = (
+        rho
+        * np.sqrt(period_values.shape[0])
+        * np.linalg.norm(new_consensus - consensus)
+    )
+    return new_consensus, new_duals, primal_residual, dual_residual
+
+
+class PeriodSubproblem:
+    """Flowsheet model of a single period, with operations used by
+    MultiPeriodFlowsheet (build, ADMM updates, solve, design fixing), which exchange
+    only numeric data, so subproblem can run in main process or in a worker process
+    (see PeriodProcess).
+
+    Args:
+        water_case (str): location of water source data file with yaml format.
+        period (dict): period dict (see load_periods)
+        design_variables: function(m) that returns dict of shared design variables
+        linear_solver (str): linear solver to use in ipopt
+        build_kwargs (dict): additional arguments passed to build_model
+    """
+
+    def __init__(
+        self, water_case, period, design_variables, linear_solver, build_kwargs
+    ):
+        self.water_case = water_case
+        self.period = period
+        self.design_variables = design_variables
+        self.linear_solver = linear_solver
+        self.build_kwargs = build_kwargs
+        self.m = None
+
+    def build(self):
+        """builds and initializes period model, returns names of design variables"""
+        kwargs = dict(self.build_kwargs)
+        if self.period.get("feed_flow_rate") is not None:
+            kwargs["feed_flow_rate"] = self.period["feed_flow_rate"]
+        if self.period.get("feed_overrides"):
+            kwargs["feed_overrides"] = self.period["feed_overrides"]
+        self.m = sar.build_model(self.water_case, **kwargs)
+        if self.period.get("electricity_cost") is not None:
+            self.m.fs.costing.electricity_cost.fix(self.period["electricity_cost"])
+        sar.initialize(self.m, linear_solver=self.linear_solver)
+        add_capacity_constraints(self.m)
+        return list(self.design_variables(self.m).keys())
+
+    def get_design_values(self):
+        return [value(var) for var in self.design_variables(self.m).values()]
+
+    def get_annual_values(self):
+        """returns annual cost and annual production of period"""
+        return value(get_annual_cost(self.m)), value(get_annual_production(self.m))
+
+    def get_lcow(self):
+        return value(self.m.fs.costing.LCOW)
+
+    def add_admm_objective(
+        self, design_names, weight, scale, rho, lcow_ref, production_scale
+    ):
+        m = self.m
+        design_vars = self.design_variables(m)
+        m.fs.admm = Block()
+        m.fs.admm.design_set = Set(initialize=design_names)
+        m.fs.admm.rho = Param(initialize=rho, mutable=True)
+        m.fs.admm.weight = Param(initialize=weight, mutable=True)
+        m.fs.admm.scale = Param(
+            m.fs.admm.design_set,
+            initialize=dict(zip(design_names, scale)),
+            mutable=True,
+        )
+        m.fs.admm.dual = Param(m.fs.admm.design_set, initialize=0, mutable=True)
+        m.fs.admm.consensus = Param(m.fs.admm.design_set, initialize=0, mutable=True)
+        # current estimate of annual LCOW, and weighted production of all periods
+        # that scales objective to LCOW magnitude
+        m.fs.admm.lcow_ref = Param(
+            initialize=lcow_ref,
+            mutable=True,
+            units=m.fs.costing.base_currency / pyunits.m**3,
+        )
+        m.fs.admm.production_scale = Param(
+            initialize=production_scale,
+            mutable=True,
+            units=pyunits.m**3 / m.fs.costing.base_period,
+        )
+
+        def deviation(name):
+            return design_vars[name] / m.fs.admm.scale[name] - m.fs.admm.consensus[name]
+
+        m.fs.admm.objective = Objective(
+            expr=m.fs.admm.weight
+            * (
+                (get_annual_cost(m) - m.fs.admm.lcow_ref * get_annual_production(m))
+                / m.fs.admm.production_scale
+                + get_objective_penalty(m)
+            )
+            + sum(m.fs.admm.dual[name] * deviation(name) for name in design_names)
+            + m.fs.admm.rho / 2 * sum(deviation(name) ** 2 for name in design_names)
+        )
+        m.fs.admm.objective.deactivate()
+
+    def set_consensus(self, consensus, duals=None, lcow_ref=None):
+        for i, name in enumerate(self.m.fs.admm.design_set):
+            self.m.fs.admm.consensus[name] = consensus[i]
+            if duals is not None:
+                self.m.fs.admm.dual[name] = duals[i]
+        if lcow_ref is not None:
+            self.m.fs.admm.lcow_ref = lcow_ref
+
+    def get_scaled_design_values(self):
+        design_vars = self.design_variables(self.m)
+        return [
+            value(design_vars[name]) / value(self.m.fs.admm.scale[name])
+            for name in self.m.fs.admm.design_set
+        ]
+
+    def set_admm_objective(self, active):
+        """activates ADMM objective (and deactivates LCOW objective), or reverse"""
+        if active:
+            self.m.fs.lcow_objective.deactivate()
+            self.m.fs.admm.objective.activate()
+        else:
+            self.m.fs.admm.objective.deactivate()
+            self.m.fs.lcow_objective.activate()
+
+    def solve(self):
+        """solves period model, returns True if solve was successful, otherwise
+        variable values are restored to values before solve and False is returned"""
+        values = [
+            (var, var.value)
+            for var in self.m.component_data_objects(Var, descend_into=True)
+        ]
+        try:
+            sar.solve_model(self.m, linear_solver=self.linear_solver)
+        except Exception as e:
+            _log.warning(f"Period solve failed: {e}")
+            for var, val in values:
+                var.set_value(val, skip_validation=True)
+            return False
+        return True
+
+    def fix_design(self, design):
+        design_vars = self.design_variables(self.m)
+        for name, design_value in design.items():
+            design_vars[name].fix(design_value)
+
+    def unfix_design(self):
+        for var in self.design_variables(self.m).values():
+            var.unfix()
+
+    def terminate_workers(self):
+        if self.m is not None and self.m.find_component("reaktoro_manager") is not None:
+            self.m.reaktoro_manager.terminate_workers()
+
+
+def _period_worker(pipe, subproblem_args):
+    """runs PeriodSubproblem in worker process, calling methods received through pipe
+    until None is received"""
+    subproblem = PeriodSubproblem(*subproblem_args)
+    while True:
+        message = pipe.recv()
+        if message is None:
+            subproblem.terminate_workers()
+            pipe.send(("success", None))
+            break
+        method, args = message
+        try:
+            pipe.send(("success", getattr(subproblem, method)(*args)))
+        except Exception as e:
+            pipe.send(("failed", f"{type(e).__name__}: {e}"))
+
+
+class PeriodProcess:
+    """Runs PeriodSubproblem in a worker process, methods of subproblem are called
+    with send followed by recv, so calls to multiple processes run in parallel
+
+    Args:
+        subproblem_args: arguments of PeriodSubproblem
+    """
+
+    def __init__(self, *subproblem_args):
+        self.pipe, remote_pipe = Pipe()
+        self.process = mp.Process(
+            target=_period_worker, args=(remote_pipe, subproblem_args)
+        )
+        self.process.start()
+
+    def send(self, method, *args):
+        self.pipe.send((method, args))
+
+    def recv(self):
+        status, result = self.pipe.recv()
+        if status != "success":
+            raise RuntimeError(f"Period worker failed: {result}")
+        return result
+
+    def terminate(self):
+        if self.process.is_alive():
+            self.pipe.send(None)
+            self.pipe.recv()
+            self.process.join()
+
+
+class MultiPeriodFlowsheet:
+    """Multi-period softening-acidification-RO flowsheet, each period is a separate
+    flowsheet model with its own feed composition, flow, and electricity cost, and
+    per-period operating variables (doses, pressures), while design variables
+    (membrane area and capacity of reactors and pumps) are shared by all periods.
+
+    Periods are coupled using consensus ADMM, where each period subproblem minimizes
+    its share of annual LCOW with augmented Lagrangian terms for deviation of its design
+    from consensus design, so subproblems are independent. With parallel=True each
+    period model is built and solved in its own worker process (see PeriodProcess), so
+    subproblems are solved in parallel within each ADMM iteration, otherwise they are
+    solved one after another. Annual LCOW (weighted cost over weighted production, see
+    get_annual_lcow) is not separable by period, so it is minimized as weighted
+    cost - lcow_ref * weighted production (Dinkelbach method), where lcow_ref is
+    updated to current annual LCOW after every ADMM iteration. After ADMM converges,
+    design is fixed and periods are re-solved for their LCOW.
+
+    A period that fails to solve in an ADMM iteration keeps its previous solution, so
+    ADMM continues with remaining periods, ADMM is stopped only if all periods fail.
+
+    Args:
+        water_case (str): location of water source data file with yaml format.
+        periods (list): list of period dicts (see load_periods), with weight,
+            electricity_cost, feed_flow_rate, and feed_overrides
+        design_variables: function(m) that returns dict of shared design variables
+        rho: ADMM penalty on scaled deviation of design from consensus
+        linear_solver (str): linear solver to use in ipopt
+        parallel (bool): If True, periods are built and solved in worker processes
+        build_kwargs: additional arguments passed to build_model
+    """
+
+    def __init__(
+        self,
+        water_case,
+        periods,
+        design_variables=get_design_variables,
+        rho=1,
+        linear_solver="mumps",
+        parallel=False,
+        **build_kwargs,
+    ):
+        self.water_case = water_case
+        self.periods = periods
+        self.design_variables = design_variables
+        self.rho = rho
+        self.linear_solver = linear_solver
+        self.parallel = parallel
+        self.build_kwargs = build_kwargs
+        total_weight = sum(period["weight"] for period in periods)
+        self.weights = [period["weight"] / total_weight for period in periods]
+        self.subproblems = []
+        self.design_names = []
+
+    @property
+    def models(self):
+        """period models (only available when periods are solved in main process)"""
+        return [
+            subproblem.m
+            for subproblem in self.subproblems
+            if isinstance(subproblem, PeriodSubproblem)
+        ]
+
+    def _call(self, method, args=None):
+        """calls method of all period subproblems (with per period arguments),
+        and returns list of results"""
+        if args is None:
+            args = [()] * len(self.subproblems)
+        if not self.parallel:
+            return [
+                getattr(subproblem, method)(*arg)
+                for subproblem, arg in zip(self.subproblems, args)
+            ]
+        for subproblem, arg in zip(self.subproblems, args):
+            subproblem.send(method, *arg)
+        return [subproblem.recv() for subproblem in self.subproblems]
+
+    def build(self):
+        """builds and initializes all periods, and adds ADMM objectives"""
+        subproblem_type = PeriodProcess if self.parallel else PeriodSubproblem
+        self.subproblems = [
+            subproblem_type(
+                self.water_case,
+                period,
+                self.design_variables,
+                self.linear_solver,
+                self.build_kwargs,
+            )
+            for period in self.periods
+        ]
+        with get_profiler().span("multi_period_build"):
+            self.design_names = self._call("build")[0]
+        self.scale = np.maximum(
+            np.abs(self.get_period_design_values()).mean(axis=0), 1e-8
+        )
+        lcow_ref = self.get_annual_lcow()
+        production_scale = np.sum(
+            np.array(self.weights) * self.get_annual_values()[:, 1]
+        )
+        self._call(
+            "add_admm_objective",
+            [
+                (
+                    self.design_names,
+                    weight,
+                    list(self.scale),
+                    self.rho,
+                    lcow_ref,
+                    production_scale,
+                )
+                for weight in self.weights
+            ],
+        )
+        self.consensus = self.get_scaled_design_values().mean(axis=0)
+        self._call("set_consensus", [(list(self.consensus),)] * len(self.periods))
+
+    def get_period_design_values(self):
+        """returns array (periods x design variables) of design values"""
+        return np.array(self._call("get_design_values"))
+
+    def get_scaled_design_values(self):
+        return np.array(self._call("get_scaled_design_values"))
+
+    def get_annual_values(self):
+        """returns array (periods x 2) of annual cost and annual production"""
+        return np.array(self._call("get_annual_values"))
+
+    def get_annual_lcow(self):
+        """returns annual LCOW of current period solutions (see get_annual_lcow)"""
+        annual_values = self.get_annual_values()
+        return get_annual_lcow(self.weights, annual_values[:, 0], annual_values[:, 1])
+
+    def get_design(self):
+        """returns consensus design values (in units of design variables)"""
+        return dict(zip(self.design_names, self.consensus * self.scale))
+
+    def solve_periods(self):
+        """solves all periods, returns list of solve success of each period"""
+        success = self._call("solve")
+        for i, solved in enumerate(success):
+            if not solved:
+                _log.warning(f"Period {i} failed to solve")
+        return success
+
+    def solve(self, max_iterations=20, tolerance=1e-3):
+        """Solves periods with consensus ADMM, then fixes design at consensus
+        (capacities at maximum required by any period) and re-solves each period for
+        its LCOW.
+
+        Args:
+            max_iterations: maximum number of ADMM iterations
+            tolerance: tolerance on primal and dual residuals of scaled design variables
+
+        Returns:
+            dict with design, LCOW of each period (nan for periods that failed to solve
+            with fixed design), annual LCOW (see get_annual_lcow), number of iterations,
+            whether ADMM converged, and periods that failed to solve
+        """
+        if len(self.subproblems) == 0:
+            self.build()
+        profiler = get_profiler()
+        duals = np.zeros((len(self.periods), len(self.design_names)))
+        self._call("set_admm_objective", [(True,)] * len(self.periods))
+        converged = False
+        iteration = 0
+        for iteration in range(1, max_iterations + 1):
+            with profiler.span("admm_iteration"):
+                if not any(self.solve_periods()):
+                    raise RuntimeError(
+                        f"All periods failed to solve in ADMM iteration {iteration}"
+                    )
+                self.consensus, duals, primal_residual, dual_residual = (
+                    consensus_update(
+                        self.get_scaled_design_values(),
+                        duals,
+                        self.consensus,
+                        self.rho,
+                    )
+                )
+                lcow_ref = self.get_annual_lcow()
+                self._call(
+                    "set_consensus",
+                    [(list(self.consensus), list(dual), lcow_ref) for dual in duals],
+                )
+            _log.info(
+                f"ADMM iteration {iteration}: primal residual {primal_residual:.3e}, "
+                f"dual residual {dual_residual:.3e}"
+            )
+            if primal_residual < tolerance and dual_residual < tolerance:
+                converged = True
+                break
+        if not converged:
+            _log.warning(
+                f"ADMM did not converge in {max_iterations} iterations, "
+                "fixing design at current consensus"
+            )
+        with profiler.span("multi_period_polish"):
+            self.fix_design()
+            self._call("set_admm_objective", [(False,)] * len(self.periods))
+            success = self.solve_periods()
+        period_lcow = [
+            lcow if solved else np.nan
+            for lcow, solved in zip(self._call("get_lcow"), success)
+        ]
+        return {
+            "design": self.get_design(),
+            "period_LCOW": period_lcow,
+            "LCOW": self.get_annual_lcow() if all(success) else np.nan,
+            "iterations": iteration,
+            "converged": converged,
+            "failed_periods": [i for i, solved in enumerate(success) if not solved],
+        }
+
+    def fix_design(self):
+        """fixes design variables in all periods at consensus, capacities are fixed at
+        maximum of consensus and capacity required by each period so all periods
+        remain feasible"""
+        design = self.get_design()
+        period_design = self.get_period_design_values()
+        for i, name in enumerate(self.design_names):
+            if name in CAPACITY_COSTING_BLOCKS:
+                design[name] = max(design[name], period_design[:, i].max())
+        self._call("fix_design", [(design,)] * len(self.periods))
+
+    def unfix_design(self):
+        self._call("unfix_design")
+
+    def terminate_workers(self):
+        for subproblem in self.subproblems:
+            if self.parallel:
+                subproblem.terminate()
+            else:
+                subproblem.terminate_workers()
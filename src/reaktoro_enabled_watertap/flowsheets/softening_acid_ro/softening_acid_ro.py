@@ -52,7 +52,7 @@ from watertap.property_models.seawater_prop_pack import SeawaterParameterBlock
 from idaes.core.util.model_statistics import degrees_of_freedom
 
 from watertap.costing import WaterTAPCosting
-from pyomo.environ import ConcreteModel, Var, Reals, Constraint, Objective
+from pyomo.environ import ConcreteModel, Var, Reals, Constraint, Objective, value
 from idaes.core import (
     FlowsheetBlock,
 )
@@ -73,14 +73,35 @@ from reaktoro_enabled_watertap.utils import scale_utils as scu
 from watertap.core.util.model_diagnostics.infeasible import *
 import os
 import tempfile
+import functools
+import idaes.logger as idaeslog
 
 from reaktoro_enabled_watertap.utils.report_util import get_lib_path
+from reaktoro_enabled_watertap.utils import hessian_tuner
+from reaktoro_enabled_watertap.utils import adaptive_sweep
+from reaktoro_enabled_watertap.utils import continuation
+from reaktoro_enabled_watertap.utils import memory_tracker
+from reaktoro_enabled_watertap.utils.phase_profiler import get_profiler, profiled
+from reaktoro_enabled_watertap.water_sources.feed_stream import FeedStreamReplay
+from reaktoro_enabled_watertap.utils.compiled_nlp import CompiledNLPSolver
+from reaktoro_enabled_watertap.utils.bound_tightening import tightened_bounds
+from reaktoro_enabled_watertap.utils import scaling_audit
+from reaktoro_enabled_watertap.utils.diagnostics import diagnostics_enabled
+from reaktoro_enabled_watertap.utils.dof_tracker import get_degrees_of_freedom
+from reaktoro_enabled_watertap.utils.structure_fingerprint import (
+    get_structure_fingerprint,
+)
 from reaktoro_enabled_watertap.costing import (
     amusat_2024_costing as ams,
 )
 
 __author__ = "Alexander V. Dudchenko"
 
+_log = idaeslog.getLogger(__name__)
+
+# maximum number of re-solves after titration curves are regenerated
+MAX_TITRATION_CURVE_UPDATES = 3
+
 
 def main(
     multi_process_reaktoro=True, result_save_location="default", linear_solver="mumps"
@@ -119,9 +140,8 @@ def main(
         )
         initialize(m, linear_solver=linear_solver, tee=True)
         for r in [60, 70, 80]:
-            m.fs.water_recovery.fix(r / 100)
             print(f"\n\n------------Solving for water recovery: {r}%------------")
-            solve_model(m, linear_solver=linear_solver, tee=True)
+            solve_with_continuation(m, r / 100, linear_solver=linear_solver)
             report_all_units(m)
         if m.find_component("reaktoro_manager") is not None:
             m.reaktoro_manager.terminate_workers()
@@ -163,6 +183,7 @@ def enable_multi_process_reaktoro(
     return rkt_options
 
 
+@profiled()
 def build_model(
     water_case,
     multi_process_reaktoro=True,
@@ -173,6 +194,14 @@ def build_model(
     acidification_reagents=["HCl", "H2SO4"],
     feed_flow_rate=5000 * pyunits.m**3 / pyunits.day,
     system_costing="watertap_default",
+    build_reporting_properties=False,
+    initial_guess_table=None,
+    reagent_superstructure=False,
+    reagent_sparsity_penalty=None,
+    acid_titration_curve=False,
+    feed_overrides=None,
+    compiled_nlp=False,
+    bound_tightening=False,
 ):
     """Builds the flowsheet model for the softening-acidification-RO process.
     Args:
@@ -190,12 +219,44 @@ def build_model(
                 - BFGS_mod - modified BFGS
                 - BFGS_damp - damped BFGS
                 - BFGS_ipopt - BFGS with ipopt update step
+                - auto - uses hessian options selected by tune_hessian_options for flowsheets
+                  with the same structure (falls back to LBFGS with GaussNewton initialization
+                  if not tuned, see build_tuned_model)
         softening_reagents (list): List of reagents to use in the softening unit.
         acidification_reagents (list): List of reagents to use in the acidification unit.
         feed_flow_rate: volumetric flow rate of the feed water to the system.
         system_costing (str): Costing method for softening and acidification units. (watertap_default, or Amusat_et_al_2024)
+        build_reporting_properties (bool): If True, on-demand properties used only for reporting
+            are built on the unit models (needed when saving them in sweeps), otherwise
+            they are evaluated on demand when units are reported.
+        initial_guess_table: InitialGuessTable used to seed chemistry blocks and precipitate
+            flows during initialization (see record_initial_guesses for populating it)
+        reagent_superstructure (bool): If True, softening and acidification reagents are treated
+            as candidates with dose lower bounds relaxed to zero, so cost optimal reagents are
+            selected in one solve (use "all" to include all bases in the catalog for softening, and
+            all acids for acidification)
+        reagent_sparsity_penalty: penalty added to LCOW objective ($/m3) for each reagent in use
+        acid_titration_curve (bool): If True, acidification unit uses titration curve generated
+            during initialization instead of reaktoro block during solve, curve is regenerated
+            in solve_model when acidification inlet drifts from composition curve was generated at
+        feed_overrides (dict): feed specifications that replace values loaded from water_case
+            (e.g. {"pH": 7.2, "ion_concentrations": {"Ca_2+": 300 * pyunits.mg / pyunits.L}}),
+            ion concentrations are replaced per ion
+        compiled_nlp (bool): If True, solve_model solves the model through NLP that is compiled once
+            and reused while model structure does not change (see utils.compiled_nlp), instead
+            of writing and loading NLP for every solve
+        bound_tightening (bool): If True, solve_model tightens variable bounds before each solve
+            by propagating bounds through algebraic constraints (see utils.bound_tightening),
+            bounds are restored after the solve
     """
 
+    if rkt_hessian_type == "auto":
+        build_options = {
+            key: val
+            for key, val in locals().items()
+            if key not in ["rkt_hessian_type", "bfgs_initialization_type"]
+        }
+        return build_tuned_model(**build_options)
     mcas_props, feed_specs = get_source_water_data(water_case)
     if feed_flow_rate is not None:
         if isinstance(feed_flow_rate, dict):
@@ -204,17 +265,26 @@ def build_model(
             )
         else:
             feed_specs["volumetric_flowrate"] = feed_flow_rate
+    if feed_overrides is not None:
+        for key, val in feed_overrides.items():
+            if key == "ion_concentrations":
+                feed_specs[key] = {**feed_specs[key], **val}
+            else:
+                feed_specs[key] = val
     mcas_props["activity_coefficient_model"] = ActivityCoefficientModel.ideal
     mcas_props["density_calculation"] = DensityCalculation.constant
 
     m = ConcreteModel()
     m.water_case = water_case
+    m.initial_guess_table = initial_guess_table
     if rkt_hessian_type == "limited-memory":
         rkt_hessian_type = "ZeroHessian"
         m.solver_limited_memory = True
     else:
         m.solver_limited_memory = False
     m.solver_limited_memory_scalar = bfgs_initialization_type
+    m.use_compiled_nlp = compiled_nlp
+    m.use_bound_tightening = bound_tightening
     rkt_options = {
         "hessian_options": {
             "hessian_type": rkt_hessian_type,
@@ -237,9 +307,9 @@ def build_model(
         reconcile_using_reaktoro=True,
         **feed_specs,
     )
-    if isinstance(softening_reagents, str):
+    if isinstance(softening_reagents, str) and softening_reagents != "all":
         softening_reagents = [softening_reagents]
-    if isinstance(acidification_reagents, str):
+    if isinstance(acidification_reagents, str) and acidification_reagents != "all":
         acidification_reagents = [acidification_reagents]
     if system_costing == "watertap_default":
         chemical_costing_type = {}
@@ -255,6 +325,7 @@ def build_model(
         )
     m.fs.softening_unit = PrecipitationUnit(
         default_property_package=m.fs.properties,
+        build_reporting_properties=build_reporting_properties,
         default_costing_package=m.fs.costing,
         selected_precipitants=[
             "Calcite",
@@ -263,14 +334,22 @@ def build_model(
         selected_reagents=softening_reagents,
         add_alkalinity=True,
         reaktoro_options=rkt_options,
+        initial_guess_table=initial_guess_table,
+        superstructure=reagent_superstructure,
+        reagent_sparsity_penalty=reagent_sparsity_penalty,
         default_costing_package_kwargs=chemical_costing_type,
     )
 
     m.fs.acidification_unit = ChemicalAdditionUnit(
         default_property_package=m.fs.properties,
+        build_reporting_properties=build_reporting_properties,
         default_costing_package=m.fs.costing,
         selected_reagents=acidification_reagents,
         reaktoro_options=rkt_options,
+        initial_guess_table=initial_guess_table,
+        superstructure=reagent_superstructure,
+        reagent_sparsity_penalty=reagent_sparsity_penalty,
+        titration_curve=acid_titration_curve,
         default_costing_package_kwargs=chemical_costing_type,
     )
     if "Seawater" in water_case:
@@ -288,11 +367,13 @@ def build_model(
 
     m.fs.ro_unit = MultiCompROUnit(
         default_property_package=m.fs.properties,
+        build_reporting_properties=build_reporting_properties,
         default_costing_package=m.fs.costing,
         ro_property_package=m.fs.ro_properties,
         selected_scalants={"Calcite": 1, "Gypsum": 1},
         use_interfacecomp_for_effluent_pH=True,
         reaktoro_options=rkt_options,
+        initial_guess_table=initial_guess_table,
         target_recovery=0.5,
     )
 
@@ -311,10 +392,12 @@ def build_model(
         )
         m.fs.hpro_unit = MultiCompROUnit(
             default_property_package=m.fs.properties,
+            build_reporting_properties=build_reporting_properties,
             default_costing_package=m.fs.costing,
             ro_property_package=m.fs.ro_properties,
             selected_scalants={"Calcite": 1, "Gypsum": 1},
             reaktoro_options=rkt_options,
+            initial_guess_table=initial_guess_table,
             use_interfacecomp_for_effluent_pH=True,
             default_costing_package_kwargs={
                 "costing_method_arguments": {"ro_type": "high_pressure"}
@@ -323,6 +406,7 @@ def build_model(
         )
         m.fs.product_mixer = MixerPhUnit(
             default_property_package=m.fs.properties,
+            build_reporting_properties=build_reporting_properties,
             default_costing_package=m.fs.costing,
             inlet_ports=["ro_inlet", "hpro_inlet"],
             add_reaktoro_chemistry=False,
@@ -330,9 +414,11 @@ def build_model(
 
     m.fs.product = MultiCompProduct(
         default_property_package=m.fs.properties,
+        build_reporting_properties=build_reporting_properties,
     )
     m.fs.brine = MultiCompProduct(
         default_property_package=m.fs.properties,
+        build_reporting_properties=build_reporting_properties,
     )
     if multi_process_reaktoro:
         m.reaktoro_manager.build_reaktoro_blocks()
@@ -379,7 +465,8 @@ def build_model(
         m.fs.ro_unit.product.connect_to(m.fs.product.inlet)
     m.fs.erd_unit.outlet.connect_to(m.fs.brine.inlet)
 
-    m.fs.costing.cost_process()
+    with get_profiler().span("cost_process"):
+        m.fs.costing.cost_process()
     m.fs.costing.add_annual_water_production(
         m.fs.product.product.properties[0].flow_vol
     )
@@ -387,15 +474,213 @@ def build_model(
     m.fs.costing.add_specific_energy_consumption(
         m.fs.product.product.properties[0].flow_vol
     )
-    m.fs.lcow_objective = Objective(expr=m.fs.costing.LCOW)
+    objective = m.fs.costing.LCOW
+    if reagent_sparsity_penalty is not None:
+        objective = (
+            objective
+            + m.fs.softening_unit.precipitation_reactor.reagent_sparsity_penalty
+            + m.fs.acidification_unit.chemical_reactor.reagent_sparsity_penalty
+        )
+    m.fs.lcow_objective = Objective(expr=objective)
     TransformationFactory("network.expand_arcs").apply_to(m)
     add_global_constraints(m)
     fix_and_scale(m)
-    scu.scale_costing_block(m.fs.costing)
+    with get_profiler().span("scale_costing_block"):
+        scu.scale_costing_block(m.fs.costing)
     add_perfomance_tracking_vars(m)
     return m
 
 
+def get_model_fingerprint(m, include_hessian_options=True):
+    """returns structural fingerprint of flowsheet (see utils.structure_fingerprint),
+    artifacts cached under this fingerprint can be reused by any flowsheet built
+    with the same configuration. If include_hessian_options is False, hessian options
+    of reaktoro blocks are excluded, so flowsheets that differ only in hessian options
+    share fingerprint, while water case is included, as hessian options that converge
+    depend on feed composition (used to key hessian tuning results)"""
+    extra = {
+        "solver_limited_memory": m.solver_limited_memory,
+        "solver_limited_memory_scalar": m.solver_limited_memory_scalar,
+    }
+    if include_hessian_options:
+        return get_structure_fingerprint(m, extra=extra)
+    extra["water_case"] = m.water_case
+    return get_structure_fingerprint(m, extra=extra, ignore_config=["hessian_options"])
+
+
+def get_tuned_hessian_options(m, cache=None):
+    """returns dict of hessian options (rkt_hessian_type, bfgs_initialization_type) selected by
+    tune_hessian_options for flowsheets with the same structure as m, or default options
+    if such flowsheet was not tuned
+
+    Args:
+        m: flowsheet model
+        cache: ArtifactCache with tuning results (default ArtifactCache())
+    """
+    options = hessian_tuner.load_tuned_hessian_options(
+        get_model_fingerprint(m, include_hessian_options=False), cache
+    )
+    if options is None:
+        _log.info(
+            f"No tuned hessian options for {m.water_case}, using {hessian_tuner.DEFAULT_HESSIAN_OPTIONS}"
+        )
+        options = hessian_tuner.DEFAULT_HESSIAN_OPTIONS
+    return options
+
+
+def build_tuned_model(water_case, cache=None, **kwargs):
+    """Builds flowsheet with hessian options selected by tune_hessian_options for
+    flowsheets with the same structure (see get_tuned_hessian_options). Flowsheet is
+    first built with default options to get its fingerprint, and is rebuilt if tuned
+    options differ from default.
+
+    Args:
+        water_case (str): location of water source data file with yaml format.
+        cache: ArtifactCache with tuning results (default ArtifactCache())
+        kwargs: additional arguments passed to build_model
+    """
+    m = build_model(water_case, **hessian_tuner.DEFAULT_HESSIAN_OPTIONS, **kwargs)
+    options = get_tuned_hessian_options(m, cache=cache)
+    if options == hessian_tuner.DEFAULT_HESSIAN_OPTIONS:
+        return m
+    memory_tracker.teardown_model(m)
+    return build_model(water_case, **options, **kwargs)
+
+
+def tune_hessian_options(
+    water_case,
+    hpro=False,
+    softening_reagents=["Na2CO3", "CaO"],
+    acidification_reagents=["HCl", "H2SO4"],
+    system_costing="watertap_default",
+    water_recoveries=[0.5, 0.6, 0.7],
+    candidates=None,
+    linear_solver="mumps",
+    multi_process_reaktoro=False,
+    cache=None,
+    **kwargs,
+):
+    """Runs a racing benchmark of reaktoro hessian options for a flowsheet configuration
+    and stores the fastest option that converges (see hessian_tuner.race_hessian_options)
+    in artifact cache under flowsheet fingerprint (see get_model_fingerprint), models
+    with the same structure and water case built with rkt_hessian_type="auto" will use
+    the stored option.
+
+    Args:
+        water_case (str): location of water source data file with yaml format.
+        hpro (bool): If True, includes high-pressure RO unit in the flowsheet.
+        softening_reagents (list): List of reagents to use in the softening unit.
+        acidification_reagents (list): List of reagents to use in the acidification unit.
+        system_costing (str): Costing method for softening and acidification units.
+        water_recoveries (list): water recoveries to race candidates over
+        candidates (dict): hessian options to test (default hessian_tuner.HESSIAN_CANDIDATES)
+        linear_solver (str): linear solver to use in ipopt
+        multi_process_reaktoro (bool): If True, enables parallel processing for reaktoro blocks.
+        cache: ArtifactCache to store tuning results in (default ArtifactCache())
+        kwargs: additional arguments passed to build_model
+    """
+    if candidates is None:
+        candidates = hessian_tuner.HESSIAN_CANDIDATES
+    if hessian_tuner.DEFAULT_HESSIAN_OPTIONS not in candidates.values():
+        # default options are always raced, so results are stored under fingerprint
+        # of flowsheet built with default options (see build_tuned_model)
+        candidates = {**candidates, "default": hessian_tuner.DEFAULT_HESSIAN_OPTIONS}
+    fingerprints = set()
+
+    def build(rkt_hessian_type, bfgs_initialization_type):
+        m = build_model(
+            water_case,
+            multi_process_reaktoro=multi_process_reaktoro,
+            hpro=hpro,
+            rkt_hessian_type=rkt_hessian_type,
+            bfgs_initialization_type=bfgs_initialization_type,
+            softening_reagents=softening_reagents,
+            acidification_reagents=acidification_reagents,
+            system_costing=system_costing,
+            **kwargs,
+        )
+        fingerprints.add(get_model_fingerprint(m, include_hessian_options=False))
+        return m
+
+    def set_water_recovery(m, water_recovery):
+        m.fs.water_recovery.fix(water_recovery)
+
+    result = hessian_tuner.race_hessian_options(
+        build,
+        lambda m: initialize(m, linear_solver=linear_solver),
+        lambda m: solve_model(m, linear_solver=linear_solver),
+        set_water_recovery,
+        water_recoveries,
+        candidates=candidates,
+        cleanup_function=memory_tracker.teardown_model,
+    )
+    if result["selected"] is None:
+        # water is not marked as tuned, so it can be tuned again (e.g. with
+        # other candidates or operating points)
+        _log.warning("No hessian option converged, tuning results are not stored")
+        return result
+    # fingerprint includes ipopt limited memory settings, which differ between
+    # candidates, so result is stored under fingerprint of every raced flowsheet
+    for fingerprint in fingerprints:
+        hessian_tuner.save_tuned_hessian_options(fingerprint, result, cache)
+    return result
+
+
+def adaptive_water_recovery_sweep(
+    m,
+    lower_limit=0.5,
+    upper_limit=0.9,
+    initial_samples=5,
+    max_samples=41,
+    tolerance=0.005,
+    linear_solver="mumps",
+    h5_file=None,
+    h5_dir="adaptive_water_recovery_sweep",
+):
+    """Sweeps water recovery using adaptive sampling (see adaptive_sweep.adaptive_sweep),
+    samples are added where LCOW or SEC curvature is high, or where RO scaling
+    constraints or pH bounds become active, instead of using a fixed linear grid.
+    Model should be initialized and set for optimization (see initialize).
+
+    Args:
+        m: initialized flowsheet model
+        lower_limit: lowest water recovery
+        upper_limit: highest water recovery
+        initial_samples: number of linearly spaced initial samples
+        max_samples: maximum number of solves
+        tolerance: target interpolation error relative to range of LCOW and SEC
+        linear_solver (str): linear solver to use in ipopt
+        h5_file: if provided results are saved using loopTool h5 layout
+        h5_dir: h5 group for results
+    """
+    active_set_components = []
+    for ro in ["ro_unit", "hpro_unit"]:
+        ro_unit = m.fs.find_component(ro)
+        if ro_unit is not None:
+            active_set_components.append(ro_unit.ro_unit.eq_max_scaling_tendency)
+            active_set_components.append(ro_unit.ro_feed.pH)
+    active_set_components.append(m.fs.softening_unit.precipitation_reactor.alkalinity)
+    active_set_components.append(m.fs.softening_unit.precipitation_reactor.pH)
+    return adaptive_sweep.adaptive_sweep(
+        m,
+        "fs.water_recovery",
+        lower_limit,
+        upper_limit,
+        outputs={
+            "fs.costing.LCOW": m.fs.costing.LCOW,
+            "fs.costing.specific_energy_consumption": m.fs.costing.specific_energy_consumption,
+        },
+        solve_function=lambda m: solve_model(m, linear_solver=linear_solver),
+        active_set_components=active_set_components,
+        initial_samples=initial_samples,
+        max_samples=max_samples,
+        tolerance=tolerance,
+        probe_function=test_func,
+        h5_file=h5_file,
+        h5_dir=h5_dir,
+    )
+
+
 def add_global_constraints(m):
     m.fs.water_recovery = Var(
         initialize=0.5,
@@ -459,13 +744,14 @@ def add_perfomance_tracking_vars(m):
 
 def report_global_state(m):
     data_dict = {"Global results": {}}
-    data_dict["Global results"]["DOfs"] = int(degrees_of_freedom(m))
+    data_dict["Global results"]["DOfs"] = int(get_degrees_of_freedom(m))
     data_dict["Global results"]["Water recovery"] = m.fs.water_recovery
     data_dict["Global results"]["LCOW"] = m.fs.costing.LCOW
 
     build_report_table("Global results", data_dict)
 
 
+@profiled()
 def fix_and_scale(m):
     for unit in m.flowsheet_unit_order:
         unit.fix_and_scale()
@@ -486,24 +772,219 @@ def fix_and_scale(m):
         m.fs.hpro_unit.ro_feed.pH.setub(max_ph)
     m.fs.softening_unit.precipitation_reactor.pH["outlet"].setlb(6)
     m.fs.softening_unit.precipitation_reactor.pH["outlet"].setub(max_ph)
-    assert degrees_of_freedom(m) == 0
+    assert get_degrees_of_freedom(m) == 0
+
+
+def audit_scaling(m, n=10, correct=False):
+    """prints n worst scaled constraints and variables at current point attributed to
+    flowsheet units (see utils.scaling_audit), if correct is True, their scaling is
+    corrected with geometric mean scaling"""
+    return scaling_audit.audit_scaling(m, n=n, correct=correct)
+
 
+def get_selected_reagents(m, threshold=1e-3):
+    """returns reagents with dose above threshold (kg/m3) in softening and
+    acidification units"""
+    return {
+        "softening_reagents": m.fs.softening_unit.get_selected_reagents(threshold),
+        "acidification_reagents": m.fs.acidification_unit.get_selected_reagents(
+            threshold
+        ),
+    }
+
+
+def select_reagents(
+    water_case,
+    water_recovery=0.5,
+    softening_reagents="all",
+    acidification_reagents="all",
+    reagent_sparsity_penalty=None,
+    linear_solver="mumps",
+    **kwargs,
+):
+    """Selects cost optimal softening and acidification reagents for a water case
+    by solving reagent superstructure model once, instead of building and solving a
+    model for each reagent combination.
+
+    Args:
+        water_case (str): location of water source data file with yaml format.
+        water_recovery: water recovery to optimize reagents at
+        softening_reagents: candidate softening reagents ("all" for all bases in catalog)
+        acidification_reagents: candidate acidification reagents ("all" for all acids in
+            catalog)
+        reagent_sparsity_penalty: penalty added to LCOW ($/m3) for each reagent in use
+        linear_solver (str): linear solver to use in ipopt
+        kwargs: additional arguments passed to build_model
 
+    Returns:
+        dict with selected softening and acidification reagents, and LCOW
+    """
+    m = build_model(
+        water_case,
+        softening_reagents=softening_reagents,
+        acidification_reagents=acidification_reagents,
+        reagent_superstructure=True,
+        reagent_sparsity_penalty=reagent_sparsity_penalty,
+        **kwargs,
+    )
+    try:
+        initialize(m, linear_solver=linear_solver)
+        if water_recovery != m.fs.water_recovery.value:
+            solve_with_continuation(m, water_recovery, linear_solver=linear_solver)
+        selected = get_selected_reagents(m)
+        selected["LCOW"] = value(m.fs.costing.LCOW)
+    finally:
+        if m.find_component("reaktoro_manager") is not None:
+            m.reaktoro_manager.terminate_workers()
+    return selected
+
+
+def restart_reaktoro_workers(m):
+    """Restarts parallel reaktoro worker processes to release memory they retained,
+    model and reaktoro blocks are not rebuilt. Workers are terminated, managed blocks
+    are registered with the parallel manager again (creating new workers), and solve,
+    initialize and display functions of new workers are wired the same way as in
+    ReaktoroBlockManager.build_reaktoro_blocks, new workers are then initialized
+    with current model state"""
+    if (
+        m.find_component("reaktoro_manager") is None
+        or not m.reaktoro_manager.config.use_parallel_mode
+    ):
+        return
+    manager = m.reaktoro_manager
+    parallel_manager = manager.parallel_manager
+    manager.terminate_workers()
+    for block_idx, block in enumerate(manager.registered_blocks):
+        parallel_manager.register_block(block_idx, block)
+        solve_func, get_func = parallel_manager.get_solve_and_get_function(block_idx)
+        manager.aggregate_solver_state.register_solve_function(block_idx, solve_func)
+        manager.aggregate_solver_state.register_get_function(block_idx, get_func)
+        block.builder.reaktoro_initialize_function = (
+            parallel_manager.get_initialize_function(block_idx)
+        )
+        block.builder.display_reaktoro_state_function = (
+            parallel_manager.get_display_function(block_idx)
+        )
+        block.builder.get_jacobian_matrix_function = (
+            parallel_manager.get_jacobian_matrix_function(block_idx)
+        )
+    parallel_manager.start_workers()
+    manager.initialize()
+
+
+def get_memory_lean_sweep(rss_threshold=None, linear_solver="mumps"):
+    """Returns MemoryLeanSweep with build, initialize and solve functions for use
+    with loopTool, models are torn down before next one is built and reaktoro workers
+    are restarted if memory is above rss_threshold (MB)"""
+    return memory_tracker.MemoryLeanSweep(
+        build_model,
+        functools.partial(initialize, linear_solver=linear_solver),
+        functools.partial(solve_model, linear_solver=linear_solver),
+        restart_function=restart_reaktoro_workers,
+        rss_threshold=rss_threshold,
+    )
+
+
+@profiled()
 def initialize(m, linear_solver="mumps", tee=False, **kwargs):
+    profiler = get_profiler()
     for unit in m.flowsheet_unit_order:
         unit.initialize()
-    m.fs.costing.initialize()
+    with profiler.span("costing_initialize"):
+        m.fs.costing.initialize()
     report_all_units(m)
-    solve_model(m, linear_solver=linear_solver, tee=tee)
+    with profiler.span("initialization_solve"):
+        solve_model(m, linear_solver=linear_solver, tee=tee)
     set_optimization(m)
 
-    if m.fs.water_recovery.value < 0.5:
-        m.fs.water_recovery.fix()
-        solve_model(m, linear_solver=linear_solver, tee=tee)
-    else:
-        m.fs.water_recovery.fix(0.5)
-    solve_model(m, linear_solver=linear_solver, tee=tee)
-    print("--------------Initialization complete--------")
+    with profiler.span("recovery_solve"):
+        if m.fs.water_recovery.value < 0.5:
+            m.fs.water_recovery.fix()
+            solve_model(m, linear_solver=linear_solver, tee=tee)
+            solve_model(m, linear_solver=linear_solver, tee=tee)
+        else:
+            m.fs.water_recovery.fix()
+            solve_with_continuation(m, 0.5, linear_solver=linear_solver, tee=tee)
+    _log.info("Initialization complete")
+
+
+def record_initial_guesses(m, table_file=None):
+    """Adds converged chemistry states of all units to the model's initial guess
+    table and saves it, should be called after model is initialized and solved so
+    entries are consistent with initialization conditions.
+
+    Args:
+        m: solved flowsheet model built with initial_guess_table
+        table_file: file to save table to (defaults to file table was loaded from)
+    """
+    if m.initial_guess_table is None:
+        raise ValueError("Model was built without initial_guess_table")
+    for unit in m.flowsheet_unit_order:
+        unit.record_initial_guess()
+    m.initial_guess_table.save(table_file)
+
+
+def update_titration_curves(m):
+    """regenerates titration curves of units whose inlet drifted from composition
+    curve was generated at, returns True if any curve was regenerated"""
+    updated = False
+    for unit in m.flowsheet_unit_order:
+        if hasattr(unit, "update_titration_curve"):
+            updated = unit.update_titration_curve() or updated
+    return updated
+
+
+def get_replay_outputs(m):
+    """returns outputs recorded for each plant data record (LCOW, energy
+    consumption, water recovery, and reagent doses in kg/m3)"""
+    outputs = {
+        "LCOW": m.fs.costing.LCOW,
+        "specific_energy_consumption": m.fs.costing.specific_energy_consumption,
+        "water_recovery": m.fs.water_recovery,
+    }
+    for unit, reactor in [
+        (m.fs.softening_unit, m.fs.softening_unit.precipitation_reactor),
+        (m.fs.acidification_unit, m.fs.acidification_unit.chemical_reactor),
+    ]:
+        for reagent in unit.selected_reagents:
+            outputs[f"{reagent} dose"] = reactor.reagent_dose[reagent]
+    return outputs
+
+
+def replay_plant_data(
+    m,
+    file_name,
+    chunk_size=1000,
+    column_map=None,
+    output_file=None,
+    linear_solver="mumps",
+    **kwargs,
+):
+    """Replays plant data (csv or parquet with ion concentrations in mg/L, pH,
+    temperature, and flow, see feed_stream.read_feed_stream) through initialized model,
+    returning optimal doses and LCOW for each record.
+
+    Args:
+        m: initialized flowsheet model, optimization variables should be unfixed
+        file_name: plant data file
+        chunk_size: number of records read and processed at once
+        column_map: dict that renames data columns to ion names or state columns
+        output_file: csv file results are appended to after each chunk
+        linear_solver (str): linear solver to use in ipopt
+        kwargs: additional options passed to FeedStreamReplay
+
+    Returns:
+        FeedStreamReplay with stats and cached results, and list of results
+        (empty if output_file is provided)
+    """
+    replay = FeedStreamReplay(
+        m,
+        lambda m: solve_model(m, linear_solver=linear_solver),
+        get_replay_outputs(m),
+        **kwargs,
+    )
+    results = replay.replay(file_name, chunk_size, column_map, output_file)
+    return replay, results
 
 
 def report_all_units(m):
@@ -522,8 +1003,11 @@ def test_func(m, **kwargs):
     """Test function to check if the model is suitable for solving
     For Seawater case, with out HPRO maximum recoveriy is 65% while, with HPRO it is 86%
     """
-    print(
-        f"Testing func: {m.water_case}, {m.fs.find_component('hpro_unit')}, {m.fs.water_recovery.value}"
+    _log.debug(
+        "Testing func: %s, %s, %s",
+        m.water_case,
+        m.fs.find_component("hpro_unit"),
+        m.fs.water_recovery.value,
     )
 
     if "Seawater" in m.water_case:
@@ -537,6 +1021,79 @@ def test_func(m, **kwargs):
     return True
 
 
+@profiled()
+def solve_with_continuation(
+    m, water_recovery, linear_solver="mumps", tee=False, targets=None, **kwargs
+):
+    """Solves model at target water recovery by stepping from current solution
+    using continuation (see continuation.continuation_solve), step size is
+    adapted to number of ipopt iterations and cut on failed solves.
+
+    Args:
+        m: solved flowsheet model
+        water_recovery: target water recovery
+        linear_solver (str): linear solver to use in ipopt
+        tee (bool): show solver output
+        targets (list): additional continuation (parameter, target) pairs, e.g.
+            [((m.fs.hp_pump_unit.pump.outlet.pressure[0], "ub"), 300e5)]
+        kwargs: continuation options (step_init, step_cut, iter_target, etc.)
+    """
+    if targets is None:
+        targets = []
+    return continuation.continuation_solve(
+        m,
+        lambda m: solve_model(m, linear_solver=linear_solver, tee=tee),
+        [(m.fs.water_recovery, water_recovery)] + list(targets),
+        iteration_function=lambda m, result: m.fs.ipopt_iterations[
+            "Number of iterations"
+        ].value,
+        **kwargs,
+    )
+
+
+def _solve(solver, m, tee=False):
+    if m.use_bound_tightening:
+        with tightened_bounds(m):
+            return solver.solve(m, tee=tee)
+    return solver.solve(m, tee=tee)
+
+
+def _solve_and_record_performance(solver, m, tee=False):
+    """solves model, and if model tracks ipopt performance, writes ipopt output to a
+    temporary file that is parsed into ipopt_iterations, unscaled_ipopt_result and
+    scaled_ipopt_result, and removed after the solve"""
+    if m.fs.find_component("ipopt_iterations") is None:
+        return _solve(solver, m, tee=tee)
+    tmp = tempfile.NamedTemporaryFile(suffix=".txt", delete=False)
+    tmp.close()
+    solver.options["output_file"] = tmp.name
+    try:
+        result = _solve(solver, m, tee=tee)
+        matched_keys, parsed_output = ipopt_perf_utils.get_ipopt_performance_data(
+            tmp.name
+        )
+    finally:
+        # remove ipopt output file even if solve fails, so long sweeps don't leak them
+        if os.path.exists(tmp.name):
+            os.remove(tmp.name)
+    iters_keys = list(m.fs.ipopt_iterations.keys())
+    for i, k in enumerate(matched_keys.groups()):
+        if k is not None:
+            k = int(float(k))
+        else:
+            k = 0
+
+        m.fs.ipopt_iterations[iters_keys[i]] = k
+    for key in m.fs.unscaled_ipopt_result:
+        m.fs.unscaled_ipopt_result[key] = parsed_output.get(key, 0)
+        m.fs.scaled_ipopt_result[key] = parsed_output["final_scaled_results"].get(
+            key, 0
+        )
+    m.fs.ipopt_iterations["Number of iterations"] = int(parsed_output["iters"])
+    return result
+
+
+@profiled()
 def solve_model(m, tee=False, linear_solver="mumps", **kwargs):
     if linear_solver == "mumps":
         pivtol = 1e-3
@@ -552,39 +1109,23 @@ def solve_model(m, tee=False, linear_solver="mumps", **kwargs):
         pivtol=pivtol,
         pivtolmax=maxpivtol,
     )
-    if m.fs.find_component("ipopt_iterations") is not None:
-        tmp = tempfile.NamedTemporaryFile(suffix=".txt", delete=False)
-        tmp.close()
-        solver.options["output_file"] = tmp.name
-    else:
-        tmp = None
-    result = solver.solve(m, tee=tee)
-    if tmp is not None:
-        matched_keys, parsed_output = ipopt_perf_utils.get_ipopt_performance_data(
-            tmp.name
-        )
-        os.remove(tmp.name)
-        iters_keys = list(m.fs.ipopt_iterations.keys())
-        for i, k in enumerate(matched_keys.groups()):
-            if k is not None:
-                k = int(float(k))
-            else:
-                k = 0
-
-            m.fs.ipopt_iterations[iters_keys[i]] = k
-        for key in m.fs.unscaled_ipopt_result:
-            m.fs.unscaled_ipopt_result[key] = parsed_output.get(key, 0)
-            m.fs.scaled_ipopt_result[key] = parsed_output["final_scaled_results"].get(
-                key, 0
-            )
-        m.fs.ipopt_iterations["Number of iterations"] = int(parsed_output["iters"])
-    if tee:
-        print("------vars_close_to_bound-tests---------")
+    if m.use_compiled_nlp:
+        solver = CompiledNLPSolver(solver.options)
+    result = _solve_and_record_performance(solver, m, tee=tee)
+    if diagnostics_enabled():
+        # whole model scans, only run when diagnostics are enabled
+        _log.debug("Variables close to bounds:")
         print_variables_close_to_bounds(m)
-        print("------constraints_close_to_bound-tests---------")
+        _log.debug("Constraints close to bounds:")
         print_constraints_close_to_bounds(m)
 
     assert_optimal_termination(result)
+    for _ in range(MAX_TITRATION_CURVE_UPDATES):
+        # curves are regenerated at new inlet composition, which requires re-solve
+        if not update_titration_curves(m):
+            break
+        result = _solve_and_record_performance(solver, m, tee=tee)
+        assert_optimal_termination(result)
     return result
 
 
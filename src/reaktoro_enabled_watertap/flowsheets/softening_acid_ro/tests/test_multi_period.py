@@ -0,0 +1,156 @@
+from reaktoro_enabled_watertap.flowsheets.softening_acid_ro import (
+    multi_period,
+)
+from pyomo.environ import (
+    units as pyunits,
+)
+from pyomo.environ import ConcreteModel, Var, value
+import numpy as np
+import pytest
+
+
+__author__ = "Alexander V. Dudchenko"
+
+
+@pytest.mark.core
+def test_load_periods(tmp_path):
+    period_file = tmp_path / "periods.csv"
+    period_file.write_text(
+        "weight,electricity_cost,feed_flow_rate,pH,Ca_2+\n"
+        "4380,0.05,4000,7.1,300\n"
+        "4380,0.09,,,\n"
+    )
+    periods = multi_period.load_periods(period_file)
+    assert len(periods) == 2
+    assert periods[0]["weight"] == 4380
+    assert periods[0]["electricity_cost"] == 0.05
+    assert (
+        pytest.approx(
+            value(
+                pyunits.convert(periods[0]["feed_flow_rate"], pyunits.m**3 / pyunits.s)
+            )
+        )
+        == 4000 / 86400
+    )
+    assert periods[0]["feed_overrides"]["pH"] == 7.1
+    assert value(periods[0]["feed_overrides"]["ion_concentrations"]["Ca_2+"]) == 300
+    assert periods[1]["electricity_cost"] == 0.09
+    assert periods[1]["feed_flow_rate"] is None
+    assert periods[1]["feed_overrides"] == {}
+
+
+@pytest.mark.core
+def test_consensus_update():
+    period_values = np.array([[1.0, 2.0], [3.0, 2.0]])
+    duals = np.zeros((2, 2))
+    consensus, duals, primal, dual = multi_period.consensus_update(
+        period_values, duals, np.array([2.0, 2.0]), rho=1
+    )
+    assert consensus == pytest.approx([2.0, 2.0])
+    assert duals == pytest.approx(np.array([[-1.0, 0], [1.0, 0]]))
+    assert primal == pytest.approx(np.sqrt(2))
+    assert dual == pytest.approx(0)
+    # at consensus, duals sum to zero and consensus does not move
+    consensus, duals, primal, dual = multi_period.consensus_update(
+        np.array([[2.0, 2.0], [2.0, 2.0]]), duals, consensus, rho=1
+    )
+    assert consensus == pytest.approx([2.0, 2.0])
+    assert primal == pytest.approx(0)
+    assert dual == pytest.approx(0)
+
+
+@pytest.mark.core
+def test_annual_lcow():
+    # periods with different production, annual LCOW is total cost over total
+    # production, not mean of period LCOWs (1 and 6 $/m3)
+    lcow = multi_period.get_annual_lcow([0.5, 0.5], [100, 300], [100, 50])
+    assert lcow == pytest.approx(200 / 75)
+    assert lcow != pytest.approx(np.mean([100 / 100, 300 / 50]))
+
+
+@pytest.mark.core
+def test_period_solve_failure(monkeypatch):
+    subproblem = multi_period.PeriodSubproblem(
+        "USDA_brackish.yaml", {"weight": 1}, None, "mumps", {}
+    )
+    subproblem.m = ConcreteModel()
+    subproblem.m.x = Var(initialize=1)
+
+    def failed_solve(m, **kwargs):
+        m.x.value = 5
+        raise RuntimeError("solver failed")
+
+    monkeypatch.setattr(multi_period.sar, "solve_model", failed_solve)
+    # failed period keeps its previous solution, so ADMM can continue
+    assert not subproblem.solve()
+    assert value(subproblem.m.x) == 1
+
+
+@pytest.mark.flowsheets
+def test_multi_period_brackish():
+    periods = [
+        {"weight": 4380, "electricity_cost": 0.05},
+        {
+            "weight": 4380,
+            "electricity_cost": 0.09,
+            "feed_flow_rate": 4000 * pyunits.m**3 / pyunits.day,
+            "feed_overrides": {
+                "ion_concentrations": {"Ca_2+": 350 * pyunits.mg / pyunits.L}
+            },
+        },
+    ]
+    mp = multi_period.MultiPeriodFlowsheet(
+        "USDA_brackish.yaml",
+        periods,
+        multi_process_reaktoro=True,
+        hpro=False,
+        feed_flow_rate=5000 * pyunits.m**3 / pyunits.day,
+    )
+    try:
+        mp.build()
+        results = mp.solve(max_iterations=30, tolerance=1e-3)
+        design = results["design"]
+        for m in mp.models:
+            # design is shared, while doses are per period
+            assert value(m.fs.ro_unit.ro_unit.area) == pytest.approx(
+                design["ro_area"], rel=1e-6
+            )
+            assert m.fs.ro_unit.ro_unit.area.fixed
+            assert value(
+                m.fs.softening_unit.precipitation_reactor.costing.capital_cost
+            ) >= design["softening_capacity"] * (1 - 1e-6)
+        assert results["converged"]
+        # periods have different production, so annual LCOW is production weighted
+        productions = [value(multi_period.get_annual_production(m)) for m in mp.models]
+        assert results["LCOW"] == pytest.approx(
+            np.dot(results["period_LCOW"], productions) / np.sum(productions),
+            rel=1e-6,
+        )
+    finally:
+        mp.terminate_workers()
+
+
+@pytest.mark.flowsheets
+def test_multi_period_parallel():
+    periods = [
+        {"weight": 4380, "electricity_cost": 0.05},
+        {"weight": 4380, "electricity_cost": 0.09},
+    ]
+    mp = multi_period.MultiPeriodFlowsheet(
+        "USDA_brackish.yaml",
+        periods,
+        parallel=True,
+        hpro=False,
+        feed_flow_rate=5000 * pyunits.m**3 / pyunits.day,
+    )
+    try:
+        mp.build()
+        # period models live in worker processes
+        assert mp.models == []
+        results = mp.solve(max_iterations=30, tolerance=1e-3)
+        assert results["converged"]
+        assert results["failed_periods"] == []
+        assert np.all(np.isfinite(results["period_LCOW"]))
+        assert results["LCOW"] == pytest.approx(np.mean(results["period_LCOW"]))
+    finally:
+        mp.terminate_workers()
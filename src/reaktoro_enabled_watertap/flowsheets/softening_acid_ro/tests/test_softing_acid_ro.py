@@ -286,3 +286,127 @@ def test_softening_acid_ro_amusat_costing(water):
         )
         == solution_results[water]["hcl_dose"]
     )
+
+
+@pytest.mark.flowsheets
+@pytest.mark.component
+def test_select_reagents():
+    selected = sar.select_reagents(
+        "USDA_brackish.yaml",
+        water_recovery=0.7,
+        softening_reagents=["Na2CO3", "CaO"],
+        acidification_reagents=["HCl", "H2SO4"],
+        reagent_sparsity_penalty=1e-3,
+        multi_process_reaktoro=False,
+    )
+    assert set(selected["softening_reagents"]) <= {"Na2CO3", "CaO"}
+    assert set(selected["acidification_reagents"]) <= {"HCl", "H2SO4"}
+    assert selected["LCOW"] > 0
+
+
+@pytest.mark.flowsheets
+@pytest.mark.component
+def test_replay_plant_data(tmp_path):
+    data_file = tmp_path / "plant_data.csv"
+    data_file.write_text(
+        "timestamp,pH,feed_flow_rate,Ca_2+,Mg_2+\n"
+        "0,7.07,5000,258,90\n"
+        "1,7.07,5000,258.2,90\n"
+        "2,7.1,5000,280,95\n"
+        "3,7.1,5500,280,95\n"
+    )
+    m = sar.build_model(
+        "USDA_brackish.yaml",
+        multi_process_reaktoro=False,
+        hpro=False,
+        feed_flow_rate=5000 * pyunits.m**3 / pyunits.day,
+    )
+    sar.initialize(m)
+    replay, results = sar.replay_plant_data(m, str(data_file), chunk_size=2)
+    assert len(results) == 4
+    assert all(result["converged"] for result in results if not result["cached"])
+    # second record repeats first composition within cache tolerance
+    assert results[1]["cached"]
+    assert results[1]["LCOW"] == results[0]["LCOW"]
+    # fourth record reuses reconciled feed of third record at different flow
+    assert replay.stats["reconciliations"] == 2
+    assert results[2]["LCOW"] > 0
+    assert results[2]["CaO dose"] is not None
+
+
+@pytest.mark.flowsheets
+@pytest.mark.component
+def test_model_fingerprint():
+    m = sar.build_model("USDA_brackish.yaml", multi_process_reaktoro=False)
+    m_flow = sar.build_model(
+        "USDA_brackish.yaml",
+        multi_process_reaktoro=False,
+        feed_flow_rate=4000 * pyunits.m**3 / pyunits.day,
+    )
+    # feed flow does not change structure, while adding hpro does
+    assert sar.get_model_fingerprint(m) == sar.get_model_fingerprint(m_flow)
+    m_hpro = sar.build_model(
+        "USDA_brackish.yaml", multi_process_reaktoro=False, hpro=True
+    )
+    assert sar.get_model_fingerprint(m) != sar.get_model_fingerprint(m_hpro)
+    # hessian options are excluded from fingerprint used for tuning results
+    m_bfgs = sar.build_model(
+        "USDA_brackish.yaml", multi_process_reaktoro=False, rkt_hessian_type="BFGS"
+    )
+    assert sar.get_model_fingerprint(m) != sar.get_model_fingerprint(m_bfgs)
+    assert sar.get_model_fingerprint(
+        m, include_hessian_options=False
+    ) == sar.get_model_fingerprint(m_bfgs, include_hessian_options=False)
+    # tuning results are not shared between water cases
+    m_sw = sar.build_model("Seawater.yaml", multi_process_reaktoro=False)
+    assert sar.get_model_fingerprint(
+        m, include_hessian_options=False
+    ) != sar.get_model_fingerprint(m_sw, include_hessian_options=False)
+
+
+@pytest.mark.flowsheets
+@pytest.mark.component
+def test_bound_tightening():
+    results = {}
+    for bound_tightening in [False, True]:
+        m = sar.build_model(
+            "USDA_brackish.yaml",
+            multi_process_reaktoro=False,
+            bound_tightening=bound_tightening,
+        )
+        sar.initialize(m)
+        sar.set_optimization(m)
+        ro_area_bounds = m.fs.ro_unit.ro_unit.area.bounds
+        sar.solve_model(m)
+        # bounds are restored after solve
+        assert m.fs.ro_unit.ro_unit.area.bounds == ro_area_bounds
+        results[bound_tightening] = value(m.fs.costing.LCOW)
+    assert results[True] == pytest.approx(results[False], rel=1e-4)
+
+
+@pytest.mark.flowsheets
+@pytest.mark.component
+def test_audit_scaling():
+    m = sar.build_model("USDA_brackish.yaml", multi_process_reaktoro=False)
+    sar.initialize(m)
+    audit = sar.audit_scaling(m, n=5)
+    summary = audit.get_unit_summary()
+    for unit in m.flowsheet_unit_order:
+        assert unit.name in summary
+    assert any(row["scaling_source"] == "grey box" for row in audit.rows)
+    assert len(audit.get_worst_rows(5)) == 5
+
+
+@pytest.mark.flowsheets
+@pytest.mark.component
+def test_restart_reaktoro_workers():
+    m = sar.build_model("USDA_brackish.yaml", multi_process_reaktoro=True)
+    sar.initialize(m)
+    m.fs.water_recovery.fix(0.6)
+    sar.solve_model(m)
+    lcow = value(m.fs.costing.LCOW)
+    sar.restart_reaktoro_workers(m)
+    # new workers solve the same point
+    sar.solve_model(m)
+    m.reaktoro_manager.terminate_workers()
+    assert value(m.fs.costing.LCOW) == pytest.approx(lcow, rel=1e-5)
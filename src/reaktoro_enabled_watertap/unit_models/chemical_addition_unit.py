@@ -17,6 +17,13 @@ from reaktoro_enabled_watertap.utils.reaktoro_utils import (
     ViableReagents,
     ReaktoroOptionsContainer,
 )
+from reaktoro_enabled_watertap.utils.titration_curve import (
+    get_spline_coefficients,
+    build_spline_expression,
+)
+from reaktoro_enabled_watertap.utils.initial_guess_table import (
+    get_composition_features,
+)
 from idaes.core.util.model_statistics import degrees_of_freedom
 
 from pyomo.environ import (
@@ -25,8 +32,10 @@ from pyomo.environ import (
     value,
     Param,
     Reals,
+    Expression,
     units as pyunits,
 )
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
 from pyomo.common.config import ConfigValue
 from idaes.core import (
     declare_process_block_class,
@@ -34,17 +43,22 @@ from idaes.core import (
 from idaes.core import UnitModelCostingBlock
 
 import idaes.core.util.scaling as iscale
+import idaes.logger as idaeslog
 
 from watertap.unit_models.stoichiometric_reactor import (
     StoichiometricReactor,
 )
 
 from reaktoro_enabled_watertap.utils import scale_utils as scu
+from reaktoro_enabled_watertap.utils.diagnostics import diagnostics_enabled
 from reaktoro_pse.reaktoro_block import ReaktoroBlock
 from collections import OrderedDict
+import numpy as np
 
 __author__ = "Alexander V. Dudchenko"
 
+_log = idaeslog.getLogger(__name__)
+
 
 @declare_process_block_class("ChemicalAdditionUnit")
 class ChemicalAdditionUnitData(WaterTapFlowsheetBlockData):
@@ -55,7 +69,8 @@ class ChemicalAdditionUnitData(WaterTapFlowsheetBlockData):
             default=["HCl"],
             description="List of reagents to add to reactor",
             doc="""
-            This selects reagents from ViableReagents class and adds them to reactor. 
+            This selects reagents from ViableReagents class and adds them to reactor, 
+            "all" adds all acids in ViableReagents class (see ViableReagentsBase.get_acids). 
             Default available reagents are CaO, and Na2CO3. 
             To add additional reagents, pass initialized ViableReagent
             object with registered new reagents into viable_reagents config option.
@@ -63,6 +78,31 @@ class ChemicalAdditionUnitData(WaterTapFlowsheetBlockData):
         ),
     )
 
+    CONFIG.declare(
+        "superstructure",
+        ConfigValue(
+            default=False,
+            description="Use selected reagents as candidates for reagent selection",
+            doc="""
+            If True, dose lower bounds of selected reagents are relaxed to zero, so selected reagents
+            act as a superstructure and the cost optimal subset of reagents is found in a single
+            optimization. Set selected_reagents to "all" to use all acids in viable_reagents.
+            """,
+        ),
+    )
+    CONFIG.declare(
+        "reagent_sparsity_penalty",
+        ConfigValue(
+            default=None,
+            description="Penalty per used reagent in superstructure mode",
+            doc="""
+            Penalty (in costing package base currency per m3 of product, same as LCOW) applied for each
+            reagent in use, can be a single value or dict with value per reagent. Builds
+            reagent_sparsity_penalty expression on the reactor that should be added to the objective
+            (see ViableReagentsBase.create_sparsity_penalty).
+            """,
+        ),
+    )
     CONFIG.declare(
         "viable_reagents",
         ConfigValue(
@@ -114,25 +154,60 @@ class ChemicalAdditionUnitData(WaterTapFlowsheetBlockData):
         ),
     )
 
+    CONFIG.declare(
+        "titration_curve",
+        ConfigValue(
+            default=False,
+            description="Use titration curve in place of reaktoro block during solve",
+            doc="""
+            If True, a titration curve (pH, alkalinity, and pE vs. acid equivalents added per mol of water)
+            is generated with Reaktoro for the inlet composition during initialization and represented
+            as a monotone spline, which replaces the reaktoro block in the solve. Curve should be
+            regenerated with update_titration_curve when inlet composition changes. Reaktoro block
+            is not registered with reaktoro_block_manager, as it is only evaluated during curve generation.
+            Selected reagents must add non zero net acid equivalents at maximum dose, if curve can not
+            be generated at inlet composition, reaktoro block is used in the solve instead.
+            """,
+        ),
+    )
+    CONFIG.declare(
+        "titration_curve_options",
+        ConfigValue(
+            default=None,
+            description="Options for titration curve generation",
+            doc="""
+            Dict with num_points (number of points on curve, default 41) and drift_tolerance
+            (change in log10 of solute to water ratios or pH above which curve is regenerated, default 0.02)
+            """,
+        ),
+    )
+
     def build(self):
         super().build()
         if self.config.viable_reagents is None:
             self.config.viable_reagents = ViableReagents()
+        if self.config.selected_reagents == "all":
+            self.config.selected_reagents = self.config.viable_reagents.get_acids(
+                self.config.default_property_package
+            )
         self.selected_reagents = {
             key: self.config.viable_reagents[key]
             for key in self.config.selected_reagents
         }
+        if self.config.titration_curve:
+            self.check_titration_reagents()
 
         self.chemical_reactor = StoichiometricReactor(
             property_package=self.config.default_property_package,
             reagent=self.selected_reagents,
         )
-        self.chemical_reactor.dissolution_reactor.properties_in[0].conc_mass_phase_comp[
-            ...
-        ]
-        self.chemical_reactor.dissolution_reactor.properties_out[
-            0
-        ].conc_mass_phase_comp[...]
+        if self.config.build_reporting_properties:
+            self.chemical_reactor.dissolution_reactor.properties_in[
+                0
+            ].conc_mass_phase_comp[...]
+            self.chemical_reactor.dissolution_reactor.properties_out[
+                0
+            ].conc_mass_phase_comp[...]
         self.chemical_reactor.pH = Var(
             ["inlet", "outlet"],
             initialize=7,
@@ -169,6 +244,18 @@ class ChemicalAdditionUnitData(WaterTapFlowsheetBlockData):
                     self.chemical_reactor.flow_mass_reagent[reagent],
                     f"{self.name}_reagent_{reagent}".replace(".", "_"),
                 )
+        if self.config.reagent_sparsity_penalty is not None:
+            penalty_units = pyunits.dimensionless
+            if self.config.default_costing_package is not None:
+                penalty_units = (
+                    self.config.default_costing_package.base_currency / pyunits.m**3
+                )
+            self.config.viable_reagents.create_sparsity_penalty(
+                self.chemical_reactor,
+                self.chemical_reactor.reagent_dose,
+                self.config.reagent_sparsity_penalty,
+                penalty_units,
+            )
         if self.config.add_reaktoro_chemistry:
             self.add_reaktoro_chemistry()
         else:
@@ -251,7 +338,194 @@ class ChemicalAdditionUnitData(WaterTapFlowsheetBlockData):
         self.reaktoro_options["chemistry_modifier"] = reagents
         self.reaktoro_options["outputs"] = outputs
         self.reaktoro_options.update_with_user_options(self.config.reaktoro_options)
+        if self.config.titration_curve:
+            # block is only evaluated during curve generation, and aggregated grey box
+            # of reaktoro_block_manager can not exclude individual blocks from solve
+            self.reaktoro_options["reaktoro_block_manager"] = None
         self.chemistry_block = ReaktoroBlock(**self.reaktoro_options)
+        self.register_initial_guess_inputs(
+            self.chemical_reactor.dissolution_reactor.properties_in[
+                0
+            ].flow_mol_phase_comp,
+            self.chemical_reactor.pH["inlet"],
+        )
+        self.register_initial_guess_components(self.chemistry_block, *outputs.values())
+        if self.config.titration_curve:
+            self.add_titration_curve(outputs)
+
+    def check_titration_reagents(self):
+        """titration curve is parameterized by acid equivalents added as all selected
+        reagents are dosed from zero to their maximum dose, so selected reagents must
+        add non zero net acid equivalents for curve knots to be strictly increasing"""
+        acid_equivalents = self.config.viable_reagents.get_acid_equivalents(
+            self.config.default_property_package
+        )
+        reagents = self.config.viable_reagents.compile().select(self.selected_reagents)
+        equivalents = np.array([acid_equivalents[name] for name in reagents.names])
+        # mols of acid equivalents per m3 of water at maximum dose
+        added = equivalents * reagents["max_dose"] / 1000 / reagents.mw
+        if abs(np.sum(added)) <= 1e-8 * max(np.sum(np.abs(added)), 1):
+            raise ValueError(
+                f"{self.name} titration_curve requires selected reagents to add non zero "
+                f"net acid equivalents, {reagents.names} add {np.sum(added)} mol/m3 "
+                "at maximum dose, use reaktoro block (titration_curve=False) instead"
+            )
+
+    def add_titration_curve(self, outputs):
+        """adds spline constraints that calculate chemistry outputs from acid
+        equivalents added per mol of water, constraints are activated (and reaktoro block
+        deactivated) once curve is generated during initialization"""
+        self.titration_options = {"num_points": 41, "drift_tolerance": 0.02}
+        if self.config.titration_curve_options is not None:
+            self.titration_options.update(self.config.titration_curve_options)
+        num_points = self.titration_options["num_points"]
+        self.acid_equivalents = self.config.viable_reagents.get_acid_equivalents(
+            self.config.default_property_package
+        )
+        properties_in = self.chemical_reactor.dissolution_reactor.properties_in[0]
+        self.chemical_reactor.titration_acid_equivalents = Expression(
+            expr=sum(
+                self.acid_equivalents[reagent]
+                * self.chemical_reactor.flow_mol_reagent[reagent]
+                for reagent in self.selected_reagents
+            )
+            / properties_in.flow_mol_phase_comp["Liq", "H2O"]
+        )
+        self.chemical_reactor.titration_knots = Param(
+            range(num_points), initialize=0, mutable=True
+        )
+        self.titration_outputs = {}
+        for (output, _), var in outputs.items():
+            coefficients = Param(
+                range(num_points - 1), range(4), initialize=0, mutable=True
+            )
+            self.chemical_reactor.add_component(
+                f"titration_{output}_coefficients", coefficients
+            )
+            self.titration_outputs[output] = (var, coefficients)
+
+        @self.chemical_reactor.Constraint(list(self.titration_outputs))
+        def eq_titration_curve(blk, output):
+            var, coefficients = self.titration_outputs[output]
+            return var == build_spline_expression(
+                blk.titration_acid_equivalents,
+                blk.titration_knots,
+                coefficients,
+            ) * pyunits.get_units(var)
+
+        self.chemical_reactor.eq_titration_curve.deactivate()
+        self._titration_features = None
+
+    def _get_titration_features(self):
+        properties_in = self.chemical_reactor.dissolution_reactor.properties_in[0]
+        features = get_composition_features(
+            properties_in.flow_mol_phase_comp, self.chemical_reactor.pH["inlet"]
+        )
+        # curve is per mol of water, so it does not depend on water flow
+        del features["H2O"]
+        return features
+
+    def generate_titration_curve(self):
+        """generates titration curve for current inlet composition by adding
+        reagents from zero to their maximum dose and evaluating reaktoro block,
+        points are added where pH changes the most (e.g. near equivalence point)"""
+        reactor = self.chemical_reactor
+        num_points = self.titration_options["num_points"]
+        reagents = self.config.viable_reagents.compile().select(self.selected_reagents)
+        properties_in = reactor.dissolution_reactor.properties_in[0]
+        # m3/s assuming water density of 1000 kg/m3, doses are in ppm (g/m3)
+        flow_vol_water = (
+            value(
+                pyunits.convert(
+                    properties_in.flow_mol_phase_comp["Liq", "H2O"]
+                    * self.config.default_property_package.mw_comp["H2O"],
+                    pyunits.kg / pyunits.s,
+                )
+            )
+            / 1000
+        )
+        max_flows = dict(
+            zip(
+                reagents.names,
+                reagents["max_dose"] / 1000 * flow_vol_water / reagents.mw,
+            )
+        )
+        stored_values = [(var, var.value) for var in reactor.flow_mol_reagent.values()]
+        solvent_flows = reactor.find_component("flow_mol_solvent")
+        if solvent_flows is not None:
+            stored_values += [(var, var.value) for var in solvent_flows.values()]
+
+        def evaluate(point):
+            for reagent in self.selected_reagents:
+                reactor.flow_mol_reagent[reagent].set_value(point * max_flows[reagent])
+            if solvent_flows is not None:
+                for solvent in solvent_flows:
+                    calculate_variable_from_constraint(
+                        solvent_flows[solvent], reactor.eq_flow_mol_solvent[solvent]
+                    )
+            self.chemistry_block.initialize()
+            return value(reactor.titration_acid_equivalents), {
+                output: value(var)
+                for output, (var, _) in self.titration_outputs.items()
+            }
+
+        # reaktoro block is evaluated directly by initialize, so it does not need to be
+        # active, and its outputs are not fixed while curve is active
+        curve = {point: evaluate(point) for point in np.linspace(0, 1, 9)}
+        while len(curve) < num_points:
+            points = sorted(curve)
+            ph_change = [
+                abs(curve[b][1]["pH"] - curve[a][1]["pH"])
+                for a, b in zip(points[:-1], points[1:])
+            ]
+            i = int(np.argmax(ph_change))
+            point = (points[i] + points[i + 1]) / 2
+            curve[point] = evaluate(point)
+        for var, val in stored_values:
+            var.set_value(val)
+
+        curve = sorted(curve.values(), key=lambda data: data[0])
+        knots = [data[0] for data in curve]
+        if np.any(np.diff(knots) <= 0):
+            # e.g. reagents neutralizing each other at inlet composition
+            _log.warning(
+                f"{self.name} titration curve acid equivalents are not strictly "
+                "increasing, using reaktoro block instead of titration curve"
+            )
+            reactor.eq_titration_curve.deactivate()
+            if not self.chemistry_block.active:
+                self.chemistry_block.activate(unfix_outputs=False)
+            self._titration_features = None
+            return
+        for i, knot in enumerate(knots):
+            reactor.titration_knots[i] = knot
+        for output, (var, coefficients) in self.titration_outputs.items():
+            spline = get_spline_coefficients(knots, [data[1][output] for data in curve])
+            for (i, k), coefficient in np.ndenumerate(spline):
+                coefficients[i, k] = coefficient
+            calculate_variable_from_constraint(var, reactor.eq_titration_curve[output])
+        if self.chemistry_block.active:
+            self.chemistry_block.deactivate(fix_outputs=False)
+        reactor.eq_titration_curve.activate()
+        self._titration_features = self._get_titration_features()
+
+    def update_titration_curve(self):
+        """regenerates titration curve if inlet composition or pH drifted beyond
+        drift_tolerance from composition curve was generated at, returns True if curve
+        was regenerated"""
+        if not self.config.titration_curve or self._titration_features is None:
+            return False
+        features = self._get_titration_features()
+        drift = max(
+            abs(features[key] - self._titration_features[key]) for key in features
+        )
+        if drift > self.titration_options["drift_tolerance"]:
+            _log.info(
+                f"{self.name} inlet drifted by {drift:.3f}, regenerating titration curve"
+            )
+            self.generate_titration_curve()
+            return True
+        return False
 
     def set_fixed_operation(self):
         """fixes operation point for chemical addition unit model"""
@@ -259,14 +533,27 @@ class ChemicalAdditionUnitData(WaterTapFlowsheetBlockData):
         for reagent, _ in self.selected_reagents.items():
             self.chemical_reactor.reagent_dose[reagent].fix(initial_dose)
         for reagent, options in self.selected_reagents.items():
-            self.chemical_reactor.reagent_dose[reagent].setlb(
-                options["min_dose"] / 1000
-            )
+            if self.config.superstructure:
+                # optimizer can remove reagent from superstructure
+                self.chemical_reactor.reagent_dose[reagent].setlb(0)
+            else:
+                self.chemical_reactor.reagent_dose[reagent].setlb(
+                    options["min_dose"] / 1000
+                )
             self.chemical_reactor.reagent_dose[reagent].setub(
                 options["max_dose"] / 1000
             )
             self.chemical_reactor.flow_mol_reagent[reagent].setlb(0)
 
+    def get_selected_reagents(self, threshold=1e-3):
+        """returns reagents with dose above threshold (kg/m3), used to identify
+        reagents selected by optimization in superstructure mode"""
+        return [
+            reagent
+            for reagent in self.selected_reagents
+            if value(self.chemical_reactor.reagent_dose[reagent]) >= threshold
+        ]
+
     def set_optimization_operation(self):
         """if we have reaktoro chemistry, we need to unfix reagent addition"""
         if self.config.add_reaktoro_chemistry:
@@ -275,21 +562,15 @@ class ChemicalAdditionUnitData(WaterTapFlowsheetBlockData):
 
     def scale_before_initialization(self, **kwargs):
         dose_scale = 1 / 0.001  # step size of ppm (or 0.001 kg/m3)
-
-        for reagent, options in self.selected_reagents.items():
-            # use mol flow, as thats what will be propagated by default via mcas
-            mass_flow_scale = dose_scale / (
-                self.config.default_property_package._default_scaling_factors[
-                    "flow_mol_phase_comp", ("Liq", "H2O")
-                ]
-                / value(self.config.default_property_package.mw_comp["H2O"])
-            )
-            mol_scale = mass_flow_scale * value(
-                pyunits.convert(
-                    self.config.viable_reagents[reagent]["mw"],
-                    pyunits.kg / pyunits.mol,
-                )
-            )
+        reagents = self.config.viable_reagents.compile().select(self.selected_reagents)
+        # use mol flow, as thats what will be propagated by default via mcas
+        mass_flow_scale = dose_scale / (
+            self.config.default_property_package._default_scaling_factors[
+                "flow_mol_phase_comp", ("Liq", "H2O")
+            ]
+            / value(self.config.default_property_package.mw_comp["H2O"])
+        )
+        for reagent, mol_scale in zip(reagents.names, mass_flow_scale * reagents.mw):
             iscale.set_scaling_factor(
                 self.chemical_reactor.flow_mol_reagent[reagent],
                 mol_scale,
@@ -340,22 +621,34 @@ class ChemicalAdditionUnitData(WaterTapFlowsheetBlockData):
             )
             if self.config.add_alkalinity:
                 iscale.set_scaling_factor(self.chemical_reactor.alkalinity, 1)
+            if self.config.titration_curve:
+                for output in self.chemical_reactor.eq_titration_curve:
+                    iscale.constraint_scaling_transform(
+                        self.chemical_reactor.eq_titration_curve[output], 1
+                    )
 
     def initialize_unit(self, **kwargs):
         self.chemical_reactor.initialize()
         if self.config.add_reaktoro_chemistry:
+            self.seed_initial_guess()
             self.chemistry_block.initialize()
-            self.chemistry_block.display_jacobian_scaling()
+            if diagnostics_enabled():
+                self.chemistry_block.display_jacobian_scaling()
             # recalcualte state with updated mol flow values
             self.chemical_reactor.initialize()
+            if self.config.titration_curve:
+                self.generate_titration_curve()
 
     def get_model_state_dict(self):
         def get_ion_comp(stream, pH, pE=None):
             data_dict = OrderedDict()
-            data_dict["Mass flow of H2O"] = stream.flow_mass_phase_comp["Liq", "H2O"]
-            for phase, ion in stream.conc_mass_phase_comp:
+            report_state = self.get_reporting_state(stream)
+            data_dict["Mass flow of H2O"] = report_state.flow_mass_phase_comp[
+                "Liq", "H2O"
+            ]
+            for phase, ion in report_state.conc_mass_phase_comp:
                 if ion != "H2O":
-                    data_dict[ion] = stream.conc_mass_phase_comp[phase, ion]
+                    data_dict[ion] = report_state.conc_mass_phase_comp[phase, ion]
             data_dict["pH"] = pH
             if pE is not None:
                 data_dict["pE"] = pE
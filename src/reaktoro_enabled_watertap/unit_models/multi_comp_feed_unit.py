@@ -40,10 +40,12 @@ from pyomo.environ import (
     assert_optimal_termination,
 )
 from idaes.core.util.model_statistics import degrees_of_freedom
+from reaktoro_enabled_watertap.utils.dof_tracker import get_degrees_of_freedom
 from watertap.core.util.initialization import interval_initializer
 import idaes.core.util.scaling as iscale
 from reaktoro_pse.reaktoro_block import ReaktoroBlock
 import idaes.logger as idaeslog
+from reaktoro_enabled_watertap.utils.diagnostics import get_tee
 from reaktoro_enabled_watertap.utils.reaktoro_utils import (
     ReaktoroOptionsContainer,
 )
@@ -246,9 +248,9 @@ class MultiCompFeedData(WaterTapFlowsheetBlockData):
         result = solver.solve(block, tee=False)
         assert_optimal_termination(result)
         # self.feed.display()
-        assert degrees_of_freedom(block) == 0
+        assert get_degrees_of_freedom(block) == 0
 
-    def reaktoro_reconciliation(self):
+    def reaktoro_reconciliation(self, tee=False):
         sub_model = ConcreteModel()
         sub_model.fs = FlowsheetBlock()
 
@@ -344,7 +346,7 @@ class MultiCompFeedData(WaterTapFlowsheetBlockData):
         assert degrees_of_freedom(sub_model.fs.feed) == 0
         solver = get_cyipopt_watertap_solver()
         _log.info("Reconciling feed with reaktoro")
-        result = solver.solve(sub_model.fs.feed, tee=True)
+        result = solver.solve(sub_model.fs.feed, tee=tee)
         if self.config.pE is not None and self.config.pE is True:
             sub_model.fs.feed.pE.fix()
         assert_optimal_termination(result)
@@ -390,9 +392,9 @@ class MultiCompFeedData(WaterTapFlowsheetBlockData):
                 )
         self.feed.alkalinity_as_CaCO3.fix()
         solver.solve(self.feed, tee=False)
-        _log.info(f"Report complete: DOFs {degrees_of_freedom(self)}")
+        _log.info(f"Report complete: DOFs {get_degrees_of_freedom(self)}")
         assert_optimal_termination(result)
-        assert degrees_of_freedom(self) == 0
+        assert get_degrees_of_freedom(self) == 0
 
     def scale_before_initialization(self, **kwargs):
         iscale.set_scaling_factor(self.feed.pH, 1)
@@ -408,17 +410,79 @@ class MultiCompFeedData(WaterTapFlowsheetBlockData):
             )
             _log.info(f"Applied scaling factor to {idx} of {scale}")
 
-    def initialize_unit(self, solver=None, tee=True):
+    def initialize_unit(self, solver=None, tee=None):
+        tee = get_tee(tee)
         if solver is None:
             solver = get_solver()
         result = solver.solve(self.feed, tee=tee)
         assert_optimal_termination(result)
         if self.config.reconcile_using_reaktoro:
-            self.reaktoro_reconciliation()
+            self.reaktoro_reconciliation(tee=tee)
             if self.feed.find_component("total_mass_flow") != None:
                 self.feed.total_mass_flow.deactivate()
                 self.feed.properties[0].flow_mass_phase_comp["Liq", "H2O"].fix()
-        assert degrees_of_freedom(self) == 0
+        assert get_degrees_of_freedom(self) == 0
+
+    def update_feed(
+        self,
+        ion_concentrations=None,
+        pH=None,
+        temperature=None,
+        volumetric_flowrate=None,
+        alkalinity_as_CaCO3=None,
+        tee=False,
+    ):
+        """Updates feed specifications (e.g. from plant data record) and re-fixes
+        and reconciles feed, ion concentrations are updated per ion, and
+        specifications that are None are kept (feed must be specified with volumetric
+        flowrate)"""
+        if self.feed.find_component("total_mass_flow") is not None:
+            raise ValueError(
+                "Feed updates require feed specified with volumetric_flowrate"
+            )
+        if ion_concentrations is not None:
+            self.config.ion_concentrations = {
+                **self.config.ion_concentrations,
+                **ion_concentrations,
+            }
+        if pH is not None:
+            self.config.pH = pH
+        if temperature is not None:
+            self.config.temperature = temperature
+        if volumetric_flowrate is not None:
+            self.config.volumetric_flowrate = volumetric_flowrate
+        if alkalinity_as_CaCO3 is not None:
+            self.config.alkalinity_as_CaCO3 = alkalinity_as_CaCO3
+            self.feed.alkalinity_as_CaCO3.fix(alkalinity_as_CaCO3)
+        self.set_fixed_operation()
+        self.initialize_unit(tee=tee)
+
+    def get_feed_state_vars(self):
+        """returns dict of variables that are fixed to specify (reconciled) feed"""
+        state_vars = {}
+        for phase, ion in self.feed.properties[0].conc_mass_phase_comp:
+            if ion != "H2O":
+                state_vars[ion] = self.feed.properties[0].conc_mass_phase_comp[
+                    phase, ion
+                ]
+        state_vars["flow_vol"] = self.feed.properties[0].flow_vol_phase["Liq"]
+        state_vars["temperature"] = self.feed.properties[0].temperature
+        state_vars["pH"] = self.feed.pH
+        state_vars["alkalinity_as_CaCO3"] = self.feed.alkalinity_as_CaCO3
+        if self.feed.find_component("pE") is not None:
+            state_vars["pE"] = self.feed.pE
+        return state_vars
+
+    def get_feed_state(self):
+        """returns values of feed state variables, which can be used to set reconciled
+        feed again with out reconciliation"""
+        return {key: var.value for key, var in self.get_feed_state_vars().items()}
+
+    def set_feed_state(self, state):
+        """fixes feed state variables to values from get_feed_state"""
+        state_vars = self.get_feed_state_vars()
+        for key, val in state.items():
+            state_vars[key].fix(val)
 
     def get_model_state_dict(self):
         model_state = {
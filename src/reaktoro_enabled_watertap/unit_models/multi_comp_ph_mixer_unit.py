@@ -31,9 +31,12 @@ from idaes.core import (
 import idaes.core.util.scaling as iscale
 from reaktoro_pse.reaktoro_block import ReaktoroBlock
 from collections import OrderedDict
+import idaes.logger as idaeslog
 
 __author__ = "Alexander V. Dudchenko"
 
+_log = idaeslog.getLogger(__name__)
+
 
 @declare_process_block_class("MixerPhUnit")
 class MixerPhUnitData(WaterTapFlowsheetBlockData):
@@ -104,6 +107,23 @@ class MixerPhUnitData(WaterTapFlowsheetBlockData):
             """,
         ),
     )
+    CONFIG.declare(
+        "parallel_inlet_speciation",
+        ConfigValue(
+            default=False,
+            description="Evaluate secondary inlet speciation in independent reaktoro blocks",
+            doc="""
+            If True, speciation of each secondary inlet is built as an independent reaktoro block
+            whose species amounts are added to the mixer reaktoro block as chemistry modifiers
+            (each species is broken down into its elements), instead of being evaluated
+            sequentially inside the mixer block. Inlet blocks enforce charge neutrality, so
+            adding their elements without species charges preserves mixer charge balance. When a
+            reaktoro_block_manager is provided in reaktoro_options, inlet blocks are evaluated
+            concurrently by its workers, so mixer evaluation cost is set by the slowest inlet
+            rather than sum over all inlets.
+            """,
+        ),
+    )
     CONFIG.declare(
         "track_pE",
         ConfigValue(
@@ -195,7 +215,8 @@ class MixerPhUnitData(WaterTapFlowsheetBlockData):
                 )
         for port in self.config.inlet_ports:
             self.mixer.find_component(f"{port}_state")[0].flow_mass_phase_comp[...]
-            self.mixer.find_component(f"{port}_state")[0].conc_mass_phase_comp[...]
+            if self.config.build_reporting_properties:
+                self.mixer.find_component(f"{port}_state")[0].conc_mass_phase_comp[...]
             inlet_var = {"pH": self.mixer.pH[port]}
             if self.config.track_pE:
                 inlet_var["pE"] = self.mixer.pE[port]
@@ -213,7 +234,8 @@ class MixerPhUnitData(WaterTapFlowsheetBlockData):
             outlet_var,
         )
         self.mixer.find_component(f"mixed_state")[0].flow_mass_phase_comp[...]
-        self.mixer.find_component(f"mixed_state")[0].conc_mass_phase_comp[...]
+        if self.config.build_reporting_properties:
+            self.mixer.find_component(f"mixed_state")[0].conc_mass_phase_comp[...]
         # volumetric temp mixing - since we are assuming we are isothermal
         # TODO: Add option to catch if we are isothermal or not
         if self.config.isothermal_mixing:
@@ -242,37 +264,72 @@ class MixerPhUnitData(WaterTapFlowsheetBlockData):
             )
         self.mixer_initialized = False
 
+    def _get_inlet_speciation_options(self, port):
+        mixer_inlet = self.mixer.find_component(f"{port}_state")[0]
+        reaktoro_options = ReaktoroOptionsContainer()
+        reaktoro_options.system_state_option(
+            "temperature",
+            mixer_inlet.temperature,
+        )
+        reaktoro_options.system_state_option(
+            "pressure",
+            mixer_inlet.pressure,
+        )
+        reaktoro_options.system_state_option("pH", self.mixer.pH[port])
+        if self.config.track_pE:
+            reaktoro_options.system_state_option("pE", self.mixer.pE[port])
+        reaktoro_options.aqueous_phase_option(
+            "composition",
+            mixer_inlet.flow_mol_phase_comp,
+        )
+        reaktoro_options["outputs"] = {"speciesAmount": True}
+        return reaktoro_options
+
+    def _get_species_modifier(self, speciation_block, species):
+        """returns element breakdown of species in speciation block database, species
+        charge is not included, as it cancels out over charge neutral inlet"""
+        elements = speciation_block.rkt_state.database.species(species).elements()
+        return dict(zip(elements.symbols(), elements.coefficients()))
+
     def add_reaktoro_chemistry(self):
         # for tracking all true species in the inlet streams
         mixing_blocks = []
+        inlet_species_modifiers = {}
+        inlet_species_amounts = {}
         for port in self.config.inlet_ports[1:]:
-            mixer_inlet = self.mixer.find_component(f"{port}_state")[0]
-            reaktoro_options = ReaktoroOptionsContainer()
-            reaktoro_options.system_state_option(
-                "temperature",
-                mixer_inlet.temperature,
-            )
-            reaktoro_options.system_state_option(
-                "pressure",
-                mixer_inlet.pressure,
-            )
-            reaktoro_options.system_state_option("pH", self.mixer.pH[port])
-            if self.config.track_pE:
-                reaktoro_options.system_state_option("pE", self.mixer.pE[port])
-            reaktoro_options.aqueous_phase_option(
-                "composition",
-                mixer_inlet.flow_mol_phase_comp,
-            )
-            reaktoro_options["build_speciation_block"] = False
-
-            reaktoro_options["outputs"] = {"speciesAmount": True}
-            reaktoro_options["build_graybox_model"] = False
+            reaktoro_options = self._get_inlet_speciation_options(port)
+            if self.config.parallel_inlet_speciation:
+                # independent block, can be dispatched to its own worker by
+                # reaktoro_block_manager, its speciated species amounts are added to
+                # mixer block as chemistry modifiers
+                reaktoro_options["build_speciation_block"] = True
+            else:
+                reaktoro_options["build_speciation_block"] = False
+                reaktoro_options["build_graybox_model"] = False
             reaktoro_options.update_with_user_options(self.config.reaktoro_options)
+            if (
+                self.config.parallel_inlet_speciation
+                and not reaktoro_options["assert_charge_neutrality"]
+            ):
+                raise ValueError(
+                    f"{self.name} parallel_inlet_speciation requires charge neutral "
+                    "inlet speciation blocks, assert_charge_neutrality can not be "
+                    "disabled"
+                )
 
             self.add_component(
                 f"{port}_speciation_block", ReaktoroBlock(**reaktoro_options)
             )
-            mixing_blocks.append(self.find_component(f"{port}_speciation_block"))
+            speciation_block = self.find_component(f"{port}_speciation_block")
+            mixing_blocks.append(speciation_block)
+            if self.config.parallel_inlet_speciation:
+                for (prop, species), obj in speciation_block.outputs.items():
+                    elements = self._get_species_modifier(speciation_block, species)
+                    if len(elements) == 0:
+                        continue
+                    modifier = f"{port}_{species}"
+                    inlet_species_modifiers[modifier] = elements
+                    inlet_species_amounts[modifier] = obj
         feed_port = self.mixer.find_component(f"{self.config.inlet_ports[0]}_state")[0]
         reaktoro_options = ReaktoroOptionsContainer()
         reaktoro_options.system_state_option(
@@ -306,9 +363,22 @@ class MixerPhUnitData(WaterTapFlowsheetBlockData):
         reaktoro_options["outputs"] = {("pH", None): self.mixer.pH["outlet"]}
         if self.config.track_pE:
             reaktoro_options["outputs"][("pE", None)] = self.mixer.pE["outlet"]
-        reaktoro_options["external_speciation_reaktoro_blocks"] = mixing_blocks
+        if self.config.parallel_inlet_speciation:
+            reaktoro_options["register_new_chemistry_modifiers"] = (
+                inlet_species_modifiers
+            )
+            reaktoro_options["chemistry_modifier"] = inlet_species_amounts
+        else:
+            reaktoro_options["external_speciation_reaktoro_blocks"] = mixing_blocks
         reaktoro_options.update_with_user_options(self.config.reaktoro_options)
         self.mixer_speciation_block = ReaktoroBlock(**reaktoro_options)
+        self.register_initial_guess_inputs(
+            feed_port.flow_mol_phase_comp,
+            self.mixer.pH[self.config.inlet_ports[0]],
+        )
+        self.register_initial_guess_components(
+            self.mixer_speciation_block, *mixing_blocks, self.mixer.pH["outlet"]
+        )
 
     def scale_before_initialization(self, **kwargs):
         if self.config.isothermal_mixing:
@@ -346,14 +416,13 @@ class MixerPhUnitData(WaterTapFlowsheetBlockData):
                         obj.fix(ref_stream.flow_mol_phase_comp[idx].value * 1)
                         self.fixed_streams.append(obj)
                     inlet_var.pressure = ref_stream.pressure.value
-                    print("Propagated stream is ", ref_inlet)
+                    _log.debug("Propagated stream is %s", ref_inlet)
                     self.mixer.pH[inlet].value = self.mixer.pH[f"{ref_inlet}"].value
                     inlet_var.temperature.value = self.mixer.find_component(
                         f"{ref_inlet}_state"
                     )[0].temperature.value
-                    print(
-                        "Fixed temperature for inlet ",
-                        inlet_var.temperature.value,
+                    _log.debug(
+                        "Fixed temperature for inlet %s", inlet_var.temperature.value
                     )
             self.mixer.pH["outlet"].value = self.mixer.pH[f"{ref_inlet}"].value
             self.mixer.mixed_state[0].temperature.value = self.mixer.find_component(
@@ -371,15 +440,23 @@ class MixerPhUnitData(WaterTapFlowsheetBlockData):
             obj.unfix()
         self.fixed_streams = []
         if self.config.add_reaktoro_chemistry:
+            self.seed_initial_guess()
+            if self.config.parallel_inlet_speciation:
+                # inlet species amounts are inputs to mixer block
+                for port in self.config.inlet_ports[1:]:
+                    self.find_component(f"{port}_speciation_block").initialize()
             self.mixer_speciation_block.initialize()
 
     def get_model_state_dict(self):
         def get_ion_comp(stream, pH, pE=None):
             data_dict = OrderedDict()
-            data_dict["Mass flow of H2O"] = stream.flow_mass_phase_comp["Liq", "H2O"]
-            for phase, ion in stream.conc_mass_phase_comp:
+            report_state = self.get_reporting_state(stream)
+            data_dict["Mass flow of H2O"] = report_state.flow_mass_phase_comp[
+                "Liq", "H2O"
+            ]
+            for phase, ion in report_state.conc_mass_phase_comp:
                 if ion != "H2O":
-                    data_dict[ion] = stream.conc_mass_phase_comp[phase, ion]
+                    data_dict[ion] = report_state.conc_mass_phase_comp[phase, ion]
             data_dict["pH"] = pH
             if pE is not None:
                 data_dict["pE"] = pE
@@ -108,8 +108,10 @@ class SplitterPhUnitData(WaterTapFlowsheetBlockData):
                 bounds=(None, None),
             )
         for port in self.config.outlet_ports:
-            self.splitter.find_component(f"{port}_state")[0].flow_mass_phase_comp[...]
-            self.splitter.find_component(f"{port}_state")[0].conc_mass_phase_comp[...]
+            if self.config.build_reporting_properties:
+                port_state = self.splitter.find_component(f"{port}_state")[0]
+                port_state.flow_mass_phase_comp[...]
+                port_state.conc_mass_phase_comp[...]
             outlet_vars = {"pH": self.splitter.pH}
             if self.config.track_pE:
                 outlet_vars["pE"] = self.splitter.pE
@@ -126,8 +128,9 @@ class SplitterPhUnitData(WaterTapFlowsheetBlockData):
             self.splitter.inlet,
             inlet_vars,
         )
-        self.splitter.find_component(f"mixed_state")[0].flow_mass_phase_comp[...]
-        self.splitter.find_component(f"mixed_state")[0].conc_mass_phase_comp[...]
+        if self.config.build_reporting_properties:
+            self.splitter.mixed_state[0].flow_mass_phase_comp[...]
+            self.splitter.mixed_state[0].conc_mass_phase_comp[...]
 
     def scale_before_initialization(self, **kwargs):
         iscale.set_scaling_factor(self.splitter.pH, 1)
@@ -157,10 +160,13 @@ class SplitterPhUnitData(WaterTapFlowsheetBlockData):
     def get_model_state_dict(self):
         def get_ion_comp(stream, pH, pE=None):
             data_dict = OrderedDict()
-            data_dict["Mass flow of H2O"] = stream.flow_mass_phase_comp["Liq", "H2O"]
-            for phase, ion in stream.conc_mass_phase_comp:
+            report_state = self.get_reporting_state(stream)
+            data_dict["Mass flow of H2O"] = report_state.flow_mass_phase_comp[
+                "Liq", "H2O"
+            ]
+            for phase, ion in report_state.conc_mass_phase_comp:
                 if ion != "H2O":
-                    data_dict[ion] = stream.conc_mass_phase_comp[phase, ion]
+                    data_dict[ion] = report_state.conc_mass_phase_comp[phase, ion]
             data_dict["pH"] = pH
             if pE is not None:
                 data_dict["pE"] = pE
@@ -62,15 +62,16 @@ class MultiCompProductData(WaterTapFlowsheetBlockData):
             inlet_vars["pE"] = self.product.pE
 
         self.register_port("inlet", self.product.inlet, inlet_vars)
-        self.product.properties[0].conc_mass_phase_comp[...]
-        self.product.properties[0].flow_mass_phase_comp[...]
+        if self.config.build_reporting_properties:
+            self.product.properties[0].conc_mass_phase_comp[...]
+            self.product.properties[0].flow_mass_phase_comp[...]
 
     def scale_before_initialization(self, **kwargs):
         iscale.set_scaling_factor(self.product.pH, 1)
         if self.config.track_pE:
             iscale.set_scaling_factor(self.product.pE, 1)
 
-    def initialize_unit(self, solver=None, tee=True):
+    def initialize_unit(self, solver=None, tee=None):
         self.product.initialize()
 
     def get_model_state_dict(self):
@@ -78,14 +79,15 @@ class MultiCompProductData(WaterTapFlowsheetBlockData):
             "Composition": {},
             "Physical state": {},
         }
-        model_state["Composition"]["Mass flow of H2O"] = self.product.properties[
-            0
-        ].flow_mass_phase_comp["Liq", "H2O"]
-        for phase, ion in self.product.properties[0].conc_mass_phase_comp:
+        report_state = self.get_reporting_state(self.product.properties[0])
+        model_state["Composition"]["Mass flow of H2O"] = (
+            report_state.flow_mass_phase_comp["Liq", "H2O"]
+        )
+        for phase, ion in report_state.conc_mass_phase_comp:
             if ion != "H2O":
-                model_state["Composition"][ion] = self.product.properties[
-                    0
-                ].conc_mass_phase_comp[phase, ion]
+                model_state["Composition"][ion] = report_state.conc_mass_phase_comp[
+                    phase, ion
+                ]
         model_state["Composition"]["pH"] = self.product.pH
         model_state["Physical state"]["Temperature"] = self.product.properties[
             0
@@ -14,6 +14,7 @@ from reaktoro_enabled_watertap.utils.watertap_flowsheet_block import (
     WaterTapFlowsheetBlockData,
 )
 from idaes.core.util.model_statistics import degrees_of_freedom
+from reaktoro_enabled_watertap.utils.dof_tracker import get_degrees_of_freedom
 from pyomo.environ import (
     Var,
     value,
@@ -162,7 +163,7 @@ class MultiCompPumpUnitData(WaterTapFlowsheetBlockData):
         self.pump.outlet.pressure[0].setub(self.config.maximum_pressure)
         self.pump.efficiency_pump[0].fix(self.config.pump_efficiency)
         self.inlet.fix()
-        assert degrees_of_freedom(self) == 0
+        assert get_degrees_of_freedom(self) == 0
         self.inlet.unfix()
 
     def set_optimization_operation(self):
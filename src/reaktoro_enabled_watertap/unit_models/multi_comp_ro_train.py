@@ -0,0 +1,420 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+from reaktoro_enabled_watertap.utils.watertap_flowsheet_block import (
+    WaterTapFlowsheetBlockData,
+)
+from reaktoro_enabled_watertap.unit_models.multi_comp_ro_unit import (
+    MultiCompROUnit,
+)
+from reaktoro_enabled_watertap.unit_models.multi_comp_pump_unit import (
+    MultiCompPumpUnit,
+)
+from reaktoro_enabled_watertap.unit_models.multi_comp_erd_unit import (
+    MultiCompERDUnit,
+)
+from reaktoro_enabled_watertap.unit_models.multi_comp_ph_mixer_unit import (
+    MixerPhUnit,
+)
+from reaktoro_enabled_watertap.unit_models.chemical_addition_unit import (
+    ChemicalAdditionUnit,
+)
+from reaktoro_pse.core.util_classes.cyipopt_solver import (
+    get_cyipopt_watertap_solver,
+)
+from idaes.core.util.model_statistics import degrees_of_freedom
+from reaktoro_enabled_watertap.utils.dof_tracker import get_degrees_of_freedom
+from pyomo.environ import (
+    value,
+    assert_optimal_termination,
+    units as pyunits,
+)
+from pyomo.common.config import ConfigValue
+from idaes.core import (
+    declare_process_block_class,
+)
+import idaes.logger as idaeslog
+
+__author__ = "Alexander V. Dudchenko"
+
+_log = idaeslog.getLogger(__name__)
+
+
+def _get_stage_options(options, stage):
+    """returns options for a stage from None, a dict applied to all stages, or
+    a list with a dict per stage"""
+    if options is None:
+        return {}
+    if isinstance(options, dict):
+        return dict(options)
+    return dict(options[stage - 1] or {})
+
+
+@declare_process_block_class("ROTrain")
+class ROTrainData(WaterTapFlowsheetBlockData):
+    """Multi-stage RO train, where retentate of each stage feeds next stage
+    (with optional booster pump and pH adjustment before it), permeate of all stages is
+    mixed into product, and retentate of last stage passes through ERD.
+
+    Stages are initialized one at a time from inlet guesses estimated using target
+    recovery of each stage, and then solved together. Guesses decouple stages, so
+    initialization errors of one stage do not propagate to the next, but stages are not
+    initialized in parallel, as initialized state of reaktoro blocks (scaling and
+    warm start) is held by python objects of the process that initialized them. To
+    evaluate reaktoro blocks in worker processes, pass a reaktoro_block_manager in
+    reaktoro_options."""
+
+    CONFIG = WaterTapFlowsheetBlockData.CONFIG()
+    CONFIG.declare(
+        "ro_property_package",
+        ConfigValue(
+            default=None,
+            description="Property package used by RO stages",
+        ),
+    )
+    CONFIG.declare(
+        "number_of_stages",
+        ConfigValue(
+            default=2,
+            domain=int,
+            description="Number of RO stages in the train",
+        ),
+    )
+    CONFIG.declare(
+        "stage_options",
+        ConfigValue(
+            default=None,
+            description="MultiCompROUnit options for RO stages",
+            doc="""
+            Dict of MultiCompROUnit config options applied to all stages, or list with a dict
+            per stage (e.g. [{"target_recovery": 0.5}, {"target_recovery": 0.4}]), these
+            override options train passes to the stages (property packages, costing, reaktoro options)
+            """,
+        ),
+    )
+    CONFIG.declare(
+        "pump_options",
+        ConfigValue(
+            default=None,
+            description="MultiCompPumpUnit options for feed and booster pumps",
+            doc="""
+            Dict of MultiCompPumpUnit config options applied to all pumps, or list with a dict
+            per stage
+            """,
+        ),
+    )
+    CONFIG.declare(
+        "add_feed_pump",
+        ConfigValue(
+            default=True,
+            description="Add pump before first stage",
+        ),
+    )
+    CONFIG.declare(
+        "booster_pumps",
+        ConfigValue(
+            default=True,
+            description="Add booster pump before each stage after the first",
+        ),
+    )
+    CONFIG.declare(
+        "interstage_ph_adjustment",
+        ConfigValue(
+            default=None,
+            description="Reagents for pH adjustment before each stage after the first",
+            doc="""
+            List of reagents, if provided, a ChemicalAdditionUnit is added before booster pump of
+            each stage after the first
+            """,
+        ),
+    )
+    CONFIG.declare(
+        "ph_adjustment_options",
+        ConfigValue(
+            default=None,
+            description="ChemicalAdditionUnit options for interstage pH adjustment",
+        ),
+    )
+    CONFIG.declare(
+        "add_erd",
+        ConfigValue(
+            default=True,
+            description="Add ERD on retentate of last stage",
+        ),
+    )
+    CONFIG.declare(
+        "reaktoro_options",
+        ConfigValue(
+            default=None,
+            description="User options for configuring Reaktoro-PSE passed to all stages",
+        ),
+    )
+    CONFIG.declare(
+        "speciation_reuse",
+        ConfigValue(
+            default=False,
+            description="Reuse speciation of first stage in following stages",
+            doc="""
+            If True, only first stage builds reaktoro blocks, following stages update speciation of
+            previous stage for additional water removal (see upstream_speciation option of MultiCompROUnit),
+            can not be used with interstage_ph_adjustment, as reused speciation does not account for
+            reagents added between stages
+            """,
+        ),
+    )
+    CONFIG.declare(
+        "coupled_solve",
+        ConfigValue(
+            default=True,
+            description="Solve whole train after stage-wise initialization",
+        ),
+    )
+
+    def build(self):
+        super().build()
+        if (
+            self.config.speciation_reuse
+            and self.config.interstage_ph_adjustment is not None
+        ):
+            raise ValueError(
+                f"{self.name} speciation_reuse can not be used with "
+                "interstage_ph_adjustment, reused speciation does not account for "
+                "reagents added between stages"
+            )
+        self.stages = []
+        self.pumps = {}
+        self.ph_adjustment_units = {}
+        self.stage_units = []
+        for stage in range(1, self.config.number_of_stages + 1):
+            units = []
+            if stage > 1 and self.config.interstage_ph_adjustment is not None:
+                ph_options = {
+                    "default_property_package": self.config.default_property_package,
+                    "default_costing_package": self.config.default_costing_package,
+                    "build_reporting_properties": self.config.build_reporting_properties,
+                    "initial_guess_table": self.config.initial_guess_table,
+                    "selected_reagents": self.config.interstage_ph_adjustment,
+                    "reaktoro_options": self.config.reaktoro_options,
+                }
+                ph_options.update(
+                    _get_stage_options(self.config.ph_adjustment_options, stage)
+                )
+                unit = ChemicalAdditionUnit(**ph_options)
+                self.add_component(f"stage_{stage}_ph_adjustment", unit)
+                self.ph_adjustment_units[stage] = unit
+                units.append(unit)
+            if (stage == 1 and self.config.add_feed_pump) or (
+                stage > 1 and self.config.booster_pumps
+            ):
+                pump_options = {
+                    "default_property_package": self.config.default_property_package,
+                    "default_costing_package": self.config.default_costing_package,
+                    "initialization_pressure": "osmotic_pressure",
+                    "maximum_pressure": 85 * pyunits.bar,
+                }
+                pump_options.update(_get_stage_options(self.config.pump_options, stage))
+                unit = MultiCompPumpUnit(**pump_options)
+                self.add_component(f"stage_{stage}_pump", unit)
+                self.pumps[stage] = unit
+                units.append(unit)
+            ro_options = {
+                "default_property_package": self.config.default_property_package,
+                "default_costing_package": self.config.default_costing_package,
+                "build_reporting_properties": self.config.build_reporting_properties,
+                "initial_guess_table": self.config.initial_guess_table,
+                "ro_property_package": self.config.ro_property_package,
+                "reaktoro_options": self.config.reaktoro_options,
+                "use_interfacecomp_for_effluent_pH": True,
+            }
+            if self.config.speciation_reuse and stage > 1:
+                ro_options["upstream_speciation"] = self.stages[-1]
+            ro_options.update(_get_stage_options(self.config.stage_options, stage))
+            unit = MultiCompROUnit(**ro_options)
+            self.add_component(f"stage_{stage}", unit)
+            self.stages.append(unit)
+            units.append(unit)
+            self.stage_units.append(units)
+
+        if self.config.number_of_stages > 1:
+            self.product_mixer = MixerPhUnit(
+                default_property_package=self.config.default_property_package,
+                build_reporting_properties=self.config.build_reporting_properties,
+                default_costing_package=self.config.default_costing_package,
+                inlet_ports=[
+                    f"stage_{stage}_product"
+                    for stage in range(1, self.config.number_of_stages + 1)
+                ],
+                add_reaktoro_chemistry=False,
+            )
+        if self.config.add_erd:
+            self.erd = MultiCompERDUnit(
+                default_property_package=self.config.default_property_package,
+                default_costing_package=self.config.default_costing_package,
+            )
+        self.build_connections()
+
+    def build_connections(self):
+        """connects units in each stage, retentate of each stage to next stage,
+        and permeate of each stage to product mixer"""
+        for stage, units in enumerate(self.stage_units, start=1):
+            for unit, next_unit in zip(units[:-1], units[1:]):
+                unit.outlet.connect_to(self.get_inlet(next_unit))
+            if stage < len(self.stage_units):
+                self.stages[stage - 1].retentate.connect_to(
+                    self.get_inlet(self.stage_units[stage][0])
+                )
+            if self.config.number_of_stages > 1:
+                self.stages[stage - 1].product.connect_to(
+                    getattr(self.product_mixer, f"stage_{stage}_product")
+                )
+        if self.config.add_erd:
+            self.stages[-1].retentate.connect_to(self.erd.inlet)
+            retentate = self.erd.outlet
+        else:
+            retentate = self.stages[-1].retentate
+        if self.config.number_of_stages > 1:
+            product = self.product_mixer.outlet
+        else:
+            product = self.stages[0].product
+        feed = self.get_inlet(self.stage_units[0][0])
+        self.register_port("feed", feed.port, feed.var_dict)
+        self.register_port("product", product.port, product.var_dict)
+        self.register_port("retentate", retentate.port, retentate.var_dict)
+
+    def get_inlet(self, unit):
+        """returns inlet port container of a unit in the train"""
+        if any(unit is stage for stage in self.stages):
+            return unit.feed
+        return unit.inlet
+
+    def get_units(self):
+        """returns all units in the train in flow order"""
+        units = [unit for units in self.stage_units for unit in units]
+        if self.config.number_of_stages > 1:
+            units.append(self.product_mixer)
+        if self.config.add_erd:
+            units.append(self.erd)
+        return units
+
+    def set_fixed_operation(self):
+        for unit in self.get_units():
+            unit.set_fixed_operation()
+
+    def set_optimization_operation(self):
+        for unit in self.get_units():
+            unit.set_optimization_operation()
+
+    def scale_before_initialization(self, **kwargs):
+        for unit in self.get_units():
+            unit.scale_before_initialization(**kwargs)
+
+    def scale_post_initialization(self, **kwargs):
+        for unit in self.get_units():
+            unit.scale_post_initialization(**kwargs)
+
+    def _copy_inlet_state(self, inlet, target, water_fraction=1, pressure=None):
+        for name, var in inlet.port.vars.items():
+            for index, var_data in var.items():
+                guess = var_data.value
+                if name == "flow_mol_phase_comp" and index[-1] == "H2O":
+                    guess = guess * water_fraction
+                elif name == "pressure" and pressure is not None:
+                    guess = pressure
+                target.port.vars[name][index].set_value(guess)
+        if inlet.var_dict is not None and target.var_dict is not None:
+            for key, var in inlet.var_dict.items():
+                if key in target.var_dict:
+                    target.var_dict[key].set_value(var.value)
+
+    def guess_stage_inlets(self):
+        """sets inlet state of each stage after the first to retentate estimated from
+        inlet of previous stage and its target recovery, assuming all solutes are rejected,
+        pressure is taken from pump of previous stage (booster pumps re-estimate it)"""
+        for stage, units in enumerate(self.stage_units, start=1):
+            inlet = self.get_inlet(units[0])
+            for unit in units[1:]:
+                self._copy_inlet_state(inlet, self.get_inlet(unit))
+            if stage == len(self.stage_units):
+                break
+            pressure = None
+            if stage in self.pumps:
+                self.pumps[stage].set_fixed_operation()
+                pressure = value(self.pumps[stage].pump.outlet.pressure[0])
+            self._copy_inlet_state(
+                inlet,
+                self.get_inlet(self.stage_units[stage][0]),
+                water_fraction=1 - self.stages[stage - 1].config.target_recovery,
+                pressure=pressure,
+            )
+
+    def initialize_stage(self, units):
+        """initializes units of a stage from its inlet guess, retentate and
+        product of the stage are not propagated, so other stages are not affected"""
+        for unit in units[:-1]:
+            unit.initialize()
+        units[-1].initialize_unit()
+
+    def initialize_unit(self, **kwargs):
+        self.guess_stage_inlets()
+        # stages are decoupled by inlet guesses, so each is initialized without
+        # propagating its guess errors to the next stage
+        for units in self.stage_units:
+            self.initialize_stage(units)
+        # replace guesses with states from initialized stages
+        for stage in self.stages:
+            if stage.config.upstream_speciation is not None:
+                stage.initialize_speciation_reuse()
+            stage.propagate_outlets()
+        if self.config.number_of_stages > 1:
+            self.product_mixer.initialize()
+        if self.config.add_erd:
+            self.erd.initialize()
+        if self.config.coupled_solve and self.config.number_of_stages > 1:
+            self.solve_coupled()
+
+    def solve_coupled(self, tee=False):
+        """solves all stages together with train feed fixed"""
+        self.feed.fix()
+        try:
+            dofs = get_degrees_of_freedom(self)
+            if dofs != 0:
+                raise ValueError(
+                    f"{self.name} requires 0 degrees of freedom for coupled solve, "
+                    f"but has {dofs}"
+                )
+            solver = get_cyipopt_watertap_solver()
+            result = solver.solve(self, tee=tee)
+        finally:
+            self.feed.unfix()
+        assert_optimal_termination(result)
+        return result
+
+    def get_model_state_dict(self):
+        self.feed.fix()
+        unit_dofs = degrees_of_freedom(self)
+        self.feed.unfix()
+        model_state = {"Model": {"DOFs": unit_dofs}}
+        for stage, ro in enumerate(self.stages, start=1):
+            stage_state = {
+                "Area": ro.ro_unit.area,
+                "Recovery": ro.ro_unit.recovery_vol_phase[0.0, "Liq"],
+                "Feed pressure": pyunits.convert(
+                    ro.ro_unit.inlet.pressure[0], to_units=pyunits.bar
+                ),
+                "Feed pH": ro.ro_feed.pH,
+            }
+            if stage in self.ph_adjustment_units:
+                reactor = self.ph_adjustment_units[stage].chemical_reactor
+                for reagent in reactor.reagent_dose:
+                    stage_state[f"{reagent} dose"] = reactor.reagent_dose[reagent]
+            model_state[f"Stage {stage}"] = stage_state
+        return model_state
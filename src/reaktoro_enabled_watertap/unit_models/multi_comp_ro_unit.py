@@ -35,9 +35,12 @@ from pyomo.environ import (
     Var,
     value,
     Constraint,
+    Expression,
     Objective,
+    log,
     units as pyunits,
 )
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
 from pyomo.common.config import ConfigValue
 from watertap.unit_models.reverse_osmosis_1D import (
     ReverseOsmosis1D,
@@ -57,6 +60,7 @@ from idaes.models.unit_models import (
     Translator,
 )
 from reaktoro_enabled_watertap.utils import scale_utils as scu
+from reaktoro_enabled_watertap.utils.diagnostics import diagnostics_enabled
 
 from reaktoro_pse.reaktoro_block import ReaktoroBlock
 from pyomo.network import Arc
@@ -170,6 +174,32 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
             """,
         ),
     )
+    CONFIG.declare(
+        "upstream_speciation",
+        ConfigValue(
+            default=None,
+            description="Upstream RO stage whose speciation is reused by this stage",
+            doc="""
+            Upstream MultiCompROUnit with chemistry (reaktoro or reused speciation). If provided, this stage
+            does not build reaktoro blocks, instead interface (and bulk) pH, pE, alkalinity and scaling tendencies
+            are updated from upstream stage for additional water removal:
+                pH = feed pH + (upstream interface pH - upstream feed pH) * ln(CF) / ln(upstream CF)
+                scaling tendency = upstream scaling tendency * (interface concentration / upstream interface concentration)**n
+            where CF is concentration factor at interface, and n is exponent from speciation_reuse_exponents
+            """,
+        ),
+    )
+    CONFIG.declare(
+        "speciation_reuse_exponents",
+        ConfigValue(
+            default=None,
+            description="Exponents used to update scaling tendency when reusing upstream speciation",
+            doc="""
+            Dict with exponent for each scalant (number of ions in scalant formula unit), scalants not provided
+            use exponent of 2 (e.g. Calcite, Gypsum)
+            """,
+        ),
+    )
     CONFIG.declare(
         "track_pE",
         ConfigValue(
@@ -231,22 +261,25 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
             inlet_property_package=self.config.default_property_package,
             outlet_property_package=self.config.ro_property_package,
         )
-        self.ro_feed.properties_out[0].flow_mol_phase_comp[...]
-        self.ro_feed.properties_out[0].conc_mass_phase_comp[...]
+        if self.config.build_reporting_properties:
+            self.ro_feed.properties_out[0].flow_mol_phase_comp[...]
+            self.ro_feed.properties_out[0].conc_mass_phase_comp[...]
         self.ro_retentate = Translator(
             inlet_property_package=self.config.ro_property_package,
             outlet_property_package=self.config.default_property_package,
         )
-        self.ro_retentate.properties_in[0].flow_mol_phase_comp[...]
-        self.ro_retentate.properties_in[0].conc_mass_phase_comp[...]
-        self.ro_retentate.properties_out[0].conc_mass_phase_comp[...]
+        if self.config.build_reporting_properties:
+            self.ro_retentate.properties_in[0].flow_mol_phase_comp[...]
+            self.ro_retentate.properties_in[0].conc_mass_phase_comp[...]
+            self.ro_retentate.properties_out[0].conc_mass_phase_comp[...]
         self.ro_product = Translator(
             inlet_property_package=self.config.ro_property_package,
             outlet_property_package=self.config.default_property_package,
         )
-        self.ro_product.properties_in[0].flow_mol_phase_comp[...]
-        self.ro_product.properties_in[0].conc_mass_phase_comp[...]
-        self.ro_product.properties_out[0].conc_mass_phase_comp[...]
+        if self.config.build_reporting_properties:
+            self.ro_product.properties_in[0].flow_mol_phase_comp[...]
+            self.ro_product.properties_in[0].conc_mass_phase_comp[...]
+            self.ro_product.properties_out[0].conc_mass_phase_comp[...]
         # set them up for translating input prop pack to outlet prop pack
         self.setup_inlet_translator_block(self.ro_feed)
 
@@ -264,7 +297,7 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
         if self.config.default_costing_package is not None:
             self.ro_unit.costing = UnitModelCostingBlock(
                 flowsheet_costing_block=self.config.default_costing_package,
-                **self.config.default_costing_package_kwargs
+                **self.config.default_costing_package_kwargs,
             )
         self.ro_feed.pH = Var(initialize=7, bounds=(0, 13), units=pyunits.dimensionless)
         self.ro_retentate.pH = Var(
@@ -337,13 +370,16 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
 
         self.build_water_removal_constraint()
 
-        if self.config.add_reaktoro_chemistry:
+        if self.config.upstream_speciation is not None:
+            self.build_scaling_constraints()
+            self.add_speciation_reuse()
+        elif self.config.add_reaktoro_chemistry:
             self.build_scaling_constraints()
             self.add_reaktoro_chemistry()
         if (
             self.config.use_interfacecomp_for_effluent_pH == False
             and self.config.use_bulkcomp_for_effluent_pH == False
-            or self.config.add_reaktoro_chemistry == False
+            or self.has_chemistry() == False
         ):
             self.add_retentate_ph_pe_constraint()
         self.add_permeate_ph_pe_constraint()
@@ -553,9 +589,16 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
 
         self.deactivate_scaling_constraints()
 
+    def has_chemistry(self):
+        """returns True if stage tracks chemistry with reaktoro or reused upstream speciation"""
+        return (
+            self.config.add_reaktoro_chemistry
+            or self.config.upstream_speciation is not None
+        )
+
     def activate_scaling_constraints(self):
         """activates scaling constraints"""
-        if self.config.add_reaktoro_chemistry:
+        if self.has_chemistry():
             for scalant in self.config.selected_scalants.keys():
                 self.ro_unit.eq_max_scaling_tendency[scalant].activate()
                 self.ro_unit.scaling_tendency[scalant].unfix()
@@ -563,7 +606,7 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
 
     def deactivate_scaling_constraints(self):
         """deactivates scaling constraints"""
-        if self.config.add_reaktoro_chemistry:
+        if self.has_chemistry():
             for scalant in self.config.selected_scalants.keys():
                 self.ro_unit.eq_max_scaling_tendency[scalant].deactivate()
                 self.ro_unit.maximum_scaling_tendency[scalant].fix()
@@ -593,6 +636,15 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
             * 0.99
         )
         self.ro_unit.eq_max_removal_at_interface.deactivate()
+        # concentration factor of solutes between inlet and interface in last node
+        self.ro_unit.interface_concentration_factor = Expression(
+            expr=self.ro_unit.inlet.flow_mass_phase_comp[0, "Liq", "H2O"]
+            / (
+                self.ro_unit.inlet.flow_mass_phase_comp[0, "Liq", "H2O"]
+                - self.ro_unit.water_removed_at_interface
+                * self.config.default_property_package.mw_comp["H2O"]
+            )
+        )
         if self.config.use_bulkcomp_for_effluent_pH:
             self.ro_unit.water_removed_in_feed = Var(
                 initialize=1, bounds=(1e-8, None), units=pyunits.mol / pyunits.s
@@ -607,6 +659,12 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
                     "Liq", "H2O"
                 ]
             )
+            self.ro_unit.bulk_concentration_factor = Expression(
+                expr=self.ro_unit.inlet.flow_mass_phase_comp[0, "Liq", "H2O"]
+                / self.ro_unit.feed_side.properties[0, 1].flow_mass_phase_comp[
+                    "Liq", "H2O"
+                ]
+            )
 
     def add_reaktoro_chemistry(self):
         """add water removal constraint, and relevant reaktoro block"""
@@ -655,6 +713,10 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
         self.reaktoro_options["outputs"] = outputs
         self.reaktoro_options.update_with_user_options(self.config.reaktoro_options)
         self.scaling_block = ReaktoroBlock(**self.reaktoro_options)
+        self.register_initial_guess_inputs(
+            self.ro_feed.properties_in[0].flow_mol_phase_comp, self.ro_feed.pH
+        )
+        self.register_initial_guess_components(self.scaling_block, *outputs.values())
         if (
             self.config.use_bulkcomp_for_effluent_pH == False
             and self.config.use_interfacecomp_for_effluent_pH
@@ -688,6 +750,172 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
             )  # ensure its scaled!
             self.reaktoro_options["outputs"] = outputs
             self.bulk_ph_block = ReaktoroBlock(**self.reaktoro_options)
+            self.register_initial_guess_components(
+                self.bulk_ph_block, *outputs.values()
+            )
+
+    def add_speciation_reuse(self):
+        """adds constraints that update upstream stage speciation for water removed
+        in this stage instead of re-equilibrating it with reaktoro"""
+        upstream = self.config.upstream_speciation
+        if not upstream.has_chemistry():
+            raise ValueError(
+                f"{upstream.name} does not track chemistry, its speciation can not be reused by {self.name}"
+            )
+        if (
+            self.config.use_bulkcomp_for_effluent_pH
+            and upstream.ro_unit.find_component("bulk_concentration_factor") is None
+        ):
+            raise ValueError(
+                f"{upstream.name} should use bulk composition for effluent pH, "
+                f"as {self.name} reuses its bulk speciation"
+            )
+        exponents = {scalant: 2 for scalant in self.config.selected_scalants}
+        if self.config.speciation_reuse_exponents is not None:
+            exponents.update(self.config.speciation_reuse_exponents)
+        log_cf_upstream = log(upstream.ro_unit.interface_concentration_factor)
+
+        def updated_potential(feed_var, upstream_interface_var, upstream_feed_var, cf):
+            # shift of pH (or pE) per log concentration factor is taken from upstream stage
+            return (
+                feed_var
+                + (upstream_interface_var - upstream_feed_var)
+                * log(cf)
+                / log_cf_upstream
+            )
+
+        # ratio of solute concentration at interface to upstream interface
+        interface = self.ro_unit.feed_side.properties_interface[0, 1]
+        upstream_interface = upstream.ro_unit.feed_side.properties_interface[0, 1]
+        self.ro_unit.interface_concentration_ratio = Expression(
+            expr=(
+                interface.flow_mass_phase_comp["Liq", self.ro_solute_type]
+                / interface.flow_mass_phase_comp["Liq", "H2O"]
+            )
+            / (
+                upstream_interface.flow_mass_phase_comp["Liq", upstream.ro_solute_type]
+                / upstream_interface.flow_mass_phase_comp["Liq", "H2O"]
+            )
+        )
+        self.ro_unit.eq_reused_interface_pH = Constraint(
+            expr=self.ro_interface_pH
+            == updated_potential(
+                self.ro_feed.pH,
+                upstream.ro_interface_pH,
+                upstream.ro_feed.pH,
+                self.ro_unit.interface_concentration_factor,
+            )
+        )
+        if self.config.track_pE:
+            self.ro_unit.eq_reused_interface_pE = Constraint(
+                expr=self.ro_interface_pE
+                == updated_potential(
+                    self.ro_feed.pE,
+                    upstream.ro_interface_pE,
+                    upstream.ro_feed.pE,
+                    self.ro_unit.interface_concentration_factor,
+                )
+            )
+
+        @self.ro_unit.Constraint(list(self.config.selected_scalants.keys()))
+        def eq_reused_scaling_tendency(blk, scalant):
+            return (
+                blk.scaling_tendency[scalant]
+                == upstream.ro_unit.scaling_tendency[scalant]
+                * blk.interface_concentration_ratio ** exponents[scalant]
+            )
+
+        if self.config.add_alkalinity:
+            self.ro_unit.interface_alkalinity = Var(
+                initialize=1,
+                units=pyunits.mg / pyunits.L,
+                doc="Alkalinity (mg/L as CaCO3)",
+            )
+            self.ro_unit.eq_reused_interface_alkalinity = Constraint(
+                expr=self.ro_unit.interface_alkalinity
+                == upstream.ro_unit.interface_alkalinity
+                * self.ro_unit.interface_concentration_ratio
+            )
+        if (
+            self.config.use_bulkcomp_for_effluent_pH == False
+            and self.config.use_interfacecomp_for_effluent_pH
+        ):
+            self.eq_bulk_interface_ph = Constraint(
+                expr=self.ro_retentate.pH == self.ro_interface_pH
+            )
+            if self.config.track_pE:
+                self.eq_bulk_interface_pE = Constraint(
+                    expr=self.ro_retentate.pE == self.ro_interface_pE
+                )
+        elif self.config.use_bulkcomp_for_effluent_pH:
+            log_cf_upstream_bulk = log(upstream.ro_unit.bulk_concentration_factor)
+            self.ro_unit.eq_reused_bulk_pH = Constraint(
+                expr=self.ro_retentate.pH
+                == self.ro_feed.pH
+                + (upstream.ro_retentate.pH - upstream.ro_feed.pH)
+                * log(self.ro_unit.bulk_concentration_factor)
+                / log_cf_upstream_bulk
+            )
+            if self.config.track_pE:
+                self.ro_unit.eq_reused_bulk_pE = Constraint(
+                    expr=self.ro_retentate.pE
+                    == self.ro_feed.pE
+                    + (upstream.ro_retentate.pE - upstream.ro_feed.pE)
+                    * log(self.ro_unit.bulk_concentration_factor)
+                    / log_cf_upstream_bulk
+                )
+            if self.config.add_alkalinity:
+                self.ro_unit.alkalinity = Var(
+                    initialize=1,
+                    units=pyunits.mg / pyunits.L,
+                    doc="Alkalinity (mg/L as CaCO3)",
+                )
+                self.ro_unit.eq_reused_alkalinity = Constraint(
+                    expr=self.ro_unit.alkalinity
+                    == upstream.ro_unit.alkalinity
+                    * self.ro_unit.bulk_concentration_factor
+                    / upstream.ro_unit.bulk_concentration_factor
+                )
+
+    def initialize_speciation_reuse(self):
+        """calculates chemistry variables from upstream speciation"""
+        reuse_constraints = [
+            (self.ro_interface_pH, self.ro_unit.eq_reused_interface_pH),
+        ]
+        if self.config.track_pE:
+            reuse_constraints.append(
+                (self.ro_interface_pE, self.ro_unit.eq_reused_interface_pE)
+            )
+        for scalant in self.ro_unit.eq_reused_scaling_tendency:
+            reuse_constraints.append(
+                (
+                    self.ro_unit.scaling_tendency[scalant],
+                    self.ro_unit.eq_reused_scaling_tendency[scalant],
+                )
+            )
+        if self.config.add_alkalinity:
+            reuse_constraints.append(
+                (
+                    self.ro_unit.interface_alkalinity,
+                    self.ro_unit.eq_reused_interface_alkalinity,
+                )
+            )
+        if self.config.use_bulkcomp_for_effluent_pH:
+            reuse_constraints.append(
+                (self.ro_retentate.pH, self.ro_unit.eq_reused_bulk_pH)
+            )
+            if self.config.track_pE:
+                reuse_constraints.append(
+                    (self.ro_retentate.pE, self.ro_unit.eq_reused_bulk_pE)
+                )
+            if self.config.add_alkalinity:
+                reuse_constraints.append(
+                    (self.ro_unit.alkalinity, self.ro_unit.eq_reused_alkalinity)
+                )
+        for var, constraint in reuse_constraints:
+            calculate_variable_from_constraint(var, constraint)
+        if self.config.use_interfacecomp_for_effluent_pH:
+            self.ro_retentate.pH.value = self.ro_interface_pH.value
 
     def set_fixed_operation(self):
         """fixes operation point for pump unit model"""
@@ -882,7 +1110,7 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
             )
 
         # scale scaling constraints if they exist
-        if self.config.add_reaktoro_chemistry:
+        if self.has_chemistry():
             for scalant, max_tendency in self.config.selected_scalants.items():
                 sf = 1 / (max_tendency)
                 iscale.set_scaling_factor(self.ro_unit.scaling_tendency[scalant], sf)
@@ -897,6 +1125,12 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
                 iscale.set_scaling_factor(self.ro_unit.interface_alkalinity, 1)
             if self.config.add_alkalinity and self.config.use_bulkcomp_for_effluent_pH:
                 iscale.set_scaling_factor(self.ro_unit.alkalinity, 1)
+        if self.config.upstream_speciation is not None:
+            for constraint in self.ro_unit.component_data_objects(
+                Constraint, descend_into=False
+            ):
+                if constraint.parent_component().local_name.startswith("eq_reused"):
+                    iscale.constraint_scaling_transform(constraint, 1)
         # scale RO unit
         h2o_rate = 1 / prop_scaling["H2O"]
         area_scale = 1 / (
@@ -1025,13 +1259,19 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
         )
 
         self.ro_feed.properties_in[0].flow_mol_phase_comp.unfix()
-        if self.config.add_reaktoro_chemistry:
+        if self.config.upstream_speciation is not None:
             self.ro_unit.eq_max_removal_at_interface.activate()
+            self.initialize_speciation_reuse()
+        elif self.config.add_reaktoro_chemistry:
+            self.ro_unit.eq_max_removal_at_interface.activate()
+            self.seed_initial_guess()
             self.scaling_block.initialize()
-            self.scaling_block.display_jacobian_scaling()
+            if diagnostics_enabled():
+                self.scaling_block.display_jacobian_scaling()
             if self.config.use_bulkcomp_for_effluent_pH:
                 self.bulk_ph_block.initialize()
-                self.bulk_ph_block.display_jacobian_scaling()
+                if diagnostics_enabled():
+                    self.bulk_ph_block.display_jacobian_scaling()
             else:
                 self.ro_retentate.pH.value = self.ro_interface_pH.value
 
@@ -1039,6 +1279,16 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
         """Returns a dictionary with the model state"""
         unit_dofs = degrees_of_freedom(self)
         ro_domains = list(self.ro_unit.length_domain)
+        reported_properties = ("flow_vol_phase", "conc_mass_phase_comp")
+        feed_state = self.get_reporting_state(
+            self.ro_feed.properties_out[0], reported_properties
+        )
+        retentate_state = self.get_reporting_state(
+            self.ro_retentate.properties_in[0], reported_properties
+        )
+        product_state = self.get_reporting_state(
+            self.ro_product.properties_in[0], reported_properties
+        )
 
         model_state_dict = {
             "Model": {"DOFs": unit_dofs},
@@ -1073,10 +1323,10 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
                     self.ro_unit.inlet.pressure[0], to_units=pyunits.bar
                 ),
                 "Temperature": self.ro_feed.inlet.temperature[0],
-                "Flow rate": self.ro_feed.properties_out[0].flow_vol_phase["Liq"],
-                self.ro_solute_type: self.ro_feed.properties_out[
-                    0
-                ].conc_mass_phase_comp["Liq", self.ro_solute_type],
+                "Flow rate": feed_state.flow_vol_phase["Liq"],
+                self.ro_solute_type: feed_state.conc_mass_phase_comp[
+                    "Liq", self.ro_solute_type
+                ],
             },
             "Retentate": {
                 "pH": self.ro_retentate.pH,
@@ -1084,10 +1334,10 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
                     self.ro_unit.retentate.pressure[0], to_units=pyunits.bar
                 ),
                 "Temperature": self.ro_retentate.outlet.temperature[0],
-                "Flow rate": self.ro_retentate.properties_in[0].flow_vol_phase["Liq"],
-                self.ro_solute_type: self.ro_retentate.properties_in[
-                    0
-                ].conc_mass_phase_comp["Liq", self.ro_solute_type],
+                "Flow rate": retentate_state.flow_vol_phase["Liq"],
+                self.ro_solute_type: retentate_state.conc_mass_phase_comp[
+                    "Liq", self.ro_solute_type
+                ],
             },
             "Permeate": {
                 "pH": self.ro_product.pH,
@@ -1095,17 +1345,17 @@ class MultiCompROUnitData(WaterTapFlowsheetBlockData):
                     self.ro_product.outlet.pressure[0], to_units=pyunits.bar
                 ),
                 "Temperature": self.ro_product.outlet.temperature[0],
-                "Flow rate": self.ro_product.properties_in[0].flow_vol_phase["Liq"],
-                self.ro_solute_type: self.ro_product.properties_in[
-                    0
-                ].conc_mass_phase_comp["Liq", self.ro_solute_type],
+                "Flow rate": product_state.flow_vol_phase["Liq"],
+                self.ro_solute_type: product_state.conc_mass_phase_comp[
+                    "Liq", self.ro_solute_type
+                ],
             },
         }
         if self.config.track_pE:
             model_state_dict["Inlet"]["pE"] = self.ro_feed.pE
             model_state_dict["Retentate"]["pE"] = self.ro_retentate.pE
             model_state_dict["Permeate"]["pE"] = self.ro_product.pE
-        if self.config.add_reaktoro_chemistry:
+        if self.has_chemistry():
             model_state_dict["Scaling potential"] = {}
             model_state_dict["Maximum scaling potential"] = {}
             for scalant in self.ro_unit.scaling_tendency:
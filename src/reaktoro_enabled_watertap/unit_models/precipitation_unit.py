@@ -34,10 +34,12 @@ from idaes.core import (
 )
 from idaes.core import UnitModelCostingBlock
 import idaes.core.util.scaling as iscale
+import numpy as np
 from watertap.unit_models.stoichiometric_reactor import (
     StoichiometricReactor,
 )
 from reaktoro_enabled_watertap.utils import scale_utils as scu
+from reaktoro_enabled_watertap.utils.diagnostics import diagnostics_enabled
 
 from reaktoro_pse.reaktoro_block import ReaktoroBlock
 from collections import OrderedDict
@@ -80,7 +82,8 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
             default=["CaO", "Na2CO3"],
             description="List of reagents to add to reactor",
             doc="""
-            This selects reagents from ViableReagents class and adds them to reactor. 
+            This selects reagents from ViableReagents class and adds them to reactor, 
+            "all" adds all bases in ViableReagents class (see ViableReagentsBase.get_bases). 
             Default available reagents are CaO, and Na2CO3. 
             To add additional reagents, pass initialized ViableReagent
             object with registered new reagents into viable_reagents config option.
@@ -88,6 +91,31 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
         ),
     )
 
+    CONFIG.declare(
+        "superstructure",
+        ConfigValue(
+            default=False,
+            description="Use selected reagents as candidates for reagent selection",
+            doc="""
+            If True, dose lower bounds of selected reagents are relaxed to zero, so selected reagents
+            act as a superstructure and the cost optimal subset of reagents is found in a single
+            optimization. Set selected_reagents to "all" to use all bases in viable_reagents.
+            """,
+        ),
+    )
+    CONFIG.declare(
+        "reagent_sparsity_penalty",
+        ConfigValue(
+            default=None,
+            description="Penalty per used reagent in superstructure mode",
+            doc="""
+            Penalty (in costing package base currency per m3 of product, same as LCOW) applied for each
+            reagent in use, can be a single value or dict with value per reagent. Builds
+            reagent_sparsity_penalty expression on the reactor that should be added to the objective
+            (see ViableReagentsBase.create_sparsity_penalty).
+            """,
+        ),
+    )
     CONFIG.declare(
         "viable_reagents",
         ConfigValue(
@@ -195,6 +223,10 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
             for key in self.config.selected_precipitants
         }
 
+        if self.config.selected_reagents == "all":
+            self.config.selected_reagents = self.config.viable_reagents.get_bases(
+                self.config.default_property_package
+            )
         self.selected_reagents = {
             key: self.config.viable_reagents[key]
             for key in self.config.selected_reagents
@@ -205,27 +237,15 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
             reagent=self.selected_reagents,
             precipitate=self.selected_precipitants,
         )
-        self.precipitation_reactor.precipitation_reactor.properties_out[
-            0
-        ].conc_mass_phase_comp[...]
-        self.precipitation_reactor.precipitation_reactor.properties_out[
-            0
-        ].flow_mass_phase_comp[...]
-
-        self.precipitation_reactor.dissolution_reactor.properties_in[
-            0
-        ].conc_mass_phase_comp[...]
-        self.precipitation_reactor.dissolution_reactor.properties_in[
-            0
-        ].flow_mass_phase_comp[...]
-        self.precipitation_reactor.dissolution_reactor.properties_out[
-            0
-        ].flow_mass_phase_comp[...]
-        self.precipitation_reactor.dissolution_reactor.properties_out[
-            0
-        ].conc_mass_phase_comp[...]
-        self.precipitation_reactor.separator.waste_state[0].conc_mass_phase_comp[...]
-        self.precipitation_reactor.separator.waste_state[0].flow_mass_phase_comp[...]
+        if self.config.build_reporting_properties:
+            for state in [
+                self.precipitation_reactor.precipitation_reactor.properties_out[0],
+                self.precipitation_reactor.dissolution_reactor.properties_in[0],
+                self.precipitation_reactor.dissolution_reactor.properties_out[0],
+                self.precipitation_reactor.separator.waste_state[0],
+            ]:
+                state.conc_mass_phase_comp[...]
+                state.flow_mass_phase_comp[...]
 
         self.precipitation_reactor.pH = Var(
             ["inlet", "outlet"],
@@ -267,6 +287,18 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
                     self.precipitation_reactor.flow_mass_reagent[reagent],
                     f"{self.name}_reagent_{reagent}".replace(".", "_"),
                 )
+        if self.config.reagent_sparsity_penalty is not None:
+            penalty_units = pyunits.dimensionless
+            if self.config.default_costing_package is not None:
+                penalty_units = (
+                    self.config.default_costing_package.base_currency / pyunits.m**3
+                )
+            self.config.viable_reagents.create_sparsity_penalty(
+                self.precipitation_reactor,
+                self.precipitation_reactor.reagent_dose,
+                self.config.reagent_sparsity_penalty,
+                penalty_units,
+            )
         self.add_sludge_mass_estimation()
         if self.config.add_reaktoro_chemistry:
             self.add_reaktoro_chemistry()
@@ -310,13 +342,10 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
 
     def add_sludge_mass_estimation(self):
         sludge_components = []
-        for (
-            phase,
-            ion,
-        ), obj in self.precipitation_reactor.separator.waste_state[
-            0.0
-        ].flow_mass_phase_comp.items():
-            sludge_components.append(obj)
+        waste_state = self.precipitation_reactor.separator.waste_state[0.0]
+        # use mol flows directly so mass flow properties are not forced on the model
+        for (phase, ion), obj in waste_state.flow_mol_phase_comp.items():
+            sludge_components.append(obj * waste_state.mw_comp[ion])
         for (
             precipitants,
             obj,
@@ -426,6 +455,17 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
         self.reaktoro_options.update_with_user_options(self.config.reaktoro_options)
 
         self.precipitation_block = ReaktoroBlock(**self.reaktoro_options)
+        self.register_initial_guess_inputs(
+            self.precipitation_reactor.dissolution_reactor.properties_in[
+                0
+            ].flow_mol_phase_comp,
+            self.precipitation_reactor.pH["inlet"],
+        )
+        self.register_initial_guess_components(
+            self.precipitation_block,
+            *self.rkt_block_outputs.values(),
+            self.precipitation_reactor.flow_mass_precipitate,
+        )
 
     def add_non_eq_reaktoro_chemistry(self):
 
@@ -567,6 +607,20 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
         non_eq_reaktoro_options.update_with_user_options(self.config.reaktoro_options)
 
         self.non_eq_precipitation_block = ReaktoroBlock(**non_eq_reaktoro_options)
+        self.register_initial_guess_inputs(
+            self.precipitation_reactor.dissolution_reactor.properties_in[
+                0
+            ].flow_mol_phase_comp,
+            self.precipitation_reactor.pH["inlet"],
+        )
+        self.register_initial_guess_components(
+            self.eq_precipitation_block,
+            self.non_eq_precipitation_block,
+            *self.eq_rkt_outputs.values(),
+            *self.non_eq_rkt_outputs.values(),
+            self.precipitation_reactor.flow_mol_precipitate,
+            self.precipitation_reactor.flow_mass_precipitate,
+        )
 
         @self.precipitation_reactor.Constraint(self.selected_precipitants)
         def precipitation_limited_reaction(fs, phase):
@@ -584,7 +638,10 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
                 self.precipitation_reactor.reagent_dose[reagent].setub(
                     options["max_dose"] / 1000
                 )
-            if options["min_dose"] is not None:
+            if self.config.superstructure:
+                # optimizer can remove reagent from superstructure
+                self.precipitation_reactor.reagent_dose[reagent].setlb(0)
+            elif options["min_dose"] is not None:
                 self.precipitation_reactor.reagent_dose[reagent].setlb(
                     options["min_dose"] / 1000
                 )
@@ -592,15 +649,11 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
             self.precipitation_reactor.flow_mol_reagent[reagent].setlb(0)
 
         self.precipitation_reactor.waste_mass_frac_precipitate.fix(0.2)
-        for phase, ion in self.precipitation_reactor.separator.waste_state[
-            0.0
-        ].flow_mass_phase_comp:
-            self.precipitation_reactor.separator.waste_state[0.0].flow_mass_phase_comp[
-                phase, ion
-            ].setlb(None)
-            self.precipitation_reactor.separator.waste_state[0.0].flow_mol_phase_comp[
-                phase, ion
-            ].setlb(None)
+        waste_state = self.precipitation_reactor.separator.waste_state[0.0]
+        for phase, ion in waste_state.flow_mol_phase_comp:
+            if waste_state.is_property_constructed("flow_mass_phase_comp"):
+                waste_state.flow_mass_phase_comp[phase, ion].setlb(None)
+            waste_state.flow_mol_phase_comp[phase, ion].setlb(None)
         for precip in self.selected_precipitants.keys():
             self.precipitation_reactor.flow_mol_precipitate[precip].setlb(0)
             self.precipitation_reactor.flow_mass_precipitate[precip].setlb(None)
@@ -609,6 +662,15 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
             if self.config.add_non_eq_reaktoro_chemistry:
                 self.precipitation_reactor.precipitation_limited_reaction.deactivate()
 
+    def get_selected_reagents(self, threshold=1e-3):
+        """returns reagents with dose above threshold (kg/m3), used to identify
+        reagents selected by optimization in superstructure mode"""
+        return [
+            reagent
+            for reagent in self.selected_reagents
+            if value(self.precipitation_reactor.reagent_dose[reagent]) >= threshold
+        ]
+
     def set_optimization_operation(self):
         """if we have reaktoro chemistry, we need to unfix the precipitate flow and reagent addition"""
         if (
@@ -626,33 +688,25 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
         # generally it appears using the smallest does step is a good scaling factor
         # but it might change depending on chemicals being added.
         dose_scale = 1 / 0.001  # step size of ppm (or 0.001 kg/m3)
-        reagent_ions = {}
-        for reagent, options in self.selected_reagents.items():
-            # use mol flow, as thats what will be propagated by default via mcas
-            mass_flow_scale = dose_scale / (
-                self.config.default_property_package._default_scaling_factors[
-                    "flow_mol_phase_comp", ("Liq", "H2O")
-                ]
-                / value(self.config.default_property_package.mw_comp["H2O"])
-            )
+        reagents = self.config.viable_reagents.compile().select(self.selected_reagents)
+        precipitants = self.config.viable_precipitants.compile().select(
+            self.selected_precipitants
+        )
+        # use mol flow, as thats what will be propagated by default via mcas
+        mass_flow_scale = dose_scale / (
+            self.config.default_property_package._default_scaling_factors[
+                "flow_mol_phase_comp", ("Liq", "H2O")
+            ]
+            / value(self.config.default_property_package.mw_comp["H2O"])
+        )
+        mol_scales = mass_flow_scale * reagents.mw
+        # scale of ions added by reagents
+        reagent_ion_scales = reagents.get_ion_scales(mol_scales)
+        for reagent, mol_scale in zip(reagents.names, mol_scales):
             iscale.set_scaling_factor(
                 self.precipitation_reactor.flow_mass_reagent[reagent],
                 mass_flow_scale,
             )
-            mol_scale = mass_flow_scale * value(
-                pyunits.convert(
-                    self.config.viable_reagents[reagent]["mw"],
-                    pyunits.kg / pyunits.mol,
-                )
-            )
-            for ion, stoich in self.config.viable_reagents[reagent][
-                "dissolution_stoichiometric"
-            ].items():
-                if ion in reagent_ions and reagent_ions[ion] < mol_scale / stoich:
-                    # if we already have this ion, we want to use the largest scale
-                    reagent_ions[ion] = mol_scale / stoich
-                else:
-                    reagent_ions[ion] = mol_scale / stoich
             iscale.set_scaling_factor(
                 self.precipitation_reactor.flow_mol_reagent[reagent],
                 mol_scale,
@@ -668,36 +722,44 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
                 self.precipitation_reactor.flow_vol_reagent[reagent],
                 vol_scale,
             )
-        for precip in self.selected_precipitants.keys():
-            scales = []
-            # use scale for ion and add scale from added chemicals
-
-            for ion, stoich in self.selected_precipitants[precip][
-                "precipitation_stoichiometric"
-            ].items():
-                sc = (
-                    self.config.default_property_package._default_scaling_factors[
-                        "flow_mol_phase_comp", ("Liq", ion)
-                    ]
-                    / stoich
-                )
-                if ion in reagent_ions:
-                    # the dose scale is for ppm, assume we adding 1000 ppm on average
-                    # this says that system has x amount of ion + 1000 ppm from reagent ion
-                    # This could also be related to maximum chemical dose, but we assume its about 1000 ppm
-                    sc = (sc**2 + (reagent_ions[ion] / 1000) ** 2) ** 0.5
-                scales.append(sc)
-            # want maximum scale for limiting ion
-            precip_scale = max(scales)
-            mol_precip_scale = precip_scale
-            mass_precip_scale = precip_scale / value(
-                value(
-                    pyunits.convert(
-                        self.config.viable_precipitants[precip]["mw"],
-                        pyunits.kg / pyunits.mol,
-                    )
+
+        # use scale for ion and add scale from added chemicals
+        ion_scales = np.array(
+            [
+                self.config.default_property_package._default_scaling_factors[
+                    "flow_mol_phase_comp", ("Liq", ion)
+                ]
+                for ion in precipitants.ions
+            ]
+        )
+        reagent_scales = np.array(
+            [
+                (
+                    reagent_ion_scales[reagents.ion_index[ion]]
+                    if ion in reagents.ion_index
+                    else np.nan
                 )
-            )
+                for ion in precipitants.ions
+            ]
+        )
+        with np.errstate(divide="ignore"):
+            scales = ion_scales / precipitants.stoichiometry
+        # the dose scale is for ppm, assume we adding 1000 ppm on average
+        # this says that system has x amount of ion + 1000 ppm from reagent ion
+        # This could also be related to maximum chemical dose, but we assume its about 1000 ppm
+        scales = np.where(
+            np.isnan(reagent_scales),
+            scales,
+            (scales**2 + (reagent_scales / 1000) ** 2) ** 0.5,
+        )
+        # want maximum scale for limiting ion
+        precip_scales = np.where(precipitants.stoichiometry != 0, scales, -np.inf).max(
+            axis=1
+        )
+        for precip, mol_precip_scale, mw in zip(
+            precipitants.names, precip_scales, precipitants.mw
+        ):
+            mass_precip_scale = mol_precip_scale / mw
             iscale.set_scaling_factor(
                 self.precipitation_reactor.flow_mass_precipitate[precip],
                 mass_precip_scale,
@@ -765,6 +827,7 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
             )
 
     def initialize_unit(self, **kwargs):
+        seeded_values = self.seed_initial_guess()
         for phase, data in self.selected_precipitants.items():
             # assume that only fraction of ions will actually precipitate
             flow = (
@@ -773,11 +836,19 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
                 ].value
                 * 0.0001
             )
+            if seeded_values is not None:
+                # start from precipitate flow of nearest converged state instead
+                name = self.precipitation_reactor.flow_mol_precipitate[phase].getname(
+                    fully_qualified=True, relative_to=self
+                )
+                if seeded_values.get(name) is not None:
+                    flow = seeded_values[name]
             self.precipitation_reactor.flow_mol_precipitate[phase].fix(flow)
         self.precipitation_reactor.initialize()
         if self.config.add_reaktoro_chemistry:
             self.precipitation_block.initialize()
-            self.precipitation_block.display_jacobian_scaling()
+            if diagnostics_enabled():
+                self.precipitation_block.display_jacobian_scaling()
             self.precipitation_reactor.initialize()
             for phase, data in self.selected_precipitants.items():
                 self.precipitation_reactor.flow_mol_precipitate[phase].unfix()
@@ -785,7 +856,8 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
 
         elif self.config.add_non_eq_reaktoro_chemistry:
             self.eq_precipitation_block.initialize()
-            self.eq_precipitation_block.display_jacobian_scaling()
+            if diagnostics_enabled():
+                self.eq_precipitation_block.display_jacobian_scaling()
 
             for phase in self.selected_precipitants:
 
@@ -794,7 +866,8 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
                     * self.precipitation_reactor.non_eq_efficacy[phase].value
                 )
             self.non_eq_precipitation_block.initialize()
-            self.non_eq_precipitation_block.display_jacobian_scaling()
+            if diagnostics_enabled():
+                self.non_eq_precipitation_block.display_jacobian_scaling()
             self.precipitation_reactor.initialize()
             for phase, data in self.selected_precipitants.items():
                 self.precipitation_reactor.flow_mol_precipitate[phase].unfix()
@@ -805,10 +878,13 @@ class PrecipitationUnitData(WaterTapFlowsheetBlockData):
     def get_model_state_dict(self):
         def get_ion_comp(stream, pH, pE=None):
             data_dict = OrderedDict()
-            data_dict["Mass flow of H2O"] = stream.flow_mass_phase_comp["Liq", "H2O"]
-            for phase, ion in stream.conc_mass_phase_comp:
+            report_state = self.get_reporting_state(stream)
+            data_dict["Mass flow of H2O"] = report_state.flow_mass_phase_comp[
+                "Liq", "H2O"
+            ]
+            for phase, ion in report_state.conc_mass_phase_comp:
                 if ion != "H2O":
-                    data_dict[ion] = stream.conc_mass_phase_comp[phase, ion]
+                    data_dict[ion] = report_state.conc_mass_phase_comp[phase, ion]
             data_dict["pH"] = pH
             if pE is not None:
                 data_dict["pE"] = pE
@@ -252,3 +252,64 @@ def test_acidification_with_custom_options():
         )
         == 7.338589245057
     )
+
+
+@pytest.mark.core
+@pytest.mark.component
+def test_acid_titration_curve():
+    m = build_case("USDA_brackish", True)
+    m.fs.acidification = ChemicalAdditionUnit(
+        default_property_package=m.fs.properties,
+        selected_reagents=["HCl", "H2SO4"],
+        titration_curve=True,
+    )
+    m.fs.acidification.fix_and_scale()
+
+    m.fs.feed.outlet.connect_to(m.fs.acidification.inlet)
+    TransformationFactory("network.expand_arcs").apply_to(m)
+    iscale.calculate_scaling_factors(m)
+
+    m.fs.feed.initialize()
+    m.fs.acidification.initialize()
+    assert not m.fs.acidification.chemistry_block.active
+    assert m.fs.acidification.chemical_reactor.eq_titration_curve.active
+    assert not m.fs.acidification.chemical_reactor.pH["outlet"].fixed
+    assert degrees_of_freedom(m) == 0
+
+    solver = get_cyipopt_watertap_solver()
+    result = solver.solve(m, tee=True)
+    assert_optimal_termination(result)
+    m.fs.acidification.report()
+    # curve should match reaktoro result from test_acidification_with_all_options
+    assert (
+        pytest.approx(
+            m.fs.acidification.chemical_reactor.pH["outlet"].value,
+            1e-3,
+        )
+        == 6.93692827314374
+    )
+    assert not m.fs.acidification.update_titration_curve()
+    # change in inlet state requires new curve
+    m.fs.acidification.chemical_reactor.pH["inlet"].value += 0.5
+    assert m.fs.acidification.update_titration_curve()
+    assert not m.fs.acidification.chemistry_block.active
+    assert degrees_of_freedom(m) == 0
+
+
+@pytest.mark.core
+def test_titration_curve_requires_net_acid_equivalents():
+    m = build_case("USDA_brackish", True)
+    viable_reagents = ViableReagents()
+    viable_reagents.register_reagent(
+        "NaCl",
+        58.44 * pyunits.g / pyunits.mol,
+        {"Na_+": 1, "Cl_-": 1},
+        cost=0.1,
+    )
+    with pytest.raises(ValueError, match="net acid equivalents"):
+        m.fs.acidification = ChemicalAdditionUnit(
+            default_property_package=m.fs.properties,
+            viable_reagents=viable_reagents,
+            selected_reagents=["NaCl"],
+            titration_curve=True,
+        )
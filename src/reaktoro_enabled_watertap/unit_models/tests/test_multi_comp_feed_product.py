@@ -143,6 +143,7 @@ def test_product():
     m.fs.feed.report(use_default_units=True)
     m.fs.product = MultiCompProduct(
         default_property_package=m.fs.properties,
+        build_reporting_properties=True,
     )
 
     m.fs.feed.outlet.connect_to(m.fs.product.inlet)
@@ -207,3 +208,32 @@ def test_with_reaktoro_intialization_feed():
             )
             == results["Cl_-"]
         )
+
+
+@pytest.mark.core
+@pytest.mark.component
+def test_update_feed():
+    m = build_case("USDA_brackish", True)
+    iscale.calculate_scaling_factors(m)
+    m.fs.feed.initialize()
+    initial_state = m.fs.feed.get_feed_state()
+    m.fs.feed.update_feed(
+        ion_concentrations={"Ca_2+": 300 * pyunits.mg / pyunits.L},
+        pH=7.3,
+    )
+    assert degrees_of_freedom(m) == 0
+    assert pytest.approx(m.fs.feed.feed.pH.value, 1e-3) == 7.3
+    assert (
+        pytest.approx(
+            m.fs.feed.feed.properties[0].conc_mass_phase_comp["Liq", "Ca_2+"].value,
+            1e-5,
+        )
+        == 0.3
+    )
+    # more calcium requires more chloride to balance charge
+    assert (
+        m.fs.feed.feed.properties[0].conc_mass_phase_comp["Liq", "Cl_-"].value
+        > initial_state["Cl_-"]
+    )
+    m.fs.feed.set_feed_state(initial_state)
+    assert m.fs.feed.get_feed_state() == initial_state
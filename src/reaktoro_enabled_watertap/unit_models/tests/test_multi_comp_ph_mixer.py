@@ -202,3 +202,103 @@ def test_mixing_sea_brackish_water_no_rkt():
         )
         == 1.9622
     )
+
+
+def build_rkt_mixer_model(parallel_inlet_speciation):
+    mcas_props, USDA_feed_specs = get_source_water_data(f"USDA_brackish.yaml")
+    _, sea_water_feed_specs = get_source_water_data(f"Seawater.yaml")
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock()
+
+    mcas_props["activity_coefficient_model"] = ActivityCoefficientModel.ideal
+    mcas_props["density_calculation"] = DensityCalculation.constant
+
+    m.fs.properties = MCASParameterBlock(**mcas_props)
+    m.fs.usda_feed = MultiCompFeed(
+        default_property_package=m.fs.properties,
+        reconcile_using_reaktoro=True,
+        **USDA_feed_specs,
+    )
+    m.fs.sea_water_feed = MultiCompFeed(
+        default_property_package=m.fs.properties,
+        reconcile_using_reaktoro=True,
+        **sea_water_feed_specs,
+    )
+    m.fs.usda_feed.fix_and_scale()
+    m.fs.sea_water_feed.set_fixed_operation()
+
+    m.fs.mixer = MixerPhUnit(
+        default_property_package=m.fs.properties,
+        inlet_ports=["usda_feed", "sea_water_feed"],
+        add_reaktoro_chemistry=True,
+        parallel_inlet_speciation=parallel_inlet_speciation,
+    )
+    m.fs.mixer.fix_and_scale()
+    m.fs.usda_feed.outlet.connect_to(m.fs.mixer.usda_feed)
+    m.fs.sea_water_feed.outlet.connect_to(m.fs.mixer.sea_water_feed)
+    TransformationFactory("network.expand_arcs").apply_to(m)
+    iscale.calculate_scaling_factors(m)
+    m.fs.usda_feed.initialize()
+    m.fs.sea_water_feed.initialize()
+    m.fs.mixer.initialize()
+    assert degrees_of_freedom(m) == 0
+    solver = get_cyipopt_watertap_solver()
+    result = solver.solve(m, tee=True)
+    assert_optimal_termination(result)
+    return m
+
+
+@pytest.mark.component
+@pytest.mark.flowsheets
+def test_parallel_inlet_speciation():
+    m = build_rkt_mixer_model(parallel_inlet_speciation=False)
+    m_parallel = build_rkt_mixer_model(parallel_inlet_speciation=True)
+    assert pytest.approx(m.fs.mixer.mixer.pH["outlet"].value, 1e-4) == (
+        m_parallel.fs.mixer.mixer.pH["outlet"].value
+    )
+
+
+@pytest.mark.core
+@pytest.mark.component
+def test_parallel_inlet_speciation_build():
+    mcas_props, USDA_feed_specs = get_source_water_data(f"USDA_brackish.yaml")
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock()
+    m.fs.properties = MCASParameterBlock(**mcas_props)
+    m.fs.mixer = MixerPhUnit(
+        default_property_package=m.fs.properties,
+        inlet_ports=["usda_feed", "sea_water_feed"],
+        add_reaktoro_chemistry=True,
+        parallel_inlet_speciation=True,
+    )
+    modifiers = (
+        m.fs.mixer.mixer_speciation_block.config.register_new_chemistry_modifiers
+    )
+    inlet_block = m.fs.mixer.sea_water_feed_speciation_block
+    assert len(modifiers) > 0
+    for (prop, species), obj in inlet_block.outputs.items():
+        modifier = f"sea_water_feed_{species}"
+        if modifier in modifiers:
+            elements = inlet_block.rkt_state.database.species(species).elements()
+            assert modifiers[modifier] == dict(
+                zip(elements.symbols(), elements.coefficients())
+            )
+    # calcium is added as element, not as Ca+2 species
+    assert modifiers["sea_water_feed_Ca+2"] == {"Ca": 1}
+
+
+@pytest.mark.core
+@pytest.mark.component
+def test_parallel_inlet_speciation_requires_charge_neutrality():
+    mcas_props, _ = get_source_water_data(f"USDA_brackish.yaml")
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock()
+    m.fs.properties = MCASParameterBlock(**mcas_props)
+    with pytest.raises(ValueError, match="assert_charge_neutrality"):
+        m.fs.mixer = MixerPhUnit(
+            default_property_package=m.fs.properties,
+            inlet_ports=["usda_feed", "sea_water_feed"],
+            add_reaktoro_chemistry=True,
+            parallel_inlet_speciation=True,
+            reaktoro_options={"assert_charge_neutrality": False},
+        )
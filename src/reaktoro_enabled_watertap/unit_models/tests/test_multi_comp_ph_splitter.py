@@ -68,6 +68,7 @@ def test_splitter():
 
     m.fs.splitter = SplitterPhUnit(
         default_property_package=m.fs.properties,
+        build_reporting_properties=True,
         outlet_ports=["feed_a", "feed_b"],
         splitter_initialization_guess=0.4,
     )
@@ -145,6 +146,7 @@ def test_splitter_3_ports():
 
     m.fs.splitter = SplitterPhUnit(
         default_property_package=m.fs.properties,
+        build_reporting_properties=True,
         outlet_ports=["feed_a", "feed_b", "port_c"],
         splitter_initialization_guess={"feed_a": 0.4, "feed_b": 0.4},
     )
@@ -0,0 +1,171 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+import pytest
+from reaktoro_enabled_watertap.unit_models.multi_comp_ro_train import (
+    ROTrain,
+)
+from reaktoro_enabled_watertap.unit_models.tests.test_multi_comp_feed_product import (
+    build_case,
+)
+from reaktoro_pse.core.util_classes.cyipopt_solver import (
+    get_cyipopt_watertap_solver,
+)
+from pyomo.environ import (
+    assert_optimal_termination,
+)
+from idaes.core.util.model_statistics import degrees_of_freedom
+
+import idaes.core.util.scaling as iscale
+from pyomo.environ import (
+    TransformationFactory,
+    value,
+)
+
+import watertap.property_models.seawater_prop_pack as sea_water_props
+
+__author__ = "Alexander V. Dudchenko"
+
+
+def build_train(**kwargs):
+    m = build_case("USDA_brackish", True)
+    m.fs.sea_water_prop_pack = sea_water_props.SeawaterParameterBlock()
+    m.fs.ro_train = ROTrain(
+        default_property_package=m.fs.properties,
+        ro_property_package=m.fs.sea_water_prop_pack,
+        **kwargs,
+    )
+    m.fs.feed.outlet.connect_to(m.fs.ro_train.feed)
+    TransformationFactory("network.expand_arcs").apply_to(m)
+    m.fs.ro_train.fix_and_scale()
+    iscale.calculate_scaling_factors(m)
+    return m
+
+
+@pytest.mark.core
+@pytest.mark.component
+def test_three_stage_train():
+    m = build_train(
+        number_of_stages=3,
+        stage_options=[
+            {"target_recovery": 0.5},
+            {"target_recovery": 0.4},
+            {"target_recovery": 0.3},
+        ],
+    )
+    assert len(m.fs.ro_train.stages) == 3
+    assert len(m.fs.ro_train.pumps) == 3
+    m.fs.feed.initialize()
+    m.fs.ro_train.initialize()
+    m.fs.ro_train.report()
+    assert degrees_of_freedom(m) == 0
+
+    solver = get_cyipopt_watertap_solver()
+    result = solver.solve(m, tee=True)
+    assert_optimal_termination(result)
+    # retentate of each stage feeds the next one
+    for stage, next_stage in zip(m.fs.ro_train.stages[:-1], m.fs.ro_train.stages[1:]):
+        assert value(
+            stage.ro_retentate.properties_out[0].flow_mol_phase_comp["Liq", "H2O"]
+        ) == pytest.approx(
+            value(
+                next_stage.ro_feed.properties_in[0].flow_mol_phase_comp["Liq", "H2O"]
+            ),
+            rel=1e-5,
+        )
+    for stage, recovery in zip(m.fs.ro_train.stages, [0.5, 0.4, 0.3]):
+        assert value(stage.ro_unit.recovery_vol_phase[0.0, "Liq"]) == pytest.approx(
+            recovery, rel=1e-2
+        )
+
+
+@pytest.mark.core
+@pytest.mark.component
+def test_stage_inlet_guesses():
+    m = build_train(number_of_stages=2, stage_options={"target_recovery": 0.5})
+    m.fs.feed.initialize()
+    m.fs.ro_train.guess_stage_inlets()
+    flows = [
+        m.fs.ro_train.get_inlet(units[0])
+        .port.vars["flow_mol_phase_comp"][0, "Liq", "H2O"]
+        .value
+        for units in m.fs.ro_train.stage_units
+    ]
+    assert flows[1] == pytest.approx(0.5 * flows[0], rel=1e-8)
+
+
+@pytest.mark.core
+@pytest.mark.component
+def test_interstage_ph_adjustment():
+    m = build_train(number_of_stages=2, interstage_ph_adjustment=["HCl"])
+    assert 2 in m.fs.ro_train.ph_adjustment_units
+    m.fs.feed.initialize()
+    m.fs.ro_train.initialize()
+    assert degrees_of_freedom(m) == 0
+    solver = get_cyipopt_watertap_solver()
+    result = solver.solve(m, tee=True)
+    assert_optimal_termination(result)
+    m.fs.ro_train.report()
+
+
+@pytest.mark.core
+def test_speciation_reuse_with_ph_adjustment():
+    with pytest.raises(ValueError, match="interstage_ph_adjustment"):
+        build_train(
+            number_of_stages=2,
+            speciation_reuse=True,
+            interstage_ph_adjustment=["HCl"],
+        )
+
+
+@pytest.mark.core
+@pytest.mark.component
+def test_speciation_reuse():
+    results = {}
+    for speciation_reuse in [False, True]:
+        m = build_train(
+            number_of_stages=2,
+            speciation_reuse=speciation_reuse,
+            stage_options=[{"target_recovery": 0.5}, {"target_recovery": 0.4}],
+        )
+        second_stage = m.fs.ro_train.stages[1]
+        assert (second_stage.find_component("scaling_block") is None) == (
+            speciation_reuse
+        )
+        m.fs.feed.initialize()
+        m.fs.ro_train.initialize()
+        solver = get_cyipopt_watertap_solver()
+        result = solver.solve(m, tee=True)
+        assert_optimal_termination(result)
+        results[speciation_reuse] = {
+            "pH": value(second_stage.ro_interface_pH),
+            "Calcite": value(second_stage.ro_unit.scaling_tendency["Calcite"]),
+            "Gypsum": value(second_stage.ro_unit.scaling_tendency["Gypsum"]),
+        }
+    # reused speciation should approximate full reaktoro solution
+    assert results[True]["pH"] == pytest.approx(results[False]["pH"], abs=0.1)
+    assert results[True]["Calcite"] == pytest.approx(results[False]["Calcite"], rel=0.2)
+    assert results[True]["Gypsum"] == pytest.approx(results[False]["Gypsum"], rel=0.2)
+
+
+@pytest.mark.core
+@pytest.mark.component
+def test_solve_coupled_releases_feed():
+    m = build_train(number_of_stages=2)
+    # unfixed area adds degree of freedom
+    m.fs.ro_train.stages[0].ro_unit.area.unfix()
+    with pytest.raises(ValueError, match="degrees of freedom"):
+        m.fs.ro_train.solve_coupled()
+    assert not any(
+        var.fixed
+        for port_var in m.fs.ro_train.feed.port.vars.values()
+        for var in port_var.values()
+    )
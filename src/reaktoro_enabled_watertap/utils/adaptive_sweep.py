@@ -0,0 +1,229 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+from pyomo.environ import value
+from pyomo.core.base.var import VarData
+from idaes.core.util.model_serializer import to_json, from_json, StoreSpec
+import numpy as np
+import h5py
+import idaes.logger as idaeslog
+
+__author__ = "Alexander V. Dudchenko"
+
+_log = idaeslog.getLogger(__name__)
+
+
+def _iter_component_data(component):
+    if component.is_indexed():
+        return list(component.values())
+    return [component]
+
+
+def get_active_set(m, active_set_components, tolerance=1e-4):
+    """returns tuple of booleans indicating if inequality constraints
+    (or variable bounds) in active_set_components are binding
+
+    Args:
+        m: model
+        active_set_components: list of constraint or var names (or components), indexed
+            components are expanded
+        tolerance: relative tolerance for a bound to be considered active
+    """
+    active = []
+    for comp in active_set_components:
+        if isinstance(comp, str):
+            comp = m.find_component(comp)
+        for data in _iter_component_data(comp):
+            if isinstance(data, VarData):
+                val = data.value
+                lb, ub = data.bounds
+            else:
+                if not data.active or data.equality:
+                    active.append(False)
+                    continue
+                val = value(data.body, exception=False)
+                lb = value(data.lower) if data.has_lb() else None
+                ub = value(data.upper) if data.has_ub() else None
+            if val is None:
+                active.append(False)
+                continue
+            is_active = False
+            for bound in [lb, ub]:
+                if bound is not None and abs(val - bound) <= tolerance * max(
+                    1, abs(bound)
+                ):
+                    is_active = True
+            active.append(is_active)
+    return tuple(active)
+
+
+def _interval_error(x, y, i):
+    """estimates interpolation error at midpoint of interval [x[i], x[i+1]]
+    by comparing linear interpolation to quadratic interpolations through neighboring points
+    """
+    x_mid = (x[i] + x[i + 1]) / 2
+    y_lin = (y[i] + y[i + 1]) / 2
+    error = 0
+    for start in [i - 1, i]:
+        if start < 0 or start + 3 > len(x):
+            continue
+        xs = x[start : start + 3]
+        ys = y[start : start + 3]
+        if np.any(np.isnan(ys)):
+            continue
+        coeffs = np.polyfit(xs, ys, 2)
+        error = max(error, abs(np.polyval(coeffs, x_mid) - y_lin))
+    return error
+
+
+def adaptive_sweep(
+    m,
+    param,
+    lower_limit,
+    upper_limit,
+    outputs,
+    solve_function,
+    refine_outputs=None,
+    active_set_components=None,
+    initial_samples=5,
+    max_samples=41,
+    tolerance=0.005,
+    min_step=None,
+    probe_function=None,
+    warm_start=True,
+    h5_file=None,
+    h5_dir="adaptive_sweep",
+):
+    """Sweeps param between lower and upper limits, adaptively adding samples where
+    interpolation error of outputs is above tolerance or where active set changes
+    (e.g. scaling constraint becoming binding). Starting from initial_samples linearly
+    spaced points, interval with highest estimated error is bisected until all
+    intervals are below tolerance, are smaller than min_step, or max_samples is reached.
+
+    Args:
+        m: model to sweep
+        param: name of the variable to sweep (e.g. fs.water_recovery)
+        lower_limit: lower limit of param
+        upper_limit: upper limit of param
+        outputs: dict of output name and model variable name (or component) to record
+        solve_function: function(m) that solves the model (should raise on failed solve)
+        refine_outputs: list of outputs used for refinement (default all outputs)
+        active_set_components: list of constraint or var names whose active state is monitored
+        initial_samples: number of linearly spaced initial samples (at least 2)
+        max_samples: maximum number of samples
+        tolerance: target interpolation error relative to range of each refined output
+        min_step: minimum interval width (default (upper_limit-lower_limit)/(4*max_samples))
+        probe_function: function(m) that returns False if point should not be solved
+            (same as loopTool probe_function)
+        warm_start: if True, model is initialized from nearest solved point before solve
+        h5_file: if provided, results are saved in loopTool h5 layout
+        h5_dir: h5 group for results
+
+    Returns:
+        dict with sweep_params, outputs, and solve_successful arrays sorted by param
+    """
+    if initial_samples < 2:
+        raise ValueError(
+            f"initial_samples must be at least 2 to define a sweep interval, got {initial_samples}"
+        )
+    if not lower_limit < upper_limit:
+        raise ValueError(
+            f"lower_limit ({lower_limit}) must be below upper_limit ({upper_limit})"
+        )
+    if refine_outputs is None:
+        refine_outputs = list(outputs.keys())
+    if active_set_components is None:
+        active_set_components = []
+    if min_step is None:
+        min_step = (upper_limit - lower_limit) / (4 * max_samples)
+    sweep_var = m.find_component(param)
+    output_components = {
+        key: m.find_component(obj) if isinstance(obj, str) else obj
+        for key, obj in outputs.items()
+    }
+    points = {}
+    states = {}
+
+    def evaluate(x):
+        sweep_var.fix(x)
+        result = {"success": False, "active": None}
+        if probe_function is not None and not probe_function(m):
+            _log.info(f"Skipping {param}={x}, probe function returned False")
+        else:
+            if warm_start and len(states) > 0:
+                nearest = min(states.keys(), key=lambda k: abs(k - x))
+                from_json(m, sd=states[nearest], wts=StoreSpec.value())
+                sweep_var.fix(x)
+            try:
+                solve_function(m)
+                result["success"] = True
+            except Exception as e:
+                _log.warning(f"Failed to solve at {param}={x}: {e}")
+        for key, comp in output_components.items():
+            result[key] = value(comp, exception=False) if result["success"] else np.nan
+        if result["success"]:
+            result["active"] = get_active_set(m, active_set_components)
+            if warm_start:
+                states[x] = to_json(m, return_dict=True, wts=StoreSpec.value())
+        points[x] = result
+        _log.info(
+            f"Solved {param}={x} ({len(points)} samples), success: {result['success']}"
+        )
+
+    for x in np.linspace(lower_limit, upper_limit, initial_samples):
+        evaluate(float(x))
+
+    while len(points) < max_samples:
+        x = np.array(sorted(points.keys()))
+        errors = np.zeros(len(x) - 1)
+        for key in refine_outputs:
+            y = np.array([points[xi][key] for xi in x], dtype=float)
+            y_range = np.nanmax(y) - np.nanmin(y) if np.any(~np.isnan(y)) else 0
+            if y_range == 0:
+                continue
+            for i in range(len(x) - 1):
+                errors[i] = max(errors[i], _interval_error(x, y, i) / y_range)
+        for i in range(len(x) - 1):
+            left, right = points[x[i]], points[x[i + 1]]
+            # refine around active set changes and feasibility boundaries
+            if left["success"] != right["success"] or left["active"] != right["active"]:
+                errors[i] = np.inf
+        errors[np.diff(x) <= min_step] = 0
+        worst = int(np.argmax(errors))
+        if errors[worst] <= tolerance:
+            break
+        evaluate(float((x[worst] + x[worst + 1]) / 2))
+
+    x = np.array(sorted(points.keys()))
+    results = {
+        "sweep_params": {param: x},
+        "outputs": {
+            key: np.array([points[xi][key] for xi in x], dtype=float) for key in outputs
+        },
+        "solve_successful": np.array([points[xi]["success"] for xi in x]),
+    }
+    if h5_file is not None:
+        save_sweep_results(results, h5_file, h5_dir)
+    return results
+
+
+def save_sweep_results(results, h5_file, h5_dir):
+    """saves sweep results to h5 file using same layout as loopTool output"""
+    with h5py.File(h5_file, "a") as f:
+        if h5_dir in f:
+            del f[h5_dir]
+        group = f.create_group(h5_dir)
+        for source in ["sweep_params", "outputs"]:
+            for key, data in results[source].items():
+                group.create_dataset(f"{source}/{key}/value", data=data)
+        group.create_dataset(
+            "solve_successful/solve_successful", data=results["solve_successful"]
+        )
@@ -0,0 +1,130 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+from contextlib import contextmanager
+
+from pyomo.environ import Var, value
+from pyomo.contrib.fbbt.fbbt import fbbt
+from pyomo.common.errors import InfeasibleConstraintException
+import idaes.logger as idaeslog
+
+from reaktoro_enabled_watertap.utils.phase_profiler import get_profiler
+
+__author__ = "Alexander V. Dudchenko"
+
+_log = idaeslog.getLogger(__name__)
+
+
+def get_variable_bounds(model):
+    """returns list of (var, lower, upper) for all variables in model, bounds are
+    stored as expressions, so bounds set by mutable params are restored as such"""
+    return [
+        (v, v.lower, v.upper)
+        for v in model.component_data_objects(Var, descend_into=True)
+    ]
+
+
+def restore_variable_bounds(bounds):
+    """restores bounds stored by get_variable_bounds"""
+    for v, lb, ub in bounds:
+        v.setlb(lb)
+        v.setub(ub)
+
+
+def _relax(bound, margin, feasibility_tol):
+    return margin * abs(bound) + feasibility_tol
+
+
+def tighten_bounds(
+    model, margin=1e-3, feasibility_tol=1e-8, max_iter=10, improvement_tol=1e-4
+):
+    """Tightens bounds of free variables through feasibility based bound tightening
+    (interval propagation through active algebraic constraints, e.g. mass balances,
+    translator blocks, and costing), starting from bounds and fixed values in model.
+    Grey box (Reaktoro) blocks are not propagated through, so only their inputs and
+    outputs that also appear in algebraic constraints are tightened.
+
+    Tightened bounds are relaxed by margin (relative) and feasibility_tol
+    (absolute), so variables implied to a single value are not treated as fixed
+    by ipopt, and never exceed original bounds.
+
+    Args:
+        model: model (or block) to tighten
+        margin: relative relaxation of tightened bounds
+        feasibility_tol: feasibility tolerance used by fbbt and absolute relaxation
+        max_iter: maximum number of fbbt passes over constraints
+        improvement_tol: minimum bound improvement for repeating fbbt on constraints
+
+    Returns:
+        list of (var, lb, ub) with original bounds of all variables
+        (see restore_variable_bounds), and number of tightened variables
+    """
+    original_bounds = get_variable_bounds(model)
+    with get_profiler().span("bound_tightening"):
+        try:
+            fbbt(
+                model,
+                feasibility_tol=feasibility_tol,
+                max_iter=max_iter,
+                improvement_tol=improvement_tol,
+            )
+        except InfeasibleConstraintException:
+            restore_variable_bounds(original_bounds)
+            raise
+    tightened = 0
+    for v, lower, upper in original_bounds:
+        if v.fixed:
+            v.setlb(lower)
+            v.setub(upper)
+            continue
+        lb = value(lower) if lower is not None else None
+        ub = value(upper) if upper is not None else None
+        new_lb = v.lb
+        new_ub = v.ub
+        if new_lb is not None and new_lb != lb:
+            new_lb = new_lb - _relax(new_lb, margin, feasibility_tol)
+            if lb is not None:
+                new_lb = max(new_lb, lb)
+        if new_ub is not None and new_ub != ub:
+            new_ub = new_ub + _relax(new_ub, margin, feasibility_tol)
+            if ub is not None:
+                new_ub = min(new_ub, ub)
+        if new_lb != lb or new_ub != ub:
+            v.setlb(new_lb)
+            v.setub(new_ub)
+            tightened += 1
+        else:
+            v.setlb(lower)
+            v.setub(upper)
+    return original_bounds, tightened
+
+
+@contextmanager
+def tightened_bounds(model, **kwargs):
+    """Context manager that tightens variable bounds (see tighten_bounds) and restores
+    original bounds on exit, so bounds implied by current fixed values (e.g. feed
+    composition) do not carry over to later solves. If bound tightening finds model
+    infeasible, original bounds are kept and solver is left to report infeasibility.
+
+    Yields:
+        number of tightened variables
+    """
+    try:
+        original_bounds, tightened = tighten_bounds(model, **kwargs)
+    except InfeasibleConstraintException as e:
+        _log.warning(f"Bound tightening found model infeasible, skipping: {e}")
+        original_bounds, tightened = [], 0
+    else:
+        _log.info(f"Bound tightening tightened bounds of {tightened} variables")
+    try:
+        yield tightened
+    finally:
+        restore_variable_bounds(original_bounds)
@@ -0,0 +1,370 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+import sys
+
+import numpy as np
+from scipy import sparse
+from pyomo.environ import Constraint, Objective, value
+from pyomo.common.collections import ComponentSet
+from pyomo.common.tee import capture_output
+from pyomo.common.numeric_types import native_numeric_types
+from pyomo.common.timing import TicTocTimer
+from pyomo.core.base.constraint import ConstraintData
+from pyomo.core.expr.visitor import identify_variables, identify_mutable_parameters
+from pyomo.opt import SolverResults, TerminationCondition
+from pyomo.contrib.pynumero.interfaces.external_grey_box import ExternalGreyBoxBlock
+from pyomo.contrib.pynumero.interfaces.pyomo_grey_box_nlp import (
+    PyomoNLPWithGreyBoxBlocks,
+)
+from pyomo.contrib.pynumero.interfaces.cyipopt_interface import CyIpoptNLP
+from idaes.core.util.scaling import get_scaling_factor
+import idaes.logger as idaeslog
+
+from reaktoro_enabled_watertap.utils.phase_profiler import get_profiler
+
+__author__ = "Alexander V. Dudchenko"
+
+_log = idaeslog.getLogger(__name__)
+
+# default options used by cyipopt-watertap solver
+DEFAULT_OPTIONS = {
+    "tol": 1e-8,
+    "constr_viol_tol": 1e-8,
+    "acceptable_constr_viol_tol": 1e-8,
+    "bound_relax_factor": 0.0,
+    "honor_original_bounds": "no",
+    "nlp_scaling_method": "user-scaling",
+}
+
+# cyipopt-watertap options that are not passed to ipopt
+WATERTAP_OPTIONS = [
+    "nlp_scaling_max_gradient",
+    "nlp_scaling_min_value",
+    "ignore_variable_scaling",
+    "ignore_constraint_scaling",
+    "halt_on_ampl_error",
+]
+
+# termination condition of ipopt return status (info["status"] of cyipopt solve)
+IPOPT_TERMINATION_CONDITIONS = {
+    0: TerminationCondition.optimal,  # Solve_Succeeded
+    1: TerminationCondition.feasible,  # Solved_To_Acceptable_Level
+    2: TerminationCondition.infeasible,  # Infeasible_Problem_Detected
+    3: TerminationCondition.minStepLength,  # Search_Direction_Becomes_Too_Small
+    4: TerminationCondition.unbounded,  # Diverging_Iterates
+    5: TerminationCondition.userInterrupt,  # User_Requested_Stop
+    6: TerminationCondition.feasible,  # Feasible_Point_Found
+    -1: TerminationCondition.maxIterations,  # Maximum_Iterations_Exceeded
+    -2: TerminationCondition.noSolution,  # Restoration_Failed
+    -3: TerminationCondition.solverFailure,  # Error_In_Step_Computation
+    -4: TerminationCondition.maxTimeLimit,  # Maximum_CpuTime_Exceeded
+    -5: TerminationCondition.maxTimeLimit,  # Maximum_WallTime_Exceeded
+    -10: TerminationCondition.invalidProblem,  # Not_Enough_Degrees_Of_Freedom
+    -11: TerminationCondition.invalidProblem,  # Invalid_Problem_Definition
+    -12: TerminationCondition.error,  # Invalid_Option
+    -13: TerminationCondition.internalSolverError,  # Invalid_Number_Detected
+    -100: TerminationCondition.internalSolverError,  # Unrecoverable_Exception
+    -101: TerminationCondition.error,  # NonIpopt_Exception_Thrown
+    -102: TerminationCondition.resourceInterrupt,  # Insufficient_Memory
+    -199: TerminationCondition.internalSolverError,  # Internal_Error
+}
+
+
+def _get_active(model, ctype):
+    return list(model.component_data_objects(ctype, active=True, descend_into=True))
+
+
+def get_structure_key(model):
+    """returns key of model structure (active constraints, objectives, and grey box
+    blocks), compiled nlp is reused while key does not change (see is_same_structure).
+    Key holds components themselves, so deleted components can't be mistaken for
+    new ones created at same address"""
+    return tuple(
+        tuple(_get_active(model, ctype))
+        for ctype in (Constraint, Objective, ExternalGreyBoxBlock)
+    )
+
+
+def is_same_structure(key, other_key):
+    """returns True if structure keys hold same components, components are compared
+    by identity, as == of pyomo components builds expressions"""
+    return all(
+        len(components) == len(other_components)
+        and all(a is b for a, b in zip(components, other_components))
+        for components, other_components in zip(key, other_key)
+    )
+
+
+class _ParametricNLP:
+    """Wraps compiled nlp, so variable bounds, initial values, and scaling are read from
+    model before each solve instead of compiled values"""
+
+    def __init__(self, nlp):
+        self._nlp = nlp
+        self.lb = nlp.primals_lb()
+        self.ub = nlp.primals_ub()
+        self.init = nlp.init_primals()
+        self.obj_scaling = 1.0
+        self.primals_scaling = np.ones(nlp.n_primals())
+        self.constraints_scaling = np.ones(nlp.n_constraints())
+
+    def __getattr__(self, attr):
+        return getattr(self._nlp, attr)
+
+    def primals_lb(self):
+        return self.lb
+
+    def primals_ub(self):
+        return self.ub
+
+    def init_primals(self):
+        return self.init
+
+    def get_obj_scaling(self):
+        return self.obj_scaling
+
+    def get_primals_scaling(self):
+        return self.primals_scaling
+
+    def get_constraints_scaling(self):
+        return self.constraints_scaling
+
+
+class CompiledNLP:
+    """Algebraic part of the model compiled once (through pynumero's ASL interface) and
+    reused for solves while model structure does not change, removing .nl writing and
+    ASL loading from each solve. Grey box blocks (Reaktoro) are evaluated through their
+    callbacks as usual.
+
+    Fixed variables that appear in active constraints with free variables are compiled as
+    variables whose bounds are set to their value before each solve (which ipopt treats
+    as fixed variables), so changing their values, or fixing and unfixing them, does not
+    require recompiling. Model is recompiled when set of active constraints, objectives,
+    or grey box blocks changes, when value of mutable param in active constraints changes,
+    or when variable excluded from compiled nlp (e.g. in constraint with only fixed
+    variables) is unfixed.
+
+    Args:
+        model: model (or block) to compile
+    """
+
+    def __init__(self, model):
+        self.model = model
+        with get_profiler().span("nlp_compile"):
+            self._compile()
+
+    def _compile(self):
+        model = self.model
+        parameter_vars = ComponentSet()
+        fixed_vars = ComponentSet()
+        self.mutable_params = ComponentSet()
+        objectives = _get_active(model, Objective)
+        for obj in _get_active(model, Constraint) + objectives:
+            body = obj.body if obj.ctype is Constraint else obj.expr
+            obj_vars = list(identify_variables(body, include_fixed=True))
+            obj_fixed = [v for v in obj_vars if v.fixed]
+            fixed_vars.update(obj_fixed)
+            if len(obj_fixed) < len(obj_vars):
+                parameter_vars.update(v for v in obj_fixed if v.value is not None)
+            exprs = [body]
+            if obj.ctype is Constraint:
+                exprs.extend([obj.lower, obj.upper])
+            for expr in exprs:
+                if expr is not None and type(expr) not in native_numeric_types:
+                    self.mutable_params.update(identify_mutable_parameters(expr))
+        for greybox in _get_active(model, ExternalGreyBoxBlock):
+            # pynumero does not support fixed grey box inputs or outputs
+            for v in list(greybox.inputs.values()) + list(greybox.outputs.values()):
+                if v.fixed:
+                    fixed_vars.add(v)
+                    parameter_vars.add(v)
+        self.excluded_vars = [v for v in fixed_vars if v not in parameter_vars]
+        self.mutable_params = list(self.mutable_params)
+        self.param_values = [value(p) for p in self.mutable_params]
+        self.structure_key = get_structure_key(model)
+
+        for v in parameter_vars:
+            v.unfix()
+        try:
+            nlp = PyomoNLPWithGreyBoxBlocks(model)
+        finally:
+            for v in parameter_vars:
+                v.fix()
+        self.nlp = _ParametricNLP(nlp)
+        root = model.model()
+        self.variables = [root.find_component(name) for name in nlp.primals_names()]
+        self.constraints = [
+            root.find_component(name) for name in nlp.constraint_names()
+        ]
+        self.pyomo_rows = np.array(
+            [isinstance(c, ConstraintData) for c in self.constraints], dtype=bool
+        )
+        # scaling of grey box constraints is provided by grey box models
+        self.base_constraints_scaling = nlp.get_constraints_scaling()
+        if self.base_constraints_scaling is None:
+            self.base_constraints_scaling = np.ones(nlp.n_constraints())
+        jac = nlp.evaluate_jacobian()
+        self.jacobian_structure = sparse.csr_matrix(
+            (np.ones(len(jac.data)), (jac.row, jac.col)), shape=jac.shape
+        )
+        self.solves = 0
+        _log.info(
+            f"Compiled NLP with {nlp.n_primals()} variables "
+            f"({len(parameter_vars)} parameters) and {nlp.n_constraints()} constraints"
+        )
+
+    def is_valid(self):
+        """returns True if compiled nlp is valid for current model structure"""
+        if any(not v.fixed for v in self.excluded_vars):
+            return False
+        if any(
+            value(p) != val for p, val in zip(self.mutable_params, self.param_values)
+        ):
+            return False
+        if not is_same_structure(get_structure_key(self.model), self.structure_key):
+            return False
+        # constraints with only fixed variables can't be solved by ipopt
+        free = np.array([not v.fixed for v in self.variables], dtype=float)
+        return bool(np.all(self.jacobian_structure @ free > 0))
+
+    def update(self, max_grad=100, min_scale=1e-8, autoscale=True):
+        """sets bounds, initial values, and scaling of compiled nlp from model"""
+        nlp = self.nlp
+        values = np.array(
+            [np.nan if v.value is None else v.value for v in self.variables]
+        )
+        fixed = np.array([v.fixed for v in self.variables], dtype=bool)
+        lb = np.array([-np.inf if v.lb is None else v.lb for v in self.variables])
+        ub = np.array([np.inf if v.ub is None else v.ub for v in self.variables])
+        lb[fixed] = values[fixed]
+        ub[fixed] = values[fixed]
+        # variables with no value start from previous solution
+        nlp.init = np.where(np.isnan(values), np.clip(nlp.init, lb, ub), values)
+        nlp.lb = lb
+        nlp.ub = ub
+
+        objective = _get_active(self.model, Objective)
+        nlp.obj_scaling = (
+            get_scaling_factor(objective[0], default=1) if len(objective) > 0 else 1.0
+        )
+        nlp.primals_scaling = np.array(
+            [get_scaling_factor(v, default=1) for v in self.variables]
+        )
+        scaling = np.copy(self.base_constraints_scaling)
+        unscaled = np.zeros(len(scaling), dtype=bool)
+        for i in np.flatnonzero(self.pyomo_rows):
+            sf = get_scaling_factor(self.constraints[i])
+            if sf is None:
+                unscaled[i] = True
+                scaling[i] = 1
+            else:
+                scaling[i] = sf
+        if autoscale and np.any(unscaled):
+            # same as ipopt-watertap, constraints without user scaling are scaled
+            # so that maximum gradient (with variable scaling) is below max_grad
+            nlp.set_primals(nlp.init)
+            jac = nlp.evaluate_jacobian().tocsr()
+            jac = abs(jac @ sparse.diags(1 / nlp.primals_scaling))
+            max_gradient = jac.max(axis=1).toarray().ravel()
+            autoscaled = unscaled & (max_gradient > max_grad)
+            scaling[autoscaled] = np.maximum(
+                min_scale, max_grad / max_gradient[autoscaled]
+            )
+        nlp.constraints_scaling = scaling
+
+    def load_solution(self, x, info):
+        fixed_values = [(v, v.value) for v in self.variables if v.fixed]
+        self.nlp.set_primals(x)
+        self.nlp.set_duals(info["mult_g"])
+        self.nlp.load_state_into_pyomo(
+            bound_multipliers=(info["mult_x_L"], info["mult_x_U"])
+        )
+        # keep fixed values exact
+        for v, val in fixed_values:
+            v.set_value(val, skip_validation=True)
+
+
+def get_compiled_nlp(model):
+    """returns compiled nlp of model, compiling it if model structure changed"""
+    compiled = getattr(model, "_compiled_nlp", None)
+    if compiled is None or not compiled.is_valid():
+        if compiled is not None:
+            _log.info("Model structure changed, recompiling NLP")
+        compiled = CompiledNLP(model)
+        model._compiled_nlp = compiled
+    return compiled
+
+
+class CompiledNLPSolver:
+    """Drop in replacement for cyipopt-watertap solver that solves model through
+    compiled nlp (see CompiledNLP), which is cached on the model and reused
+    across solves (e.g. sweep points) with only variable value, bound, or fixed
+    status changes.
+
+    Args:
+        options: ipopt options (e.g. options of solver from get_cyipopt_watertap_solver)
+    """
+
+    def __init__(self, options=None):
+        self.options = dict(options) if options is not None else {}
+
+    def solve(self, model, tee=False, **kwargs):
+        options = dict(DEFAULT_OPTIONS)
+        options.update(self.options)
+        max_grad = options.get("nlp_scaling_max_gradient", 100)
+        min_scale = options.get("nlp_scaling_min_value", 1e-8)
+        autoscale = not options.get("ignore_constraint_scaling", False)
+        for key in WATERTAP_OPTIONS:
+            options.pop(key, None)
+
+        compiled = get_compiled_nlp(model)
+        with get_profiler().span("nlp_update"):
+            compiled.update(max_grad=max_grad, min_scale=min_scale, autoscale=autoscale)
+        nlp = compiled.nlp
+        problem = CyIpoptNLP(nlp)
+        problem.set_problem_scaling(
+            nlp.get_obj_scaling(),
+            nlp.get_primals_scaling(),
+            nlp.get_constraints_scaling(),
+        )
+        if not nlp.has_hessian_support():
+            options["hessian_approximation"] = "limited-memory"
+        for key, val in options.items():
+            problem.add_option(key, val)
+
+        timer = TicTocTimer()
+        try:
+            with get_profiler().span("nlp_solve"):
+                with capture_output(sys.stdout if tee else None, capture_fd=True):
+                    x, info = problem.solve(nlp.init_primals())
+        finally:
+            problem.close()
+        wall_time = timer.toc(None)
+        compiled.solves += 1
+        compiled.load_solution(x, info)
+
+        results = SolverResults()
+        results.problem.name = model.name
+        results.problem.upper_bound = info["obj_val"]
+        results.problem.number_of_constraints = nlp.n_constraints()
+        results.problem.number_of_variables = nlp.n_primals()
+        results.solver.name = "cyipopt-compiled"
+        results.solver.return_code = info["status"]
+        results.solver.message = info["status_msg"]
+        results.solver.wallclock_time = wall_time
+        results.solver.termination_condition = IPOPT_TERMINATION_CONDITIONS.get(
+            info["status"], TerminationCondition.error
+        )
+        results.solver.status = TerminationCondition.to_solver_status(
+            results.solver.termination_condition
+        )
+        return results
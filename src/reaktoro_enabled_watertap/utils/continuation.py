@@ -0,0 +1,158 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+from pyomo.environ import Var
+from pyomo.common.collections import ComponentMap
+import idaes.logger as idaeslog
+
+__author__ = "Alexander V. Dudchenko"
+
+_log = idaeslog.getLogger(__name__)
+
+
+def _get_parameter_value(parameter):
+    if isinstance(parameter, tuple):
+        var, bound = parameter
+        return var.lb if bound == "lb" else var.ub
+    return parameter.value
+
+
+def _set_parameter_value(parameter, val):
+    if isinstance(parameter, tuple):
+        var, bound = parameter
+        if bound == "lb":
+            var.setlb(val)
+        else:
+            var.setub(val)
+    else:
+        parameter.fix(val)
+
+
+def _get_parameter_name(parameter):
+    if isinstance(parameter, tuple):
+        return f"{parameter[0].name}.{parameter[1]}"
+    return parameter.name
+
+
+def store_variable_values(m):
+    """returns map of all variable values in the model"""
+    values = ComponentMap()
+    for var in m.component_data_objects(Var, descend_into=True):
+        values[var] = var.value
+    return values
+
+
+def restore_variable_values(values):
+    for var, val in values.items():
+        var.set_value(val, skip_validation=True)
+
+
+def continuation_solve(
+    m,
+    solve_function,
+    targets,
+    step_init=0.1,
+    step_cut=0.5,
+    step_accel=0.5,
+    iter_target=20,
+    min_step=0.01,
+    max_step=1.0,
+    max_evaluations=50,
+    iteration_function=None,
+):
+    """Moves model from its current operating point to target values using
+    continuation (homotopy). All parameters are moved together along a single
+    homotopy parameter from 0 (current values) to 1 (targets). After a failed solve
+    the last converged solution is restored and step is cut by step_cut, after a
+    successful solve step is adjusted based on number of solver iterations
+    (step *= 1 + step_accel * (iter_target / iterations - 1)), so steps grow
+    when solves converge fast.
+
+    Args:
+        m: model to solve, should be at a converged solution
+        solve_function: function(m) that solves the model (should raise on failed solve)
+        targets: list of (parameter, target value) pairs, parameter can be a variable
+            (which is fixed to the target) or tuple of (variable, "lb" or "ub") to
+            move a variable bound (e.g. pressure or reagent dose bound)
+        step_init: initial homotopy step
+        step_cut: factor step is multiplied by after failed solve
+        step_accel: acceleration factor for step growth
+        iter_target: target number of solver iterations per step
+        min_step: minimum step, continuation fails if step is cut below it
+        max_step: maximum step
+        max_evaluations: maximum number of solves
+        iteration_function: function(m, result) returning number of solver iterations of
+            last solve, if not provided step is only grown by step_accel after each solve
+
+    Returns:
+        dict with number of solves, failed solves, total iterations, and
+        homotopy steps taken
+    """
+    start_values = [_get_parameter_value(parameter) for parameter, _ in targets]
+    for (parameter, _), start in zip(targets, start_values):
+        if start is None:
+            raise ValueError(
+                f"{_get_parameter_name(parameter)} has no value to start continuation from"
+            )
+
+    def set_homotopy_point(point):
+        for (parameter, target), start in zip(targets, start_values):
+            _set_parameter_value(parameter, start + point * (target - start))
+
+    stats = {"solves": 0, "failed_solves": 0, "iterations": 0, "steps": []}
+    point = 0
+    step = min(step_init, max_step)
+    converged_values = store_variable_values(m)
+    while point < 1:
+        if stats["solves"] >= max_evaluations:
+            set_homotopy_point(point)
+            restore_variable_values(converged_values)
+            raise RuntimeError(
+                f"Continuation reached maximum number of solves ({max_evaluations}) "
+                f"at homotopy point {point}"
+            )
+        next_point = min(point + step, 1)
+        set_homotopy_point(next_point)
+        stats["solves"] += 1
+        try:
+            result = solve_function(m)
+            solved = True
+        except Exception as e:
+            _log.info(f"Continuation solve failed at homotopy point {next_point}: {e}")
+            solved = False
+        if solved:
+            point = next_point
+            stats["steps"].append(point)
+            converged_values = store_variable_values(m)
+            iterations = None
+            if iteration_function is not None:
+                iterations = iteration_function(m, result)
+            if iterations:
+                stats["iterations"] += iterations
+                step *= 1 + step_accel * (iter_target / iterations - 1)
+            else:
+                step *= 1 + step_accel
+            step = max(min(step, max_step), min_step)
+            _log.info(
+                f"Continuation converged at homotopy point {point}, "
+                f"iterations: {iterations}, next step: {step}"
+            )
+        else:
+            stats["failed_solves"] += 1
+            restore_variable_values(converged_values)
+            if step <= min_step:
+                set_homotopy_point(point)
+                raise RuntimeError(
+                    f"Continuation failed, step cut below minimum step {min_step} "
+                    f"at homotopy point {point}"
+                )
+            step = max(step * step_cut, min_step)
+    return stats
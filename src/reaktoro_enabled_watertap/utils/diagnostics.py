@@ -0,0 +1,99 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+import logging
+from collections import deque
+from contextlib import contextmanager
+
+import idaes.logger as idaeslog
+
+__author__ = "Alexander V. Dudchenko"
+
+# all package loggers (idaeslog.getLogger(__name__)) are children of this logger
+PACKAGE_LOGGER_NAME = "reaktoro_enabled_watertap"
+
+
+def get_package_logger():
+    """returns package logger (logging.Logger underlying idaeslog adapter)"""
+    return idaeslog.getLogger(PACKAGE_LOGGER_NAME).logger
+
+
+def set_log_level(level):
+    """sets logging level of all package loggers (e.g. idaeslog.WARNING for
+    production sweeps, or idaeslog.DEBUG to enable diagnostics)"""
+    get_package_logger().setLevel(level)
+
+
+def enable_diagnostics(enabled=True):
+    """enables (or disables) expensive diagnostics, such as close to bounds scans after
+    solves, Reaktoro Jacobian scaling displays, and solver output during unit
+    initialization, by setting package logging level to DEBUG (or INFO)"""
+    set_log_level(idaeslog.DEBUG if enabled else idaeslog.INFO)
+
+
+def diagnostics_enabled():
+    """returns True if expensive diagnostics should be computed and reported"""
+    return get_package_logger().isEnabledFor(idaeslog.DEBUG)
+
+
+def get_tee(tee=None):
+    """returns tee, or if tee is None, whether diagnostics are enabled"""
+    return diagnostics_enabled() if tee is None else tee
+
+
+class _BufferHandler(logging.Handler):
+    """passes records at or above level to parent logger, and keeps last
+    buffer_size records below level in a buffer"""
+
+    def __init__(self, logger, level, buffer_size):
+        super().__init__()
+        self.logger = logger
+        self.pass_level = level
+        self.buffer = deque(maxlen=buffer_size)
+
+    def emit(self, record):
+        if record.levelno >= self.pass_level:
+            self.logger.parent.handle(record)
+        else:
+            self.buffer.append(record)
+
+    def flush_buffer(self):
+        while self.buffer:
+            self.logger.parent.handle(self.buffer.popleft())
+
+
+@contextmanager
+def quiet_logging(level=idaeslog.WARNING, buffer_size=1000):
+    """Context manager for production solves. Package records below level are kept
+    in a buffer of last buffer_size records instead of being reported, and are
+    reported only if an exception is raised within the context, so failed solves
+    can still be diagnosed. Diagnostics are disabled within the context.
+
+    Args:
+        level: minimum level of records that are reported immediately
+        buffer_size: number of buffered records kept for reporting on failure
+    """
+    logger = get_package_logger()
+    old_level = logger.level
+    old_propagate = logger.propagate
+    handler = _BufferHandler(logger, level, buffer_size)
+    logger.setLevel(min(level, idaeslog.INFO))
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        yield handler
+    except BaseException:
+        handler.flush_buffer()
+        raise
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(old_level)
+        logger.propagate = old_propagate
@@ -0,0 +1,198 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+import itertools
+
+from pyomo.environ import Block, Constraint, value
+from pyomo.common.collections import ComponentMap
+from pyomo.core.expr.visitor import identify_variables
+from pyomo.contrib.pynumero.interfaces.external_grey_box import ExternalGreyBoxBlock
+from idaes.core.util.model_statistics import degrees_of_freedom
+import idaes.logger as idaeslog
+
+from reaktoro_enabled_watertap.utils.diagnostics import diagnostics_enabled
+
+__author__ = "Alexander V. Dudchenko"
+
+_log = idaeslog.getLogger(__name__)
+
+
+def _is_equality(con):
+    # same definition as idaes activated_equalities_generator
+    return (
+        con.upper is not None
+        and con.lower is not None
+        and value(con.upper) == value(con.lower)
+    )
+
+
+class DOFTracker:
+    """Tracks degrees of freedom of a block (same definition as idaes
+    degrees_of_freedom: unfixed variables in active equality constraints and grey box
+    blocks minus number of active equalities) without walking constraint expressions
+    on every check.
+
+    Variables of each equality constraint are identified once, and number of active
+    equalities referencing each variable is updated incrementally when constraints are
+    activated or deactivated. Fixing or unfixing variables only requires reading
+    fixed flags of variables in active equalities. Changes made directly on the model
+    (v.fix(), c.deactivate()) are picked up on next check, while added or deleted
+    components (or members of indexed components) trigger full rebuild of tracker.
+    Constraint expressions replaced in place (c.set_value()) are not detected. When
+    diagnostics are enabled (see utils.diagnostics), each check is cross-checked
+    against full idaes computation.
+
+    Args:
+        block: block to track
+    """
+
+    def __init__(self, block):
+        self.block = block
+        self.rebuilds = -1
+        self.rebuild()
+
+    def _get_blocks(self):
+        return list(
+            itertools.chain(
+                [self.block],
+                self.block.component_data_objects(
+                    (Block, ExternalGreyBoxBlock), descend_into=True
+                ),
+            )
+        )
+
+    def _get_structure_stamp(self):
+        # number of declared components of each block and number of members of its
+        # constraints and sub-blocks, changes when components are added or deleted,
+        # or indexed components gain or lose members (e.g. ConstraintList.add)
+        return [
+            (
+                len(blk._decl),
+                [
+                    len(comp)
+                    for comp in blk.component_objects(
+                        (Constraint, Block, ExternalGreyBoxBlock), descend_into=False
+                    )
+                ],
+            )
+            for blk in self.blocks
+        ]
+
+    def rebuild(self):
+        """identifies variables in all equality constraints and grey box blocks of block"""
+        self.blocks = self._get_blocks()
+        self.block_active = [blk.active for blk in self.blocks]
+        self.structure_stamp = self._get_structure_stamp()
+        self.constraint_vars = ComponentMap()
+        self.constraint_active = ComponentMap()
+        self.var_count = ComponentMap()
+        self.n_equalities = 0
+        active_blocks = itertools.chain(
+            [self.block],
+            self.block.component_data_objects(Block, active=True, descend_into=True),
+        )
+        for blk in active_blocks:
+            # constraints of deactivated blocks are not tracked, as activating
+            # block triggers rebuild
+            for con in blk.component_data_objects(
+                Constraint, active=None, descend_into=False
+            ):
+                if not _is_equality(con):
+                    continue
+                self.constraint_vars[con] = None
+                self.constraint_active[con] = False
+                if con.active:
+                    self._activate(con)
+        for grey_box in self.block.component_data_objects(
+            ExternalGreyBoxBlock, active=True, descend_into=True
+        ):
+            self.n_equalities += len(grey_box.outputs)
+            self.n_equalities += grey_box.get_external_model().n_equality_constraints()
+            for v in itertools.chain(
+                grey_box.inputs.values(), grey_box.outputs.values()
+            ):
+                self.var_count[v] = self.var_count.get(v, 0) + 1
+        self.rebuilds += 1
+
+    def _get_constraint_vars(self, con):
+        if self.constraint_vars[con] is None:
+            self.constraint_vars[con] = list(identify_variables(con.body))
+        return self.constraint_vars[con]
+
+    def _activate(self, con):
+        self.constraint_active[con] = True
+        self.n_equalities += 1
+        for v in self._get_constraint_vars(con):
+            self.var_count[v] = self.var_count.get(v, 0) + 1
+
+    def _deactivate(self, con):
+        self.constraint_active[con] = False
+        self.n_equalities -= 1
+        for v in self._get_constraint_vars(con):
+            self.var_count[v] -= 1
+            if self.var_count[v] == 0:
+                del self.var_count[v]
+
+    def activate(self, con):
+        """activates constraint (data or indexed) and updates tracked equalities"""
+        con.activate()
+        self._update_constraints(con.values() if con.is_indexed() else [con])
+
+    def deactivate(self, con):
+        """deactivates constraint (data or indexed) and updates tracked equalities"""
+        con.deactivate()
+        self._update_constraints(con.values() if con.is_indexed() else [con])
+
+    def _update_constraints(self, constraints):
+        for con in constraints:
+            if con not in self.constraint_active:
+                continue
+            if con.active and not self.constraint_active[con]:
+                self._activate(con)
+            elif not con.active and self.constraint_active[con]:
+                self._deactivate(con)
+
+    def _sync(self):
+        if self._get_structure_stamp() != self.structure_stamp or any(
+            blk.active != active for blk, active in zip(self.blocks, self.block_active)
+        ):
+            self.rebuild()
+        else:
+            self._update_constraints(self.constraint_active.keys())
+
+    def degrees_of_freedom(self):
+        """returns degrees of freedom of tracked block"""
+        self._sync()
+        dofs = sum(1 for v in self.var_count.keys() if not v.fixed) - self.n_equalities
+        if diagnostics_enabled():
+            full_dofs = degrees_of_freedom(self.block)
+            if full_dofs != dofs:
+                _log.warning(
+                    f"Tracked degrees of freedom of {self.block.name} ({dofs}) do not "
+                    f"match full computation ({full_dofs}), rebuilding tracker"
+                )
+                self.rebuild()
+                return full_dofs
+        return dofs
+
+
+def get_dof_tracker(block):
+    """returns DOFTracker of block, creating it on first use"""
+    tracker = getattr(block, "_dof_tracker", None)
+    if tracker is None:
+        tracker = DOFTracker(block)
+        block._dof_tracker = tracker
+    return tracker
+
+
+def get_degrees_of_freedom(block):
+    """returns degrees of freedom of block using its DOFTracker (see DOFTracker)"""
+    return get_dof_tracker(block).degrees_of_freedom()
@@ -0,0 +1,223 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+import math
+import time
+import idaes.logger as idaeslog
+
+from reaktoro_enabled_watertap.utils.structure_fingerprint import ArtifactCache
+
+__author__ = "Alexander V. Dudchenko"
+
+_log = idaeslog.getLogger(__name__)
+
+# Hessian options tested in stability study
+# (analysis_scripts/softening_acid_ro/data_generation/stability_sweep.yaml)
+HESSIAN_CANDIDATES = {
+    "lmt_sc1": {
+        "rkt_hessian_type": "limited-memory",
+        "bfgs_initialization_type": "scalar1",
+    },
+    "zero_hs": {
+        "rkt_hessian_type": "ZeroHessian",
+        "bfgs_initialization_type": "scalar1",
+    },
+    "gauss_newton": {
+        "rkt_hessian_type": "GaussNewton",
+        "bfgs_initialization_type": "scalar1",
+    },
+    "lbfgs_sc1": {"rkt_hessian_type": "LBFGS", "bfgs_initialization_type": "scalar1"},
+    "lbfgs_gn": {
+        "rkt_hessian_type": "LBFGS",
+        "bfgs_initialization_type": "GaussNewton",
+    },
+    "bfgs_sc1": {"rkt_hessian_type": "BFGS", "bfgs_initialization_type": "scalar1"},
+    "bfgs_gn": {"rkt_hessian_type": "BFGS", "bfgs_initialization_type": "GaussNewton"},
+    "cbfgs_sc1": {"rkt_hessian_type": "CBFGS", "bfgs_initialization_type": "scalar1"},
+    "cbfgs_gn": {
+        "rkt_hessian_type": "CBFGS",
+        "bfgs_initialization_type": "GaussNewton",
+    },
+    "bfgs_damp_sc1": {
+        "rkt_hessian_type": "BFGS_damp",
+        "bfgs_initialization_type": "scalar1",
+    },
+    "bfgs_damp_gn": {
+        "rkt_hessian_type": "BFGS_damp",
+        "bfgs_initialization_type": "GaussNewton",
+    },
+    "bfgs_ipopt_sc1": {
+        "rkt_hessian_type": "BFGS_ipopt",
+        "bfgs_initialization_type": "scalar1",
+    },
+    "bfgs_ipopt_gn": {
+        "rkt_hessian_type": "BFGS_ipopt",
+        "bfgs_initialization_type": "GaussNewton",
+    },
+}
+
+DEFAULT_HESSIAN_OPTIONS = HESSIAN_CANDIDATES["lbfgs_gn"]
+
+# name of tuning results in artifact cache
+TUNING_ARTIFACT = "hessian_tuning"
+
+
+def load_tuned_hessian_options(fingerprint, cache=None):
+    """returns hessian options tuned for models with structure fingerprint
+    (see utils.structure_fingerprint), or None if such model was not tuned
+
+    Args:
+        fingerprint: structure fingerprint of model
+        cache: ArtifactCache with tuning results (default ArtifactCache())
+    """
+    if cache is None:
+        cache = ArtifactCache()
+    tuning_result = cache.load(fingerprint, TUNING_ARTIFACT)
+    if tuning_result is None:
+        return None
+    return {
+        "rkt_hessian_type": tuning_result["rkt_hessian_type"],
+        "bfgs_initialization_type": tuning_result["bfgs_initialization_type"],
+    }
+
+
+def save_tuned_hessian_options(fingerprint, tuning_result, cache=None):
+    """stores tuning result (see race_hessian_options) for models with structure
+    fingerprint in artifact cache (default ArtifactCache())"""
+    if cache is None:
+        cache = ArtifactCache()
+    cache.save(fingerprint, TUNING_ARTIFACT, tuning_result)
+
+
+def race_hessian_options(
+    build_function,
+    initialize_function,
+    solve_function,
+    set_operating_point,
+    operating_points,
+    candidates=None,
+    time_limit_factor=3.0,
+    cleanup_function=None,
+):
+    """Races hessian options over a set of operating points. Candidates are raced one
+    at a time, so only one model (and its reaktoro workers) is alive at a time, and
+    are ranked by convergence rate and then by total time to solution (including
+    initialization). Cumulative results of each candidate after every operating point
+    are compared to those of the best candidate so far, candidate is stopped once it
+    solved fewer operating points than the best one, or is slower than
+    time_limit_factor x the best one, and its model is cleaned up before the next
+    candidate is built.
+
+    Args:
+        build_function: function that takes hessian options (rkt_hessian_type, bfgs_initialization_type)
+            as kwargs and returns a model
+        initialize_function: function that initializes the model
+        solve_function: function that solves the model (should raise on failed solve)
+        set_operating_point: function(m, point) that sets operating point (e.g. water recovery)
+        operating_points: list of operating points to race over
+        candidates: dict of candidate hessian options (default HESSIAN_CANDIDATES)
+        time_limit_factor: candidates slower than this factor times best one are stopped
+        cleanup_function: function called on model of each candidate after it was raced
+            (e.g. to terminate workers)
+
+    Returns:
+        dict with selected options and per candidate results
+    """
+    if candidates is None:
+        candidates = HESSIAN_CANDIDATES
+    results = {
+        name: {"time": 0.0, "solved": 0, "attempted": 0, "status": "racing"}
+        for name in candidates
+    }
+    # cumulative (solved, time) of each candidate after every operating point
+    history = {name: [] for name in candidates}
+    best = None
+
+    def _convergence_rate(result):
+        if result["attempted"] == 0:
+            return 0
+        return result["solved"] / result["attempted"]
+
+    def _rank_key(name):
+        return (-_convergence_rate(results[name]), results[name]["time"])
+
+    def _get_elimination(name):
+        """returns status of candidate name if it is beaten by best candidate at any
+        operating point it was raced at, or None"""
+        for point, (solved, solve_time), (best_solved, best_time) in zip(
+            operating_points, history[name], history[best]
+        ):
+            if solved < best_solved:
+                return f"failed at {point}"
+            if solve_time > best_time * time_limit_factor:
+                return f"too slow at {point}"
+        return None
+
+    for name, options in candidates.items():
+        ts = time.perf_counter()
+        model = None
+        try:
+            model = build_function(**options)
+            initialize_function(model)
+        except Exception as e:
+            _log.warning(f"Hessian option {name} failed to initialize: {e}")
+            results[name]["status"] = "failed initialization"
+        results[name]["time"] += time.perf_counter() - ts
+        if results[name]["status"] == "racing":
+            for point in operating_points:
+                ts = time.perf_counter()
+                results[name]["attempted"] += 1
+                try:
+                    set_operating_point(model, point)
+                    solve_function(model)
+                    results[name]["solved"] += 1
+                except Exception as e:
+                    _log.info(f"Hessian option {name} failed at {point}: {e}")
+                results[name]["time"] += time.perf_counter() - ts
+                history[name].append((results[name]["solved"], results[name]["time"]))
+                if best is not None:
+                    status = _get_elimination(name)
+                    if status is not None:
+                        results[name]["status"] = status
+                        break
+        if model is not None and cleanup_function is not None:
+            cleanup_function(model)
+        if results[name]["status"] != "racing":
+            continue
+        if results[name]["solved"] == 0:
+            results[name]["status"] = "failed all operating points"
+        elif best is None or _rank_key(name) < _rank_key(best):
+            previous_best, best = best, name
+            if previous_best is not None:
+                results[previous_best]["status"] = (
+                    _get_elimination(previous_best) or "eliminated"
+                )
+        else:
+            results[name]["status"] = "eliminated"
+        _log.info(f"Hessian racing: {name} raced, best option {best}")
+
+    if best is None:
+        _log.warning(
+            f"No hessian option solved any operating point, using default {DEFAULT_HESSIAN_OPTIONS}"
+        )
+        selected_options = DEFAULT_HESSIAN_OPTIONS
+    else:
+        selected_options = candidates[best]
+        results[best]["status"] = "selected"
+    for name in results:
+        results[name]["convergence_rate"] = _convergence_rate(results[name])
+    return {
+        "selected": best,
+        "rkt_hessian_type": selected_options["rkt_hessian_type"],
+        "bfgs_initialization_type": selected_options["bfgs_initialization_type"],
+        "operating_points": list(operating_points),
+        "results": results,
+    }
@@ -0,0 +1,99 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+import os
+import json
+import math
+import idaes.logger as idaeslog
+
+__author__ = "Alexander V. Dudchenko"
+
+_log = idaeslog.getLogger(__name__)
+
+# bin width of features, entries in same bin replace each other
+DEFAULT_BIN_WIDTH = 0.1  # log10 units
+PH_BIN_WIDTH = 0.25
+
+
+def get_composition_features(flow_mol_phase_comp, pH=None):
+    """returns features used to look up initial guesses, which include
+    log10 of water flow, log10 of each solute to water molar ratio (captures TDS
+    and composition), and pH
+
+    Args:
+        flow_mol_phase_comp: indexed flow_mol_phase_comp var of chemistry input state
+        pH: pH var of chemistry input state
+    """
+    water_flow = flow_mol_phase_comp["Liq", "H2O"].value
+    features = {"H2O": math.log10(max(water_flow, 1e-20))}
+    for (phase, comp), var in flow_mol_phase_comp.items():
+        if comp != "H2O":
+            features[comp] = math.log10(max(var.value / water_flow, 1e-20))
+    if pH is not None:
+        features["pH"] = pH.value
+    return features
+
+
+def _get_bin(features):
+    return tuple(
+        (
+            key,
+            round(val / (PH_BIN_WIDTH if key == "pH" else DEFAULT_BIN_WIDTH)),
+        )
+        for key, val in sorted(features.items())
+    )
+
+
+class InitialGuessTable:
+    """Table of converged chemistry states binned by composition, TDS and pH.
+    Entries are stored per unit (e.g. fs.softening_unit) and store values of
+    variables the unit registered for seeding (reaktoro block variables and outputs,
+    precipitate flows, etc.), lookup returns values of nearest entry.
+
+    Args:
+        table_file: json file to load table from and save it to
+    """
+
+    def __init__(self, table_file=None):
+        self.table_file = table_file
+        self.entries = {}
+        if table_file is not None and os.path.exists(table_file):
+            with open(table_file, "r") as f:
+                self.entries = json.load(f)
+            _log.info(f"Loaded initial guess table from {table_file}")
+
+    def add(self, key, features, values):
+        """adds entry for unit key, replacing existing entry in the same feature bin"""
+        entries = self.entries.setdefault(key, [])
+        entry_bin = _get_bin(features)
+        entries[:] = [e for e in entries if _get_bin(e["features"]) != entry_bin]
+        entries.append({"features": dict(features), "values": dict(values)})
+
+    def lookup(self, key, features):
+        """returns values of nearest entry for unit key (or None if there are none)"""
+        nearest = None
+        nearest_distance = None
+        for entry in self.entries.get(key, []):
+            if set(entry["features"]) != set(features):
+                continue
+            distance = sum((entry["features"][k] - features[k]) ** 2 for k in features)
+            if nearest_distance is None or distance < nearest_distance:
+                nearest, nearest_distance = entry, distance
+        if nearest is None:
+            return None
+        return nearest["values"]
+
+    def save(self, table_file=None):
+        if table_file is None:
+            table_file = self.table_file
+        os.makedirs(os.path.dirname(os.path.abspath(table_file)), exist_ok=True)
+        with open(table_file, "w") as f:
+            json.dump(self.entries, f, indent=1)
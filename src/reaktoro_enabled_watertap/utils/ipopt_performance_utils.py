@@ -12,9 +12,12 @@
 
 import re
 import sys
+import idaes.logger as idaeslog
 
 __author__ = "Alexander V. Dudchenko"
 
+_log = idaeslog.getLogger(__name__)
+
 
 def get_ipopt_performance_data(solver_output_file):
     """process ipopt output file to extract performance data
@@ -98,7 +101,7 @@ def _parse_ipopt_output(output):
                     try:
                         iter_data[key] = float(iter_data[key])
                     except (ValueError, TypeError):
-                        print(
+                        _log.warning(
                             "Error converting Ipopt log entry to "
                             f"float:\n\t{sys.exc_info()[1]}\n\t{line}"
                         )
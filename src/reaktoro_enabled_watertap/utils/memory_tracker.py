@@ -0,0 +1,234 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+import os
+import gc
+import sys
+import json
+import subprocess
+from contextlib import contextmanager
+import idaes.logger as idaeslog
+
+__author__ = "Alexander V. Dudchenko"
+
+_log = idaeslog.getLogger(__name__)
+
+MB = 1024**2
+
+
+def _get_windows_rss():
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    get_process_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+    get_process_memory_info.argtypes = [
+        wintypes.HANDLE,
+        ctypes.POINTER(PROCESS_MEMORY_COUNTERS),
+        wintypes.DWORD,
+    ]
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    get_process_memory_info(process, ctypes.byref(counters), counters.cb)
+    return counters.WorkingSetSize
+
+
+def get_rss():
+    """returns current resident set size of current process in bytes (read from
+    /proc on linux, working set size on windows, and ps on other systems, e.g. mac)"""
+    if sys.platform.startswith("linux"):
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    if sys.platform == "win32":
+        return _get_windows_rss()
+    # ps reports rss in KB
+    rss = subprocess.run(
+        ["ps", "-o", "rss=", "-p", str(os.getpid())],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return int(rss.strip()) * 1024
+
+
+def teardown_model(m):
+    """Terminates reaktoro workers and removes all components from the model, so
+    reaktoro systems, gray-box models and worker pipes it holds can be released"""
+    if m.find_component("reaktoro_manager") is not None:
+        m.reaktoro_manager.terminate_workers()
+        del m.reaktoro_manager
+    m.clear()
+    gc.collect()
+
+
+class MemoryTracker:
+    """Tracks resident memory of build/initialize/solve/teardown phases, and
+    memory after every sweep point.
+
+    Example:
+        tracker = MemoryTracker()
+        with tracker.phase("build"):
+            m = build_model()
+        tracker.record_point()
+        tracker.report()
+    """
+
+    def __init__(self):
+        self.phases = []
+        self.points = []
+
+    @contextmanager
+    def phase(self, name):
+        rss_start = get_rss()
+        try:
+            yield
+        finally:
+            rss_end = get_rss()
+            self.phases.append(
+                {"phase": name, "rss_start": rss_start, "rss_end": rss_end}
+            )
+            _log.debug(f"{name}: {(rss_end - rss_start) / MB:.1f} MB")
+
+    def record_point(self):
+        """records memory after a sweep point, returns current rss"""
+        rss = get_rss()
+        self.points.append(rss)
+        return rss
+
+    def get_phase_growth(self):
+        """returns dict of phase name and total, mean, and max memory growth (bytes)"""
+        growth = {}
+        for data in self.phases:
+            growth.setdefault(data["phase"], []).append(
+                data["rss_end"] - data["rss_start"]
+            )
+        return {
+            name: {
+                "calls": len(vals),
+                "total": sum(vals),
+                "mean": sum(vals) / len(vals),
+                "max": max(vals),
+            }
+            for name, vals in growth.items()
+        }
+
+    def report(self):
+        _log.info("------------Memory growth per phase------------")
+        _log.info(f"{'Phase':<20}{'Calls':>8}{'Total (MB)':>14}{'Mean (MB)':>14}")
+        for name, growth in self.get_phase_growth().items():
+            _log.info(
+                f"{name:<20}{growth['calls']:>8}{growth['total'] / MB:>14.2f}"
+                f"{growth['mean'] / MB:>14.2f}"
+            )
+        if len(self.points) > 0:
+            _log.info(
+                f"Sweep points: {len(self.points)}, first: {self.points[0] / MB:.1f} MB, "
+                f"last: {self.points[-1] / MB:.1f} MB, max: {max(self.points) / MB:.1f} MB"
+            )
+
+    def save(self, file_name):
+        with open(file_name, "w") as f:
+            json.dump(
+                {
+                    "phase_growth": self.get_phase_growth(),
+                    "phases": self.phases,
+                    "points": self.points,
+                },
+                f,
+                indent=1,
+            )
+
+
+class MemoryLeanSweep:
+    """Wraps build, initialize, and optimize functions passed to loopTool so that
+    previously built model is torn down before a new one is built, memory is tracked
+    for every phase and sweep point, and workers are restarted when memory is above
+    threshold.
+
+    Args:
+        build_function: loopTool build function
+        initialize_function: loopTool initialize function
+        optimize_function: loopTool optimize function
+        teardown_function: function(m) that releases model resources (default teardown_model)
+        restart_function: function(m) that restarts reaktoro workers, called after a sweep
+            point if rss is above rss_threshold
+        rss_threshold: memory threshold in MB for restarting workers (None to disable)
+        tracker: MemoryTracker to record memory in (a new one is created if not provided)
+    """
+
+    def __init__(
+        self,
+        build_function,
+        initialize_function,
+        optimize_function,
+        teardown_function=teardown_model,
+        restart_function=None,
+        rss_threshold=None,
+        tracker=None,
+    ):
+        self.build_function = build_function
+        self.initialize_function = initialize_function
+        self.optimize_function = optimize_function
+        self.teardown_function = teardown_function
+        self.restart_function = restart_function
+        self.rss_threshold = rss_threshold
+        self.tracker = tracker if tracker is not None else MemoryTracker()
+        self.model = None
+        self.restarts = 0
+
+    def teardown(self):
+        if self.model is not None:
+            with self.tracker.phase("teardown"):
+                self.teardown_function(self.model)
+            self.model = None
+
+    def build(self, *args, **kwargs):
+        self.teardown()
+        with self.tracker.phase("build"):
+            self.model = self.build_function(*args, **kwargs)
+        return self.model
+
+    def initialize(self, m, *args, **kwargs):
+        with self.tracker.phase("initialize"):
+            return self.initialize_function(m, *args, **kwargs)
+
+    def optimize(self, m, *args, **kwargs):
+        try:
+            with self.tracker.phase("solve"):
+                return self.optimize_function(m, *args, **kwargs)
+        finally:
+            rss = self.tracker.record_point()
+            if (
+                self.rss_threshold is not None
+                and self.restart_function is not None
+                and rss > self.rss_threshold * MB
+            ):
+                _log.warning(
+                    f"Memory {rss / MB:.1f} MB above threshold {self.rss_threshold} MB, "
+                    "restarting workers"
+                )
+                with self.tracker.phase("restart"):
+                    self.restart_function(m)
+                self.restarts += 1
@@ -0,0 +1,180 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+import sys
+import json
+import functools
+from time import perf_counter
+from contextlib import contextmanager
+
+__author__ = "Alexander V. Dudchenko"
+
+
+class _Span:
+    __slots__ = ("name", "time", "calls", "children")
+
+    def __init__(self, name):
+        self.name = name
+        self.time = 0.0
+        self.calls = 0
+        self.children = {}
+
+    def self_time(self):
+        return self.time - sum(child.time for child in self.children.values())
+
+
+class PhaseProfiler:
+    """Hierarchical timer for build, scaling, initialization, and solve phases.
+    Spans with the same name under the same parent are merged, so profiler only
+    stores time and number of calls per call path and can be left on during sweeps.
+
+    Example:
+        profiler = get_profiler()
+        with profiler.span("initialize"):
+            m.fs.feed.initialize()
+        profiler.report()
+        profiler.save_flamegraph("profile.folded")
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        self.root = _Span("root")
+        self._stack = [self.root]
+
+    def is_active(self, *names):
+        """returns True if names are the innermost open spans"""
+        if len(self._stack) <= len(names):
+            return False
+        return tuple(span.name for span in self._stack[-len(names) :]) == names
+
+    @contextmanager
+    def span(self, *names):
+        """times code inside context, multiple names open nested spans
+        (e.g. span(unit_name, phase))"""
+        if not self.enabled or self.is_active(*names):
+            yield
+            return
+        spans = []
+        for name in names:
+            parent = self._stack[-1]
+            node = parent.children.get(name)
+            if node is None:
+                node = parent.children[name] = _Span(name)
+            self._stack.append(node)
+            spans.append(node)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            for node in spans:
+                node.time += elapsed
+                node.calls += 1
+            del self._stack[-len(spans) :]
+
+    def profiled(self, name=None):
+        """decorator that times every call of a function"""
+
+        def decorator(func):
+            span_name = func.__name__ if name is None else name
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def iter_spans(self):
+        """yields call path (tuple of span names) and span for all recorded spans"""
+        pending = [((), self.root)]
+        while pending:
+            path, node = pending.pop()
+            for name, child in reversed(list(node.children.items())):
+                child_path = path + (name,)
+                yield child_path, child
+                pending.append((child_path, child))
+
+    def get_summary(self):
+        """returns list of dicts with path, calls, total and self time (s) of each span,
+        sorted by total time"""
+        summary = [
+            {
+                "path": ";".join(path),
+                "calls": span.calls,
+                "total": span.time,
+                "self": span.self_time(),
+            }
+            for path, span in self.iter_spans()
+        ]
+        return sorted(summary, key=lambda row: row["total"], reverse=True)
+
+    def get_phase_totals(self):
+        """returns self time (s) and calls of each span name summed over all call
+        paths, e.g. total time spent in initialize_unit of all units"""
+        totals = {}
+        for path, span in self.iter_spans():
+            data = totals.setdefault(path[-1], {"calls": 0, "self": 0.0})
+            data["calls"] += span.calls
+            data["self"] += span.self_time()
+        return totals
+
+    def report(self, max_rows=40, ostream=None):
+        """writes table of call paths with calls, total and self time"""
+        if ostream is None:
+            ostream = sys.stdout
+        ostream.write("------------Phase profile------------\n")
+        ostream.write(f"{'Span':<70}{'Calls':>8}{'Total (s)':>12}{'Self (s)':>12}\n")
+        for row in self.get_summary()[:max_rows]:
+            path = row["path"]
+            if len(path) > 68:
+                path = "..." + path[-65:]
+            ostream.write(
+                f"{path:<70}{row['calls']:>8}{row['total']:>12.3f}{row['self']:>12.3f}\n"
+            )
+
+    def save_flamegraph(self, file_name):
+        """saves self time of each call path in folded stack format (microseconds),
+        which can be loaded by flamegraph.pl, speedscope, or inferno"""
+        with open(file_name, "w") as f:
+            for path, span in self.iter_spans():
+                self_time = int(round(span.self_time() * 1e6))
+                if self_time > 0:
+                    f.write(f"{';'.join(path)} {self_time}\n")
+
+    def save(self, file_name):
+        with open(file_name, "w") as f:
+            json.dump(
+                {
+                    "summary": self.get_summary(),
+                    "phase_totals": self.get_phase_totals(),
+                },
+                f,
+                indent=1,
+            )
+
+
+_profiler = PhaseProfiler()
+
+
+def get_profiler():
+    """returns profiler shared by flowsheet units and flowsheet helpers"""
+    return _profiler
+
+
+def profiled(name=None):
+    """decorator that times every call of a function with shared profiler"""
+    return _profiler.profiled(name)
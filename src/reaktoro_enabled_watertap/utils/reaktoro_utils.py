@@ -13,16 +13,109 @@
 from pyomo.environ import (
     value,
     Var,
+    Param,
+    Expression,
     Constraint,
     units as pyunits,
 )
 
+import numpy as np
 
 import idaes.core.util.scaling as iscale
 
 __author__ = "Alexander V. Dudchenko"
 
 
+class CompiledCatalog:
+    """Numeric form of a reagent or precipitant catalog, with molecular weights and
+    properties stored as arrays and stoichiometry as a dense (entry x ion) matrix,
+    so unit models can compute scaling and constraint coefficients without
+    iterating nested dicts or converting pyomo units.
+
+    Args:
+        names: reagent (or precipitant) names, one per matrix row
+        ions: ion names, one per matrix column
+        mw: molecular weights (kg/mol)
+        stoichiometry: matrix of moles of ion per mole of entry
+        properties: additional per entry arrays (e.g. purity, solvent_ratio)
+    """
+
+    def __init__(self, names, ions, mw, stoichiometry, **properties):
+        self.names = list(names)
+        self.ions = list(ions)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.ion_index = {ion: i for i, ion in enumerate(self.ions)}
+        self.mw = np.asarray(mw, dtype=float)
+        self.stoichiometry = np.asarray(stoichiometry, dtype=float).reshape(
+            len(self.names), len(self.ions)
+        )
+        self.properties = {
+            key: np.asarray(val, dtype=float) for key, val in properties.items()
+        }
+
+    def __getitem__(self, key):
+        return self.properties[key]
+
+    def __len__(self):
+        return len(self.names)
+
+    def select(self, names):
+        """returns catalog with only selected entries (in given order) and the ions
+        they contain"""
+        rows = [self.index[name] for name in names]
+        stoichiometry = self.stoichiometry[rows]
+        columns = np.flatnonzero(np.any(stoichiometry != 0, axis=0))
+        return CompiledCatalog(
+            [self.names[i] for i in rows],
+            [self.ions[i] for i in columns],
+            self.mw[rows],
+            stoichiometry[:, columns],
+            **{key: val[rows] for key, val in self.properties.items()},
+        )
+
+    def get_stoichiometry(self, name):
+        """returns dict of ion and moles for an entry"""
+        row = self.stoichiometry[self.index[name]]
+        return {self.ions[i]: row[i] for i in np.flatnonzero(row)}
+
+    def get_ion_scales(self, entry_scales):
+        """returns per ion scaling factors derived from per entry scaling factors
+        (entry_scale / stoichiometry), where entries share an ion the scale of the
+        last entry is used, ions not in any entry are nan"""
+        ion_scales = np.full(len(self.ions), np.nan)
+        for row, entry_scale in zip(self.stoichiometry, entry_scales):
+            mask = row != 0
+            ion_scales[mask] = entry_scale / row[mask]
+        return ion_scales
+
+
+def _to_kg_per_mol(mw):
+    return value(pyunits.convert(mw, pyunits.kg / pyunits.mol))
+
+
+def _compile_catalog(catalog, stoichiometry_key, **properties):
+    names = list(catalog.keys())
+    ions = []
+    for options in catalog.values():
+        for ion in options[stoichiometry_key]:
+            if ion not in ions:
+                ions.append(ion)
+    stoichiometry = np.zeros((len(names), len(ions)))
+    for i, options in enumerate(catalog.values()):
+        for ion, stoich in options[stoichiometry_key].items():
+            stoichiometry[i, ions.index(ion)] = stoich
+    return CompiledCatalog(
+        names,
+        ions,
+        [_to_kg_per_mol(options["mw"]) for options in catalog.values()],
+        stoichiometry,
+        **{
+            key: [func(name, options) for name, options in catalog.items()]
+            for key, func in properties.items()
+        },
+    )
+
+
 class ViableReagentsBase(dict):
     """class for tracking reagents and creating approriate constraints to handle non-pure reagents"""
 
@@ -78,6 +171,7 @@ class ViableReagentsBase(dict):
             # ratio on mol to mol basis
             solvent_ratio = mols_solvent / mols_reagent
             dissolution_stoichiometric[solvent[0]] = solvent_ratio + _solvent_adjust
+        self._compiled = None
         self[reagent] = {
             "mw": mw,
             "dissolution_stoichiometric": dissolution_stoichiometric,
@@ -105,6 +199,62 @@ class ViableReagentsBase(dict):
                 "solvent_ratio": solvent_ratio,  # for reaktoro only - we need to know extra water, reaktoro handles dissociation for us
             }
 
+    def compile(self):
+        """returns CompiledCatalog of registered reagents with purity adjusted mw,
+        stoichiometry (including solvent), solvent ratio, purity, dose limits (ppm),
+        density (kg/m3) and cost (nan if not provided), catalog is compiled once and
+        reused until a new reagent is registered"""
+        if getattr(self, "_compiled", None) is None:
+            solvents = getattr(self, "solvents", {})
+            self._compiled = _compile_catalog(
+                self,
+                "dissolution_stoichiometric",
+                purity=lambda name, options: options["purity"],
+                solvent_ratio=lambda name, options: (
+                    solvents[name]["solvent_ratio"] if name in solvents else 0
+                ),
+                min_dose=lambda name, options: options["min_dose"],
+                max_dose=lambda name, options: options["max_dose"],
+                density_reagent=lambda name, options: value(
+                    pyunits.convert(
+                        options["density_reagent"], pyunits.kg / pyunits.m**3
+                    )
+                ),
+                cost=lambda name, options: (
+                    np.nan if options["cost"] is None else options["cost"]
+                ),
+            )
+        return self._compiled
+
+    def get_acid_equivalents(self, property_package):
+        """returns mols of H+ released (acids, positive) or consumed (bases, negative)
+        per mol of each reagent, charge released by dissolved ions is balanced by H+
+        (or OH-), ions not in property_package are treated as neutral"""
+        acid_equivalents = {}
+        for reagent, options in self.items():
+            acid_equivalents[reagent] = -sum(
+                value(property_package.charge_comp[ion]) * mols
+                for ion, mols in options["dissolution_stoichiometric"].items()
+                if ion in property_package.charge_comp
+            )
+        return acid_equivalents
+
+    def get_acids(self, property_package):
+        """returns list of reagents that release H+ (see get_acid_equivalents)"""
+        return [
+            reagent
+            for reagent, eq in self.get_acid_equivalents(property_package).items()
+            if eq > 0
+        ]
+
+    def get_bases(self, property_package):
+        """returns list of reagents that consume H+ (see get_acid_equivalents)"""
+        return [
+            reagent
+            for reagent, eq in self.get_acid_equivalents(property_package).items()
+            if eq < 0
+        ]
+
     def get_reaktoro_chemistry_modifiers(self):
         """Return a dictionary of reaktoro chemistry modifiers"""
         if hasattr(self, "modifier"):
@@ -176,6 +326,56 @@ class ViableReagentsBase(dict):
         else:
             return None
 
+    def create_sparsity_penalty(
+        self,
+        block,
+        reagent_dose,
+        penalty,
+        penalty_units=pyunits.dimensionless,
+        smoothing_dose=1e-3,
+    ):
+        """Create a smooth penalty on number of reagents in use, for selecting
+        reagents in superstructure mode
+
+        This will create a mutable parameter (reagent_sparsity_weight) and an expression
+        (reagent_sparsity_penalty) equal to sum of weight*dose/(dose+smoothing_dose) over
+        reagents, which approaches weight for every reagent with dose well above
+        smoothing_dose and zero for unused reagents.
+
+        Args:
+            block: block to add penalty to
+            reagent_dose: indexed reagent dose var (kg/m3)
+            penalty: penalty per used reagent, single value or dict with value per reagent
+            penalty_units: units of penalty (should match objective it is added to)
+            smoothing_dose: dose at which half of penalty is applied (kg/m3)
+        """
+        if not isinstance(penalty, dict):
+            penalty = {reagent: penalty for reagent in reagent_dose}
+        block.add_component(
+            "reagent_sparsity_weight",
+            Param(
+                list(reagent_dose.keys()),
+                initialize={
+                    reagent: penalty.get(reagent, 0) for reagent in reagent_dose
+                },
+                mutable=True,
+                units=penalty_units,
+            ),
+        )
+        smoothing_dose = smoothing_dose * pyunits.kg / pyunits.m**3
+        block.add_component(
+            "reagent_sparsity_penalty",
+            Expression(
+                expr=sum(
+                    block.reagent_sparsity_weight[reagent]
+                    * reagent_dose[reagent]
+                    / (reagent_dose[reagent] + smoothing_dose)
+                    for reagent in reagent_dose
+                )
+            ),
+        )
+        return block.reagent_sparsity_penalty
+
     def scale_solvent_vars_and_constraints(self, block):
         for solvent, info in self.solvent_info.items():
             sfs = []
@@ -256,6 +456,7 @@ class ViablePrecipitantsBase(dict):
 
         """
 
+        self._compiled = None
         self[precipitant] = {
             "mw": mw,
             "precipitation_stoichiometric": precipitation_stoichiometric,
@@ -263,6 +464,14 @@ class ViablePrecipitantsBase(dict):
             "reaktoro_modifier": reaktoro_modifier,
         }
 
+    def compile(self):
+        """returns CompiledCatalog of registered precipitants with mw and
+        precipitation stoichiometry, catalog is compiled once and reused until a new
+        precipitant is registered"""
+        if getattr(self, "_compiled", None) is None:
+            self._compiled = _compile_catalog(self, "precipitation_stoichiometric")
+        return self._compiled
+
 
 class ReaktoroOptionsContainer(dict):
     """Container for storing reaktoro options and providing simple methods for updating
@@ -0,0 +1,238 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+from pyomo.common.formatting import tabular_writer
+from pyomo.core.base.var import VarData
+from pyomo.environ import (
+    value,
+    units as pyunits,
+)
+from idaes.core.util.units_of_measurement import report_quantity
+import numpy as np
+import csv
+import json
+import sys
+
+__author__ = "Alexander V. Dudchenko"
+
+SNAPSHOT_DTYPE = np.dtype(
+    [
+        ("section", object),
+        ("key", object),
+        ("value", np.float64),
+        ("units", object),
+        ("fixed", object),
+        ("bounds", object),
+        ("is_int", np.bool_),
+    ]
+)
+
+
+class ReportUnitCache(dict):
+    """Cache of units per reported entry, keyed by (section, key), each entry holds
+    (model units, reporting units, conversion factor to reporting units)"""
+
+    def get_units(self, label, obj, use_default_units):
+        if label not in self:
+            self[label] = self._build_units(obj)
+        model_units, reporting_units, factor = self[label]
+        if use_default_units:
+            return reporting_units, factor
+        return model_units, 1.0
+
+    def _build_units(self, obj):
+        model_units = pyunits.get_units(obj)
+        if model_units is None:
+            model_units = pyunits.dimensionless
+        # pyomo units do not support offset units, so conversion is a scale factor
+        reporting_quantity = report_quantity(1 * model_units)
+        return str(model_units), str(reporting_quantity.u), reporting_quantity.m
+
+
+def _get_fixed_state(v):
+    """Get the fixed state of a variable, if none exists then return N/A"""
+    try:
+        return v.fixed
+    except AttributeError:
+        return "N/A"
+
+
+def _get_bounds(v):
+    """Get the bounds of a variable, if none exists then return N/A"""
+    try:
+        return v.bounds
+    except AttributeError:
+        return "N/A"
+
+
+def _get_value(v):
+    """Get the value of a reported object, vars are read directly,
+    expressions are evaluated, returns nan if value is not available"""
+    if isinstance(v, VarData):
+        val = v.value
+    else:
+        val = value(v, exception=False)
+    if val is None:
+        return np.nan
+    return val
+
+
+class ReportSnapshot:
+    """Holds reported values for a single unit in a numpy record array, values are read
+    from the model once, and text/CSV/JSON outputs are rendered from the snapshot
+    without touching the model again
+
+    Args:
+        unit_name: Name of the unit
+        records: numpy record array with SNAPSHOT_DTYPE
+    """
+
+    def __init__(self, unit_name, records):
+        self.unit_name = unit_name
+        self.records = records
+
+    def sections(self):
+        """returns sections in order they were reported"""
+        return list(dict.fromkeys(self.records["section"]))
+
+    def to_dict(self):
+        """returns nested dict of section -> key -> data"""
+        data = {}
+        for row in self.records:
+            value = None if np.isnan(row["value"]) else row["value"]
+            if row["is_int"] and value is not None:
+                value = int(value)
+            data.setdefault(row["section"], {})[str(row["key"])] = {
+                "value": value,
+                "units": row["units"],
+                "fixed": row["fixed"],
+                "bounds": row["bounds"],
+            }
+        return data
+
+    def to_json(self, ostream=None, **kwargs):
+        """writes snapshot as json to ostream (or returns a json string if ostream is None)"""
+        data = {self.unit_name: self.to_dict()}
+        if ostream is None:
+            return json.dumps(data, default=str, **kwargs)
+        json.dump(data, ostream, default=str, **kwargs)
+
+    def to_csv(self, ostream, write_header=True):
+        """writes snapshot as csv rows (unit, section, key, value, units, fixed, bounds)"""
+        writer = csv.writer(ostream)
+        if write_header:
+            writer.writerow(
+                ["Unit", "Section", "Key", "Value", "Units", "Fixed", "Bounds"]
+            )
+        for row in self.records:
+            writer.writerow(
+                [
+                    self.unit_name,
+                    row["section"],
+                    row["key"],
+                    row["value"],
+                    row["units"],
+                    row["fixed"],
+                    row["bounds"],
+                ]
+            )
+
+    def to_text(self, ostream=None, prefix=""):
+        """writes snapshot as text table, matching build_report_table output"""
+
+        def get_values(k, row):
+            if row["is_int"]:
+                return [int(row["value"]), row["units"], "N/A", "N/A"]
+            if np.isnan(row["value"]):
+                # same behavior as tabular_writer when value is not available
+                raise ValueError(f"No value for {k}")
+            return [
+                "{:#.5g}".format(row["value"]),
+                row["units"],
+                row["fixed"],
+                row["bounds"],
+            ]
+
+        if ostream is None:
+            ostream = sys.stdout
+        max_str_length = 84
+        tab = " " * 4
+        ostream.write("\n" + "-" * max_str_length + "\n")
+        ostream.write(f"{prefix}{tab}{self.unit_name} state")
+        ostream.write("\n" * 2)
+        for section in self.sections():
+            rows = self.records[self.records["section"] == section]
+            ostream.write(f"{prefix}{tab}{section}: \n")
+            tabular_writer(
+                ostream,
+                prefix + tab,
+                ((row["key"], row) for row in rows),
+                ("Value", "Units", "Fixed", "Bounds"),
+                get_values,
+            )
+            ostream.write(f"\n")
+
+        ostream.write("-" * max_str_length + "\n")
+
+
+def take_report_snapshot(
+    unit_name, data_dict, use_default_units=False, unit_cache=None
+):
+    """Reads all values in data_dict (same format as used by build_report_table) into
+    a ReportSnapshot
+
+    Args:
+        unit_name: Name of the unit
+        data_dict: Dictionary containing data to report
+        use_default_units: Boolean to indicate if default reporting units should be used
+        unit_cache: ReportUnitCache to reuse units between snapshots
+            (a new one is created if not provided)
+    """
+    if unit_cache is None:
+        unit_cache = ReportUnitCache()
+    sections = []
+    keys = []
+    objs = []
+    for section, sub_data in data_dict.items():
+        for key, obj in sub_data.items():
+            sections.append(section)
+            keys.append(key)
+            objs.append(obj)
+
+    records = np.empty(len(objs), dtype=SNAPSHOT_DTYPE)
+    for i, (section, key) in enumerate(zip(sections, keys)):
+        # assign per entry, as keys can be tuples (e.g. indexed vars)
+        records["section"][i] = section
+        records["key"][i] = key
+    records["value"] = np.fromiter(
+        (_get_value(obj) for obj in objs), dtype=np.float64, count=len(objs)
+    )
+    is_int = np.fromiter(
+        (isinstance(obj, int) for obj in objs), dtype=np.bool_, count=len(objs)
+    )
+    is_number = is_int | np.fromiter(
+        (isinstance(obj, float) for obj in objs), dtype=np.bool_, count=len(objs)
+    )
+    records["is_int"] = is_int
+    factors = np.ones(len(objs))
+    for i, obj in enumerate(objs):
+        if is_number[i]:
+            records["units"][i] = "dimensionless"
+            records["fixed"][i] = "N/A"
+            records["bounds"][i] = "N/A"
+            continue
+        records["units"][i], factors[i] = unit_cache.get_units(
+            (sections[i], keys[i]), obj, use_default_units
+        )
+        records["fixed"][i] = _get_fixed_state(obj)
+        records["bounds"][i] = _get_bounds(obj)
+    records["value"] = records["value"] * factors
+    return ReportSnapshot(unit_name, records)
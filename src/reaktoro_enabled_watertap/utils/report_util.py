@@ -11,9 +11,13 @@
 #################################################################################
 from pyomo.common.formatting import tabular_writer
 from pyomo.environ import (
+    ConcreteModel,
     value,
     units as pyunits,
 )
+from pyomo.contrib.incidence_analysis.scc_solver import (
+    solve_strongly_connected_components,
+)
 import sys
 from idaes.core.util.units_of_measurement import report_quantity
 
@@ -27,6 +31,57 @@ def get_lib_path():
     return pathlib.Path(reaktoro_enabled_watertap.__file__).parent.resolve()
 
 
+def build_evaluation_state(state):
+    """Builds a detached copy of a state block in its own model, so on-demand
+    properties can be evaluated for reporting without adding variables and
+    constraints to the model being solved.
+
+    Args:
+        state: State block data to create an evaluation copy of
+
+    Returns:
+        standalone ConcreteModel with evaluation state block on eval_model.state[0]
+        (reference to the model should be kept, as state data only weakly references it)
+    """
+    eval_model = ConcreteModel()
+    eval_model.state = state.params.build_state_block([0], defined_state=True)
+    return eval_model
+
+
+def get_state_values(state):
+    """returns tuple of state variable values of state block data, used to detect
+    if state changed (e.g. by a solve) since its properties were evaluated"""
+    return tuple(
+        state_var[idx].value
+        for state_var in state.define_state_vars().values()
+        for idx in state_var
+    )
+
+
+def evaluate_state_properties(state, eval_model, properties):
+    """Copies state variable values from state into the evaluation state, constructs
+    requested properties on it and evaluates them by solving the
+    square property system block by block (no NLP solver required).
+
+    Args:
+        state: State block data holding current solution
+        eval_model: Detached model built by build_evaluation_state
+        properties: list of property names to evaluate (e.g. conc_mass_phase_comp)
+
+    Returns:
+        evaluation state block data with evaluated properties
+    """
+    eval_state = eval_model.state[0]
+    for state_var in state.define_state_vars().values():
+        eval_var = eval_state.component(state_var.local_name)
+        for idx in state_var:
+            eval_var[idx].fix(value(state_var[idx]))
+    for prop in properties:
+        getattr(eval_state, prop)
+    solve_strongly_connected_components(eval_model)
+    return eval_state
+
+
 def build_report_table(
     unit_name, data_dict, ostream=None, prefix="", use_default_units=False
 ):
@@ -1,8 +1,11 @@
 from pyomo.util.calc_var_value import calculate_variable_from_constraint
 
 import idaes.core.util.scaling as iscale
+import idaes.logger as idaeslog
 from pyomo.environ import value
 
+_log = idaeslog.getLogger(__name__)
+
 
 def calculate_scale_from_dependent_vars(var, constraint, dependent_vars):
     """
@@ -43,13 +46,13 @@ def calculate_scale_from_dependent_vars(var, constraint, dependent_vars):
     if iscale.get_scaling_factor(var) is None:
         iscale.set_scaling_factor(var, scale)
     else:
-        print("Skiping, as scaling far already existsf for ", var.name)
+        _log.debug("Skipping, as scaling factor already exists for %s", var.name)
     if iscale.get_constraint_transform_applied_scaling_factor(constraint) is None:
         iscale.constraint_scaling_transform(constraint, scale)
     else:
-        print(
-            "Skiping, as scaling far already existsf for ",
-            var.name,
+        _log.debug(
+            "Skipping, as scaling factor already exists for %s (%s)",
+            constraint.name,
             iscale.get_constraint_transform_applied_scaling_factor(constraint),
         )
     for v, (initial_values, fixed_states) in zip(
@@ -142,10 +145,10 @@ def scale_costing_block(costing_block):
     operating_costing_factor = 1 / (
         1 / operating_costing_factor + 1 / capital_costing_factor * 0.03
     )  # account for small fixed cost due to capital cost
-    print("Capital cost scaling factor: ", capital_costing_factor)
-    print("Operating cost scaling factor: ", operating_costing_factor)
-    print("Variable cost scaling factor: ", variable_costing_factor)
-    print("Flow cost types: ", flow_cost_types)
+    _log.debug("Capital cost scaling factor: %s", capital_costing_factor)
+    _log.debug("Operating cost scaling factor: %s", operating_costing_factor)
+    _log.debug("Variable cost scaling factor: %s", variable_costing_factor)
+    _log.debug("Flow cost types: %s", flow_cost_types)
     # iscale.set_scaling_factor(costing_block.electricity_cost, 100)
 
     iscale.set_scaling_factor(costing_block.utilization_factor, 1)
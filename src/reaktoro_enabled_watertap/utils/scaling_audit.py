@@ -0,0 +1,337 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+import sys
+import math
+
+import numpy as np
+from scipy import sparse
+from pyomo.environ import Block, Constraint
+from pyomo.common.collections import ComponentMap, ComponentSet
+from pyomo.core.expr.visitor import identify_variables
+from pyomo.core.expr.calculus.derivatives import differentiate, Modes
+from pyomo.contrib.pynumero.interfaces.external_grey_box import ExternalGreyBoxBlock
+import idaes.core.util.scaling as iscale
+import idaes.logger as idaeslog
+
+from reaktoro_enabled_watertap.utils.phase_profiler import get_profiler
+
+__author__ = "Alexander V. Dudchenko"
+
+_log = idaeslog.getLogger(__name__)
+
+
+def _badness(max_entry, min_entry):
+    # orders of magnitude that extreme entries are away from 1
+    if max_entry == 0 or not np.isfinite(max_entry):
+        return math.inf
+    return max(abs(math.log10(max_entry)), abs(math.log10(min_entry)))
+
+
+class ScalingAudit:
+    """Audits scaling of model at current point. Builds Jacobian of active constraints
+    with respect to free variables (including Reaktoro grey box outputs), scaled
+    the same way as cyipopt-watertap solver scales it (variable and constraint
+    scaling factors, with unscaled constraints autoscaled to max_grad), and ranks
+    rows and columns by badness: number of orders of magnitude that their largest or
+    smallest non-zero scaled entry is away from 1. Each row and column is attributed
+    to unit it belongs to and to how its scaling was set.
+
+    Args:
+        model: model to audit
+        units: unit blocks rows and columns are attributed to (defaults to
+            model.flowsheet_unit_order, or blocks on model.fs or model)
+        include_grey_box: if True, Jacobian of grey box blocks is evaluated and included
+        max_grad: maximum gradient used for autoscaling unscaled constraints
+        min_scale: minimum autoscaled constraint scaling factor
+    """
+
+    def __init__(
+        self, model, units=None, include_grey_box=True, max_grad=100, min_scale=1e-8
+    ):
+        self.model = model
+        if units is None:
+            units = getattr(model, "flowsheet_unit_order", None)
+        if units is None:
+            flowsheet = model.find_component("fs")
+            units = list(
+                (flowsheet if flowsheet is not None else model).component_data_objects(
+                    Block, descend_into=False
+                )
+            )
+        self.units = ComponentSet(units)
+        self.include_grey_box = include_grey_box
+        self.max_grad = max_grad
+        self.min_scale = min_scale
+        with get_profiler().span("scaling_audit"):
+            self._build()
+
+    def get_unit(self, component):
+        """returns name of unit component belongs to"""
+        block = component.parent_block()
+        while block is not None:
+            if block in self.units:
+                return block.name
+            block = block.parent_block()
+        return self.model.name
+
+    def _get_column(self, var):
+        if var not in self.column_index:
+            self.column_index[var] = len(self.variables)
+            self.variables.append(var)
+        return self.column_index[var]
+
+    def _add_row(self, component, columns, entries, scaling, source):
+        row = len(self.rows)
+        self.rows.append(
+            {
+                "name": component.name,
+                "unit": self.get_unit(component),
+                "scaling_source": source,
+                "component": component,
+            }
+        )
+        self.row_scaling.append(scaling)
+        self.jac_rows.extend([row] * len(columns))
+        self.jac_cols.extend(columns)
+        self.jac_data.extend(entries)
+
+    def _add_constraint(self, con):
+        free_vars = [v for v in identify_variables(con.body) if not v.fixed]
+        if len(free_vars) == 0:
+            return
+        columns = [self._get_column(v) for v in free_vars]
+        try:
+            entries = differentiate(
+                con.body, wrt_list=free_vars, mode=Modes.reverse_numeric
+            )
+        except (ValueError, ZeroDivisionError, OverflowError) as e:
+            _log.warning(f"Failed to evaluate Jacobian of {con.name}: {e}")
+            entries = [math.nan] * len(free_vars)
+        sf = iscale.get_scaling_factor(con)
+        if iscale.get_constraint_transform_applied_scaling_factor(con) is not None:
+            source = "constraint_scaling_transform"
+        elif sf is not None:
+            source = "set_scaling_factor"
+        else:
+            source = "autoscaling"
+        self._add_row(con, columns, entries, sf, source)
+
+    def _add_grey_box(self, block):
+        model = block.get_external_model()
+        inputs = list(block.inputs.values())
+        outputs = list(block.outputs.values())
+        model.set_input_values(np.array([v.value for v in inputs], dtype=float))
+        # fixed inputs are not columns of Jacobian
+        input_columns = [None if v.fixed else self._get_column(v) for v in inputs]
+        if model.n_outputs() > 0:
+            # output constraints are output - f(inputs) = 0
+            jac = model.evaluate_jacobian_outputs().tocsr()
+            scaling = model.get_output_constraint_scaling_factors()
+            for i, output in enumerate(outputs):
+                row = jac.getrow(i)
+                free = np.array(
+                    [input_columns[j] is not None for j in row.indices], dtype=bool
+                )
+                self._add_row(
+                    output,
+                    [self._get_column(output)]
+                    + [input_columns[j] for j in row.indices[free]],
+                    [1.0] + list(-row.data[free]),
+                    None if scaling is None else scaling[i],
+                    "grey box",
+                )
+        if model.n_equality_constraints() > 0:
+            jac = model.evaluate_jacobian_equality_constraints().tocsr()
+            scaling = model.get_equality_constraint_scaling_factors()
+            for i in range(model.n_equality_constraints()):
+                row = jac.getrow(i)
+                free = np.array(
+                    [input_columns[j] is not None for j in row.indices], dtype=bool
+                )
+                self._add_row(
+                    block,
+                    [input_columns[j] for j in row.indices[free]],
+                    list(row.data[free]),
+                    None if scaling is None else scaling[i],
+                    "grey box",
+                )
+
+    def _build(self):
+        self.rows = []
+        self.row_scaling = []
+        self.variables = []
+        self.column_index = ComponentMap()
+        self.jac_rows = []
+        self.jac_cols = []
+        self.jac_data = []
+        for con in self.model.component_data_objects(
+            Constraint, active=True, descend_into=True
+        ):
+            self._add_constraint(con)
+        if self.include_grey_box:
+            for block in self.model.component_data_objects(
+                ExternalGreyBoxBlock, active=True, descend_into=True
+            ):
+                self._add_grey_box(block)
+        shape = (len(self.rows), len(self.variables))
+        self.jacobian = sparse.csr_matrix(
+            (self.jac_data, (self.jac_rows, self.jac_cols)), shape=shape
+        )
+        self.variable_scaling = np.array(
+            [iscale.get_scaling_factor(v, default=1) for v in self.variables]
+        )
+        self.columns = [
+            {
+                "name": v.name,
+                "unit": self.get_unit(v),
+                "scaling_source": (
+                    "set_scaling_factor"
+                    if iscale.get_scaling_factor(v) is not None
+                    else "unscaled"
+                ),
+                "component": v,
+            }
+            for v in self.variables
+        ]
+        jac = self.jacobian @ sparse.diags(1 / self.variable_scaling)
+        row_max = abs(jac).max(axis=1).toarray().ravel() if shape[1] > 0 else []
+        scaling = np.ones(shape[0])
+        for i, sf in enumerate(self.row_scaling):
+            if sf is not None:
+                scaling[i] = sf
+            elif row_max[i] > self.max_grad:
+                # same as cyipopt-watertap, unscaled rows with large gradients are scaled
+                scaling[i] = max(self.min_scale, self.max_grad / row_max[i])
+        self.constraint_scaling = scaling
+        self.scaled_jacobian = abs(sparse.diags(scaling) @ jac).tocsr()
+        self.scaled_jacobian.eliminate_zeros()
+        self._rank(self.rows, self.scaled_jacobian)
+        self._rank(self.columns, self.scaled_jacobian.T.tocsr())
+
+    def _rank(self, entries, jac):
+        for i, entry in enumerate(entries):
+            data = jac.data[jac.indptr[i] : jac.indptr[i + 1]]
+            if len(data) == 0:
+                entry.update(max=0.0, min=0.0, badness=math.inf)
+                continue
+            entry["max"] = float(np.max(data))
+            entry["min"] = float(np.min(data))
+            entry["badness"] = _badness(entry["max"], entry["min"])
+
+    def get_worst_rows(self, n=10):
+        """returns n rows with highest badness"""
+        return sorted(self.rows, key=lambda r: -r["badness"])[:n]
+
+    def get_worst_columns(self, n=10):
+        """returns n columns with highest badness"""
+        return sorted(self.columns, key=lambda c: -c["badness"])[:n]
+
+    def get_unit_summary(self):
+        """returns dict of unit names with number of rows and columns and their
+        highest badness"""
+        summary = {}
+        for kind, entries in (("rows", self.rows), ("columns", self.columns)):
+            for entry in entries:
+                unit = summary.setdefault(
+                    entry["unit"],
+                    {"rows": 0, "columns": 0, "max_badness": 0.0},
+                )
+                unit[kind] += 1
+                unit["max_badness"] = max(unit["max_badness"], entry["badness"])
+        return summary
+
+    def get_jacobian_spread(self):
+        """returns orders of magnitude between largest and smallest scaled entry"""
+        data = self.scaled_jacobian.data
+        data = data[np.isfinite(data)]
+        if len(data) == 0:
+            return 0.0
+        return math.log10(np.max(data) / np.min(data))
+
+    def display(self, n=10, ostream=None):
+        """prints summary of units and n worst rows and columns"""
+        if ostream is None:
+            ostream = sys.stdout
+        ostream.write(
+            f"Scaled Jacobian: {len(self.rows)} rows, {len(self.columns)} columns, "
+            f"{self.scaled_jacobian.nnz} non-zeros, "
+            f"spread {self.get_jacobian_spread():.1f} orders of magnitude\n"
+        )
+        ostream.write("\nUnit summary:\n")
+        for unit, data in sorted(
+            self.get_unit_summary().items(), key=lambda x: -x[1]["max_badness"]
+        ):
+            ostream.write(
+                f"  {unit}: rows {data['rows']}, columns {data['columns']}, "
+                f"max badness {data['max_badness']:.2f}\n"
+            )
+        for title, entries in (
+            ("rows", self.get_worst_rows(n)),
+            ("columns", self.get_worst_columns(n)),
+        ):
+            ostream.write(f"\nWorst {title} (badness, max, min, scaling, unit):\n")
+            for entry in entries:
+                ostream.write(
+                    f"  {entry['badness']:6.2f} {entry['max']:10.3e} "
+                    f"{entry['min']:10.3e} {entry['scaling_source']:28s} "
+                    f"{entry['unit']}: {entry['name']}\n"
+                )
+
+    def apply_geometric_mean_scaling(self, n_rows=10, n_columns=10, threshold=2):
+        """Rescales up to n_rows worst constraints and n_columns worst variables with
+        badness above threshold, so geometric mean of their largest and smallest scaled
+        entries is 1. Grey box rows are skipped, as their scaling is set by grey
+        box model. Model should be audited again after correction, as column and
+        row corrections also change entries of other rows and columns.
+
+        Returns:
+            dict of corrected component names and new scaling factors
+        """
+        corrected = {}
+        for i, row in enumerate(self.rows):
+            row["index"] = i
+        for j, col in enumerate(self.columns):
+            col["index"] = j
+        for row in self.get_worst_rows(n_rows):
+            if row["badness"] <= threshold or not np.isfinite(row["badness"]):
+                continue
+            if row["scaling_source"] == "grey box":
+                continue
+            sf = self.constraint_scaling[row["index"]] / math.sqrt(
+                row["max"] * row["min"]
+            )
+            iscale.set_scaling_factor(row["component"], sf)
+            corrected[row["name"]] = sf
+        for col in self.get_worst_columns(n_columns):
+            if col["badness"] <= threshold or not np.isfinite(col["badness"]):
+                continue
+            sf = self.variable_scaling[col["index"]] * math.sqrt(
+                col["max"] * col["min"]
+            )
+            iscale.set_scaling_factor(col["component"], sf)
+            corrected[col["name"]] = sf
+        _log.info(f"Corrected scaling of {len(corrected)} components")
+        return corrected
+
+
+def audit_scaling(model, n=10, correct=False, ostream=None, **kwargs):
+    """Audits scaling of model (see ScalingAudit), prints n worst rows and columns, and
+    if correct is True applies geometric mean scaling to them
+
+    Returns:
+        ScalingAudit
+    """
+    audit = ScalingAudit(model, **kwargs)
+    audit.display(n, ostream=ostream)
+    if correct:
+        audit.apply_geometric_mean_scaling(n_rows=n, n_columns=n)
+    return audit
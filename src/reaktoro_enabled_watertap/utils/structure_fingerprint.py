@@ -0,0 +1,185 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+import os
+import json
+import enum
+import hashlib
+import tempfile
+import itertools
+
+from pyomo.environ import Var, Constraint, Objective, Block
+from pyomo.common.config import ConfigDict, ConfigList
+from pyomo.common.numeric_types import native_numeric_types
+from pyomo.core.base.component import ComponentBase
+from pyomo.core.base.units_container import units as pyunits
+import idaes.logger as idaeslog
+
+from reaktoro_enabled_watertap.utils.phase_profiler import get_profiler
+
+__author__ = "Alexander V. Dudchenko"
+
+_log = idaeslog.getLogger(__name__)
+
+# environment variable that overrides default cache directory
+CACHE_DIR_ENV = "REAKTORO_WATERTAP_CACHE_DIR"
+
+
+def _serialize_config(val, ignore=()):
+    """returns json serializable description of config value, numeric values are
+    replaced by their type, as only structure of configuration is fingerprinted,
+    and entries with keys in ignore are skipped"""
+    if isinstance(val, (ConfigDict, dict)):
+        return {
+            str(key): _serialize_config(v, ignore)
+            for key, v in val.items()
+            if key not in ignore
+        }
+    if isinstance(val, ConfigList):
+        return [_serialize_config(v, ignore) for v in val.value()]
+    if isinstance(val, (list, tuple, set)):
+        items = [_serialize_config(v, ignore) for v in val]
+        return sorted(items, key=str) if isinstance(val, set) else items
+    if val is None or isinstance(val, (bool, str)):
+        return val
+    if isinstance(val, enum.Enum):
+        return str(val)
+    if type(val) in native_numeric_types:
+        return type(val).__name__
+    if isinstance(val, ComponentBase):
+        return f"component:{val.name}"
+    if hasattr(val, "is_expression_type"):
+        # quantities with units (e.g. 300 * pyunits.mg / pyunits.L)
+        return f"quantity:{pyunits.get_units(val)}"
+    if callable(val):
+        return f"callable:{getattr(val, '__qualname__', type(val).__name__)}"
+    return f"object:{type(val).__name__}"
+
+
+def _iter_structure(model, ignore_config=()):
+    for comp in model.component_objects(descend_into=True):
+        entry = [comp.ctype.__name__, comp.getname(fully_qualified=True)]
+        if comp.is_indexed():
+            entry.append([str(index) for index in comp.keys()])
+        if comp.ctype in (Constraint, Objective, Block):
+            entry.append([bool(data.active) for data in comp.values()])
+        elif comp.ctype is Var:
+            entry.append([bool(data.fixed) for data in comp.values()])
+        yield entry
+    for blk in itertools.chain(
+        [model], model.component_data_objects(Block, descend_into=True)
+    ):
+        config = getattr(blk, "config", None)
+        if isinstance(config, ConfigDict):
+            yield [
+                "config",
+                blk.getname(fully_qualified=True),
+                _serialize_config(config, ignore_config),
+            ]
+
+
+def get_structure_fingerprint(model, extra=None, ignore_config=None):
+    """Returns structural fingerprint (sha256 hex digest) of model. Fingerprint covers
+    component names and types, index sets, active status of blocks, constraints, and
+    objectives, fixed status of variables, and configuration of unit models and
+    Reaktoro blocks (species, phases, activity models, database, etc.). Values of
+    variables and numeric configuration options are not included, so models built
+    for different feeds with the same structure share a fingerprint.
+
+    Args:
+        model: model (or block) to fingerprint
+        extra: json serializable data added to fingerprint (e.g. build options
+            not reflected in model structure)
+        ignore_config: configuration keys excluded from fingerprint at any level
+            (e.g. ["hessian_options"] for solver options of Reaktoro blocks)
+    """
+    if ignore_config is None:
+        ignore_config = ()
+    with get_profiler().span("structure_fingerprint"):
+        digest = hashlib.sha256()
+        for entry in _iter_structure(model, set(ignore_config)):
+            digest.update(json.dumps(entry, sort_keys=True, default=str).encode())
+        if extra is not None:
+            digest.update(json.dumps(extra, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+
+def get_default_cache_dir():
+    """returns cache directory set by REAKTORO_WATERTAP_CACHE_DIR environment variable,
+    or reaktoro_enabled_watertap folder in user cache directory"""
+    if os.environ.get(CACHE_DIR_ENV):
+        return os.environ[CACHE_DIR_ENV]
+    cache_home = os.environ.get(
+        "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+    )
+    return os.path.join(cache_home, "reaktoro_enabled_watertap")
+
+
+class ArtifactCache:
+    """Local cache of build artifacts (e.g. scaling factors, sparsity patterns, or
+    tuned options) keyed by model structure fingerprint, so any layer can check if an
+    artifact for a model with the same structure exists before building it. Artifacts
+    are stored as json files in cache_dir/fingerprint/name.json.
+
+    Args:
+        cache_dir: cache directory (defaults to get_default_cache_dir())
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir if cache_dir is not None else get_default_cache_dir()
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, fingerprint, name):
+        return os.path.join(self.cache_dir, fingerprint, f"{name}.json")
+
+    def has(self, fingerprint, name):
+        return os.path.exists(self.path(fingerprint, name))
+
+    def load(self, fingerprint, name):
+        """returns stored artifact, or None if artifact is not in cache"""
+        file_name = self.path(fingerprint, name)
+        if not os.path.exists(file_name):
+            self.misses += 1
+            return None
+        try:
+            with open(file_name, "r") as f:
+                artifact = json.load(f)
+        except (OSError, ValueError) as e:
+            _log.warning(f"Failed to load cached {name} from {file_name}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return artifact
+
+    def save(self, fingerprint, name, artifact):
+        """stores json serializable artifact, file is replaced atomically so
+        parallel workers can share cache directory"""
+        file_name = self.path(fingerprint, name)
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(file_name), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(artifact, f)
+            os.replace(tmp_file, file_name)
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+        _log.debug(f"Cached {name} for model {fingerprint[:12]}")
+
+    def get_or_create(self, fingerprint, name, create_function):
+        """returns cached artifact, or creates it with create_function() and stores it"""
+        artifact = self.load(fingerprint, name)
+        if artifact is None:
+            artifact = create_function()
+            self.save(fingerprint, name, artifact)
+        return artifact
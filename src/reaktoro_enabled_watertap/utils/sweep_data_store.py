@@ -0,0 +1,325 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+import os
+import json
+import shutil
+import hashlib
+import fnmatch
+import numpy as np
+import h5py
+import idaes.logger as idaeslog
+
+__author__ = "Alexander V. Dudchenko"
+
+_log = idaeslog.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+SOLVE_SUCCESSFUL_KEY = "solve_successful"
+
+
+def get_store_path(h5_file):
+    """returns default columnar store location for a loopTool h5 file"""
+    return os.path.splitext(str(h5_file))[0] + "_columnar"
+
+
+def _decode(item):
+    if isinstance(item, bytes):
+        return item.decode()
+    return item
+
+
+def _get_branch(h5_dir):
+    """converts loopTool h5 directory (analysis/loop_key/loop_value/.../sweep_name)
+    to branch tuple ((loop_key, loop_value), ..., sweep_name)"""
+    path = h5_dir.strip("/").split("/")[1:]
+    branch = tuple((path[i], path[i + 1]) for i in range(0, len(path) - 1, 2))
+    if len(path) % 2 == 1:
+        branch = branch + (path[-1],)
+    return branch
+
+
+def _branch_to_list(branch):
+    return [list(b) if isinstance(b, tuple) else b for b in branch]
+
+
+def _branch_from_list(branch):
+    return tuple(tuple(b) if isinstance(b, list) else b for b in branch)
+
+
+def export_sweep_to_columnar_store(h5_file, store_path=None, overwrite=False):
+    """Converts loopTool h5 output into a columnar store, with one .npy column per
+    output variable, partitioned by sweep branch (e.g. hessian_sim_cases, water_sim_cases).
+    An index file maps variable names to column files so data can be memory mapped
+    and loaded per key without reading the whole sweep output.
+
+    Args:
+        h5_file: loopTool h5 output file
+        store_path: directory to store columnar data (default: h5 file name + _columnar)
+        overwrite: if True, existing store is replaced
+
+    Returns:
+        path to the columnar store
+    """
+    if store_path is None:
+        store_path = get_store_path(h5_file)
+    if os.path.exists(store_path):
+        if overwrite:
+            shutil.rmtree(store_path)
+        else:
+            raise FileExistsError(
+                f"Columnar store {store_path} already exists, use overwrite=True to replace it"
+            )
+    os.makedirs(store_path)
+
+    sweep_dirs = []
+
+    def find_sweeps(name, obj):
+        if isinstance(obj, h5py.Group) and "outputs" in obj:
+            sweep_dirs.append(name)
+
+    index = {"source": os.path.abspath(str(h5_file)), "partitions": []}
+    with h5py.File(h5_file, "r") as h5file:
+        h5file.visititems(find_sweeps)
+        for part_num, h5_dir in enumerate(sorted(sweep_dirs)):
+            group = h5file[h5_dir]
+            part_dir = f"p{part_num:05d}"
+            os.makedirs(os.path.join(store_path, part_dir))
+            columns = {}
+            for source in ["sweep_params", "outputs"]:
+                if source not in group:
+                    continue
+                for key, var_group in group[source].items():
+                    if key in columns or "value" not in var_group:
+                        continue
+                    column_file = os.path.join(part_dir, f"c{len(columns):05d}.npy")
+                    data = np.asarray(var_group["value"][()], dtype=np.float64)
+                    np.save(os.path.join(store_path, column_file), data)
+                    units = None
+                    if "units" in var_group:
+                        units = _decode(var_group["units"][()])
+                    columns[key] = {
+                        "file": column_file,
+                        "units": units,
+                        "length": int(data.size),
+                        "source": source,
+                    }
+            if SOLVE_SUCCESSFUL_KEY in group:
+                column_file = os.path.join(part_dir, f"c{len(columns):05d}.npy")
+                data = np.asarray(group[SOLVE_SUCCESSFUL_KEY][SOLVE_SUCCESSFUL_KEY][()])
+                np.save(os.path.join(store_path, column_file), data)
+                columns[SOLVE_SUCCESSFUL_KEY] = {
+                    "file": column_file,
+                    "units": None,
+                    "length": int(data.size),
+                    "source": SOLVE_SUCCESSFUL_KEY,
+                }
+            index["partitions"].append(
+                {
+                    "h5_dir": h5_dir,
+                    "branch": _branch_to_list(_get_branch(h5_dir)),
+                    "columns": columns,
+                }
+            )
+    with open(os.path.join(store_path, INDEX_FILE), "w") as f:
+        json.dump(index, f, indent=1)
+    _log.info(
+        f"Exported {len(index['partitions'])} sweep partitions from {h5_file} to {store_path}"
+    )
+    return store_path
+
+
+class SweepDataStore:
+    """Reads columnar sweep store created by export_sweep_to_columnar_store,
+    only registered keys are loaded, and they are memory mapped from disk.
+    Returned data keys follow PsDataManager convention, with sweep name added
+    so sweeps with same loop values do not overwrite each other
+    ((loop_key, loop_value), ..., sweep_name, return_key)
+
+    Registered keys can also be loaded into psPlotKit PsDataManager (see
+    get_data_manager), so figure scripts keep data manager features (unit
+    conversion, data selection and reduction, costing) while only reading
+    registered columns.
+
+    Args:
+        store_path: path to columnar store (or loopTool h5 file, in which case
+            default store location is used and created if it does not exist, or
+            re-created if h5 file was modified after store was exported)
+    """
+
+    def __init__(self, store_path):
+        if str(store_path).endswith(".h5"):
+            h5_file = store_path
+            store_path = get_store_path(h5_file)
+            index_file = os.path.join(store_path, INDEX_FILE)
+            if not os.path.exists(store_path):
+                export_sweep_to_columnar_store(h5_file, store_path)
+            elif not os.path.exists(index_file) or os.path.getmtime(
+                h5_file
+            ) > os.path.getmtime(index_file):
+                _log.info(f"{h5_file} is newer than {store_path}, re-exporting")
+                export_sweep_to_columnar_store(h5_file, store_path, overwrite=True)
+        self.store_path = store_path
+        with open(os.path.join(store_path, INDEX_FILE), "r") as f:
+            index = json.load(f)
+        self.partitions = {}
+        self.h5_dirs = {}
+        for partition in index["partitions"]:
+            branch = _branch_from_list(partition["branch"])
+            self.partitions[branch] = partition["columns"]
+            self.h5_dirs[branch] = partition["h5_dir"]
+        self.registered_keys = {}
+        self.registered_options = {}
+        self.key_patterns = []
+        self.data = {}
+
+    def get_branches(self, **branch_filter):
+        """returns branches in the store, optionally filtered by loop values
+        e.g. get_branches(water_sim_cases="BGW")"""
+        branches = []
+        for branch in self.partitions:
+            loop_values = dict(b for b in branch if isinstance(b, tuple))
+            if all(loop_values.get(k) == v for k, v in branch_filter.items()):
+                branches.append(branch)
+        return branches
+
+    def get_keys(self, branch=None):
+        """returns all variable keys in store (or in specific branch)"""
+        if branch is not None:
+            return list(self.partitions[branch].keys())
+        keys = {}
+        for columns in self.partitions.values():
+            keys.update(dict.fromkeys(columns))
+        return list(keys)
+
+    def register_data_key(self, file_key, return_key=None, **kwargs):
+        """registers variable to load, similar to PsDataManager.register_data_key
+
+        Args:
+            file_key: variable name in sweep output (e.g. fs.costing.LCOW)
+            return_key: key to return data under (default is file_key)
+            kwargs: options passed to PsDataManager.register_data_key when data is
+                loaded with get_data_manager (e.g. units)
+        """
+        if return_key is None:
+            return_key = file_key
+        self.registered_keys[file_key] = return_key
+        self.registered_options[file_key] = kwargs
+
+    def register_key_pattern(self, pattern):
+        """registers fnmatch pattern of keys to include in data manager created by
+        get_data_manager without registering them, for keys that are registered by
+        psPlotKit itself (e.g. costing keys registered by PsCostingManager)"""
+        self.key_patterns.append(pattern)
+
+    def _get_selected_keys(self, branch):
+        return [
+            key
+            for key in self.partitions[branch]
+            if key in self.registered_keys
+            or key == SOLVE_SUCCESSFUL_KEY
+            or any(fnmatch.fnmatchcase(key, p) for p in self.key_patterns)
+        ]
+
+    def get_column(self, branch, file_key, mmap_mode="r"):
+        """returns memory mapped column for key in a branch"""
+        column = self.partitions[branch][file_key]
+        return np.load(
+            os.path.join(self.store_path, column["file"]), mmap_mode=mmap_mode
+        )
+
+    def get_units(self, branch, file_key):
+        return self.partitions[branch][file_key]["units"]
+
+    def load_data(self, branches=None, mmap_mode="r"):
+        """loads registered keys from store
+
+        Args:
+            branches: list of branches to load (default all)
+            mmap_mode: numpy memory map mode, None loads data into memory
+
+        Returns:
+            dict of data keyed by (*branch_loop_pairs, sweep_name, return_key)
+        """
+        if branches is None:
+            branches = list(self.partitions.keys())
+        for branch in branches:
+            for file_key, return_key in self.registered_keys.items():
+                if file_key not in self.partitions[branch]:
+                    _log.warning(f"{file_key} not found in {branch}")
+                    continue
+                self.data[branch + (return_key,)] = self.get_column(
+                    branch, file_key, mmap_mode
+                )
+        return self.data
+
+    def export_h5_subset(self):
+        """writes registered keys (and keys matching registered patterns) of all
+        branches to h5 file with loopTool layout, file is reused while it is newer
+        than the store
+
+        Returns:
+            path to h5 file
+        """
+        keys = sorted(
+            set(
+                key
+                for branch in self.partitions
+                for key in self._get_selected_keys(branch)
+            )
+        )
+        key_hash = hashlib.sha256(json.dumps(keys).encode()).hexdigest()[:16]
+        h5_file = os.path.join(self.store_path, f"subset_{key_hash}.h5")
+        if os.path.exists(h5_file) and os.path.getmtime(h5_file) >= os.path.getmtime(
+            os.path.join(self.store_path, INDEX_FILE)
+        ):
+            return h5_file
+        with h5py.File(h5_file, "w") as h5file:
+            for branch, columns in self.partitions.items():
+                group = h5file.require_group(self.h5_dirs[branch])
+                for key in self._get_selected_keys(branch):
+                    data = self.get_column(branch, key, mmap_mode=None)
+                    if key == SOLVE_SUCCESSFUL_KEY:
+                        group.create_dataset(f"{key}/{key}", data=data)
+                        continue
+                    # swept keys are exported once, but loopTool writes them to both
+                    sources = ["outputs"]
+                    if columns[key].get("source") == "sweep_params":
+                        sources.append("sweep_params")
+                    for source in sources:
+                        var_group = group.create_group(f"{source}/{key}")
+                        var_group.create_dataset("value", data=data)
+                        if columns[key]["units"] is not None:
+                            var_group.create_dataset(
+                                "units", data=columns[key]["units"]
+                            )
+        return h5_file
+
+    def get_data_manager(self, **kwargs):
+        """returns psPlotKit PsDataManager that reads h5 file with only registered
+        keys (see export_h5_subset), with keys registered using their options
+
+        Args:
+            kwargs: options passed to PsDataManager
+
+        Returns:
+            PsDataManager (data is loaded with its load_data)
+        """
+        from psPlotKit.data_manager.ps_data_manager import PsDataManager
+
+        data_manager = PsDataManager(self.export_h5_subset(), **kwargs)
+        for file_key, return_key in self.registered_keys.items():
+            data_manager.register_data_key(
+                file_key=file_key,
+                return_key=return_key,
+                **self.registered_options[file_key],
+            )
+        return data_manager
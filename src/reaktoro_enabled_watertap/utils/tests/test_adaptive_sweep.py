@@ -0,0 +1,120 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from reaktoro_enabled_watertap.utils import adaptive_sweep
+from reaktoro_enabled_watertap.utils.sweep_data_store import SweepDataStore
+from pyomo.environ import ConcreteModel, Var, Constraint
+import numpy as np
+import pytest
+
+
+def build_model():
+    m = ConcreteModel()
+    m.water_recovery = Var(initialize=0.5)
+    m.concentration = Var(initialize=2)
+    m.LCOW = Var(initialize=2)
+    # becomes active at water recovery of 2/3
+    m.eq_max_concentration = Constraint(expr=m.concentration <= 3)
+    return m
+
+
+def solve(m):
+    # mimics a solve, concentration is capped at 3 and LCOW rises sharply once
+    # constraint becomes active
+    concentration = 1 / (1 - m.water_recovery.value)
+    m.concentration.value = min(concentration, 3)
+    m.LCOW.value = concentration + 5 * max(0, concentration - 3)
+
+
+def probe(m):
+    return m.water_recovery.value <= 0.86
+
+
+@pytest.mark.core
+def test_get_active_set():
+    m = build_model()
+    m.concentration.setub(3)
+    m.concentration.value = 2
+    assert adaptive_sweep.get_active_set(
+        m, ["eq_max_concentration", m.concentration]
+    ) == (False, False)
+    m.concentration.value = 3
+    assert adaptive_sweep.get_active_set(
+        m, ["eq_max_concentration", m.concentration]
+    ) == (True, True)
+
+
+@pytest.mark.core
+def test_adaptive_sweep(tmp_path):
+    m = build_model()
+    h5_file = str(tmp_path / "sweep.h5")
+    result = adaptive_sweep.adaptive_sweep(
+        m,
+        "water_recovery",
+        0.5,
+        0.9,
+        outputs={"LCOW": "LCOW"},
+        solve_function=solve,
+        active_set_components=["eq_max_concentration"],
+        initial_samples=5,
+        max_samples=30,
+        tolerance=0.005,
+        probe_function=probe,
+        h5_file=h5_file,
+        h5_dir="sweep/adaptive",
+    )
+    x = result["sweep_params"]["water_recovery"]
+    success = result["solve_successful"]
+    assert len(x) <= 30
+    assert np.all(np.diff(x) > 0)
+    # samples are refined around active set change and feasibility limit
+    assert np.min(np.abs(x - 2 / 3)) < 0.005
+    assert np.min(np.abs(x - 0.86)) < 0.005
+    assert not np.any(success[x > 0.86])
+    assert np.all(success[x <= 0.86])
+    # fewer samples needed on smooth side of active set change
+    assert np.sum(x < 0.6) < np.sum((x > 2 / 3) & (x < 0.86))
+    expected = 1 / (1 - x[success])
+    expected = expected + 5 * np.maximum(0, expected - 3)
+    assert result["outputs"]["LCOW"][success] == pytest.approx(expected)
+    assert np.all(np.isnan(result["outputs"]["LCOW"][~success]))
+
+    store = SweepDataStore(h5_file)
+    branch = store.get_branches()[0]
+    assert store.get_column(branch, "water_recovery") == pytest.approx(x)
+    assert np.all(store.get_column(branch, "solve_successful") == success)
+
+
+@pytest.mark.core
+def test_adaptive_sweep_invalid_samples():
+    m = build_model()
+    with pytest.raises(ValueError, match="initial_samples"):
+        adaptive_sweep.adaptive_sweep(
+            m,
+            "water_recovery",
+            0.5,
+            0.9,
+            outputs={"LCOW": "LCOW"},
+            solve_function=solve,
+            initial_samples=1,
+        )
+    with pytest.raises(ValueError, match="lower_limit"):
+        adaptive_sweep.adaptive_sweep(
+            m,
+            "water_recovery",
+            0.5,
+            0.5,
+            outputs={"LCOW": "LCOW"},
+            solve_function=solve,
+        )
@@ -0,0 +1,57 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from reaktoro_enabled_watertap.utils import bound_tightening
+from pyomo.environ import ConcreteModel, Var, Param, Constraint
+from pyomo.common.errors import InfeasibleConstraintException
+import pytest
+
+
+def build_model():
+    m = ConcreteModel()
+    m.max_flow = Param(initialize=100, mutable=True)
+    m.x = Var(bounds=(0, m.max_flow), initialize=1)
+    m.y = Var(bounds=(2, 5), initialize=1)
+    m.feed = Var(initialize=10, bounds=(0, None))
+    m.feed.fix()
+    m.balance = Constraint(expr=m.x + m.y == m.feed)
+    return m
+
+
+@pytest.mark.core
+def test_tightened_bounds():
+    m = build_model()
+    with bound_tightening.tightened_bounds(m, margin=1e-3) as tightened:
+        assert tightened == 1
+        assert m.x.lb == pytest.approx(5 * (1 - 1e-3), rel=1e-6)
+        assert m.x.ub == pytest.approx(8 * (1 + 1e-3), rel=1e-6)
+        assert m.y.bounds == (2, 5)
+        assert m.feed.bounds == (0, None)
+    # original bounds are restored, including bounds set by params
+    assert m.x.bounds == (0, 100)
+    m.max_flow = 50
+    assert m.x.ub == 50
+
+
+@pytest.mark.core
+def test_tightened_bounds_infeasible():
+    m = build_model()
+    m.feed.fix(200)
+    with pytest.raises(InfeasibleConstraintException):
+        bound_tightening.tighten_bounds(m)
+    assert m.x.bounds == (0, 100)
+    # solve is attempted with original bounds
+    with bound_tightening.tightened_bounds(m) as tightened:
+        assert tightened == 0
+        assert m.x.bounds == (0, 100)
@@ -0,0 +1,91 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+import pytest
+from pyomo.environ import (
+    ConcreteModel,
+    Var,
+    Param,
+    Constraint,
+    Objective,
+    assert_optimal_termination,
+)
+from reaktoro_enabled_watertap.utils.compiled_nlp import (
+    CompiledNLPSolver,
+    get_compiled_nlp,
+    get_structure_key,
+    is_same_structure,
+)
+
+__author__ = "Alexander V. Dudchenko"
+
+
+def build_model():
+    m = ConcreteModel()
+    m.x = Var(initialize=0)
+    m.y = Var(initialize=0, bounds=(0, None))
+    m.total = Var(initialize=1)
+    m.total.fix()
+    m.weight = Param(initialize=1, mutable=True)
+    m.eq_total = Constraint(expr=m.x + m.y == m.total)
+    m.objective = Objective(expr=m.weight * (m.x - 1) ** 2 + (m.y - 2) ** 2)
+    return m
+
+
+@pytest.mark.core
+def test_structure_key():
+    m = build_model()
+    key = get_structure_key(m)
+    assert is_same_structure(key, get_structure_key(m))
+    # replaced constraint is a different component, even if it has same name
+    m.del_component(m.eq_total)
+    m.eq_total = Constraint(expr=m.x + m.y == m.total)
+    assert not is_same_structure(key, get_structure_key(m))
+    m.eq_total.deactivate()
+    assert not is_same_structure(get_structure_key(m), key)
+
+
+@pytest.mark.component
+@pytest.mark.flowsheets
+def test_compiled_nlp_reuse():
+    m = build_model()
+    solver = CompiledNLPSolver()
+    assert_optimal_termination(solver.solve(m))
+    assert m.x.value == pytest.approx(0, abs=1e-6)
+    assert m.y.value == pytest.approx(1, abs=1e-6)
+    compiled = get_compiled_nlp(m)
+
+    # fixed variable value change reuses compiled nlp
+    m.total.fix(3)
+    assert_optimal_termination(solver.solve(m))
+    assert m.x.value == pytest.approx(1, abs=1e-6)
+    assert m.y.value == pytest.approx(2, abs=1e-6)
+    assert m.total.value == 3
+    # fixing variable also reuses compiled nlp
+    m.x.fix(2)
+    assert_optimal_termination(solver.solve(m))
+    assert m.y.value == pytest.approx(1, abs=1e-6)
+    assert get_compiled_nlp(m) is compiled
+    assert compiled.solves == 3
+
+    # mutable param and structure changes recompile nlp
+    m.x.unfix()
+    m.total.fix(1)
+    m.weight = 3
+    assert_optimal_termination(solver.solve(m))
+    assert m.x.value == pytest.approx(0.5, abs=1e-6)
+    assert get_compiled_nlp(m) is not compiled
+    compiled = get_compiled_nlp(m)
+    m.eq_total.deactivate()
+    assert_optimal_termination(solver.solve(m))
+    assert m.x.value == pytest.approx(1, abs=1e-6)
+    assert m.y.value == pytest.approx(2, abs=1e-6)
+    assert get_compiled_nlp(m) is not compiled
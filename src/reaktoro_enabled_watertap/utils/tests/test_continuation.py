@@ -0,0 +1,68 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from reaktoro_enabled_watertap.utils.continuation import continuation_solve
+from pyomo.environ import ConcreteModel, Var
+import pytest
+
+
+def build_model():
+    m = ConcreteModel()
+    m.water_recovery = Var(initialize=0.5)
+    m.water_recovery.fix()
+    m.pressure = Var(initialize=50, bounds=(0, 60))
+    m.solution = Var(initialize=0.5)
+    m.iterations = Var(initialize=0)
+    return m
+
+
+def solve(m):
+    # mimics a solver that only converges when starting close to the solution
+    # and needs more iterations for bigger steps
+    change = abs(m.water_recovery.value - m.solution.value)
+    if change > 0.1 or m.pressure.ub < 10 * m.water_recovery.value / 0.1:
+        m.solution.value = -1
+        raise RuntimeError("Failed to converge")
+    m.iterations.value = int(5 + 200 * change)
+    m.solution.value = m.water_recovery.value
+
+
+@pytest.mark.core
+def test_continuation_solve():
+    m = build_model()
+    stats = continuation_solve(
+        m,
+        solve,
+        [(m.water_recovery, 0.85), ((m.pressure, "ub"), 90)],
+        step_init=0.5,
+        iter_target=10,
+        iteration_function=lambda m, result: m.iterations.value,
+    )
+    assert m.water_recovery.value == pytest.approx(0.85)
+    assert m.solution.value == pytest.approx(0.85)
+    assert m.pressure.ub == pytest.approx(90)
+    assert stats["failed_solves"] > 0
+    assert stats["steps"][-1] == 1
+    assert stats["steps"] == sorted(stats["steps"])
+    assert stats["iterations"] > 0
+
+
+@pytest.mark.core
+def test_continuation_solve_failure():
+    m = build_model()
+    with pytest.raises(RuntimeError, match="minimum step"):
+        continuation_solve(m, solve, [(m.water_recovery, 0.85)], min_step=0.1)
+    # model is left at last converged point
+    assert m.solution.value == pytest.approx(m.water_recovery.value)
+    assert m.water_recovery.value < 0.85
@@ -0,0 +1,68 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from reaktoro_enabled_watertap.utils import diagnostics
+import idaes.logger as idaeslog
+import logging
+import pytest
+
+_log = idaeslog.getLogger("reaktoro_enabled_watertap.utils.tests")
+
+
+class _RecordHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record.getMessage())
+
+
+@pytest.fixture
+def parent_records():
+    parent = diagnostics.get_package_logger().parent
+    handler = _RecordHandler()
+    parent.addHandler(handler)
+    level = diagnostics.get_package_logger().level
+    yield handler.records
+    parent.removeHandler(handler)
+    diagnostics.set_log_level(level)
+
+
+@pytest.mark.core
+def test_diagnostics_flag(parent_records):
+    diagnostics.enable_diagnostics(True)
+    assert diagnostics.diagnostics_enabled()
+    assert diagnostics.get_tee() is True
+    assert diagnostics.get_tee(False) is False
+    diagnostics.enable_diagnostics(False)
+    assert not diagnostics.diagnostics_enabled()
+    assert diagnostics.get_tee() is False
+
+
+@pytest.mark.core
+def test_quiet_logging(parent_records):
+    diagnostics.enable_diagnostics(True)
+    with diagnostics.quiet_logging():
+        assert not diagnostics.diagnostics_enabled()
+        _log.info("buffered")
+        _log.warning("reported")
+    assert parent_records == ["reported"]
+    # original level is restored
+    assert diagnostics.diagnostics_enabled()
+    with pytest.raises(RuntimeError):
+        with diagnostics.quiet_logging():
+            _log.info("reported on failure")
+            raise RuntimeError("failed solve")
+    assert parent_records == ["reported", "reported on failure"]
@@ -0,0 +1,103 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from reaktoro_enabled_watertap.utils import dof_tracker, diagnostics
+from idaes.core.util.model_statistics import degrees_of_freedom
+from pyomo.environ import ConcreteModel, Block, Var, Constraint, ConstraintList, Set
+import pytest
+
+
+def build_model():
+    m = ConcreteModel()
+    m.ions = Set(initialize=["Ca_2+", "Cl_-"])
+    m.unit = Block()
+    m.unit.flow_in = Var(m.ions, initialize=1)
+    m.unit.flow_out = Var(m.ions, initialize=1)
+    m.unit.recovery = Var(initialize=0.5)
+    m.unit.balance = Constraint(
+        m.ions, rule=lambda b, ion: b.flow_out[ion] == b.recovery * b.flow_in[ion]
+    )
+    m.unit.max_recovery = Constraint(expr=m.unit.recovery <= 0.9)
+    m.aux = Block()
+    m.aux.x = Var(initialize=1)
+    m.aux.eq = Constraint(expr=m.aux.x == 2 * m.unit.recovery)
+    return m
+
+
+@pytest.mark.core
+def test_dof_tracker():
+    m = build_model()
+    tracker = dof_tracker.DOFTracker(m)
+
+    def check():
+        assert tracker.degrees_of_freedom() == degrees_of_freedom(m)
+
+    check()
+    m.unit.flow_in.fix()
+    check()
+    m.unit.recovery.fix()
+    check()
+    assert tracker.degrees_of_freedom() == 0
+    tracker.deactivate(m.unit.balance)
+    check()
+    tracker.activate(m.unit.balance["Ca_2+"])
+    check()
+    # changes made directly on model are picked up
+    m.unit.balance["Cl_-"].activate()
+    m.unit.recovery.unfix()
+    check()
+    m.aux.deactivate()
+    check()
+    m.aux.activate()
+    check()
+    assert tracker.rebuilds == 2
+    # added components trigger rebuild
+    m.unit.extra = Constraint(expr=m.unit.recovery == 0.5)
+    check()
+    assert tracker.rebuilds == 3
+
+
+@pytest.mark.core
+def test_dof_tracker_indexed_members():
+    m = build_model()
+    m.unit.cuts = ConstraintList()
+    tracker = dof_tracker.get_dof_tracker(m)
+    assert dof_tracker.get_dof_tracker(m) is tracker
+    assert tracker.degrees_of_freedom() == degrees_of_freedom(m)
+    # new members of existing indexed components trigger rebuild
+    m.unit.cuts.add(m.unit.recovery == 0.5)
+    assert tracker.degrees_of_freedom() == degrees_of_freedom(m)
+    assert tracker.rebuilds == 1
+    m.unit.cuts.clear()
+    assert tracker.degrees_of_freedom() == degrees_of_freedom(m)
+    assert tracker.rebuilds == 2
+
+
+@pytest.mark.core
+def test_dof_tracker_cross_check():
+    m = build_model()
+    assert dof_tracker.get_degrees_of_freedom(m) == degrees_of_freedom(m)
+    tracker = dof_tracker.get_dof_tracker(m)
+    # change that is not detected by tracker (expression replaced in place)
+    m.aux.eq.set_value(m.unit.recovery == 0.5)
+    level = diagnostics.get_package_logger().level
+    try:
+        diagnostics.enable_diagnostics(False)
+        assert tracker.degrees_of_freedom() != degrees_of_freedom(m)
+        diagnostics.enable_diagnostics(True)
+        assert tracker.degrees_of_freedom() == degrees_of_freedom(m)
+        diagnostics.enable_diagnostics(False)
+        assert tracker.degrees_of_freedom() == degrees_of_freedom(m)
+    finally:
+        diagnostics.set_log_level(level)
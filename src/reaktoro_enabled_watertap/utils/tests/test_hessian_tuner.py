@@ -0,0 +1,110 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from reaktoro_enabled_watertap.utils import hessian_tuner
+from reaktoro_enabled_watertap.utils.structure_fingerprint import ArtifactCache
+import time
+import pytest
+
+# solve time and maximum recovery each candidate can solve to
+candidate_performance = {
+    "fast_unstable": {"time": 0.01, "max_recovery": 0.6},
+    "fast": {"time": 0.012, "max_recovery": 0.9},
+    "slow": {"time": 0.2, "max_recovery": 0.9},
+    "broken": {"time": 0.0, "max_recovery": None},
+}
+candidates = {
+    name: {"rkt_hessian_type": name, "bfgs_initialization_type": "scalar1"}
+    for name in candidate_performance
+}
+
+
+def build(rkt_hessian_type, bfgs_initialization_type):
+    return {"name": rkt_hessian_type, "recovery": 0.5, "cleaned": False}
+
+
+def initialize(m):
+    if candidate_performance[m["name"]]["max_recovery"] is None:
+        raise RuntimeError("Failed to initialize")
+
+
+def solve(m):
+    time.sleep(candidate_performance[m["name"]]["time"])
+    if m["recovery"] > candidate_performance[m["name"]]["max_recovery"]:
+        raise RuntimeError("Failed to solve")
+
+
+def set_recovery(m, recovery):
+    m["recovery"] = recovery
+
+
+@pytest.mark.core
+def test_race_hessian_options(tmp_path):
+    cleaned = []
+    alive = []
+
+    def build_one(**options):
+        # candidates are raced one at a time
+        assert len(alive) == len(cleaned)
+        alive.append(options["rkt_hessian_type"])
+        return build(**options)
+
+    result = hessian_tuner.race_hessian_options(
+        build_one,
+        initialize,
+        solve,
+        set_recovery,
+        [0.5, 0.6, 0.7, 0.8],
+        candidates=candidates,
+        time_limit_factor=3,
+        cleanup_function=lambda m: cleaned.append(m["name"]),
+    )
+    assert result["selected"] == "fast"
+    assert result["rkt_hessian_type"] == "fast"
+    assert result["results"]["broken"]["status"] == "failed initialization"
+    assert result["results"]["fast_unstable"]["status"] == "failed at 0.7"
+    assert result["results"]["slow"]["status"] == "too slow at 0.5"
+    assert result["results"]["fast"]["convergence_rate"] == 1
+    # all models are cleaned up
+    assert sorted(cleaned) == sorted(["broken", "fast_unstable", "fast", "slow"])
+
+    cache = ArtifactCache(tmp_path)
+    fingerprint = "test_fingerprint"
+    assert hessian_tuner.load_tuned_hessian_options(fingerprint, cache) is None
+    hessian_tuner.save_tuned_hessian_options(fingerprint, result, cache)
+    assert hessian_tuner.load_tuned_hessian_options(fingerprint, cache) == {
+        "rkt_hessian_type": "fast",
+        "bfgs_initialization_type": "scalar1",
+    }
+    # results are found by new cache instance in same directory
+    assert hessian_tuner.load_tuned_hessian_options(
+        fingerprint, ArtifactCache(tmp_path)
+    ) == {"rkt_hessian_type": "fast", "bfgs_initialization_type": "scalar1"}
+
+
+@pytest.mark.core
+def test_race_hessian_options_no_solution():
+    result = hessian_tuner.race_hessian_options(
+        build,
+        initialize,
+        solve,
+        set_recovery,
+        [0.5],
+        candidates={"broken": candidates["broken"]},
+    )
+    assert result["selected"] is None
+    assert (
+        result["rkt_hessian_type"]
+        == hessian_tuner.DEFAULT_HESSIAN_OPTIONS["rkt_hessian_type"]
+    )
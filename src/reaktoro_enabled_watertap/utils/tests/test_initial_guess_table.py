@@ -0,0 +1,111 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from reaktoro_enabled_watertap.utils.initial_guess_table import (
+    InitialGuessTable,
+    get_composition_features,
+)
+from reaktoro_enabled_watertap.utils.watertap_flowsheet_block import (
+    WaterTapFlowsheetBlockData,
+)
+from idaes.core import FlowsheetBlock, declare_process_block_class
+from pyomo.environ import ConcreteModel, Var, Block
+import pytest
+
+
+@declare_process_block_class("ChemistryUnit")
+class ChemistryUnitData(WaterTapFlowsheetBlockData):
+    """Test unit mimicking a unit with a reaktoro chemistry block"""
+
+    def build(self):
+        super().build()
+        self.flow_mol_phase_comp = Var(
+            [("Liq", "H2O"), ("Liq", "NaCl")], initialize={("Liq", "H2O"): 50}
+        )
+        self.flow_mol_phase_comp["Liq", "NaCl"].value = 0.5
+        self.pH = Var(["inlet", "outlet"], initialize=7)
+        self.chemistry_block = Block()
+        self.chemistry_block.inputs = Var([1, 2], initialize=1)
+        self.flow_mol_precipitate = Var(initialize=1e-5)
+        self.register_initial_guess_inputs(self.flow_mol_phase_comp, self.pH["inlet"])
+        self.register_initial_guess_components(
+            self.chemistry_block, self.pH["outlet"], self.flow_mol_precipitate
+        )
+
+
+def build_model(table):
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.unit = ChemistryUnit(initial_guess_table=table)
+    return m
+
+
+@pytest.mark.core
+def test_table_lookup(tmp_path):
+    table = InitialGuessTable()
+    assert table.lookup("fs.unit", {"H2O": 1, "pH": 7}) is None
+    table.add("fs.unit", {"H2O": 1, "pH": 7}, {"x": 1})
+    table.add("fs.unit", {"H2O": 2, "pH": 7}, {"x": 2})
+    # same bin replaces existing entry
+    table.add("fs.unit", {"H2O": 1.01, "pH": 7.05}, {"x": 3})
+    assert len(table.entries["fs.unit"]) == 2
+    assert table.lookup("fs.unit", {"H2O": 1.2, "pH": 7})["x"] == 3
+    assert table.lookup("fs.unit", {"H2O": 1.8, "pH": 7})["x"] == 2
+    # entries with different features (e.g. other ions) are not used
+    assert table.lookup("fs.unit", {"H2O": 1, "Ca": 1, "pH": 7}) is None
+    assert table.lookup("fs.other_unit", {"H2O": 1, "pH": 7}) is None
+
+    table_file = str(tmp_path / "table.json")
+    table.save(table_file)
+    loaded_table = InitialGuessTable(table_file)
+    assert loaded_table.entries == table.entries
+
+
+@pytest.mark.core
+def test_composition_features():
+    m = build_model(None)
+    features = get_composition_features(
+        m.fs.unit.flow_mol_phase_comp, m.fs.unit.pH["inlet"]
+    )
+    assert features["H2O"] == pytest.approx(1.69897, rel=1e-5)
+    assert features["NaCl"] == pytest.approx(-2)
+    assert features["pH"] == 7
+
+
+@pytest.mark.core
+def test_seed_and_record():
+    table = InitialGuessTable()
+    m = build_model(table)
+    assert m.fs.unit.seed_initial_guess() is None
+    m.fs.unit.chemistry_block.inputs[1].value = 5
+    m.fs.unit.pH["outlet"].value = 9
+    m.fs.unit.flow_mol_precipitate.value = 0.1
+    m.fs.unit.record_initial_guess()
+    assert table.entries["fs.unit"][0]["values"] == {
+        "chemistry_block.inputs[1]": 5,
+        "chemistry_block.inputs[2]": 1,
+        "pH[outlet]": 9,
+        "flow_mol_precipitate": 0.1,
+    }
+
+    # seed a new model with slightly different composition, fixed vars are not changed
+    m = build_model(table)
+    m.fs.unit.flow_mol_phase_comp["Liq", "NaCl"].value = 0.6
+    m.fs.unit.flow_mol_precipitate.fix()
+    values = m.fs.unit.seed_initial_guess()
+    assert values is not None
+    assert m.fs.unit.chemistry_block.inputs[1].value == 5
+    assert m.fs.unit.pH["outlet"].value == 9
+    assert m.fs.unit.flow_mol_precipitate.value == 1e-5
+    assert values["flow_mol_precipitate"] == 0.1
@@ -0,0 +1,67 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from reaktoro_enabled_watertap.utils.memory_tracker import (
+    MemoryLeanSweep,
+    get_rss,
+)
+from pyomo.environ import ConcreteModel, Var, Constraint
+import pytest
+
+
+def build_model(size=1000):
+    m = ConcreteModel()
+    m.x = Var(range(size), initialize=1)
+    m.eq = Constraint(range(size), rule=lambda m, i: m.x[i] == 1)
+    return m
+
+
+@pytest.mark.core
+def test_memory_lean_sweep(tmp_path):
+    restarted = []
+    solved = []
+
+    def optimize(m):
+        solved.append(m)
+        if len(solved) == 3:
+            raise RuntimeError("Failed to converge")
+
+    sweep = MemoryLeanSweep(
+        build_model,
+        lambda m: None,
+        optimize,
+        restart_function=lambda m: restarted.append(m),
+        rss_threshold=0,
+    )
+    assert get_rss() > 0
+    first_model = sweep.build(size=10)
+    sweep.initialize(first_model)
+    sweep.optimize(first_model)
+    sweep.optimize(first_model)
+    second_model = sweep.build(size=10)
+    # previous model is torn down before new one is built
+    assert len(list(first_model.component_objects())) == 0
+    assert len(list(second_model.component_objects())) == 2
+    with pytest.raises(RuntimeError):
+        sweep.optimize(second_model)
+    sweep.teardown()
+
+    assert len(sweep.tracker.points) == 3
+    assert sweep.restarts == 3
+    growth = sweep.tracker.get_phase_growth()
+    assert growth["build"]["calls"] == 2
+    assert growth["solve"]["calls"] == 3
+    assert growth["teardown"]["calls"] == 2
+    sweep.tracker.report()
+    sweep.tracker.save(str(tmp_path / "memory.json"))
@@ -0,0 +1,105 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from reaktoro_enabled_watertap.utils.phase_profiler import (
+    PhaseProfiler,
+    get_profiler,
+)
+from reaktoro_enabled_watertap.utils.watertap_flowsheet_block import (
+    WaterTapFlowsheetBlockData,
+)
+from idaes.core import FlowsheetBlock, declare_process_block_class
+from pyomo.environ import ConcreteModel, Var
+import io
+import pytest
+
+
+@declare_process_block_class("ProfiledUnit")
+class ProfiledUnitData(WaterTapFlowsheetBlockData):
+    def build(self):
+        super().build()
+        self.x = Var(initialize=1)
+
+    def set_fixed_operation(self):
+        self.x.fix()
+
+    def initialize_unit(self):
+        self.x.value = 2
+
+
+@declare_process_block_class("DerivedProfiledUnit")
+class DerivedProfiledUnitData(ProfiledUnitData):
+    def build(self):
+        super().build()
+        self.y = Var(initialize=1)
+
+
+@pytest.mark.core
+def test_nested_spans(tmp_path):
+    profiler = PhaseProfiler()
+    for _ in range(2):
+        with profiler.span("initialize"):
+            with profiler.span("fs.unit", "initialize_unit"):
+                pass
+            with profiler.span("solve"):
+                pass
+    summary = {row["path"]: row for row in profiler.get_summary()}
+    assert set(summary) == {
+        "initialize",
+        "initialize;fs.unit",
+        "initialize;fs.unit;initialize_unit",
+        "initialize;solve",
+    }
+    assert summary["initialize"]["calls"] == 2
+    assert summary["initialize;fs.unit;initialize_unit"]["calls"] == 2
+    assert summary["initialize"]["total"] >= summary["initialize;solve"]["total"]
+    assert profiler.get_phase_totals()["solve"]["calls"] == 2
+
+    flamegraph = tmp_path / "profile.folded"
+    profiler.save_flamegraph(str(flamegraph))
+    for line in flamegraph.read_text().splitlines():
+        path, self_time = line.rsplit(" ", 1)
+        assert path in summary
+        assert int(self_time) > 0
+
+    ostream = io.StringIO()
+    profiler.report(ostream=ostream)
+    lines = ostream.getvalue().splitlines()
+    assert len(lines) == 2 + len(summary)
+    assert lines[2].startswith("initialize ")
+
+    profiler.enabled = False
+    with profiler.span("disabled"):
+        pass
+    assert "disabled" not in {row["path"] for row in profiler.get_summary()}
+
+
+@pytest.mark.core
+def test_unit_phases():
+    profiler = get_profiler()
+    profiler.reset()
+    m = ConcreteModel()
+    with profiler.span("build_model"):
+        m.fs = FlowsheetBlock(dynamic=False)
+        m.fs.unit = DerivedProfiledUnit()
+    m.fs.unit.fix_and_scale()
+    m.fs.unit.initialize()
+    paths = {row["path"]: row for row in profiler.get_summary()}
+    # nested super().build() calls are recorded as a single span
+    assert paths["build_model;fs.unit;build"]["calls"] == 1
+    assert "build_model;fs.unit;build;fs.unit" not in paths
+    assert paths["fs.unit;set_fixed_operation"]["calls"] == 1
+    assert paths["fs.unit;initialize_unit"]["calls"] == 1
+    assert paths["fs.unit;propagate_outlets"]["calls"] == 1
+    profiler.reset()
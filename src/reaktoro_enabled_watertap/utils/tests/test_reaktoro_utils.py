@@ -0,0 +1,112 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from reaktoro_enabled_watertap.utils.reaktoro_utils import (
+    ViableReagents,
+    ViablePrecipitantsBase,
+)
+from pyomo.environ import units as pyunits
+import numpy as np
+import pytest
+
+
+@pytest.mark.core
+def test_compiled_reagent_catalog():
+    reagents = ViableReagents()
+    catalog = reagents.compile()
+    assert catalog is reagents.compile()
+    assert catalog.names == ["Na2CO3", "CaO", "HCl", "H2SO4"]
+    assert catalog.mw[0] == pytest.approx(0.10599)
+    assert catalog.get_stoichiometry("Na2CO3") == {"Na_+": 2, "HCO3_-": 1}
+    # solvent of non-pure reagents is part of stoichiometry
+    hcl = catalog.get_stoichiometry("HCl")
+    assert hcl["H2O"] == pytest.approx(catalog["solvent_ratio"][2] + 1)
+    assert catalog["solvent_ratio"][2] == pytest.approx((0.7 / 18.01) / (0.3 / 36.46))
+    assert catalog["density_reagent"][2] == pytest.approx(1180)
+    assert catalog["cost"][0] == pytest.approx(0.19)
+
+    # registering a reagent recompiles catalog
+    reagents.register_reagent(
+        "NaOH",
+        39.9971 * pyunits.g / pyunits.mol,
+        {"Na_+": 1, "H2O": 1},
+        solvent=("H2O", 18.01 * pyunits.g / pyunits.mol),
+        purity=0.5,
+    )
+    catalog = reagents.compile()
+    assert catalog.names[-1] == "NaOH"
+    assert np.isnan(catalog["cost"][-1])
+
+    selected = catalog.select(["NaOH", "Na2CO3"])
+    assert selected.names == ["NaOH", "Na2CO3"]
+    assert set(selected.ions) == {"Na_+", "H2O", "HCO3_-"}
+    assert selected.stoichiometry.shape == (2, 3)
+    # where reagents share an ion scale of last reagent is used
+    ion_scales = selected.get_ion_scales([1, 2])
+    assert ion_scales[selected.ion_index["Na_+"]] == pytest.approx(1)
+    assert ion_scales[selected.ion_index["HCO3_-"]] == pytest.approx(2)
+
+
+@pytest.mark.core
+def test_compiled_precipitant_catalog():
+    precipitants = ViablePrecipitantsBase()
+    for i in range(30):
+        precipitants.register_solid(
+            f"solid_{i}",
+            (100 + i) * pyunits.g / pyunits.mol,
+            {"Ca_2+": 1, f"ion_{i}": i + 1},
+            "Ca_2+",
+        )
+    catalog = precipitants.compile()
+    assert len(catalog) == 30
+    assert len(catalog.ions) == 31
+    assert catalog.mw[-1] == pytest.approx(0.129)
+    selected = catalog.select(["solid_3"])
+    assert selected.ions == ["Ca_2+", "ion_3"]
+    assert selected.stoichiometry.tolist() == [[1, 4]]
+
+
+@pytest.mark.core
+def test_sparsity_penalty():
+    from pyomo.environ import ConcreteModel, Var, value
+
+    reagents = ViableReagents()
+    m = ConcreteModel()
+    m.reagent_dose = Var(
+        list(reagents.keys()), initialize=0, units=pyunits.kg / pyunits.m**3
+    )
+    m.reagent_dose["CaO"].value = 1
+    m.reagent_dose["HCl"].value = 1e-3
+    penalty = reagents.create_sparsity_penalty(
+        m, m.reagent_dose, {"CaO": 0.01, "HCl": 0.02}
+    )
+    assert value(penalty) == pytest.approx(0.01 * 1 / 1.001 + 0.02 * 0.5)
+    assert value(m.reagent_sparsity_weight["Na2CO3"]) == 0
+
+
+@pytest.mark.core
+def test_acids_and_bases():
+    from pyomo.environ import ConcreteModel, Param
+
+    reagents = ViableReagents()
+    m = ConcreteModel()
+    # stand in for property package charge_comp
+    m.charge_comp = Param(
+        ["Na_+", "HCO3_-", "Ca_2+", "Cl_-", "SO4_2-"],
+        initialize={"Na_+": 1, "HCO3_-": -1, "Ca_2+": 2, "Cl_-": -1, "SO4_2-": -2},
+    )
+    acid_equivalents = reagents.get_acid_equivalents(m)
+    assert acid_equivalents == {"Na2CO3": -1, "CaO": -2, "HCl": 1, "H2SO4": 2}
+    assert reagents.get_acids(m) == ["HCl", "H2SO4"]
+    assert reagents.get_bases(m) == ["Na2CO3", "CaO"]
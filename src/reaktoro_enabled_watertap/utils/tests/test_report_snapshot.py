@@ -0,0 +1,103 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from pyomo.environ import (
+    ConcreteModel,
+    Var,
+    units as pyunits,
+)
+from reaktoro_enabled_watertap.utils.report_util import build_report_table
+from reaktoro_enabled_watertap.utils.report_snapshot import (
+    ReportUnitCache,
+    take_report_snapshot,
+)
+import pytest
+import json
+import csv
+
+from io import StringIO
+
+
+def build_data_dict():
+    m = ConcreteModel()
+    m.flow = Var(initialize=2, units=pyunits.kg / pyunits.s, bounds=(0, None))
+    m.flow.fix()
+    m.pressure = Var(initialize=2e5, units=pyunits.Pa)
+    m.conc = Var(["A", "B"], initialize=0.5, units=pyunits.g / pyunits.L)
+    m.temp = Var(initialize=298.15, units=pyunits.K)
+    m.no_value = Var(units=pyunits.m)
+    data_dict = {
+        "Model": {"DOFs": 0, "Ratio": 0.25},
+        "State": {
+            "Flow": m.flow,
+            "Pressure": pyunits.convert(m.pressure, to_units=pyunits.bar),
+            "Temperature": m.temp,
+            "No value": m.no_value,
+        },
+        "Composition": m.conc,
+    }
+    return m, data_dict
+
+
+@pytest.mark.core
+@pytest.mark.parametrize("use_default_units", [False, True])
+def test_snapshot_text_matches_report_table(use_default_units):
+    m, data_dict = build_data_dict()
+    expected = StringIO()
+    build_report_table(
+        "test unit", data_dict, expected, use_default_units=use_default_units
+    )
+    snapshot = take_report_snapshot(
+        "test unit", data_dict, use_default_units=use_default_units
+    )
+    result = StringIO()
+    snapshot.to_text(result)
+    assert result.getvalue() == expected.getvalue()
+
+
+@pytest.mark.core
+def test_snapshot_values_and_cache():
+    m, data_dict = build_data_dict()
+    cache = ReportUnitCache()
+    snapshot = take_report_snapshot(
+        "test unit", data_dict, use_default_units=True, unit_cache=cache
+    )
+    assert snapshot.sections() == ["Model", "State", "Composition"]
+    assert ("State", "Flow") in cache
+    data = snapshot.to_dict()
+    assert data["Model"]["DOFs"]["value"] == 0
+    assert data["State"]["Flow"]["value"] == pytest.approx(2)
+    assert data["State"]["Flow"]["fixed"] == True
+    assert data["State"]["Temperature"]["value"] == pytest.approx(298.15)
+    assert data["State"]["No value"]["value"] is None
+    # g/L reported as kg/m**3
+    assert data["Composition"]["A"]["value"] == pytest.approx(0.5)
+
+    # snapshot reads values, while units are reused from cache
+    m.flow.fix(3)
+    n_cached = len(cache)
+    snapshot = take_report_snapshot(
+        "test unit", data_dict, use_default_units=True, unit_cache=cache
+    )
+    assert len(cache) == n_cached
+    assert snapshot.to_dict()["State"]["Flow"]["value"] == pytest.approx(3)
+
+    json_data = json.loads(snapshot.to_json())
+    assert json_data["test unit"]["State"]["Flow"]["value"] == pytest.approx(3)
+
+    csv_stream = StringIO()
+    snapshot.to_csv(csv_stream)
+    rows = list(csv.reader(StringIO(csv_stream.getvalue())))
+    assert rows[0] == ["Unit", "Section", "Key", "Value", "Units", "Fixed", "Bounds"]
+    assert len(rows) == len(snapshot.records) + 1
@@ -0,0 +1,79 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from reaktoro_enabled_watertap.utils.scaling_audit import ScalingAudit, audit_scaling
+from pyomo.environ import ConcreteModel, Block, Var, Constraint
+import idaes.core.util.scaling as iscale
+import io
+import pytest
+
+
+def build_model():
+    m = ConcreteModel()
+    m.fs = Block()
+    m.fs.pump = Block()
+    m.fs.pump.flow = Var(initialize=1e-3)
+    m.fs.pump.power = Var(initialize=1e5)
+    # poorly scaled, power is ~1e8 times flow
+    m.fs.pump.eq_power = Constraint(expr=m.fs.pump.power == 1e8 * m.fs.pump.flow)
+    m.fs.ro = Block()
+    m.fs.ro.area = Var(initialize=100)
+    m.fs.ro.eq_area = Constraint(expr=m.fs.ro.area == 1e5 * m.fs.pump.flow)
+    iscale.set_scaling_factor(m.fs.pump.flow, 1e3)
+    iscale.set_scaling_factor(m.fs.ro.area, 1e-2)
+    iscale.set_scaling_factor(m.fs.ro.eq_area, 1e-2)
+    return m
+
+
+@pytest.mark.core
+def test_scaling_audit():
+    m = build_model()
+    audit = ScalingAudit(m)
+    assert len(audit.rows) == 2
+    assert len(audit.columns) == 3
+    worst_row = audit.get_worst_rows(1)[0]
+    assert worst_row["name"] == "fs.pump.eq_power"
+    assert worst_row["unit"] == "fs.pump"
+    # unscaled row with gradient above 100 is autoscaled as in cyipopt-watertap
+    assert worst_row["scaling_source"] == "autoscaling"
+    assert worst_row["max"] == pytest.approx(100)
+    assert worst_row["min"] == pytest.approx(1e-3)
+    assert worst_row["badness"] == pytest.approx(3)
+    row = [r for r in audit.rows if r["name"] == "fs.ro.eq_area"][0]
+    assert row["scaling_source"] == "set_scaling_factor"
+    assert row["badness"] == pytest.approx(0)
+    worst_column = audit.get_worst_columns(1)[0]
+    assert worst_column["name"] == "fs.pump.power"
+    assert worst_column["scaling_source"] == "unscaled"
+    summary = audit.get_unit_summary()
+    assert summary["fs.pump"]["rows"] == 1
+    assert summary["fs.ro"]["columns"] == 1
+    assert audit.get_jacobian_spread() == pytest.approx(5)
+
+
+@pytest.mark.core
+def test_geometric_mean_scaling():
+    m = build_model()
+    stream = io.StringIO()
+    audit = audit_scaling(m, n=5, ostream=stream)
+    assert "fs.pump.eq_power" in stream.getvalue()
+    corrected = audit.apply_geometric_mean_scaling(n_rows=1, n_columns=1, threshold=1)
+    assert "fs.pump.eq_power" in corrected
+    assert "fs.pump.power" in corrected
+    assert iscale.get_scaling_factor(m.fs.pump.power) == pytest.approx(1e-3)
+    # audit after correction shows improved scaling of worst row
+    audit = ScalingAudit(m)
+    row = [r for r in audit.rows if r["name"] == "fs.pump.eq_power"][0]
+    assert row["scaling_source"] == "set_scaling_factor"
+    assert row["badness"] < 3
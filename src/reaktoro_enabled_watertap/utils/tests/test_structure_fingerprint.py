@@ -0,0 +1,90 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from reaktoro_enabled_watertap.utils.structure_fingerprint import (
+    get_structure_fingerprint,
+    ArtifactCache,
+)
+from pyomo.environ import ConcreteModel, Var, Constraint, Set, units as pyunits
+from pyomo.common.config import ConfigDict, ConfigValue
+import pytest
+
+
+def build_model(ions=("Ca_2+", "Cl_-"), x_value=1, conc=300):
+    m = ConcreteModel()
+    m.ions = Set(initialize=ions)
+    m.x = Var(m.ions, initialize=x_value)
+    m.y = Var(initialize=2)
+    m.con = Constraint(m.ions, rule=lambda m, ion: m.x[ion] == m.y)
+    m.config = ConfigDict()
+    m.config.declare("database", ConfigValue(default="PhreeqcDatabase"))
+    m.config.declare(
+        "ion_concentrations",
+        ConfigValue(
+            default={ion: conc * pyunits.mg / pyunits.L for ion in ions},
+        ),
+    )
+    return m
+
+
+@pytest.mark.core
+def test_structure_fingerprint():
+    fingerprint = get_structure_fingerprint(build_model())
+    # values do not change structure
+    assert get_structure_fingerprint(build_model(x_value=5, conc=100)) == fingerprint
+    assert get_structure_fingerprint(build_model(ions=("Ca_2+", "Cl_-", "Na_+"))) != (
+        fingerprint
+    )
+    m = build_model()
+    m.con["Ca_2+"].deactivate()
+    assert get_structure_fingerprint(m) != fingerprint
+    m = build_model()
+    m.y.fix()
+    assert get_structure_fingerprint(m) != fingerprint
+    m = build_model()
+    m.config.database = "SupcrtDatabase"
+    assert get_structure_fingerprint(m) != fingerprint
+    assert get_structure_fingerprint(build_model(), extra={"hpro": True}) != (
+        fingerprint
+    )
+    # ignored configuration keys do not change fingerprint
+    m = build_model()
+    m.config.database = "SupcrtDatabase"
+    assert get_structure_fingerprint(m, ignore_config=["database"]) == (
+        get_structure_fingerprint(build_model(), ignore_config=["database"])
+    )
+
+
+@pytest.mark.core
+def test_artifact_cache(tmp_path):
+    cache = ArtifactCache(tmp_path)
+    fingerprint = get_structure_fingerprint(build_model())
+    assert not cache.has(fingerprint, "scaling")
+    assert cache.load(fingerprint, "scaling") is None
+    created = []
+
+    def create():
+        created.append(True)
+        return {"x": [1, 2]}
+
+    assert cache.get_or_create(fingerprint, "scaling", create) == {"x": [1, 2]}
+    assert cache.get_or_create(fingerprint, "scaling", create) == {"x": [1, 2]}
+    assert len(created) == 1
+    assert cache.has(fingerprint, "scaling")
+    # model with same structure finds artifact in new cache instance
+    cache = ArtifactCache(tmp_path)
+    assert cache.load(get_structure_fingerprint(build_model(x_value=3)), "scaling") == {
+        "x": [1, 2]
+    }
+    assert cache.hits == 1
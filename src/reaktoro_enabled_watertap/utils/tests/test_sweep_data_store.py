@@ -0,0 +1,125 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from reaktoro_enabled_watertap.utils.sweep_data_store import (
+    export_sweep_to_columnar_store,
+    get_store_path,
+    SweepDataStore,
+    INDEX_FILE,
+)
+import os
+import numpy as np
+import h5py
+import pytest
+
+
+def write_loop_tool_output(h5_file):
+    """writes h5 file with same layout as loopTool output"""
+    with h5py.File(h5_file, "w") as f:
+        for hessian in ["lbfgs_gn", "bfgs_gn"]:
+            for water in ["BGW", "SW_RO"]:
+                sweep = f.create_group(
+                    f"stability_sweep/hessian_sim_cases/{hessian}/water_sim_cases/{water}/recovery_sweep"
+                )
+                recovery = np.linspace(0.5, 0.9, 11)
+                lcow = recovery * (2 if water == "SW_RO" else 1)
+                sweep.create_dataset(
+                    "sweep_params/fs.water_recovery/value", data=recovery
+                )
+                sweep.create_dataset("outputs/fs.water_recovery/value", data=recovery)
+                sweep.create_dataset("outputs/fs.costing.LCOW/value", data=lcow)
+                sweep.create_dataset("outputs/fs.costing.LCOW/units", data="USD/m**3")
+                sweep.create_dataset(
+                    "solve_successful/solve_successful", data=np.ones(11, dtype=bool)
+                )
+
+
+@pytest.mark.core
+def test_columnar_store(tmp_path):
+    h5_file = str(tmp_path / "stability_sweep_analysisType_stability_sweep.h5")
+    write_loop_tool_output(h5_file)
+    store_path = export_sweep_to_columnar_store(h5_file)
+    assert store_path == get_store_path(h5_file)
+    with pytest.raises(FileExistsError):
+        export_sweep_to_columnar_store(h5_file)
+    export_sweep_to_columnar_store(h5_file, overwrite=True)
+
+    store = SweepDataStore(store_path)
+    assert len(store.get_branches()) == 4
+    branches = store.get_branches(water_sim_cases="BGW")
+    assert len(branches) == 2
+    assert branches[0] == (
+        ("hessian_sim_cases", "bfgs_gn"),
+        ("water_sim_cases", "BGW"),
+        "recovery_sweep",
+    )
+    assert set(store.get_keys()) == {
+        "fs.water_recovery",
+        "fs.costing.LCOW",
+        "solve_successful",
+    }
+    assert store.get_units(branches[0], "fs.costing.LCOW") == "USD/m**3"
+
+    store.register_data_key("fs.costing.LCOW", "LCOW")
+    data = store.load_data(branches=store.get_branches(water_sim_cases="SW_RO"))
+    # only registered keys and selected branches are loaded
+    assert len(data) == 2
+    lcow = data[
+        (
+            ("hessian_sim_cases", "lbfgs_gn"),
+            ("water_sim_cases", "SW_RO"),
+            "recovery_sweep",
+            "LCOW",
+        )
+    ]
+    assert isinstance(lcow, np.memmap)
+    assert lcow == pytest.approx(np.linspace(0.5, 0.9, 11) * 2)
+
+    # opening from h5 uses existing store
+    store = SweepDataStore(h5_file)
+    assert store.store_path == store_path
+
+    # store is re-exported when h5 is newer
+    index_time = os.path.getmtime(os.path.join(store_path, INDEX_FILE))
+    os.utime(h5_file, (index_time + 10, index_time + 10))
+    store = SweepDataStore(h5_file)
+    assert os.path.getmtime(os.path.join(store_path, INDEX_FILE)) > index_time
+
+
+@pytest.mark.core
+def test_h5_subset(tmp_path):
+    h5_file = str(tmp_path / "stability_sweep_analysisType_stability_sweep.h5")
+    write_loop_tool_output(h5_file)
+    store = SweepDataStore(h5_file)
+    store.register_data_key("fs.water_recovery", "Water recovery", units="%")
+    subset_file = store.export_h5_subset()
+    assert store.export_h5_subset() == subset_file
+    with h5py.File(subset_file, "r") as f:
+        sweep = f[
+            "stability_sweep/hessian_sim_cases/bfgs_gn/water_sim_cases/BGW/recovery_sweep"
+        ]
+        # only registered keys are written
+        assert list(sweep["outputs"].keys()) == ["fs.water_recovery"]
+        assert sweep["sweep_params/fs.water_recovery/value"][()] == pytest.approx(
+            np.linspace(0.5, 0.9, 11)
+        )
+        assert sweep["solve_successful/solve_successful"][()].all()
+    store.register_key_pattern("fs.costing.*")
+    subset_file = store.export_h5_subset()
+    with h5py.File(subset_file, "r") as f:
+        sweep = f[
+            "stability_sweep/hessian_sim_cases/bfgs_gn/water_sim_cases/SW_RO/recovery_sweep"
+        ]
+        assert set(sweep["outputs"].keys()) == {"fs.water_recovery", "fs.costing.LCOW"}
+        assert sweep["outputs/fs.costing.LCOW/units"][()].decode() == "USD/m**3"
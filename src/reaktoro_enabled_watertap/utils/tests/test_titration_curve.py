@@ -0,0 +1,68 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+
+__author__ = "Alexander V. Dudchenko"
+
+from reaktoro_enabled_watertap.utils.titration_curve import (
+    get_spline_coefficients,
+    evaluate_spline,
+    build_spline_expression,
+)
+from pyomo.environ import ConcreteModel, Var, Param, value
+import numpy as np
+import pytest
+
+
+def get_titration_data():
+    # strong acid titration like curve with steep drop at equivalence point
+    x = np.array([-2, -1, -0.5, -0.1, 0, 0.1, 0.5, 1, 2])
+    pH = 7 - 3 * np.tanh(5 * x)
+    return x, pH
+
+
+@pytest.mark.core
+def test_spline_interpolation():
+    x, pH = get_titration_data()
+    coefficients = get_spline_coefficients(x, pH)
+    assert coefficients.shape == (len(x) - 1, 4)
+    assert evaluate_spline(x, coefficients, x) == pytest.approx(pH)
+    # spline does not overshoot monotone data
+    x_fine = np.linspace(-3, 3, 601)
+    pH_fine = evaluate_spline(x, coefficients, x_fine)
+    assert np.all(np.diff(pH_fine) <= 1e-12)
+    # linear extrapolation beyond knots
+    assert evaluate_spline(x, coefficients, [-3, -4]) == pytest.approx(
+        [pH[0] + coefficients[0, 1] * -1, pH[0] + coefficients[0, 1] * -2]
+    )
+    with pytest.raises(ValueError):
+        get_spline_coefficients([0, 1, 1], [1, 2, 3])
+
+
+@pytest.mark.core
+def test_spline_expression():
+    x, pH = get_titration_data()
+    coefficients = get_spline_coefficients(x, pH)
+    m = ConcreteModel()
+    m.x = Var(initialize=0)
+    m.knots = Param(range(len(x)), initialize=0, mutable=True)
+    m.coefficients = Param(range(len(x) - 1), range(4), initialize=0, mutable=True)
+    m.pH = build_spline_expression(m.x, m.knots, m.coefficients)
+    # params can be updated after expression is built
+    for i, knot in enumerate(x):
+        m.knots[i] = knot
+    for (i, k), coefficient in np.ndenumerate(coefficients):
+        m.coefficients[i, k] = coefficient
+    for point in [-4, -2, -0.3, 0, 0.05, 0.7, 2, 3.5]:
+        m.x.value = point
+        assert value(m.pH) == pytest.approx(
+            float(evaluate_spline(x, coefficients, point))
+        )
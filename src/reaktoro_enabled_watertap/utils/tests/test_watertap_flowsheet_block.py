@@ -19,6 +19,7 @@ from pyomo.environ import (
     ConcreteModel,
     Var,
     Constraint,
+    value,
     units as pyunits,
 )
 from idaes.core import (
@@ -28,9 +29,11 @@ from idaes.core import (
 from watertap.core.solvers import get_solver
 from pyomo.common.config import ConfigValue
 from watertap.property_models.seawater_prop_pack import SeawaterParameterBlock
+from reaktoro_enabled_watertap.utils import watertap_flowsheet_block
 from reaktoro_enabled_watertap.utils.watertap_flowsheet_block import (
     WaterTapFlowsheetBlockData,
 )
+from reaktoro_enabled_watertap.utils.report_util import evaluate_state_properties
 from idaes.core.util.model_statistics import degrees_of_freedom
 from idaes.core import (
     declare_process_block_class,
@@ -223,3 +226,72 @@ def test_report(feed_flowsheet_fixture):
     assert os.getvalue().replace(" ", "").encode("utf-8") == result.replace(
         " ", ""
     ).encode("utf-8")
+
+
+@pytest.mark.core
+def test_get_reporting_state(monkeypatch):
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.seawater_props = SeawaterParameterBlock()
+    m.fs.feed = FlowsheetFeed(default_property_package=m.fs.seawater_props)
+    assert m.fs.feed.config.build_reporting_properties == False
+    m.fs.state = m.fs.seawater_props.build_state_block([0])
+    m.fs.state[0].flow_mass_phase_comp["Liq", "H2O"].fix(1)
+    m.fs.state[0].flow_mass_phase_comp["Liq", "TDS"].fix(0.035)
+    m.fs.state[0].temperature.fix(298.15)
+    m.fs.state[0].pressure.fix(101325)
+
+    report_state = m.fs.feed.get_reporting_state(
+        m.fs.state[0], ("conc_mass_phase_comp", "flow_vol_phase")
+    )
+    # properties are evaluated on a detached state, and not added to model
+    assert report_state is not m.fs.state[0]
+    assert not m.fs.state[0].is_property_constructed("conc_mass_phase_comp")
+    assert not m.fs.state[0].is_property_constructed("flow_vol_phase")
+    assert pytest.approx(
+        report_state.flow_vol_phase["Liq"].value, rel=1e-5
+    ) == 1.035 / value(report_state.dens_mass_phase["Liq"])
+    assert (
+        pytest.approx(report_state.conc_mass_phase_comp["Liq", "TDS"].value, rel=1e-5)
+        == value(report_state.dens_mass_phase["Liq"]) * 0.035 / 1.035
+    )
+
+    # evaluation is cached while model state does not change
+    evaluations = []
+
+    def counted_evaluate(*args):
+        evaluations.append(args)
+        return evaluate_state_properties(*args)
+
+    monkeypatch.setattr(
+        watertap_flowsheet_block, "evaluate_state_properties", counted_evaluate
+    )
+    assert (
+        m.fs.feed.get_reporting_state(
+            m.fs.state[0], ("conc_mass_phase_comp", "flow_vol_phase")
+        )
+        is report_state
+    )
+    assert len(evaluations) == 0
+
+    # evaluation state is reused and updated with new model state
+    m.fs.state[0].flow_mass_phase_comp["Liq", "TDS"].fix(0.07)
+    new_report_state = m.fs.feed.get_reporting_state(
+        m.fs.state[0], ("conc_mass_phase_comp", "flow_vol_phase")
+    )
+    assert new_report_state is report_state
+    assert len(evaluations) == 1
+    assert (
+        pytest.approx(report_state.conc_mass_phase_comp["Liq", "TDS"].value, rel=1e-5)
+        == value(report_state.dens_mass_phase["Liq"]) * 0.07 / 1.07
+    )
+
+    # if property exists on the model, model state is returned
+    m.fs.state[0].conc_mass_phase_comp
+    m.fs.state[0].flow_vol_phase
+    assert (
+        m.fs.feed.get_reporting_state(
+            m.fs.state[0], ("conc_mass_phase_comp", "flow_vol_phase")
+        )
+        is m.fs.state[0]
+    )
@@ -0,0 +1,112 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+from pyomo.environ import Expr_if
+import numpy as np
+
+__author__ = "Alexander V. Dudchenko"
+
+
+def get_spline_coefficients(x, y):
+    """Returns coefficients of shape preserving (Fritsch-Carlson) cubic Hermite spline
+    through points x, y. Spline is continuous in value and first derivative, and
+    monotone wherever data is monotone, so it does not overshoot steep parts of
+    titration curves.
+
+    Args:
+        x: strictly increasing knots
+        y: values at knots
+
+    Returns:
+        array with shape (len(x)-1, 4) with coefficients a, b, c, d of
+        y = a + b*dx + c*dx**2 + d*dx**3 where dx = x - x[i] on each interval
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    h = np.diff(x)
+    if np.any(h <= 0):
+        raise ValueError("Spline knots must be strictly increasing")
+    delta = np.diff(y) / h
+    slopes = np.zeros(len(x))
+    slopes[0] = delta[0]
+    slopes[-1] = delta[-1]
+    for i in range(1, len(x) - 1):
+        if delta[i - 1] * delta[i] > 0:
+            # weighted harmonic mean keeps spline monotone
+            w1 = 2 * h[i] + h[i - 1]
+            w2 = h[i] + 2 * h[i - 1]
+            slopes[i] = (w1 + w2) / (w1 / delta[i - 1] + w2 / delta[i])
+    coefficients = np.zeros((len(h), 4))
+    coefficients[:, 0] = y[:-1]
+    coefficients[:, 1] = slopes[:-1]
+    coefficients[:, 2] = (3 * delta - 2 * slopes[:-1] - slopes[1:]) / h
+    coefficients[:, 3] = (slopes[:-1] + slopes[1:] - 2 * delta) / h**2
+    return coefficients
+
+
+def evaluate_spline(knots, coefficients, x):
+    """evaluates spline (with linear extrapolation outside of knots) at x"""
+    knots = np.asarray(knots, dtype=float)
+    x = np.asarray(x, dtype=float)
+    i = np.clip(np.searchsorted(knots, x, side="right") - 1, 0, len(knots) - 2)
+    dx = x - knots[i]
+    a, b, c, d = coefficients[i].T
+    result = a + b * dx + c * dx**2 + d * dx**3
+    # linear extrapolation using end slopes
+    h_end = knots[-1] - knots[-2]
+    a, b, c, d = coefficients[-1]
+    y_end = a + b * h_end + c * h_end**2 + d * h_end**3
+    slope_end = b + 2 * c * h_end + 3 * d * h_end**2
+    result = np.where(x > knots[-1], y_end + slope_end * (x - knots[-1]), result)
+    result = np.where(
+        x < knots[0],
+        coefficients[0, 0] + coefficients[0, 1] * (x - knots[0]),
+        result,
+    )
+    return result
+
+
+def build_spline_expression(x, knots, coefficients):
+    """Builds pyomo expression of spline (with linear extrapolation outside
+    of knots) as nested Expr_if.
+
+    Args:
+        x: pyomo expression spline is evaluated at
+        knots: indexed (0..n-1) param (or list) with knot locations
+        coefficients: param (or array) indexed by (interval, 0..3) with spline
+            coefficients (see get_spline_coefficients)
+    """
+    num_intervals = len(knots) - 1
+
+    def cubic(i, dx):
+        return (
+            coefficients[i, 0]
+            + coefficients[i, 1] * dx
+            + coefficients[i, 2] * dx**2
+            + coefficients[i, 3] * dx**3
+        )
+
+    last = num_intervals - 1
+    h_end = knots[num_intervals] - knots[last]
+    slope_end = (
+        coefficients[last, 1]
+        + 2 * coefficients[last, 2] * h_end
+        + 3 * coefficients[last, 3] * h_end**2
+    )
+    expr = cubic(last, h_end) + slope_end * (x - knots[num_intervals])
+    for i in reversed(range(num_intervals)):
+        expr = Expr_if(IF=x <= knots[i + 1], THEN=cubic(i, x - knots[i]), ELSE=expr)
+    expr = Expr_if(
+        IF=x <= knots[0],
+        THEN=coefficients[0, 0] + coefficients[0, 1] * (x - knots[0]),
+        ELSE=expr,
+    )
+    return expr
@@ -16,17 +16,52 @@ from idaes.core import (
     declare_process_block_class,
 )
 from pyomo.common.config import ConfigValue
+from pyomo.environ import Var
+import idaes.logger as idaeslog
 
 from reaktoro_enabled_watertap.utils.connection_utility import (
     PortContainer,
     ConnectionContainer,
 )
 from reaktoro_enabled_watertap.utils.report_util import (
-    build_report_table,
+    build_evaluation_state,
+    evaluate_state_properties,
+    get_state_values,
 )
+from reaktoro_enabled_watertap.utils.report_snapshot import (
+    ReportUnitCache,
+    take_report_snapshot,
+)
+from reaktoro_enabled_watertap.utils.initial_guess_table import (
+    get_composition_features,
+)
+from reaktoro_enabled_watertap.utils.phase_profiler import get_profiler
+import functools
 
 __author__ = "Alexander V. Dudchenko"
 
+_log = idaeslog.getLogger(__name__)
+
+# unit methods that are timed by phase profiler
+PROFILED_PHASES = [
+    "build",
+    "set_fixed_operation",
+    "scale_before_initialization",
+    "initialize_unit",
+    "propagate_outlets",
+    "set_optimization_operation",
+    "scale_post_initialization",
+]
+
+
+def _profile_phase(phase, method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with get_profiler().span(self.name, phase):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
 
 @declare_process_block_class("WaterTapFlowsheetBlock")
 class WaterTapFlowsheetBlockData(FlowsheetBlockData):
@@ -51,9 +86,47 @@ class WaterTapFlowsheetBlockData(FlowsheetBlockData):
             """,
         ),
     )
+    CONFIG.declare(
+        "build_reporting_properties",
+        ConfigValue(
+            default=False,
+            domain=bool,
+            description="Build on-demand properties used only for reporting",
+            doc="""
+                If True, on-demand properties used only for reporting (e.g. conc_mass_phase_comp,
+                flow_mass_phase_comp) are constructed on the model during build. If False, they
+                are not added to the model and are instead evaluated on a detached copy of the
+                state block when the unit is reported.
+            """,
+        ),
+    )
+
+    CONFIG.declare(
+        "initial_guess_table",
+        ConfigValue(
+            default=None,
+            description="Table of converged chemistry states used to seed initialization",
+            doc="""
+                InitialGuessTable with converged chemistry states, if provided, registered
+                chemistry variables (reaktoro blocks, their outputs, precipitate flows) are
+                seeded from the nearest table entry before chemistry is initialized
+            """,
+        ),
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        """wraps unit phases implemented by subclass with phase profiler spans"""
+        super().__init_subclass__(**kwargs)
+        for phase in PROFILED_PHASES:
+            if phase in cls.__dict__:
+                setattr(cls, phase, _profile_phase(phase, cls.__dict__[phase]))
 
     def build(self):
         self.outlet_connections = []
+        self._reporting_states = {}
+        self._report_unit_cache = ReportUnitCache()
+        self._initial_guess_inputs = None
+        self._initial_guess_components = []
         super().build()
 
     def fix_and_scale(self):
@@ -70,8 +143,9 @@ class WaterTapFlowsheetBlockData(FlowsheetBlockData):
 
     def propagate_outlets(self):
         """propagates registered outlet connections"""
-        for outlet in self.outlet_connections:
-            outlet.propagate()
+        with get_profiler().span(self.name, "propagate_outlets"):
+            for outlet in self.outlet_connections:
+                outlet.propagate()
 
     def set_fixed_operation(self, **kwargs):
         """Developer should implement a routine to fix unit operation for initialization and 0DOF solving"""
@@ -109,6 +183,92 @@ class WaterTapFlowsheetBlockData(FlowsheetBlockData):
         else:
             raise TypeError("Outlet connection must be a ConnectionContainer")
 
+    def get_reporting_state(
+        self, state, properties=("flow_mass_phase_comp", "conc_mass_phase_comp")
+    ):
+        """returns state block that should be used to report on-demand properties,
+        if properties are already on the model (or build_reporting_properties is True)
+        returns the model state, otherwise returns a detached copy of the state with
+        properties evaluated at current model solution, evaluation is cached and only
+        repeated when state values (or requested properties) change, so repeated
+        reports of same solution do not re-solve the detached state
+
+        Args:
+            state: state block data to report
+            properties: on-demand properties that will be reported
+        """
+        if self.config.build_reporting_properties or all(
+            state.is_property_constructed(prop) for prop in properties
+        ):
+            return state
+        if state.name not in self._reporting_states:
+            self._reporting_states[state.name] = (build_evaluation_state(state), None)
+        eval_model, evaluated_key = self._reporting_states[state.name]
+        key = (get_state_values(state), tuple(properties))
+        if key != evaluated_key:
+            evaluate_state_properties(state, eval_model, properties)
+            self._reporting_states[state.name] = (eval_model, key)
+        return eval_model.state[0]
+
+    def register_initial_guess_inputs(self, flow_mol_phase_comp, pH=None):
+        """registers chemistry input state used to look up initial guesses
+
+        Args:
+            flow_mol_phase_comp: flow_mol_phase_comp of state used as chemistry input
+            pH: pH var of the chemistry input
+        """
+        self._initial_guess_inputs = (flow_mol_phase_comp, pH)
+
+    def register_initial_guess_components(self, *components):
+        """registers vars (or blocks) whose values are stored in and seeded from
+        initial guess table"""
+        self._initial_guess_components.extend(components)
+
+    def _get_initial_guess_vars(self):
+        for component in self._initial_guess_components:
+            if component.ctype is Var:
+                if component.is_indexed():
+                    yield from component.values()
+                else:
+                    yield component
+            else:
+                yield from component.component_data_objects(Var, descend_into=True)
+
+    def seed_initial_guess(self):
+        """seeds registered unfixed variables from nearest entry in initial guess table
+
+        Returns:
+            dict of seeded values keyed by variable name relative to the unit,
+            or None if unit was not seeded
+        """
+        table = self.config.initial_guess_table
+        if table is None or self._initial_guess_inputs is None:
+            return None
+        values = table.lookup(
+            self.name, get_composition_features(*self._initial_guess_inputs)
+        )
+        if values is None:
+            return None
+        for var in self._get_initial_guess_vars():
+            name = var.getname(fully_qualified=True, relative_to=self)
+            if not var.fixed and values.get(name) is not None:
+                var.set_value(values[name], skip_validation=True)
+        _log.info(f"Seeded {self.name} from initial guess table")
+        return values
+
+    def record_initial_guess(self):
+        """adds current (converged) values of registered variables to initial guess table"""
+        table = self.config.initial_guess_table
+        if table is None or self._initial_guess_inputs is None:
+            return
+        values = {
+            var.getname(fully_qualified=True, relative_to=self): var.value
+            for var in self._get_initial_guess_vars()
+        }
+        table.add(
+            self.name, get_composition_features(*self._initial_guess_inputs), values
+        )
+
     def get_unit_name(self):
         """returns the name of the unit block, developer can overwrite this
         to provide more descriptive name"""
@@ -163,15 +323,26 @@ class WaterTapFlowsheetBlockData(FlowsheetBlockData):
         else:
             return None
 
+    def get_report_snapshot(self, use_default_units=False):
+        """returns ReportSnapshot of current model state, units of reported
+        values are cached on the unit, so repeated snapshots only read values
+
+        Args:
+            use_default_units: Boolean to indicate if default reporting units should be used
+        """
+        return take_report_snapshot(
+            self.get_unit_name(),
+            self.get_model_state_dict(),
+            use_default_units=use_default_units,
+            unit_cache=self._report_unit_cache,
+        )
+
     def report(
         self, time_point=0, dof=False, ostream=None, prefix="", use_default_units=False
     ):
-        defined_variables = self.get_model_state_dict()
         unit_name = self.get_unit_name()
 
         if unit_name is not None:
-            build_report_table(
-                unit_name, defined_variables, ostream, prefix, use_default_units
-            )
+            self.get_report_snapshot(use_default_units).to_text(ostream, prefix)
         if unit_name is None:
             super().report(time_point, dof, ostream, prefix)
@@ -0,0 +1,316 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+import os
+import math
+from time import perf_counter
+
+import pandas as pd
+from pyomo.environ import value, units as pyunits
+import idaes.logger as idaeslog
+
+from reaktoro_enabled_watertap.utils import continuation
+from reaktoro_enabled_watertap.utils.phase_profiler import get_profiler
+
+__author__ = "Alexander V. Dudchenko"
+
+_log = idaeslog.getLogger(__name__)
+
+# columns of plant data that are not ion concentrations
+STATE_COLUMNS = {
+    "timestamp",
+    "pH",
+    "temperature",
+    "feed_flow_rate",
+    "alkalinity_as_CaCO3",
+}
+
+# relative width of composition bins, records in same bin are treated as repeated
+DEFAULT_CACHE_TOLERANCE = 0.01
+PH_CACHE_TOLERANCE = 0.02
+TEMPERATURE_CACHE_TOLERANCE = 0.1
+
+
+def _iter_chunks(file_name, chunk_size):
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading parquet files requires pyarrow to be installed")
+        for batch in pq.ParquetFile(file_name).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(file_name, chunksize=chunk_size)
+
+
+def read_feed_stream(file_name, chunk_size=1000, column_map=None):
+    """Reads plant data (SCADA or lab data) from csv or parquet file in chunks, so
+    files larger than memory can be replayed.
+
+    Columns should include (all but ion concentrations are optional):
+        timestamp: record time
+        pH: feed pH
+        temperature: feed temperature in K
+        feed_flow_rate: feed flow rate in m3/day
+        alkalinity_as_CaCO3: feed alkalinity in mg/L as CaCO3
+        any other column is ion concentration in mg/L (e.g. Ca_2+)
+
+    Args:
+        file_name: csv or parquet (.parquet, .pq) file
+        chunk_size: number of rows read at once
+        column_map: dict that renames data columns (e.g. {"Calcium (mg/L)": "Ca_2+"})
+
+    Yields:
+        list of feed records for each chunk, records with missing values are skipped
+    """
+    for chunk in _iter_chunks(file_name, chunk_size):
+        if column_map is not None:
+            chunk = chunk.rename(columns=column_map)
+        records = []
+        for row in chunk.to_dict("records"):
+            record = get_feed_record(row)
+            if record is None:
+                _log.warning(f"Skipping record with missing data: {row}")
+            else:
+                records.append(record)
+        yield records
+
+
+def get_feed_record(row):
+    """converts data row to feed record with specifications for MultiCompFeed.update_feed,
+    returns None if row has missing values"""
+    if any(
+        val is None or (isinstance(val, float) and math.isnan(val))
+        for val in row.values()
+    ):
+        return None
+    record = {
+        "timestamp": row.get("timestamp"),
+        "ion_concentrations": {
+            ion: float(conc) for ion, conc in row.items() if ion not in STATE_COLUMNS
+        },
+    }
+    for key in ["pH", "temperature", "feed_flow_rate", "alkalinity_as_CaCO3"]:
+        record[key] = float(row[key]) if key in row else None
+    return record
+
+
+def _bin(val, tolerance):
+    # relative bins for concentrations and flows
+    return round(math.log(max(val, 1e-12)) / math.log1p(tolerance))
+
+
+def get_composition_key(record, tolerance=DEFAULT_CACHE_TOLERANCE):
+    """returns key of feed composition (ions, pH, temperature, and alkalinity), records
+    with same key reconcile to the same feed"""
+    key = [
+        (ion, _bin(conc, tolerance))
+        for ion, conc in sorted(record["ion_concentrations"].items())
+    ]
+    if record.get("pH") is not None:
+        key.append(("pH", round(record["pH"] / PH_CACHE_TOLERANCE)))
+    if record.get("temperature") is not None:
+        key.append(
+            ("temperature", round(record["temperature"] / TEMPERATURE_CACHE_TOLERANCE))
+        )
+    if record.get("alkalinity_as_CaCO3") is not None:
+        key.append(
+            ("alkalinity_as_CaCO3", _bin(record["alkalinity_as_CaCO3"], tolerance))
+        )
+    return tuple(key)
+
+
+def get_record_key(record, tolerance=DEFAULT_CACHE_TOLERANCE):
+    """returns key of feed composition and flow, records with the same key have the same
+    optimal operation"""
+    key = get_composition_key(record, tolerance)
+    if record.get("feed_flow_rate") is not None:
+        key = key + (("feed_flow_rate", _bin(record["feed_flow_rate"], tolerance)),)
+    return key
+
+
+class FeedStreamReplay:
+    """Replays feed records through a pre-built and solved flowsheet. Each record
+    is reconciled for charge and alkalinity by the feed unit, and flowsheet is
+    re-solved starting from solution of previous record (warm start), if warm
+    started solve fails, flowsheet is moved to new feed using continuation.
+
+    Reconciled feeds are cached by composition, and results by composition and flow,
+    so repeated records (e.g. lab data held between samples) are not reconciled
+    or solved again.
+
+    Args:
+        m: flowsheet model that is initialized and solved
+        solve_function: function(m) that solves model (should raise on failed solve)
+        outputs: dict of result names and pyomo components (e.g. LCOW, doses)
+        feed: MultiCompFeed unit that records are applied to (defaults to m.fs.feed)
+        cache_tolerance: relative tolerance of composition and flow bins used for caching
+        continuation_options: options passed to continuation.continuation_solve
+    """
+
+    def __init__(
+        self,
+        m,
+        solve_function,
+        outputs,
+        feed=None,
+        cache_tolerance=DEFAULT_CACHE_TOLERANCE,
+        continuation_options=None,
+    ):
+        self.m = m
+        self.solve_function = solve_function
+        self.outputs = outputs
+        self.feed = feed if feed is not None else m.fs.feed
+        self.cache_tolerance = cache_tolerance
+        self.continuation_options = (
+            continuation_options if continuation_options is not None else {}
+        )
+        self.reconciled_feeds = {}
+        self.results = {}
+        self.stats = {
+            "records": 0,
+            "reconciliations": 0,
+            "cached_results": 0,
+            "continuation_solves": 0,
+            "failed_records": 0,
+            "time": 0.0,
+        }
+
+    def reconcile(self, record):
+        """returns reconciled feed state for record, feed is left at its current state"""
+        key = get_composition_key(record, self.cache_tolerance)
+        if key not in self.reconciled_feeds:
+            current_state = self.feed.get_feed_state()
+            with get_profiler().span("feed_reconciliation"):
+                self.feed.update_feed(
+                    ion_concentrations={
+                        ion: conc * pyunits.mg / pyunits.L
+                        for ion, conc in record["ion_concentrations"].items()
+                    },
+                    pH=record.get("pH"),
+                    temperature=record.get("temperature"),
+                    alkalinity_as_CaCO3=(
+                        record["alkalinity_as_CaCO3"] * pyunits.mg / pyunits.L
+                        if record.get("alkalinity_as_CaCO3") is not None
+                        else None
+                    ),
+                )
+            state = self.feed.get_feed_state()
+            # flow is set per record, so only composition is cached
+            del state["flow_vol"]
+            self.reconciled_feeds[key] = state
+            self.feed.set_feed_state(current_state)
+            self.stats["reconciliations"] += 1
+        state = dict(self.reconciled_feeds[key])
+        if record.get("feed_flow_rate") is not None:
+            state["flow_vol"] = value(
+                pyunits.convert(
+                    record["feed_flow_rate"] * pyunits.m**3 / pyunits.day,
+                    to_units=pyunits.m**3 / pyunits.s,
+                )
+            )
+        return state
+
+    def solve_record(self, state):
+        """moves flowsheet to feed state, returns True if solve converged"""
+        start_state = self.feed.get_feed_state()
+        converged_values = continuation.store_variable_values(self.m)
+        self.feed.set_feed_state(state)
+        try:
+            with get_profiler().span("record_solve"):
+                self.solve_function(self.m)
+            return True
+        except Exception as e:
+            _log.info(f"Warm started solve failed ({e}), using continuation")
+        continuation.restore_variable_values(converged_values)
+        self.feed.set_feed_state(start_state)
+        state_vars = self.feed.get_feed_state_vars()
+        self.stats["continuation_solves"] += 1
+        try:
+            with get_profiler().span("record_continuation"):
+                continuation.continuation_solve(
+                    self.m,
+                    self.solve_function,
+                    [(state_vars[key], val) for key, val in state.items()],
+                    **self.continuation_options,
+                )
+            return True
+        except Exception as e:
+            _log.warning(f"Continuation to record feed failed: {e}")
+            continuation.restore_variable_values(converged_values)
+            self.feed.set_feed_state(start_state)
+            return False
+
+    def process_record(self, record):
+        """reconciles and solves record, returns dict with record timestamp, outputs,
+        and whether solve converged or result was cached"""
+        start = perf_counter()
+        self.stats["records"] += 1
+        key = get_record_key(record, self.cache_tolerance)
+        if key in self.results:
+            self.stats["cached_results"] += 1
+            result = dict(self.results[key])
+            result["cached"] = True
+        else:
+            try:
+                converged = self.solve_record(self.reconcile(record))
+            except Exception as e:
+                _log.warning(f"Feed reconciliation failed: {e}")
+                converged = False
+            if converged:
+                result = {name: value(obj) for name, obj in self.outputs.items()}
+                self.results[key] = result
+                result = dict(result)
+            else:
+                self.stats["failed_records"] += 1
+                result = {name: None for name in self.outputs}
+            result["converged"] = converged
+            result["cached"] = False
+        result["timestamp"] = record.get("timestamp")
+        self.stats["time"] += perf_counter() - start
+        return result
+
+    def process_batch(self, records):
+        return [self.process_record(record) for record in records]
+
+    def replay(self, file_name, chunk_size=1000, column_map=None, output_file=None):
+        """Replays plant data file chunk by chunk, results of each chunk are appended
+        to output_file (csv) if provided.
+
+        Returns:
+            list of results for all records (empty if output_file is provided)
+        """
+        results = []
+        write_header = True
+        for records in read_feed_stream(file_name, chunk_size, column_map):
+            chunk_results = self.process_batch(records)
+            if output_file is not None:
+                pd.DataFrame(chunk_results).to_csv(
+                    output_file,
+                    mode="w" if write_header else "a",
+                    header=write_header,
+                    index=False,
+                )
+                write_header = False
+            else:
+                results.extend(chunk_results)
+            _log.info(
+                f"Processed {self.stats['records']} records, "
+                f"{self.get_throughput():.1f} records/hour"
+            )
+        return results
+
+    def get_throughput(self):
+        """returns number of records processed per hour of wall time"""
+        if self.stats["time"] == 0:
+            return 0
+        return self.stats["records"] / self.stats["time"] * 3600
@@ -0,0 +1,69 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2026, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Laboratory of the Rockies, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://https://github.com/watertap-org/reaktoro_enabled_watertap"
+#################################################################################
+import pytest
+from reaktoro_enabled_watertap.water_sources import feed_stream
+
+__author__ = "Alexander V. Dudchenko"
+
+
+@pytest.fixture
+def plant_data(tmp_path):
+    data_file = tmp_path / "plant_data.csv"
+    data_file.write_text(
+        "timestamp,pH,temperature,feed_flow_rate,Calcium,Cl_-\n"
+        "2024-01-01 00:00,7.1,293.15,5000,258,870\n"
+        "2024-01-01 01:00,7.1,293.15,5000,258.5,870\n"
+        "2024-01-01 02:00,7.1,293.15,,260,870\n"
+        "2024-01-01 03:00,7.4,293.15,4000,300,870\n"
+        "2024-01-01 04:00,7.4,293.15,6000,300,870\n"
+    )
+    return str(data_file)
+
+
+@pytest.mark.core
+def test_read_feed_stream(plant_data):
+    chunks = list(
+        feed_stream.read_feed_stream(
+            plant_data, chunk_size=2, column_map={"Calcium": "Ca_2+"}
+        )
+    )
+    assert [len(chunk) for chunk in chunks] == [2, 1, 1]
+    record = chunks[0][0]
+    assert record["timestamp"] == "2024-01-01 00:00"
+    assert record["ion_concentrations"] == {"Ca_2+": 258, "Cl_-": 870}
+    assert record["pH"] == 7.1
+    assert record["temperature"] == 293.15
+    assert record["feed_flow_rate"] == 5000
+    assert record["alkalinity_as_CaCO3"] is None
+
+
+@pytest.mark.core
+def test_record_keys(plant_data):
+    records = [
+        record
+        for chunk in feed_stream.read_feed_stream(plant_data, chunk_size=10)
+        for record in chunk
+    ]
+    # composition within tolerance is treated as repeated
+    assert feed_stream.get_record_key(records[0]) == feed_stream.get_record_key(
+        records[1]
+    )
+    assert feed_stream.get_record_key(records[0]) != feed_stream.get_record_key(
+        records[2]
+    )
+    # same composition at different flow reuses reconciled feed, but not results
+    assert feed_stream.get_composition_key(
+        records[2]
+    ) == feed_stream.get_composition_key(records[3])
+    assert feed_stream.get_record_key(records[2]) != feed_stream.get_record_key(
+        records[3]
+    )